@@ -0,0 +1,69 @@
+import os
+
+from deepstar.models.blob_model import BlobModel
+from deepstar.util.command_line_route_handler import CommandLineRouteHandler
+from deepstar.util.debug import debug
+
+
+class BlobCommandLineRouteHandler(CommandLineRouteHandler):
+    """
+    This class implements the BlobCommandLineRouteHandler class.
+    """
+
+    def list(self):
+        """
+        This method lists statistics for the blob store.
+
+        :rtype: None
+        """
+
+        count, refs, size, ref_size = BlobModel().stats()
+
+        debug(f'enabled={BlobModel.enabled()}', 3)
+        debug('blobs | refs | size | referenced size', 3)
+        debug('-------------------------------------', 3)
+        debug(f'{count} | {refs} | {size} | {ref_size}', 3)
+
+    def gc(self):
+        """
+        This method removes blobs that are no longer referenced.
+
+        :rtype: None
+        """
+
+        count, size = BlobModel().gc()
+
+        debug(f'{count} blobs ({size} bytes) were successfully removed', 3)
+
+    def usage(self):
+        """
+        This method prints usage.
+
+        :rtype: None
+        """
+
+        path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'blob_command_line_route_handler_usage.txt')
+
+        with open(path, 'r') as file_:
+            usage = file_.read()
+
+        usage = usage.strip()
+
+        debug(usage, 3)
+
+    def handle(self, args, opts):
+        """
+        This method handles command line arguments for the blob store.
+
+        :param list(str) args: The list of command line arguments.
+        :param dict opts: The dict of options.
+        :rtype: None
+        """
+
+        if args[1] == 'list':
+            self.list()
+        elif args[1] == 'gc':
+            self.gc()
+        elif args[1] == 'usage':
+            self.usage()
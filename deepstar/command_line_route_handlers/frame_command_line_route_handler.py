@@ -42,26 +42,17 @@ class FrameCommandLineRouteHandler(CommandLineRouteHandler):
         if count == 0:
             return
 
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
-        offset = 0
         p1 = FrameSetSubDir.path(frame_set_id)
 
-        while True:
-            frames = frame_model.list(frame_set_id, length=length,
-                                      offset=offset)
+        extension = FrameSetModel().codec(frame_set_id).extension
 
-            if not frames:
-                break
+        for frame in frame_model.iterate(frame_set_id):
+            p2 = FrameFile.path(p1, frame[0], extension)
 
-            for frame in frames:
-                p2 = FrameFile.path(p1, frame[0], 'jpg')
+            height, width, _ = cv2.imread(p2).shape
 
-                height, width, _ = cv2.imread(p2).shape
-
-                debug(f'{frame[0]} | {frame[1]} | {frame[2]} | ({width} | '
-                      f'{height})', 3)
-
-            offset += length
+            debug(f'{frame[0]} | {frame[1]} | {frame[2]} | ({width} | '
+                  f'{height})', 3)
 
     def usage(self):
         """
@@ -7,14 +7,18 @@ import imutils
 
 from deepstar.filesystem.frame_file import FrameFile
 from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
+from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
+from deepstar.models.blob_model import BlobModel
 from deepstar.models.frame_model import FrameModel
 from deepstar.models.frame_set_model import FrameSetModel
 from deepstar.models.transform_set_model import TransformSetModel
 from deepstar.plugins.plugin import Plugin
+from deepstar.util.codec import Codec
 from deepstar.util.command_line_route_handler import CommandLineRouteHandler
 from deepstar.util.command_line_route_handler_error import \
     CommandLineRouteHandlerError
 from deepstar.util.debug import debug
+from deepstar.util.model_cache import ModelCache
 from deepstar.util.parse import parse_range
 
 
@@ -82,11 +86,27 @@ class FrameSetCommandLineRouteHandler(CommandLineRouteHandler):
             raise CommandLineRouteHandlerError(
                 f"'{name}' is not a valid frame set extraction plugin name")
 
+        # the plugin's models are loaded once up front (see ModelCache) so
+        # that an invalid option or a model that fails to load is reported
+        # before any work is done
+        if hasattr(plugin, 'models'):
+            try:
+                ModelCache.warm(plugin.models(opts))
+            except ValueError as e:
+                raise CommandLineRouteHandlerError(str(e))
+
         transform_set_model = TransformSetModel()
 
         for frame_set_id in frame_set_ids:
-            transform_set_id = plugin().frame_set_select_extract(frame_set_id,
-                                                                 opts)
+            try:
+                transform_set_id = plugin() \
+                    .frame_set_select_extract(frame_set_id, opts)
+            except ValueError as e:
+                raise CommandLineRouteHandlerError(str(e))
+
+            if BlobModel.enabled():
+                BlobModel().insert_dir(
+                    TransformSetSubDir.path(transform_set_id))
 
             result = transform_set_model.select(transform_set_id)
 
@@ -112,10 +132,16 @@ class FrameSetCommandLineRouteHandler(CommandLineRouteHandler):
                 raise CommandLineRouteHandlerError(
                     f'Frame set with ID {frame_set_id:08d} not found')
 
+        blob_model = BlobModel()
+
         for frame_set_id in frame_set_ids:
             frame_set_model.delete(frame_set_id)
 
-            shutil.rmtree(FrameSetSubDir.path(frame_set_id))
+            p1 = FrameSetSubDir.path(frame_set_id)
+
+            blob_model.delete_dir(p1)
+
+            shutil.rmtree(p1)
 
             debug(f'Frame set {frame_set_id} was successfully deleted', 3)
 
@@ -139,9 +165,11 @@ class FrameSetCommandLineRouteHandler(CommandLineRouteHandler):
         for frame_set_id in frame_set_ids:
             result = frame_set_model.select(frame_set_id)
 
-            self.select_merge([frame_set_id], result[1], rejected=True)
+            self.select_merge([frame_set_id], result[1], rejected=True,
+                              codec=frame_set_model.codec(frame_set_id))
 
-    def select_merge(self, frame_set_ids, video_id=None, rejected=False):
+    def select_merge(self, frame_set_ids, video_id=None, rejected=False,
+                     codec=None):
         """
         This method merges multiple frame sets into one frame set.
 
@@ -150,10 +178,15 @@ class FrameSetCommandLineRouteHandler(CommandLineRouteHandler):
              (if any). The default value is None.
         :param bool rejected: True if should include rejected frames else False
             if should not. The default value is False.
+        :param Codec codec: The merged frame set's codec (frames in other
+            codecs are transcoded). The default value is Codec().
         :raises: CommandLineRouteHandlerError
         :rtype: None
         """
 
+        if codec is None:
+            codec = Codec()
+
         frame_set_model = FrameSetModel()
 
         for frame_set_id in frame_set_ids:
@@ -162,45 +195,96 @@ class FrameSetCommandLineRouteHandler(CommandLineRouteHandler):
                 raise CommandLineRouteHandlerError(
                     f'Frame set with ID {frame_set_id:08d} not found')
 
-        frame_set_id = frame_set_model.insert(video_id)
+        frame_set_id = frame_set_model.insert(video_id, codec)
 
         p1 = FrameSetSubDir.path(frame_set_id)
 
         os.makedirs(p1)
 
         frame_model = FrameModel()
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
 
         for frame_set_id_ in frame_set_ids:
-            offset = 0
             p2 = FrameSetSubDir.path(frame_set_id_)
 
-            while True:
-                frames = frame_model.list(frame_set_id_, length=length,
-                                          offset=offset, rejected=rejected)
+            codec_ = frame_set_model.codec(frame_set_id_)
 
-                if not frames:
-                    break
+            ids = frame_model.merge(frame_set_id, frame_set_id_,
+                                    rejected=rejected)
 
-                for frame in frames:
-                    frame_id = frame_model.insert(frame_set_id, frame[2])
+            for frame_id_, frame_id in ids:
+                p3 = FrameFile.path(p2, frame_id_, codec_.extension)
+                p4 = FrameFile.path(p2, frame_id_, codec_.extension,
+                                    '192x192')
+                p5 = FrameFile.path(p1, frame_id, codec.extension)
+                p6 = FrameFile.path(p1, frame_id, codec.extension, '192x192')
 
-                    p3 = FrameFile.path(p2, frame[0], 'jpg')
-                    p4 = FrameFile.path(p2, frame[0], 'jpg', '192x192')
-                    p5 = FrameFile.path(p1, frame_id, 'jpg')
-                    p6 = FrameFile.path(p1, frame_id, 'jpg', '192x192')
+                codec.copy(p3, codec_, p5)
+                codec.copy(p4, codec_, p6)
 
-                    shutil.copy(p3, p5)
-                    shutil.copy(p4, p6)
+                debug(f'Frame with ID {frame_id_:08d} and thumbnail at {p3} '
+                      f'and {p4} merged as ID {frame_id:08d} at {p5} and '
+                      f'{p6}', 4)
 
-                    debug(f'Frame with ID {frame[0]:08d} and thumbnail at '
-                          f'{p3} and {p4} merged as ID {frame_id:08d} at '
-                          f'{p5} and {p6}', 4)
-
-                offset += length
+        if BlobModel.enabled():
+            BlobModel().insert_dir(p1)
 
         debug(f'frame_set_id={frame_set_id}, fk_videos={video_id}', 3)
 
+    def select_reextract(self, frame_set_ids, opts={}):
+        """
+        This method re-extracts the frames of frame sets from their videos to
+        new frame sets, seeking straight to the frame number of each frame
+        that was not rejected (e.g. to regenerate or upscale only the frames
+        that survived curation).
+
+        :param list(int) frame_set_ids: The frame set IDs.
+        :param dict opts: The dict of options.
+        :raises: CommandLineRouteHandlerError
+        :rtype: None
+        """
+
+        frame_set_model = FrameSetModel()
+
+        frame_model = FrameModel()
+
+        frame_numbers = {}
+
+        for frame_set_id in frame_set_ids:
+            result = frame_set_model.select(frame_set_id)
+            if result is None:
+                raise CommandLineRouteHandlerError(
+                    f'Frame set with ID {frame_set_id:08d} not found')
+
+            if result[1] is None:
+                raise CommandLineRouteHandlerError(
+                    f'Frame set with ID {frame_set_id:08d} does not '
+                    f'correspond to a video')
+
+            positions = frame_model.positions(frame_set_id, rejected=False)
+
+            for frame_id, frame_number, _ in positions:
+                if frame_number is None:
+                    raise CommandLineRouteHandlerError(
+                        f'Frame with ID {frame_id:08d} does not have a '
+                        f'frame number')
+
+            frame_numbers[frame_set_id] = [r[1] for r in positions]
+
+        width = int(opts.get('width', 0))
+
+        plugin = Plugin.get('video_select_extract', 'default')()
+
+        for frame_set_id in frame_set_ids:
+            video_id = frame_set_model.select(frame_set_id)[1]
+
+            frame_set_id_ = plugin.video_select_reextract(
+                video_id, frame_numbers[frame_set_id], width=width)
+
+            if BlobModel.enabled():
+                BlobModel().insert_dir(FrameSetSubDir.path(frame_set_id_))
+
+            debug(f'frame_set_id={frame_set_id_}, fk_videos={video_id}', 3)
+
     def select_export_dir(self, frame_set_ids, target_dir, opts={}):
         """
         This method exports frame sets to a directory.
@@ -221,36 +305,27 @@ class FrameSetCommandLineRouteHandler(CommandLineRouteHandler):
                     f'Frame set with ID {frame_set_id:08d} not found')
 
         frame_model = FrameModel()
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
         count = 0
 
         for fid in frame_set_ids:
-            offset = 0
             frame_set_path = FrameSetSubDir.path(fid)
 
-            while True:
-                results = frame_model.list(fid, length=length, offset=offset,
-                                           rejected=False)
-
-                if not results:
-                    break
-
-                for frame_id, _, _ in results:
-                    file_path = FrameFile().path(frame_set_path, frame_id,
-                                                 'jpg')
-                    if 'format' in opts:
-                        filename = opts['format'] % frame_id
-                    else:
-                        filename = os.path.basename(file_path)
+            extension = frame_set_model.codec(fid).extension
 
-                    target_path = os.path.join(target_dir, filename)
-                    shutil.copy(file_path, target_path)
-                    count += 1
+            for frame_id, _, _ in frame_model.iterate(fid, rejected=False):
+                file_path = FrameFile().path(frame_set_path, frame_id,
+                                             extension)
+                if 'format' in opts:
+                    filename = opts['format'] % frame_id
+                else:
+                    filename = os.path.basename(file_path)
 
-                    debug(f'Frame with ID {frame_id:08d} at {file_path} '
-                          f'exported to {target_path}', 4)
+                target_path = os.path.join(target_dir, filename)
+                shutil.copy(file_path, target_path)
+                count += 1
 
-                offset += length
+                debug(f'Frame with ID {frame_id:08d} at {file_path} '
+                      f'exported to {target_path}', 4)
 
         debug(f'{count} frames were successfully exported to {target_dir}',
               3)
@@ -270,7 +345,9 @@ class FrameSetCommandLineRouteHandler(CommandLineRouteHandler):
             raise CommandLineRouteHandlerError(
                 f'The path at {images_path} is not a directory')
 
-        frame_set_id = FrameSetModel().insert(None)
+        codec = Codec()
+
+        frame_set_id = FrameSetModel().insert(None, codec)
 
         p1 = FrameSetSubDir.path(frame_set_id)
 
@@ -278,30 +355,34 @@ class FrameSetCommandLineRouteHandler(CommandLineRouteHandler):
 
         frame_model = FrameModel()
 
-        for image_path in glob.glob(os.path.join(images_path, '*')):
-            ext = os.path.splitext(image_path)[1].lower()
+        with frame_model.batch() as batch:
+            for image_path in glob.glob(os.path.join(images_path, '*')):
+                ext = os.path.splitext(image_path)[1].lower()
+
+                if ext not in ['.jpg', '.png']:
+                    debug(f"Skipped image at {image_path} because it does "
+                          f"not have a '.jpg' or '.png' file extension", 4)
+                    continue
 
-            if ext not in ['.jpg', '.png']:
-                debug(f"Skipped image at {image_path} because it does not "
-                      f"have a '.jpg' or '.png' file extension", 4)
-                continue
+                image = cv2.imread(image_path)
 
-            image = cv2.imread(image_path)
+                frame_id = batch.insert(frame_set_id, 0)
 
-            frame_id = frame_model.insert(frame_set_id, 0)
+                p2 = FrameFile.path(p1, frame_id, codec.extension)
 
-            p2 = FrameFile.path(p1, frame_id, 'jpg')
+                codec.write(p2, image)
 
-            cv2.imwrite(p2, image, [cv2.IMWRITE_JPEG_QUALITY, 100])
+                thumbnail = imutils.resize(image, width=192, height=192)
 
-            thumbnail = imutils.resize(image, width=192, height=192)
+                p3 = FrameFile.path(p1, frame_id, codec.extension, '192x192')
 
-            p3 = FrameFile.path(p1, frame_id, 'jpg', '192x192')
+                codec.write(p3, thumbnail)
 
-            cv2.imwrite(p3, thumbnail, [cv2.IMWRITE_JPEG_QUALITY, 100])
+                debug(f'Image at {image_path} inserted with ID '
+                      f'{frame_id:08d} at {p2} and {p3}', 4)
 
-            debug(f'Image at {image_path} inserted with ID {frame_id:08d} at '
-                  f'{p2} and {p3}', 4)
+        if BlobModel.enabled():
+            BlobModel().insert_dir(p1)
 
         debug(f'frame_set_id={frame_set_id}, fk_videos=None', 3)
 
@@ -346,6 +427,8 @@ class FrameSetCommandLineRouteHandler(CommandLineRouteHandler):
             self.select_clone(parse_range(args[3]))
         elif args[1] == 'select' and args[4] == 'merge':
             self.select_merge(parse_range(args[3]))
+        elif args[1] == 'select' and args[4] == 'reextract':
+            self.select_reextract(parse_range(args[3]), opts)
         elif args[1] == 'select' and args[4] == 'export' \
                 and args[5] == 'dir':
             self.select_export_dir(parse_range(args[3]), args[6], opts)
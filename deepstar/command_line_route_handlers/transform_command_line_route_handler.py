@@ -45,27 +45,18 @@ class TransformCommandLineRouteHandler(CommandLineRouteHandler):
         if count == 0:
             return
 
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
-        offset = 0
         p1 = TransformSetSubDir.path(transform_set_id)
 
-        while True:
-            transforms = transform_model.list(transform_set_id, length=length,
-                                              offset=offset)
+        extension = TransformSetModel().codec(transform_set_id).extension
 
-            if not transforms:
-                break
+        for transform in transform_model.iterate(transform_set_id):
+            p2 = TransformFile.path(p1, transform[0], extension)
 
-            for transform in transforms:
-                p2 = TransformFile.path(p1, transform[0], 'jpg')
+            height, width, _ = cv2.imread(p2).shape
 
-                height, width, _ = cv2.imread(p2).shape
-
-                debug(f'{transform[0]} | {transform[1]} | {transform[2]} | '
-                      f'{transform[3]} | {transform[4]} | ({width} | '
-                      f'{height})', 3)
-
-            offset += length
+            debug(f'{transform[0]} | {transform[1]} | {transform[2]} | '
+                  f'{transform[3]} | {transform[4]} | ({width} | '
+                  f'{height})', 3)
 
     def usage(self):
         """
@@ -3,9 +3,11 @@ import shutil
 
 from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
+from deepstar.models.blob_model import BlobModel
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
 from deepstar.plugins.plugin import Plugin
+from deepstar.util.codec import Codec
 from deepstar.util.command_line_route_handler import CommandLineRouteHandler
 from deepstar.util.command_line_route_handler_error import \
     CommandLineRouteHandlerError
@@ -69,6 +71,10 @@ class TransformSetCommandLineRouteHandler(CommandLineRouteHandler):
             except ValueError as e:
                 raise CommandLineRouteHandlerError(str(e))
 
+            if BlobModel.enabled():
+                BlobModel().insert_dir(
+                    TransformSetSubDir.path(new_transform_set_id))
+
             result = transform_set_model.select(new_transform_set_id)
 
             debug(f'transform_set_id={result[0]}, name={result[1]}, '
@@ -152,36 +158,28 @@ class TransformSetCommandLineRouteHandler(CommandLineRouteHandler):
                 f'{target_dir} is not a directory')
 
         transform_model = TransformModel()
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
         count = 0
 
         for tid in transform_set_ids:
-            offset = 0
             transform_set_path = TransformSetSubDir.path(tid)
 
-            while True:
-                results = transform_model.list(tid, length=length,
-                                               offset=offset, rejected=False)
-
-                if not results:
-                    break
-
-                for transform_id, _, _, _, _ in results:
-                    file_path = TransformFile().path(transform_set_path,
-                                                     transform_id, 'jpg')
-                    if 'format' in opts:
-                        filename = opts['format'] % transform_id
-                    else:
-                        filename = os.path.basename(file_path)
+            extension = transform_set_model.codec(tid).extension
 
-                    target_path = os.path.join(target_dir, filename)
-                    shutil.copy(file_path, target_path)
-                    count += 1
+            for transform_id, _, _, _, _ in transform_model.iterate(
+                    tid, rejected=False):
+                file_path = TransformFile().path(transform_set_path,
+                                                 transform_id, extension)
+                if 'format' in opts:
+                    filename = opts['format'] % transform_id
+                else:
+                    filename = os.path.basename(file_path)
 
-                    debug(f'Transform with ID {transform_id:08d} at '
-                          f'{file_path} exported to {target_path}', 4)
+                target_path = os.path.join(target_dir, filename)
+                shutil.copy(file_path, target_path)
+                count += 1
 
-                offset += length
+                debug(f'Transform with ID {transform_id:08d} at '
+                      f'{file_path} exported to {target_path}', 4)
 
         debug(f'{count} transforms were successfully exported to {target_dir}',
               3)
@@ -207,7 +205,6 @@ class TransformSetCommandLineRouteHandler(CommandLineRouteHandler):
                 f'{target_dir} is not a directory')
 
         transform_model = TransformModel()
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
         count = 0
 
         for transform_set_id in transform_set_ids:
@@ -215,28 +212,20 @@ class TransformSetCommandLineRouteHandler(CommandLineRouteHandler):
                                       f'{transform_set_id:08X}.mp4')
 
             def image_paths():
-                offset = 0
                 p1 = TransformSetSubDir.path(transform_set_id)
 
-                while True:
-                    transforms = transform_model.list(transform_set_id,
-                                                      length=length,
-                                                      offset=offset,
-                                                      rejected=False)
+                extension = TransformSetModel().codec(
+                    transform_set_id).extension
 
-                    if not transforms:
-                        break
+                for transform in transform_model.iterate(transform_set_id,
+                                                         rejected=False):
+                    image_path = TransformFile.path(p1, transform[0],
+                                                    extension)
 
-                    for transform in transforms:
-                        image_path = TransformFile.path(p1, transform[0],
-                                                        'jpg')
+                    yield image_path
 
-                        yield image_path
-
-                        debug(f'Transform with ID {transform[0]:08d} at '
-                              f'{image_path} exported to {video_path}', 4)
-
-                    offset += length
+                    debug(f'Transform with ID {transform[0]:08d} at '
+                          f'{image_path} exported to {video_path}', 4)
 
             ret = create_one_video_file_from_many_image_files(
                 image_paths, video_path)
@@ -275,10 +264,12 @@ class TransformSetCommandLineRouteHandler(CommandLineRouteHandler):
             self.select_merge([transform_set_id], name=result[1],
                               fk_frame_sets=result[2],
                               fk_prev_transform_sets=transform_set_id,
-                              rejected=True)
+                              rejected=True,
+                              codec=transform_set_model.codec(
+                                  transform_set_id))
 
     def select_merge(self, transform_set_ids, name='merge', fk_frame_sets=None,
-                     fk_prev_transform_sets=None, rejected=False):
+                     fk_prev_transform_sets=None, rejected=False, codec=None):
         """
         This method merges multiple transform sets into one transform set.
 
@@ -292,10 +283,15 @@ class TransformSetCommandLineRouteHandler(CommandLineRouteHandler):
             is None.
         :param bool rejected: True if should include rejected else False if
             should not. The default value is False.
+        :param Codec codec: The merged transform set's codec (transforms in
+            other codecs are transcoded). The default value is Codec().
         :raises: CommandLineRouteHandlerError
         :rtype: None
         """
 
+        if codec is None:
+            codec = Codec()
+
         transform_set_model = TransformSetModel()
 
         for transform_set_id in transform_set_ids:
@@ -305,43 +301,34 @@ class TransformSetCommandLineRouteHandler(CommandLineRouteHandler):
                     f'Transform set with ID {transform_set_id:08d} not found')
 
         transform_set_id = transform_set_model.insert(name, fk_frame_sets,
-                                                      fk_prev_transform_sets)
+                                                      fk_prev_transform_sets,
+                                                      codec)
 
         p1 = TransformSetSubDir.path(transform_set_id)
 
         os.makedirs(p1)
 
         transform_model = TransformModel()
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
 
         for transform_set_id_ in transform_set_ids:
-            offset = 0
             p2 = TransformSetSubDir.path(transform_set_id_)
 
-            while True:
-                transforms = transform_model.list(transform_set_id_,
-                                                  length=length,
-                                                  offset=offset,
-                                                  rejected=rejected)
+            codec_ = transform_set_model.codec(transform_set_id_)
 
-                if not transforms:
-                    break
+            ids = transform_model.merge(transform_set_id, transform_set_id_,
+                                        rejected=rejected)
 
-                for transform in transforms:
-                    transform_id = transform_model.insert(transform_set_id,
-                                                          transform[2],
-                                                          transform[3],
-                                                          transform[4])
+            for transform_id_, transform_id in ids:
+                p3 = TransformFile.path(p2, transform_id_, codec_.extension)
+                p4 = TransformFile.path(p1, transform_id, codec.extension)
 
-                    p3 = TransformFile.path(p2, transform[0], 'jpg')
-                    p4 = TransformFile.path(p1, transform_id, 'jpg')
+                codec.copy(p3, codec_, p4)
 
-                    shutil.copy(p3, p4)
+                debug(f'Transform with ID {transform_id_:08d} at {p3} '
+                      f'merged as ID {transform_id:08d} at {p4}', 4)
 
-                    debug(f'Transform with ID {transform[0]:08d} at {p3} '
-                          f'merged as ID {transform_id:08d} at {p4}', 4)
-
-                offset += length
+        if BlobModel.enabled():
+            BlobModel().insert_dir(p1)
 
         result = transform_set_model.select(transform_set_id)
 
@@ -379,6 +366,10 @@ class TransformSetCommandLineRouteHandler(CommandLineRouteHandler):
         except ValueError as e:
             raise CommandLineRouteHandlerError(str(e))
 
+        if BlobModel.enabled():
+            BlobModel().insert_dir(
+                TransformSetSubDir.path(new_transform_set_id))
+
         result = transform_set_model.select(new_transform_set_id)
 
         debug(f'transform_set_id={result[0]}, name={result[1]}, '
@@ -403,10 +394,16 @@ class TransformSetCommandLineRouteHandler(CommandLineRouteHandler):
                 raise CommandLineRouteHandlerError(
                     f'Transform set with ID {transform_set_id:08d} not found')
 
+        blob_model = BlobModel()
+
         for transform_set_id in transform_set_ids:
             transform_set_model.delete(transform_set_id)
 
-            shutil.rmtree(TransformSetSubDir.path(transform_set_id))
+            p1 = TransformSetSubDir.path(transform_set_id)
+
+            blob_model.delete_dir(p1)
+
+            shutil.rmtree(p1)
 
             debug(f'Transform set {transform_set_id} was successfully deleted',
                   3)
@@ -6,17 +6,22 @@ import urllib
 import pytube
 import vimeo_dl as vimeo
 
+from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
 from deepstar.filesystem.video_dir import VideoDir
 from deepstar.filesystem.video_file import VideoFile
+from deepstar.models.blob_model import BlobModel
 from deepstar.models.video_model import VideoModel
 from deepstar.plugins.plugin import Plugin
 from deepstar.util.command_line_route_handler import CommandLineRouteHandler
 from deepstar.util.command_line_route_handler_error import \
     CommandLineRouteHandlerError
 from deepstar.util.debug import debug
-from deepstar.util.parse import parse_range
+from deepstar.util.model_cache import ModelCache
+from deepstar.util.parse import parse_range, parse_time
+from deepstar.util.process_pool import job_count
 from deepstar.util.tempdir import tempdir
-from deepstar.util.video import create_one_video_file_from_one_image_file
+from deepstar.util.video import create_one_video_file_from_one_image_file, \
+    probe_video_file
 
 
 def pytube_on_progress_callback(stream, chunk, file_handle, bytes_remaining):
@@ -66,7 +71,9 @@ class VideoCommandLineRouteHandler(CommandLineRouteHandler):
 
         desc = opts.get('description', None)
 
-        video_id = VideoModel().insert(path, filename, desc)
+        probe = probe_video_file(VideoFile.path(filename))
+
+        video_id = VideoModel().insert(path, filename, desc, probe)
 
         debug(f'video_id={video_id}, uri={path}, filename={filename}, '
               f'description={desc}', 3)
@@ -171,7 +178,9 @@ class VideoCommandLineRouteHandler(CommandLineRouteHandler):
 
         filename = os.path.basename(path)
 
-        video_id = VideoModel().insert(url, filename, desc)
+        probe = probe_video_file(VideoFile.path(filename))
+
+        video_id = VideoModel().insert(url, filename, desc, probe)
 
         debug(f'video_id={video_id}, uri={url}, filename={filename}, '
               f'description={desc}', 3)
@@ -305,7 +314,9 @@ class VideoCommandLineRouteHandler(CommandLineRouteHandler):
         filename = f'{self.uuid()}.mp4'
         self.vimeo_stream_download(stream, VideoDir.path(), filename)
 
-        video_id = VideoModel().insert(url, filename, desc)
+        probe = probe_video_file(VideoFile.path(filename))
+
+        video_id = VideoModel().insert(url, filename, desc, probe)
 
         debug(f'video_id={video_id}, uri={url}, filename={filename}, '
               f'description={desc}', 3)
@@ -375,11 +386,14 @@ class VideoCommandLineRouteHandler(CommandLineRouteHandler):
         result = VideoModel().list()
 
         debug(f'{len(result)} results', 3)
-        debug('id | uri | filename | description', 3)
-        debug('---------------------------------', 3)
+        debug('id | uri | filename | description | frame_count | fps | '
+              'width | height | duration | fourcc', 3)
+        debug('---------------------------------------------------------'
+              '--------------------------------', 3)
 
         for r in result:
-            debug(f'{r[0]} | {r[1]} | {r[2]} | {r[3]}', 3)
+            debug(f'{r[0]} | {r[1]} | {r[2]} | {r[3]} | {r[4]} | {r[5]} | '
+                  f'{r[6]} | {r[7]} | {r[8]} | {r[9]}', 3)
 
     def select_extract(self, video_ids, opts={}):
         """
@@ -399,15 +413,64 @@ class VideoCommandLineRouteHandler(CommandLineRouteHandler):
                 raise CommandLineRouteHandlerError(
                     f'Video with ID {video_id:08d} not found')
 
-        plugin = Plugin.get('video_select_extract', 'default')
+        plugin = Plugin.get('video_select_extract', 'default')()
 
-        for video_id in video_ids:
-            frame_set_id = plugin().video_select_extract(
-                               video_id,
-                               sub_sample=int(opts.get('sub-sample', 1)),
-                               max_sample=int(opts.get('max-sample', 0)))
+        sub_sample = int(opts.get('sub-sample', 1))
+        max_sample = int(opts.get('max-sample', 0))
+
+        jobs = job_count(opts)
+
+        kwargs = {}
+
+        if 'scene-threshold' in opts:
+            kwargs['scene_threshold'] = float(opts['scene-threshold'])
+            kwargs['min_gap'] = int(opts.get('min-gap', 1))
+            kwargs['max_gap'] = int(opts.get('max-gap', 0))
+
+        if 'window' in opts:
+            kwargs['window'] = int(opts['window'])
+
+        try:
+            if 'start-time' in opts:
+                kwargs['start_time'] = parse_time(opts['start-time'])
+
+            if 'end-time' in opts:
+                kwargs['end_time'] = parse_time(opts['end-time'])
+        except ValueError as e:
+            raise CommandLineRouteHandlerError(str(e))
+
+        if 'fps' in opts:
+            kwargs['fps'] = float(opts['fps'])
+
+        if 'resume' in opts:
+            kwargs['resume'] = True
+
+        # many videos are decoded a video per worker process and one video a
+        # segment per worker process (or, to resume, one video at a time)
+        if jobs > 1 and len(video_ids) > 1 and 'resume' not in opts and \
+                hasattr(plugin, 'video_select_extract_many'):
+            results = plugin.video_select_extract_many(
+                video_ids, sub_sample=sub_sample, max_sample=max_sample,
+                jobs=jobs, **kwargs)
+        else:
+            if jobs > 1:
+                kwargs['jobs'] = jobs
+
+            results = ((video_id, plugin.video_select_extract(
+                           video_id, sub_sample=sub_sample,
+                           max_sample=max_sample, **kwargs))
+                       for video_id in video_ids)
+
+        # the plugin validates the sampling options when the first video is
+        # extracted
+        try:
+            for video_id, frame_set_id in results:
+                if BlobModel.enabled():
+                    BlobModel().insert_dir(FrameSetSubDir.path(frame_set_id))
 
-            debug(f'frame_set_id={frame_set_id}, video_id={video_id}', 3)
+                debug(f'frame_set_id={frame_set_id}, video_id={video_id}', 3)
+        except ValueError as e:
+            raise CommandLineRouteHandlerError(str(e))
 
     def delete(self, video_ids):
         """
@@ -470,6 +533,7 @@ class VideoCommandLineRouteHandler(CommandLineRouteHandler):
         :param int video_id: The video ID.
         :param str model_name: The name of the detection model to run.
         :param opts dict: The dict of options.
+        :raises: CommandLineRouteHandlerError
         """
 
         video_model = VideoModel()
@@ -484,8 +548,21 @@ class VideoCommandLineRouteHandler(CommandLineRouteHandler):
             raise CommandLineRouteHandlerError(
                 f"'{model_name}' is not a valid video select detect plugin name")
 
+        # the plugin's models are loaded once up front (see ModelCache) so
+        # that an invalid option or a model that fails to load is reported
+        # before any work is done
+        if hasattr(plugin, 'models'):
+            try:
+                ModelCache.warm(plugin.models(opts))
+            except ValueError as e:
+                raise CommandLineRouteHandlerError(str(e))
+
         video_path = VideoFile.path(result[2])
-        plugin().video_select_detect(video_path, opts)
+
+        try:
+            plugin().video_select_detect(video_path, opts)
+        except ValueError as e:
+            raise CommandLineRouteHandlerError(str(e))
 
     def usage(self):
         """
@@ -10,6 +10,8 @@ import sys
 import textwrap
 
 
+from deepstar.command_line_route_handlers.blob_command_line_route_handler \
+    import BlobCommandLineRouteHandler
 from deepstar.command_line_route_handlers.frame_command_line_route_handler \
     import FrameCommandLineRouteHandler
 from deepstar.command_line_route_handlers \
@@ -25,14 +27,18 @@ from deepstar.command_line_route_handlers \
     import TransformSetCommandLineRouteHandler
 from deepstar.command_line_route_handlers.video_command_line_route_handler \
     import VideoCommandLineRouteHandler
+from deepstar.filesystem.blob_dir import BlobDir
 from deepstar.filesystem.db_dir import DBDir
 from deepstar.filesystem.file_dir import FileDir
 from deepstar.filesystem.frame_set_dir import FrameSetDir
 from deepstar.filesystem.transform_set_dir import TransformSetDir
 from deepstar.filesystem.video_dir import VideoDir
+from deepstar.models.blob_model import BlobModel
 from deepstar.models.frame_model import FrameModel
 from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.job_model import JobModel
 from deepstar.models.model import Model
+from deepstar.models.schema_model import SchemaModel
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
 from deepstar.models.video_model import VideoModel
@@ -58,8 +64,9 @@ class Deepstar:
         """
 
         for cls in [DBDir, FileDir, FrameSetDir, VideoDir, TransformSetDir,
-                    Model, VideoModel, FrameSetModel, FrameModel,
-                    TransformSetModel, TransformModel]:
+                    BlobDir, Model, VideoModel, FrameSetModel, FrameModel,
+                    TransformSetModel, TransformModel, BlobModel, JobModel,
+                    SchemaModel]:
             cls.init()
 
     def usage(self):
@@ -87,6 +94,9 @@ class Deepstar:
                 <red>Transforms</red>
                   $ python main.py usage transforms
 
+                <red>Blobs</red>
+                  $ python main.py usage blobs
+
                 <red>Implode</red>
                   $ python main.py usage implode
                 ''').strip()
@@ -164,6 +174,10 @@ class Deepstar:
             ('^usage transforms$', TransformCommandLineRouteHandler),
             ('^list transform_sets \\d+ transforms$',
              TransformCommandLineRouteHandler),
+            # blobs
+            ('^usage blobs$', BlobCommandLineRouteHandler),
+            ('^list blobs$', BlobCommandLineRouteHandler),
+            ('^gc blobs$', BlobCommandLineRouteHandler),
             # implode
             ('^usage implode$', ImplodeCommandLineRouteHandler),
             ('^implode$', ImplodeCommandLineRouteHandler)
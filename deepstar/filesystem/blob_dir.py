@@ -0,0 +1,29 @@
+import os
+
+from deepstar.filesystem.file_dir import FileDir
+
+
+class BlobDir:
+    """
+    This class implements the BlobDir class.
+    """
+
+    @classmethod
+    def path(cls):
+        """
+        This method returns the path to the blob directory.
+
+        :rtype: str
+        """
+
+        return os.path.join(FileDir.path(), 'blobs')
+
+    @classmethod
+    def init(cls):
+        """
+        This method initializes the blob directory.
+
+        :rtype: None
+        """
+
+        os.makedirs(BlobDir.path(), exist_ok=True)
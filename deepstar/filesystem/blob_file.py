@@ -0,0 +1,22 @@
+import os
+
+from deepstar.filesystem.blob_dir import BlobDir
+
+
+class BlobFile:
+    """
+    This class implements the BlobFile class.
+    """
+
+    @classmethod
+    def path(cls, digest):
+        """
+        This method returns the path to a blob file. Blob files are fanned out
+        over sub directories named for the first two characters of their
+        digest.
+
+        :param str digest: The blob's hex digest.
+        :rtype: str
+        """
+
+        return os.path.join(BlobDir.path(), digest[:2], digest)
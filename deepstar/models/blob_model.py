@@ -0,0 +1,392 @@
+import hashlib
+import os
+
+from deepstar.filesystem.blob_file import BlobFile
+from deepstar.filesystem.file_dir import FileDir
+from deepstar.models.model import Model
+
+
+class BlobModel(Model):
+    """
+    This class implements the BlobModel class.
+
+    When the DEEPSTAR_BLOB_STORE environment variable is set to 1, the image
+    files of new frame sets and transform sets are stored once per distinct
+    content (by SHA-256 digest) under BlobDir. The files in the set sub
+    directories become hardlinks to their blobs, so they are still resolved
+    through FrameFile and TransformFile. Each such file is recorded in
+    blob_refs (by its path relative to FileDir) and counted in blobs.refs.
+    """
+
+    @classmethod
+    def init(cls):
+        """
+        This method initializes the model.
+
+        :rtype: None
+        """
+
+        query = """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    id INTEGER PRIMARY KEY,
+                    digest TEXT NOT NULL UNIQUE,
+                    inode INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    refs INTEGER NOT NULL
+                )
+                """
+
+        Model.execute(query)
+
+        query = """
+                CREATE INDEX IF NOT EXISTS blobs_inode
+                ON blobs (inode)
+                """
+
+        Model.execute(query)
+
+        query = """
+                CREATE TABLE IF NOT EXISTS blob_refs (
+                    path TEXT PRIMARY KEY,
+                    fk_blobs INTEGER NOT NULL,
+                    FOREIGN KEY(fk_blobs) REFERENCES blobs(id)
+                )
+                """
+
+        Model.execute(query)
+
+        query = """
+                CREATE INDEX IF NOT EXISTS blob_refs_fk_blobs
+                ON blob_refs (fk_blobs)
+                """
+
+        Model.execute(query)
+
+    @classmethod
+    def enabled(cls):
+        """
+        This method returns True if the blob store is enabled else False.
+
+        :rtype: bool
+        """
+
+        return os.environ.get('DEEPSTAR_BLOB_STORE', '0') == '1'
+
+    def select(self, path):
+        """
+        This method performs a select operation.
+
+        :param str path: The path to a file referencing a blob.
+        :rtype: tuple
+        """
+
+        query = """
+                SELECT blobs.id, blobs.digest, blobs.inode, blobs.size,
+                blobs.refs
+                FROM blob_refs
+                JOIN blobs ON blobs.id = blob_refs.fk_blobs
+                WHERE blob_refs.path = ?
+                """
+
+        result = Model.execute(query, (self._relpath(path),))
+
+        return result.fetchone()
+
+    def insert(self, path, digest=None):
+        """
+        This method performs an insert operation. The file at path is stored
+        as a blob (or replaced with a hardlink to an existing blob with the
+        same content) and a reference to the blob is recorded.
+
+        :param str path: The path to a frame or transform file.
+        :param str digest: The file's digest (see _digest) if already
+            computed, else None to compute it before the write transaction.
+        :rtype: int
+        """
+
+        relpath = self._relpath(path)
+
+        stat = os.stat(path)
+
+        if digest is None:
+            digest = self._digest(path, stat)
+
+        with Model.transaction():
+            query = """
+                    SELECT fk_blobs
+                    FROM blob_refs
+                    WHERE path = ?
+                    """
+
+            ref = Model.execute(query, (relpath,)).fetchone()
+
+            query = """
+                    SELECT id
+                    FROM blobs
+                    WHERE inode = ?
+                    """
+
+            blob = Model.execute(query, (stat.st_ino,)).fetchone()
+
+            if ref is not None:
+                if blob is not None and blob[0] == ref[0]:
+                    return ref[0]
+
+                # the file was replaced since it was stored
+                self._unref(relpath, ref[0])
+
+            if blob is None:
+                # the blob was removed (see gc) since the file was hashed
+                if digest is None:
+                    digest = self._digest(path, stat)
+
+                blob = (self._store(path, stat, digest),)
+
+            query = """
+                    UPDATE blobs
+                    SET refs = refs + 1
+                    WHERE id = ?
+                    """
+
+            Model.execute(query, (blob[0],))
+
+            query = """
+                    INSERT INTO blob_refs
+                    (path, fk_blobs)
+                    VALUES
+                    (?, ?)
+                    """
+
+            Model.execute(query, (relpath, blob[0]))
+
+        return blob[0]
+
+    def insert_dir(self, dir_path, length=None):
+        """
+        This method performs an insert operation for every file in a
+        directory (e.g. a frame set sub directory). The files are hashed
+        outside of the write transactions, which are committed every length
+        files so that other writers are not kept waiting.
+
+        :param str dir_path: The path to the directory.
+        :param int length: The optional number of files per transaction. The
+            default value is the value of the MODEL_BATCH_LENGTH environment
+            variable or 100.
+        :rtype: int
+        """
+
+        if length is None:
+            length = int(os.environ.get('MODEL_BATCH_LENGTH', '100'))
+
+        paths = [os.path.join(dir_path, name)
+                 for name in sorted(os.listdir(dir_path))]
+
+        paths = [path for path in paths if os.path.isfile(path)]
+
+        for i in range(0, len(paths), length):
+            chunk = [(path, self._digest(path, os.stat(path)))
+                     for path in paths[i:i + length]]
+
+            with Model.transaction():
+                for path, digest in chunk:
+                    self.insert(path, digest)
+
+        return len(paths)
+
+    def delete_dir(self, dir_path):
+        """
+        This method drops the references held by the files in a directory
+        (e.g. a frame set sub directory that is about to be removed). Blobs
+        are not removed (see gc).
+
+        :param str dir_path: The path to the directory.
+        :rtype: int
+        """
+
+        start = self._relpath(dir_path) + os.sep
+        end = start[:-1] + chr(ord(os.sep) + 1)
+
+        with Model.transaction():
+            query = """
+                    UPDATE blobs
+                    SET refs = refs - (
+                        SELECT COUNT(*)
+                        FROM blob_refs
+                        WHERE fk_blobs = blobs.id AND path >= ? AND path < ?
+                    )
+                    WHERE id IN (
+                        SELECT fk_blobs
+                        FROM blob_refs
+                        WHERE path >= ? AND path < ?
+                    )
+                    """
+
+            Model.execute(query, (start, end, start, end))
+
+            query = """
+                    DELETE FROM blob_refs
+                    WHERE path >= ? AND path < ?
+                    """
+
+            result = Model.execute(query, (start, end))
+
+        return result.rowcount
+
+    def gc(self):
+        """
+        This method removes blobs that are no longer referenced and returns
+        the number of blobs and bytes reclaimed.
+
+        :rtype: tuple(int, int)
+        """
+
+        with Model.transaction():
+            query = """
+                    SELECT id, digest, size
+                    FROM blobs
+                    WHERE refs <= 0
+                    """
+
+            blobs = Model.execute(query).fetchall()
+
+            query = """
+                    DELETE FROM blobs
+                    WHERE refs <= 0
+                    """
+
+            Model.execute(query)
+
+        for _, digest, _ in blobs:
+            path = BlobFile.path(digest)
+
+            if os.path.isfile(path):
+                os.remove(path)
+
+        return len(blobs), sum([blob[2] for blob in blobs])
+
+    def stats(self):
+        """
+        This method returns the number of blobs, the number of references to
+        them, the number of bytes stored and the number of bytes referenced.
+
+        :rtype: tuple(int, int, int, int)
+        """
+
+        query = """
+                SELECT COUNT(*), IFNULL(SUM(refs), 0), IFNULL(SUM(size), 0),
+                IFNULL(SUM(size * refs), 0)
+                FROM blobs
+                """
+
+        return Model.execute(query).fetchone()
+
+    def _digest(self, path, stat):
+        """
+        This method returns the SHA-256 digest (in hex) of the file at path,
+        or None if the file is a hardlink to a blob (so that it need not be
+        read).
+
+        :param str path: The path to the file.
+        :param os.stat_result stat: The file's stat result.
+        :rtype: str
+        """
+
+        query = """
+                SELECT id
+                FROM blobs
+                WHERE inode = ?
+                """
+
+        if Model.execute(query, (stat.st_ino,)).fetchone() is not None:
+            return None
+
+        sha256 = hashlib.sha256()
+
+        with open(path, 'rb') as file_:
+            for chunk in iter(lambda: file_.read(1048576), b''):
+                sha256.update(chunk)
+
+        return sha256.hexdigest()
+
+    def _store(self, path, stat, digest):
+        """
+        This method stores the file at path as a blob or, if a blob with the
+        same content exists, replaces the file with a hardlink to that blob,
+        and returns the blob ID.
+
+        :param str path: The path to the file.
+        :param os.stat_result stat: The file's stat result.
+        :param str digest: The file's digest (see _digest).
+        :rtype: int
+        """
+
+        query = """
+                SELECT id
+                FROM blobs
+                WHERE digest = ?
+                """
+
+        blob = Model.execute(query, (digest,)).fetchone()
+
+        blob_path = BlobFile.path(digest)
+
+        if blob is not None:
+            tmp_path = f'{path}.tmp'
+
+            os.link(blob_path, tmp_path)
+            os.replace(tmp_path, path)
+
+            return blob[0]
+
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+
+        # a blob file left behind by an interrupted insert
+        if os.path.isfile(blob_path):
+            os.remove(blob_path)
+
+        os.link(path, blob_path)
+
+        query = """
+                INSERT INTO blobs
+                (digest, inode, size, refs)
+                VALUES
+                (?, ?, ?, 0)
+                """
+
+        result = Model.execute(query, (digest, stat.st_ino, stat.st_size))
+
+        return result.lastrowid
+
+    def _unref(self, relpath, blob_id):
+        """
+        This method drops one reference.
+
+        :param str relpath: The referencing path relative to FileDir.
+        :param int blob_id: The blob ID.
+        :rtype: None
+        """
+
+        query = """
+                UPDATE blobs
+                SET refs = refs - 1
+                WHERE id = ?
+                """
+
+        Model.execute(query, (blob_id,))
+
+        query = """
+                DELETE FROM blob_refs
+                WHERE path = ?
+                """
+
+        Model.execute(query, (relpath,))
+
+    def _relpath(self, path):
+        """
+        This method returns a path relative to FileDir.
+
+        :param str path: The path.
+        :rtype: str
+        """
+
+        return os.path.relpath(os.path.realpath(path), FileDir.path())
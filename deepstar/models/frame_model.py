@@ -1,4 +1,7 @@
+import os
+
 from deepstar.models.model import Model
+from deepstar.models.model_batch import ModelBatch
 from deepstar.models.frame_set_model import FrameSetModel
 
 
@@ -45,26 +48,52 @@ class FrameModel(Model):
 
         return result.fetchone()
 
-    def insert(self, frame_set_id, rejected):
+    def insert(self, frame_set_id, rejected, timestamp=None,
+               frame_number=None):
         """
         This method performs an insert operation.
 
         :param int frame_set_id: The frame set ID.
         :param int rejected: 1 or 0 for rejected or not rejected respectively.
+        :param float timestamp: The optional timestamp of the frame in its
+            video in milliseconds.
+        :param int frame_number: The optional (0-based) frame number of the
+            frame in its video.
         :rtype: int
         """
 
         query = """
                 INSERT INTO frames
-                (fk_frame_sets, rejected)
+                (fk_frame_sets, rejected, timestamp, frame_number)
                 VALUES
-                (?, ?)
+                (?, ?, ?, ?)
                 """
 
-        result = Model.execute(query, (frame_set_id, rejected))
+        result = Model.execute(query, (frame_set_id, rejected, timestamp,
+                                       frame_number))
 
         return result.lastrowid
 
+    def batch(self, length=None, checkpoints=False):
+        """
+        This method returns a batch for performing many insert operations in
+        few transactions. The batch's insert method takes the same arguments
+        as this class's insert method and returns the frame ID.
+
+        Example:
+
+        with FrameModel().batch() as batch:
+            frame_id = batch.insert(frame_set_id, 0)
+
+        :param int length: The optional number of frames per transaction.
+        :param bool checkpoints: True if frames are only flushed at
+            checkpoints (see ModelBatch.checkpoint) else False.
+        :rtype: ModelBatch
+        """
+
+        return ModelBatch('frames', ['fk_frame_sets', 'rejected', 'timestamp',
+                                     'frame_number'], length, checkpoints)
+
     def list(self, frame_set_id, length=-1, offset=None, rejected=True):
         """
         This method performs a list operation.
@@ -92,6 +121,8 @@ class FrameModel(Model):
         if rejected is False:
             query += ' AND rejected = 0'
 
+        query += ' ORDER BY id'
+
         if length is not None:
             query += ' LIMIT ?'
             params += (length,)
@@ -104,6 +135,152 @@ class FrameModel(Model):
 
         return result.fetchall()
 
+    def iterate(self, frame_set_id, rejected=True, length=None, after=0):
+        """
+        This method iterates over the frames in a frame set in ID order. Rows
+        are fetched in batches of length rows using keyset pagination (id > the
+        last ID seen) so that a full pass over a frame set is linear in its
+        size.
+
+        :param int frame_set_id: The frame set ID.
+        :param bool rejected: True if should include rejected frames else False
+            if should not. The default value is True.
+        :param int length: The optional batch length. The default value is the
+            value of the MODEL_LIST_LENGTH environment variable or 100.
+        :param int after: Start after the frame with ID after (e.g. to resume
+            an iteration). The default value of 0 indicates the first frame.
+        :rtype: generator(tuple)
+        """
+
+        if length is None:
+            length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
+
+        query = """
+                SELECT MIN(id), MAX(id)
+                FROM frames
+                WHERE fk_frame_sets = ?
+                """
+
+        result = Model.execute(query, (frame_set_id,))
+
+        first_id, max_id = result.fetchone()
+
+        if first_id is None:
+            return
+
+        if rejected is False:
+            query = """
+                    SELECT id, fk_frame_sets, rejected
+                    FROM frames
+                    WHERE fk_frame_sets = ? AND rejected = 0 AND id > ?
+                        AND id <= ?
+                    ORDER BY id LIMIT ?
+                    """
+        else:
+            # the frame set index orders the frames by rejected first, so
+            # that they are walked in ID order between the first and last IDs
+            # (the frames of a frame set are inserted in ranges of
+            # consecutive IDs) rather than sorted for each batch
+            query = """
+                    SELECT id, fk_frame_sets, rejected
+                    FROM frames
+                    WHERE +fk_frame_sets = ? AND id > ? AND id <= ?
+                    ORDER BY id LIMIT ?
+                    """
+
+        last_id = max(after, first_id - 1)
+
+        while True:
+            result = Model.execute(query, (frame_set_id, last_id, max_id,
+                                           length))
+
+            frames = result.fetchall()
+
+            yield from frames
+
+            if len(frames) < length:
+                break
+
+            last_id = frames[-1][0]
+
+    def merge(self, frame_set_id, src_frame_set_id, rejected=True):
+        """
+        This method copies the frames in a frame set into another frame set
+        in one transaction (an INSERT ... SELECT per frame) and returns the
+        mapping of old to new frame IDs.
+
+        :param int frame_set_id: The frame set ID into which to copy.
+        :param int src_frame_set_id: The frame set ID from which to copy.
+        :param bool rejected: True if should include rejected frames else False
+            if should not. The default value is True.
+        :rtype: list(tuple)
+        """
+
+        where = 'WHERE fk_frame_sets = ?'
+
+        if rejected is False:
+            where += ' AND rejected = 0'
+
+        with Model.transaction():
+            query = f"""
+                    SELECT id
+                    FROM frames
+                    {where}
+                    ORDER BY id
+                    """
+
+            result = Model.execute(query, (src_frame_set_id,))
+
+            ids = [row[0] for row in result.fetchall()]
+
+            # the IDs are reserved as by ModelBatch so that the rows of open
+            # batches are not assigned them
+            base = Model.reserve('frames', len(ids)) - 1
+
+            # the IDs are assigned in order by one INSERT ... SELECT per frame
+            # rather than by a window function (which requires SQLite 3.25)
+            query = """
+                    INSERT INTO frames
+                    (id, fk_frame_sets, rejected, timestamp, frame_number)
+                    SELECT ?, ?, rejected, timestamp, frame_number
+                    FROM frames
+                    WHERE id = ?
+                    """
+
+            params = [(base + 1 + n, frame_set_id, id_)
+                      for n, id_ in enumerate(ids)]
+
+            Model.connection().executemany(query, params)
+
+        return list(zip(ids, range(base + 1, base + 1 + len(ids))))
+
+    def positions(self, frame_set_id, rejected=True):
+        """
+        This method returns the frame IDs, frame numbers and timestamps (in
+        milliseconds) of the frames in a frame set in ID order. Either may be
+        None if unknown (e.g. for frames inserted from images).
+
+        :param int frame_set_id: The frame set ID.
+        :param bool rejected: True if should include rejected frames else False
+            if should not. The default value is True.
+        :rtype: list(tuple)
+        """
+
+        query = """
+                SELECT id, frame_number, timestamp
+                FROM frames
+                WHERE fk_frame_sets = ?
+                """
+
+        if rejected is False:
+            query += ' AND rejected = 0'
+
+        query += ' ORDER BY id'
+
+        result = Model.execute(query, (frame_set_id,))
+
+        return result.fetchall()
+
     def update(self, frame_id, rejected):
         """
         This method performs an update operation.
@@ -123,6 +300,39 @@ class FrameModel(Model):
 
         return True if result.rowcount == 1 else False
 
+    def set_rejected(self, frame_ids, rejected):
+        """
+        This method performs a bulk update operation of the rejected column
+        in one transaction.
+
+        :param list(int) frame_ids: The frame IDs.
+        :param int rejected: 1 or 0 for rejected or not rejected respectively.
+        :rtype: int
+        """
+
+        query = """
+                UPDATE frames
+                SET rejected = ?
+                WHERE id = ?
+                """
+
+        params = [(rejected, frame_id) for frame_id in frame_ids]
+
+        with Model.transaction():
+            result = Model.connection().executemany(query, params)
+
+        return result.rowcount
+
+    def reject_many(self, frame_ids):
+        """
+        This method performs a bulk reject operation.
+
+        :param list(int) frame_ids: The frame IDs.
+        :rtype: int
+        """
+
+        return self.set_rejected(frame_ids, 1)
+
     def count(self, frame_set_id, rejected=True):
         """
         This method performs a count operation.
@@ -1,4 +1,5 @@
 from deepstar.models.model import Model
+from deepstar.util.codec import Codec
 
 
 class FrameSetModel(Model):
@@ -41,22 +42,27 @@ class FrameSetModel(Model):
 
         return result.fetchone()
 
-    def insert(self, video_id):
+    def insert(self, video_id, codec=None):
         """
         This method performs an insert operation.
 
         :param int video_id: The foreign key video ID.
+        :param Codec codec: The optional codec in which the frame set's files
+            are written. The default value is Codec().
         :rtype: int
         """
 
+        if codec is None:
+            codec = Codec()
+
         query = """
                 INSERT INTO frame_sets
-                (video_id)
+                (video_id, codec)
                 VALUES
-                (?)
+                (?, ?)
                 """
 
-        result = Model.execute(query, (video_id,))
+        result = Model.execute(query, (video_id, codec.spec))
 
         return result.lastrowid
 
@@ -93,3 +99,21 @@ class FrameSetModel(Model):
         result = Model.execute(query, (frame_set_id,))
 
         return True if result.rowcount == 1 else False
+
+    def codec(self, frame_set_id):
+        """
+        This method returns the codec in which a frame set's files are written.
+
+        :param int frame_set_id: The frame set ID.
+        :rtype: Codec
+        """
+
+        query = """
+                SELECT codec
+                FROM frame_sets
+                WHERE id = ?
+                """
+
+        result = Model.execute(query, (frame_set_id,)).fetchone()
+
+        return Codec(result[0] if result and result[0] else Codec.legacy)
@@ -0,0 +1,183 @@
+from deepstar.models.model import Model
+
+
+class JobModel(Model):
+    """
+    This class implements the JobModel class.
+
+    A job records the progress of an extraction from a source (e.g. a video)
+    to a frame set or transform set so that an interrupted extraction can be
+    resumed into the same set. The checkpoint (e.g. the last source frame
+    number or the last input ID) is updated in the same transaction as the
+    rows it covers. A job is deleted with its set.
+    """
+
+    @classmethod
+    def init(cls):
+        """
+        This method initializes the model.
+
+        :rtype: None
+        """
+
+        query = """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT,
+                    source_id INTEGER,
+                    fk_frame_sets INTEGER,
+                    fk_transform_sets INTEGER,
+                    options TEXT,
+                    checkpoint INTEGER,
+                    finished INTEGER,
+                    FOREIGN KEY(fk_frame_sets) REFERENCES frame_sets(id)
+                        ON DELETE CASCADE,
+                    FOREIGN KEY(fk_transform_sets)
+                        REFERENCES transform_sets(id)
+                        ON DELETE CASCADE
+                )
+                """
+
+        Model.execute(query)
+
+    def select(self, job_id):
+        """
+        This method performs a select operation.
+
+        :param int job_id: The job ID.
+        :rtype: tuple
+        """
+
+        query = """
+                SELECT id, name, source_id, fk_frame_sets, fk_transform_sets,
+                       options, checkpoint, finished
+                FROM jobs
+                WHERE id = ?
+                """
+
+        result = Model.execute(query, (job_id,))
+
+        return result.fetchone()
+
+    def find(self, name, source_id, options):
+        """
+        This method returns the latest job with the name, source ID and
+        options or None if there is none.
+
+        :param str name: The job name.
+        :param int source_id: The source ID.
+        :param str options: The options (serialized).
+        :rtype: tuple
+        """
+
+        query = """
+                SELECT id, name, source_id, fk_frame_sets, fk_transform_sets,
+                       options, checkpoint, finished
+                FROM jobs
+                WHERE name = ? AND source_id = ? AND options = ?
+                ORDER BY id DESC
+                LIMIT 1
+                """
+
+        result = Model.execute(query, (name, source_id, options))
+
+        return result.fetchone()
+
+    def insert(self, name, source_id, options, frame_set_id=None,
+               transform_set_id=None):
+        """
+        This method performs an insert operation.
+
+        :param str name: The job name.
+        :param int source_id: The source ID.
+        :param str options: The options (serialized).
+        :param int frame_set_id: The ID of the frame set extracted to (if
+            any). The default value is None.
+        :param int transform_set_id: The ID of the transform set extracted to
+            (if any). The default value is None.
+        :rtype: int
+        """
+
+        query = """
+                INSERT INTO jobs
+                (name, source_id, fk_frame_sets, fk_transform_sets, options,
+                 finished)
+                VALUES
+                (?, ?, ?, ?, ?, 0)
+                """
+
+        result = Model.execute(query, (name, source_id, frame_set_id,
+                                       transform_set_id, options))
+
+        return result.lastrowid
+
+    def update(self, job_id, checkpoint=None, finished=None):
+        """
+        This method performs an update operation.
+
+        :param int job_id: The job ID.
+        :param int checkpoint: The checkpoint.
+        :param int finished: 1 if the job is finished else 0.
+        :rtype: bool
+        """
+
+        fields = []
+        params = ()
+
+        if checkpoint is not None:
+            fields.append('checkpoint = ?')
+            params += (checkpoint,)
+
+        if finished is not None:
+            fields.append('finished = ?')
+            params += (finished,)
+
+        if len(fields) == 0:
+            return False
+
+        params += (job_id,)
+
+        query = f"""
+                UPDATE jobs
+                SET {', '.join(fields)}
+                WHERE id = ?
+                """
+
+        result = Model.execute(query, params)
+
+        return True if result.rowcount == 1 else False
+
+    def list(self):
+        """
+        This method performs a list operation.
+
+        :rtype: list(tuple)
+        """
+
+        query = """
+                SELECT id, name, source_id, fk_frame_sets, fk_transform_sets,
+                       options, checkpoint, finished
+                FROM jobs
+                """
+
+        result = Model.execute(query)
+
+        return result.fetchall()
+
+    def delete(self, job_id):
+        """
+        This method performs a delete operation.
+
+        :param int job_id: The job ID.
+        :rtype: bool
+        """
+
+        query = """
+                DELETE
+                FROM jobs
+                WHERE id = ?
+                """
+
+        result = Model.execute(query, (job_id,))
+
+        return True if result.rowcount == 1 else False
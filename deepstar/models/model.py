@@ -1,5 +1,7 @@
+import contextlib
+import os
 import sqlite3
-from threading import Lock
+from threading import current_thread, get_ident, Lock
 
 from deepstar.filesystem.db_file import DBFile
 
@@ -7,24 +9,84 @@ from deepstar.filesystem.db_file import DBFile
 class Model:
     """
     This class implements the Model class.
+
+    Each thread (in each process) is handed its own DB connection. The DB is
+    opened in WAL mode so that readers (e.g. the curation UIs) do not block and
+    are not blocked by a writer (e.g. an extraction plugin).
     """
 
-    db = None
-    lock = Lock()
+    pragmas = [
+        'PRAGMA journal_mode = WAL',
+        'PRAGMA synchronous = NORMAL',
+        'PRAGMA cache_size = -65536',
+        'PRAGMA mmap_size = 268435456',
+        'PRAGMA foreign_keys = 1'
+    ]
+
+    # The number of seconds a connection waits on a lock held by another
+    # connection before raising sqlite3.OperationalError.
+    timeout = 60.0
+
+    _connections = {}
+    _lock = Lock()
 
     @classmethod
     def init(cls):
         """
-        This method initializes the DB connection.
+        This method initializes the DB connection for the calling thread.
 
         :rtype: None
         """
 
-        if Model.db is None:
-            Model.db = sqlite3.connect(DBFile.path(), isolation_level=None,
-                                       check_same_thread=False)
+        Model.connection()
+
+    @classmethod
+    def connection(cls):
+        """
+        This method returns the DB connection for the calling thread and
+        process, opening it if necessary.
+
+        :rtype: sqlite3.Connection
+        """
+
+        key = (os.getpid(), get_ident())
+
+        connection = Model._connections.get(key)
+        if connection is not None:
+            return connection[1]
+
+        db = sqlite3.connect(DBFile.path(), isolation_level=None,
+                             check_same_thread=False, timeout=Model.timeout)
+
+        for pragma in Model.pragmas:
+            db.execute(pragma)
+
+        with Model._lock:
+            Model._prune()
+
+            Model._connections[key] = (current_thread(), db)
+
+        return db
+
+    @classmethod
+    def _prune(cls):
+        """
+        This method closes and forgets the DB connections of threads that have
+        exited and of processes other than this one (e.g. connections
+        inherited by a forked worker process).
+
+        :rtype: None
+        """
+
+        pid = os.getpid()
+
+        for key, (thread, db) in list(Model._connections.items()):
+            if key[0] != pid:
+                del Model._connections[key]
+            elif not thread.is_alive():
+                db.close()
 
-            Model.db.execute('PRAGMA foreign_keys = 1')
+                del Model._connections[key]
 
     @classmethod
     def execute(cls, query, params=()):
@@ -36,24 +98,96 @@ class Model:
         :rtype: sqlite3.Cursor
         """
 
-        Model.lock.acquire()
+        return Model.connection().execute(query, params)
+
+    @classmethod
+    @contextlib.contextmanager
+    def transaction(cls):
+        """
+        This method wraps a block in a write transaction that is committed if
+        the block succeeds and rolled back if it raises. A block run while the
+        calling thread's connection is already in a transaction joins that
+        transaction instead and leaves committing to its owner.
+
+        :yields: None
+        """
+
+        if Model.connection().in_transaction:
+            yield
+
+            return
+
+        Model.execute('BEGIN IMMEDIATE')
 
         try:
-            result = Model.db.execute(query, params)
-        finally:
-            Model.lock.release()
+            yield
+        except BaseException:
+            Model.execute('ROLLBACK')
+
+            raise
+
+        Model.execute('COMMIT')
+
+    @classmethod
+    def reserve(cls, table, length):
+        """
+        This method reserves a range of length IDs of a table with an
+        AUTOINCREMENT id (by advancing its sequence past both the sequence and
+        the table's largest ID, so that no other writer is assigned them) in a
+        write transaction and returns the first ID.
+
+        :param str table: The table name.
+        :param int length: The number of IDs.
+        :rtype: int
+        """
+
+        with Model.transaction():
+            query = f"""
+                    SELECT MAX(
+                        IFNULL((SELECT seq
+                                FROM sqlite_sequence
+                                WHERE name = ?), 0),
+                        IFNULL((SELECT MAX(id)
+                                FROM {table}), 0)) + 1
+                    """
+
+            first_id = Model.execute(query, (table,)).fetchone()[0]
+
+            last_id = first_id + length - 1
 
-        return result
+            query = """
+                    UPDATE sqlite_sequence
+                    SET seq = ?
+                    WHERE name = ?
+                    """
+
+            result = Model.execute(query, (last_id, table))
+
+            if result.rowcount == 0:
+                query = """
+                        INSERT INTO sqlite_sequence
+                        (name, seq)
+                        VALUES
+                        (?, ?)
+                        """
+
+                Model.execute(query, (table, last_id))
+
+        return first_id
 
     @classmethod
     def close(cls):
         """
-        This method closes the DB connection.
+        This method closes all DB connections opened by this process.
 
         :rtype: None
         """
 
-        if Model.db:
-            Model.db.close()
+        pid = os.getpid()
+
+        with Model._lock:
+            for key, (_, db) in Model._connections.items():
+                if key[0] == pid:
+                    db.close()
 
-            Model.db = None
+            Model._connections.clear()
@@ -0,0 +1,224 @@
+import os
+import sqlite3
+
+from deepstar.models.model import Model
+
+
+class ModelBatch:
+    """
+    This class implements the ModelBatch class.
+
+    A ModelBatch buffers inserted rows and writes them with one executemany
+    in one short write transaction per length rows, so that other writers
+    (e.g. the curation UIs or other extractions) are only blocked while rows
+    are written rather than while the rows are produced. Row IDs are reserved
+    up front in ranges of length IDs (by advancing the table's AUTOINCREMENT
+    sequence in a short write transaction, so that no other writer is
+    assigned them), so that insert can return the ID of a row before the row
+    is written. The IDs left unused when the batch exits are given back
+    unless another writer has advanced the sequence since.
+
+    Calls such as updating a job's checkpoint are buffered via checkpoint and
+    made in the transaction in which the rows inserted before them are
+    flushed. A batch with checkpoints only flushes at checkpoints, so that a
+    checkpoint is never committed without all of the rows it covers nor rows
+    without the checkpoint covering them (the rows inserted after the last
+    checkpoint are discarded if the batch exits with an exception).
+
+    A batch used while the calling thread's connection is already in a
+    transaction joins that transaction (see Model.transaction).
+    """
+
+    def __init__(self, table, columns, length=None, checkpoints=False):
+        """
+        This method initializes an instance of the ModelBatch class.
+
+        :param str table: The table name (of a table with an AUTOINCREMENT
+            id).
+        :param list(str) columns: The column names (excluding id).
+        :param int length: The optional number of rows to buffer before
+            flushing. The default value is the value of the MODEL_BATCH_LENGTH
+            environment variable or 100.
+        :param bool checkpoints: True if rows are only flushed at checkpoints
+            (see checkpoint) else False. The default value is False.
+        :rtype: None
+        """
+
+        if length is None:
+            length = int(os.environ.get('MODEL_BATCH_LENGTH', '100'))
+
+        self._table = table
+        self._columns = columns
+        self._length = length
+        self._checkpoints = checkpoints
+        self._rows = []
+        self._calls = []
+        self._covered = 0
+
+        # the reserved ID range
+        self._first_id = None
+        self._next_id = None
+        self._last_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is not None and issubclass(exc_type, sqlite3.Error):
+                self.rollback()
+            else:
+                if exc_type is not None and self._checkpoints:
+                    self._discard(self._covered)
+
+                self.flush()
+        finally:
+            self._release()
+
+    def insert(self, *values):
+        """
+        This method buffers a row and returns its ID.
+
+        :param tuple values: The column values (in the order of columns).
+            Omitted trailing values are NULL.
+        :rtype: int
+        """
+
+        if self._next_id is None or self._next_id > self._last_id:
+            self._reserve()
+
+        row_id = self._next_id
+
+        self._next_id += 1
+
+        values += (None,) * (len(self._columns) - len(values))
+
+        self._rows.append((row_id,) + values)
+
+        if len(self._rows) >= self._length and not self._checkpoints:
+            self.flush()
+
+        return row_id
+
+    def checkpoint(self, function, *args, **kwargs):
+        """
+        This method buffers a call (e.g. updating a job's checkpoint) to be
+        made after the rows buffered so far are written and in the same
+        transaction, and flushes if length rows or calls are buffered.
+
+        :param callable function: The function.
+        :param tuple args: The function's arguments.
+        :param dict kwargs: The function's keyword arguments.
+        :rtype: None
+        """
+
+        self._calls.append((function, args, kwargs))
+
+        self._covered = len(self._rows)
+
+        if len(self._rows) >= self._length or \
+                len(self._calls) >= self._length:
+            self.flush()
+
+    def flush(self):
+        """
+        This method writes the buffered rows (and makes the buffered calls) in
+        one write transaction.
+
+        :rtype: None
+        """
+
+        if not self._rows and not self._calls:
+            return
+
+        try:
+            with Model.transaction():
+                if self._rows:
+                    columns = ', '.join(['id'] + self._columns)
+                    params = ', '.join(['?'] * (len(self._columns) + 1))
+
+                    query = f"""
+                            INSERT INTO {self._table}
+                            ({columns})
+                            VALUES
+                            ({params})
+                            """
+
+                    Model.connection().executemany(query, self._rows)
+
+                for function, args, kwargs in self._calls:
+                    function(*args, **kwargs)
+        except sqlite3.Error:
+            self.rollback()
+
+            raise
+
+        self._rows = []
+        self._calls = []
+        self._covered = 0
+
+    def rollback(self):
+        """
+        This method discards the buffered rows and calls.
+
+        :rtype: None
+        """
+
+        self._discard(0)
+
+        self._calls = []
+        self._covered = 0
+
+    def _discard(self, index):
+        """
+        This method discards the buffered rows from an index on, rewinding the
+        next ID to the first discarded ID within the reserved range so that
+        the IDs of the discarded rows are given back.
+
+        :param int index: The index.
+        :rtype: None
+        """
+
+        if index < len(self._rows):
+            self._next_id = max(self._first_id, self._rows[index][0])
+
+            del self._rows[index:]
+
+    def _reserve(self):
+        """
+        This method reserves the next range of length IDs (see
+        Model.reserve).
+
+        :rtype: None
+        """
+
+        first_id = Model.reserve(self._table, self._length)
+
+        last_id = first_id + self._length - 1
+
+        self._first_id = first_id
+        self._next_id = first_id
+        self._last_id = last_id
+
+    def _release(self):
+        """
+        This method gives back the unused IDs of the reserved range unless
+        another writer has advanced the sequence since they were reserved.
+
+        :rtype: None
+        """
+
+        if self._next_id is not None and self._next_id <= self._last_id:
+            query = """
+                    UPDATE sqlite_sequence
+                    SET seq = ?
+                    WHERE name = ? AND seq = ?
+                    """
+
+            with Model.transaction():
+                Model.execute(query, (self._next_id - 1, self._table,
+                                      self._last_id))
+
+        self._first_id = None
+        self._next_id = None
+        self._last_id = None
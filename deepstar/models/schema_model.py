@@ -0,0 +1,211 @@
+from deepstar.models.model import Model
+
+
+class SchemaModel(Model):
+    """
+    This class implements the SchemaModel class.
+
+    The schema version is stored in the DB's user_version pragma. Each entry
+    in migrations upgrades the schema by one version and is applied exactly
+    once (and in order) to both new and existing DBs.
+    """
+
+    migrations = [
+        # 1 - secondary indexes for per set listing, counting and cascades
+        [
+            """
+            CREATE INDEX IF NOT EXISTS frames_fk_frame_sets_rejected
+            ON frames (fk_frame_sets, rejected)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS transforms_fk_transform_sets_rejected
+            ON transforms (fk_transform_sets, rejected)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS transforms_fk_frames
+            ON transforms (fk_frames)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS transform_sets_fk_frame_sets
+            ON transform_sets (fk_frame_sets)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS transform_sets_fk_prev_transform_sets
+            ON transform_sets (fk_prev_transform_sets)
+            """
+        ],
+        # 2 - per set image codecs (NULL for sets written as jpg:100)
+        [
+            """
+            ALTER TABLE frame_sets
+            ADD COLUMN codec TEXT
+            """,
+            """
+            ALTER TABLE transform_sets
+            ADD COLUMN codec TEXT
+            """
+        ],
+        # 3 - the timestamp (in milliseconds) of each frame in its video
+        [
+            """
+            ALTER TABLE frames
+            ADD COLUMN timestamp REAL
+            """
+        ],
+        # 4 - the frame number of each frame in its video
+        [
+            """
+            ALTER TABLE frames
+            ADD COLUMN frame_number INTEGER
+            """
+        ],
+        # 5 - the metadata of each video as probed when it was inserted
+        [
+            """
+            ALTER TABLE videos
+            ADD COLUMN frame_count INTEGER
+            """,
+            """
+            ALTER TABLE videos
+            ADD COLUMN fps REAL
+            """,
+            """
+            ALTER TABLE videos
+            ADD COLUMN width INTEGER
+            """,
+            """
+            ALTER TABLE videos
+            ADD COLUMN height INTEGER
+            """,
+            """
+            ALTER TABLE videos
+            ADD COLUMN duration REAL
+            """,
+            """
+            ALTER TABLE videos
+            ADD COLUMN fourcc TEXT
+            """
+        ],
+        # 6 - job lookup by name and source for resuming
+        [
+            """
+            CREATE INDEX IF NOT EXISTS jobs_name_source_id
+            ON jobs (name, source_id)
+            """
+        ],
+        # 7 - AUTOINCREMENT frame and transform IDs so that batches can
+        # reserve ID ranges (see ModelBatch)
+        [
+            """
+            CREATE TABLE frames_ (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fk_frame_sets INTEGER,
+                rejected INTEGER,
+                timestamp REAL,
+                frame_number INTEGER,
+                FOREIGN KEY(fk_frame_sets) REFERENCES frame_sets(id)
+                    ON DELETE CASCADE
+            )
+            """,
+            """
+            INSERT INTO frames_
+            (id, fk_frame_sets, rejected, timestamp, frame_number)
+            SELECT id, fk_frame_sets, rejected, timestamp, frame_number
+            FROM frames
+            """,
+            """
+            DROP TABLE frames
+            """,
+            """
+            ALTER TABLE frames_
+            RENAME TO frames
+            """,
+            """
+            CREATE INDEX frames_fk_frame_sets_rejected
+            ON frames (fk_frame_sets, rejected)
+            """,
+            """
+            CREATE TABLE transforms_ (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fk_transform_sets INTEGER,
+                fk_frames INTEGER,
+                metadata TEXT,
+                rejected INTEGER,
+                FOREIGN KEY(fk_transform_sets)
+                    REFERENCES transform_sets(id)
+                    ON DELETE CASCADE,
+                FOREIGN KEY(fk_frames) REFERENCES frames(id)
+            )
+            """,
+            """
+            INSERT INTO transforms_
+            (id, fk_transform_sets, fk_frames, metadata, rejected)
+            SELECT id, fk_transform_sets, fk_frames, metadata, rejected
+            FROM transforms
+            """,
+            """
+            DROP TABLE transforms
+            """,
+            """
+            ALTER TABLE transforms_
+            RENAME TO transforms
+            """,
+            """
+            CREATE INDEX transforms_fk_transform_sets_rejected
+            ON transforms (fk_transform_sets, rejected)
+            """,
+            """
+            CREATE INDEX transforms_fk_frames
+            ON transforms (fk_frames)
+            """
+        ]
+    ]
+
+    @classmethod
+    def init(cls):
+        """
+        This method upgrades the schema to the latest version.
+
+        :rtype: None
+        """
+
+        version = SchemaModel.version()
+
+        if version >= len(SchemaModel.migrations):
+            return
+
+        # so that tables can be rebuilt (dropping a table referenced by
+        # another would otherwise fail or cascade)
+        Model.execute('PRAGMA foreign_keys = 0')
+
+        try:
+            for migration in SchemaModel.migrations[version:]:
+                version += 1
+
+                Model.execute('BEGIN')
+
+                try:
+                    for query in migration:
+                        Model.execute(query)
+
+                    Model.execute(f'PRAGMA user_version = {version}')
+                except Exception:
+                    Model.execute('ROLLBACK')
+
+                    raise
+
+                Model.execute('COMMIT')
+        finally:
+            Model.execute('PRAGMA foreign_keys = 1')
+
+    @classmethod
+    def version(cls):
+        """
+        This method returns the schema version.
+
+        :rtype: int
+        """
+
+        result = Model.execute('PRAGMA user_version')
+
+        return result.fetchone()[0]
@@ -1,4 +1,7 @@
+import os
+
 from deepstar.models.model import Model
+from deepstar.models.model_batch import ModelBatch
 from deepstar.models.transform_set_model import TransformSetModel
 
 
@@ -72,6 +75,27 @@ class TransformModel(Model):
 
         return result.lastrowid
 
+    def batch(self, length=None, checkpoints=False):
+        """
+        This method returns a batch for performing many insert operations in
+        few transactions. The batch's insert method takes the same arguments
+        as this class's insert method and returns the transform ID.
+
+        Example:
+
+        with TransformModel().batch() as batch:
+            transform_id = batch.insert(transform_set_id, frame_id, None, 0)
+
+        :param int length: The optional number of transforms per transaction.
+        :param bool checkpoints: True if transforms are only flushed at
+            checkpoints (see ModelBatch.checkpoint) else False.
+        :rtype: ModelBatch
+        """
+
+        return ModelBatch('transforms', ['fk_transform_sets', 'fk_frames',
+                                         'metadata', 'rejected'],
+                          length, checkpoints)
+
     def list(self, transform_set_id, length=-1, offset=None, rejected=True):
         """
         This method performs a list operation.
@@ -99,6 +123,8 @@ class TransformModel(Model):
         if rejected is False:
             query += ' AND rejected = 0'
 
+        query += ' ORDER BY id'
+
         if length is not None:
             query += ' LIMIT ?'
             params += (length,)
@@ -111,6 +137,125 @@ class TransformModel(Model):
 
         return result.fetchall()
 
+    def iterate(self, transform_set_id, rejected=True, length=None):
+        """
+        This method iterates over the transforms in a transform set in ID
+        order. Rows are fetched in batches of length rows using keyset
+        pagination (id > the last ID seen) so that a full pass over a transform
+        set is linear in its size.
+
+        :param int transform_set_id: The transform set ID.
+        :param bool rejected: True if should include rejected transforms else
+            False if should not. The default value is True.
+        :param int length: The optional batch length. The default value is the
+            value of the MODEL_LIST_LENGTH environment variable or 100.
+        :rtype: generator(tuple)
+        """
+
+        if length is None:
+            length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
+
+        query = """
+                SELECT MIN(id), MAX(id)
+                FROM transforms
+                WHERE fk_transform_sets = ?
+                """
+
+        result = Model.execute(query, (transform_set_id,))
+
+        first_id, max_id = result.fetchone()
+
+        if first_id is None:
+            return
+
+        if rejected is False:
+            query = """
+                    SELECT id, fk_transform_sets, fk_frames, metadata, rejected
+                    FROM transforms
+                    WHERE fk_transform_sets = ? AND rejected = 0 AND id > ?
+                        AND id <= ?
+                    ORDER BY id LIMIT ?
+                    """
+        else:
+            # the transform set index orders the transforms by rejected
+            # first, so that they are walked in ID order between the first and
+            # last IDs (the transforms of a transform set are inserted in
+            # ranges of consecutive IDs) rather than sorted for each batch
+            query = """
+                    SELECT id, fk_transform_sets, fk_frames, metadata, rejected
+                    FROM transforms
+                    WHERE +fk_transform_sets = ? AND id > ? AND id <= ?
+                    ORDER BY id LIMIT ?
+                    """
+
+        last_id = first_id - 1
+
+        while True:
+            result = Model.execute(query, (transform_set_id, last_id, max_id,
+                                           length))
+
+            transforms = result.fetchall()
+
+            yield from transforms
+
+            if len(transforms) < length:
+                break
+
+            last_id = transforms[-1][0]
+
+    def merge(self, transform_set_id, src_transform_set_id, rejected=True):
+        """
+        This method copies the transforms in a transform set into another
+        transform set in one transaction (an INSERT ... SELECT per transform)
+        and returns the mapping of old to new transform IDs.
+
+        :param int transform_set_id: The transform set ID into which to copy.
+        :param int src_transform_set_id: The transform set ID from which to
+            copy.
+        :param bool rejected: True if should include rejected transforms else
+            False if should not. The default value is True.
+        :rtype: list(tuple)
+        """
+
+        where = 'WHERE fk_transform_sets = ?'
+
+        if rejected is False:
+            where += ' AND rejected = 0'
+
+        with Model.transaction():
+            query = f"""
+                    SELECT id
+                    FROM transforms
+                    {where}
+                    ORDER BY id
+                    """
+
+            result = Model.execute(query, (src_transform_set_id,))
+
+            ids = [row[0] for row in result.fetchall()]
+
+            # the IDs are reserved as by ModelBatch so that the rows of open
+            # batches are not assigned them
+            base = Model.reserve('transforms', len(ids)) - 1
+
+            # the IDs are assigned in order by one INSERT ... SELECT per
+            # transform rather than by a window function (which requires
+            # SQLite 3.25)
+            query = """
+                    INSERT INTO transforms
+                    (id, fk_transform_sets, fk_frames, metadata, rejected)
+                    SELECT ?, ?, fk_frames, metadata, rejected
+                    FROM transforms
+                    WHERE id = ?
+                    """
+
+            params = [(base + 1 + n, transform_set_id, id_)
+                      for n, id_ in enumerate(ids)]
+
+            Model.connection().executemany(query, params)
+
+        return list(zip(ids, range(base + 1, base + 1 + len(ids))))
+
     def update(self, transform_id, metadata=None, rejected=None):
         """
         This method performs an update operation.
@@ -147,6 +292,39 @@ class TransformModel(Model):
 
         return True if result.rowcount == 1 else False
 
+    def set_rejected(self, transform_ids, rejected):
+        """
+        This method performs a bulk update operation of the rejected column
+        in one transaction.
+
+        :param list(int) transform_ids: The transform IDs.
+        :param int rejected: 1 or 0 for rejected or not rejected respectively.
+        :rtype: int
+        """
+
+        query = """
+                UPDATE transforms
+                SET rejected = ?
+                WHERE id = ?
+                """
+
+        params = [(rejected, transform_id) for transform_id in transform_ids]
+
+        with Model.transaction():
+            result = Model.connection().executemany(query, params)
+
+        return result.rowcount
+
+    def reject_many(self, transform_ids):
+        """
+        This method performs a bulk reject operation.
+
+        :param list(int) transform_ids: The transform IDs.
+        :rtype: int
+        """
+
+        return self.set_rejected(transform_ids, 1)
+
     def count(self, transform_set_id, rejected=True):
         """
         This method performs a count operation.
@@ -1,4 +1,5 @@
 from deepstar.models.model import Model
+from deepstar.util.codec import Codec
 
 
 class TransformSetModel(Model):
@@ -46,25 +47,31 @@ class TransformSetModel(Model):
 
         return result.fetchone()
 
-    def insert(self, name, frame_set_id, prev_transform_set_id=None):
+    def insert(self, name, frame_set_id, prev_transform_set_id=None,
+               codec=None):
         """
         This method performs an insert operation.
 
         :param str name: The comma separated list of transform names.
         :param int frame_set_id: The frame set ID.
         :param int prev_transform_set_id: The previous transform set ID.
+        :param Codec codec: The optional codec in which the transform set's
+            files are written. The default value is Codec().
         :rtype: int
         """
 
+        if codec is None:
+            codec = Codec()
+
         query = """
                 INSERT INTO transform_sets
-                (name, fk_frame_sets, fk_prev_transform_sets)
+                (name, fk_frame_sets, fk_prev_transform_sets, codec)
                 VALUES
-                (?, ?, ?)
+                (?, ?, ?, ?)
                 """
 
         result = Model.execute(query, (name, frame_set_id,
-                                       prev_transform_set_id))
+                                       prev_transform_set_id, codec.spec))
 
         return result.lastrowid
 
@@ -101,3 +108,22 @@ class TransformSetModel(Model):
         result = Model.execute(query, (transform_set_id,))
 
         return True if result.rowcount == 1 else False
+
+    def codec(self, transform_set_id):
+        """
+        This method returns the codec in which a transform set's files are
+        written.
+
+        :param int transform_set_id: The transform set ID.
+        :rtype: Codec
+        """
+
+        query = """
+                SELECT codec
+                FROM transform_sets
+                WHERE id = ?
+                """
+
+        result = Model.execute(query, (transform_set_id,)).fetchone()
+
+        return Codec(result[0] if result and result[0] else Codec.legacy)
@@ -43,26 +43,56 @@ class VideoModel(Model):
 
         return result.fetchone()
 
-    def insert(self, uri, filename, description=None):
+    def insert(self, uri, filename, description=None, probe=None):
         """
         This method performs an insert operation.
 
         :param str uri: The URI to the video.
         :param str filename: The filename for the video.
+        :param str description: The description of the video.
+        :param tuple probe: The video's frame count, FPS, width, height,
+            duration (in milliseconds) and FourCC (see
+            util.video.probe_video_file). The default value of None indicates
+            that they are unknown.
         :rtype: int
         """
 
+        if probe is None:
+            probe = (None,) * 6
+
         query = """
                 INSERT INTO videos
-                (uri, filename, description)
+                (uri, filename, description, frame_count, fps, width, height,
+                 duration, fourcc)
                 VALUES
-                (?, ?, ?)
+                (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """
 
-        result = Model.execute(query, (uri, filename, description))
+        result = Model.execute(query, (uri, filename, description) +
+                               tuple(probe))
 
         return result.lastrowid
 
+    def probe(self, video_id):
+        """
+        This method returns a video's frame count, FPS, width, height,
+        duration (in milliseconds) and FourCC as probed when it was inserted
+        (each None if unknown) or None if the video is not found.
+
+        :param int video_id: The video ID.
+        :rtype: tuple
+        """
+
+        query = """
+                SELECT frame_count, fps, width, height, duration, fourcc
+                FROM videos
+                WHERE id = ?
+                """
+
+        result = Model.execute(query, (video_id,))
+
+        return result.fetchone()
+
     def update(self, video_id, uri=None):
         """
         This method performs an update operation.
@@ -102,7 +132,8 @@ class VideoModel(Model):
         """
 
         query = """
-                SELECT id, uri, filename, description
+                SELECT id, uri, filename, description, frame_count, fps,
+                       width, height, duration, fourcc
                 FROM videos
                 """
 
@@ -1,32 +1,28 @@
-import os
 import re
 
-import cv2
 import numpy as np
 
-from deepstar.filesystem.transform_file import TransformFile
-from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
-from deepstar.models.transform_model import TransformModel
-from deepstar.models.transform_set_model import TransformSetModel
 from deepstar.util.cv import adjust_color
-from deepstar.util.debug import debug
+from deepstar.util.transform_set_select_extract_base import \
+    TransformSetSelectExtractBase
 
 
-class AdjustColorTransformSetSelectExtractPlugin:
+class AdjustColorTransformSetSelectExtractPlugin(
+        TransformSetSelectExtractBase):
     """
     This class implements the AdjustTransformSetSelectExtractPlugin class.
     """
 
     name = 'adjust_color'
 
-    def transform_set_select_extract(self, transform_set_id, opts):
+    def options(self, opts):
         """
-        This method adjusts color for each transform in a transform set.
+        This method validates and parses the r, g and b options into color
+        adjustments.
 
-        :param int transform_set_id: The transform set ID.
         :param dict opts: The dict of options.
         :raises: ValueError
-        :rtype: None
+        :rtype: list
         """
 
         r = opts.get('r', None)
@@ -54,55 +50,23 @@ class AdjustColorTransformSetSelectExtractPlugin:
             else:
                 color_adjustments.append(None)
 
-        transform_set_model = TransformSetModel()
+        return color_adjustments
 
-        result = transform_set_model.select(transform_set_id)
-
-        transform_set_id_ = TransformSetModel().insert('adjust_color',
-                                                       result[2],
-                                                       transform_set_id)
-
-        p1 = TransformSetSubDir.path(transform_set_id_)
-
-        os.makedirs(p1)
-
-        p2 = TransformSetSubDir.path(transform_set_id)
-        transform_model = TransformModel()
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
-        offset = 0
-
-        while True:
-            transforms = transform_model.list(transform_set_id, length=length,
-                                              offset=offset, rejected=False)
-
-            if not transforms:
-                break
-
-            for transform in transforms:
-                transform_id = transform_model.insert(transform_set_id_,
-                                                      transform[2],
-                                                      transform[3],
-                                                      transform[4])
-
-                p3 = TransformFile.path(p2, transform[0], 'jpg')
-                p4 = TransformFile.path(p1, transform_id, 'jpg')
-
-                image = cv2.imread(p3)
-
-                image = image.astype(np.short)
-
-                for color_adjustment in color_adjustments:
-                    if color_adjustment is not None:
-                        image = adjust_color(image, color_adjustment[0],
-                                             color_adjustment[1],
-                                             color_adjustment[2])
+    def transform(self, image, metadata, options):
+        """
+        This method adjusts color for a transform.
 
-                cv2.imwrite(p4, image, [cv2.IMWRITE_JPEG_QUALITY, 100])
+        :param numpy.ndarray image: The image.
+        :param str metadata: Metadata for the transform.
+        :param list options: The color adjustments.
+        :rtype: tuple(numpy.ndarray, str)
+        """
 
-                debug(f'Transform with ID {transform_id:08d} at {p4} '
-                      f'extracted from transform with ID {transform[0]:08d} '
-                      f'at {p3}', 4)
+        image = image.astype(np.short)
 
-            offset += length
+        for color_adjustment in options:
+            if color_adjustment is not None:
+                image = adjust_color(image, color_adjustment[0],
+                                     color_adjustment[1], color_adjustment[2])
 
-        return transform_set_id_
+        return image, metadata
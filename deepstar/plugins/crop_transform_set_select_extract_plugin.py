@@ -1,29 +1,21 @@
-import os
+from deepstar.util.transform_set_select_extract_base import \
+    TransformSetSelectExtractBase
 
-import cv2
 
-from deepstar.filesystem.transform_file import TransformFile
-from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
-from deepstar.models.transform_model import TransformModel
-from deepstar.models.transform_set_model import TransformSetModel
-from deepstar.util.debug import debug
-
-
-class CropTransformSetSelectExtractPlugin:
+class CropTransformSetSelectExtractPlugin(TransformSetSelectExtractBase):
     """
     This class implements the CropTransformSetSelectExtractPlugin class.
     """
 
     name = 'crop'
 
-    def transform_set_select_extract(self, transform_set_id, opts):
+    def options(self, opts):
         """
-        This method crops each transform in a transform set.
+        This method validates and parses the x1, y1, x2 and y2 options.
 
-        :param int transform_set_id: The transform set ID.
         :param dict opts: The dict of options.
         :raises: ValueError
-        :rtype: None
+        :rtype: tuple(int, int, int, int)
         """
 
         x1 = int(opts['x1']) if ('x1' in opts) else None
@@ -36,48 +28,19 @@ class CropTransformSetSelectExtractPlugin:
                 'The x1, y1, x2 and y2 options are required but were not '
                 'supplied')
 
-        transform_set_model = TransformSetModel()
-
-        result = transform_set_model.select(transform_set_id)
-
-        transform_set_id_ = TransformSetModel().insert('crop', result[2],
-                                                       transform_set_id)
-
-        p1 = TransformSetSubDir.path(transform_set_id_)
-
-        os.makedirs(p1)
-
-        p2 = TransformSetSubDir.path(transform_set_id)
-        transform_model = TransformModel()
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
-        offset = 0
-
-        while True:
-            transforms = transform_model.list(transform_set_id, length=length,
-                                              offset=offset, rejected=False)
+        return x1, y1, x2, y2
 
-            if not transforms:
-                break
-
-            for transform in transforms:
-                transform_id = transform_model.insert(transform_set_id_,
-                                                      transform[2],
-                                                      transform[3],
-                                                      transform[4])
-
-                p3 = TransformFile.path(p2, transform[0], 'jpg')
-                p4 = TransformFile.path(p1, transform_id, 'jpg')
-
-                image_1 = cv2.imread(p3)
-
-                image_2 = image_1[y1:y2, x1:x2]
-
-                cv2.imwrite(p4, image_2, [cv2.IMWRITE_JPEG_QUALITY, 100])
+    def transform(self, image, metadata, options):
+        """
+        This method crops a transform.
 
-                debug(f'Transform with ID {transform_id:08d} at {p4} '
-                      f'extracted from transform with ID {transform[0]:08d} '
-                      f'at {p3}', 4)
+        :param numpy.ndarray image: The image.
+        :param str metadata: Metadata for the transform.
+        :param tuple(int, int, int, int) options: The x1, y1, x2 and y2
+            options.
+        :rtype: tuple(numpy.ndarray, str)
+        """
 
-            offset += length
+        x1, y1, x2, y2 = options
 
-        return transform_set_id_
+        return image[y1:y2, x1:x2], metadata
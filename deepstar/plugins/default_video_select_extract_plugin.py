@@ -1,17 +1,31 @@
+import collections
+import concurrent.futures
+import itertools
+import json
+import math
 import os
+import shutil
+import tempfile
 
 import cv2
 import imutils
 
 from deepstar.filesystem.frame_file import FrameFile
+from deepstar.filesystem.frame_set_dir import FrameSetDir
 from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
 from deepstar.filesystem.video_file import VideoFile
 from deepstar.models.frame_model import FrameModel
 from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.job_model import JobModel
 from deepstar.models.video_model import VideoModel
+from deepstar.util.codec import Codec
 from deepstar.util.command_line_route_handler_error import \
     CommandLineRouteHandlerError
+from deepstar.util.cv import sharpness
 from deepstar.util.debug import debug
+from deepstar.util.prefetch import prefetch
+from deepstar.util.process_pool import process_pool
+from deepstar.util.scene_gate import SceneGate
 
 
 class DefaultVideoSelectExtractPlugin:
@@ -19,9 +33,41 @@ class DefaultVideoSelectExtractPlugin:
     This class implements the DefaultVideoSelectExtractPlugin class.
     """
 
-    def video_select_extract(self, video_id, sub_sample=1, max_sample=0):
+    # The minimum number of frames per segment when a video is decoded in
+    # segments (seeking to a segment decodes from the preceding keyframe so
+    # segments much shorter than a typical GOP gain nothing).
+    min_segment_length = 250
+
+    # The minimum sub_sample stride at which skipped frames are sought past
+    # rather than grabbed (a seek decodes from the preceding keyframe so only
+    # pays off for strides longer than a typical GOP).
+    seek_min_stride = 250
+
+    # The number of threads encoding frames when a video is extracted in the
+    # calling process (None for the number of CPUs, at most queue_length).
+    encode_threads = None
+
+    # The maximum number of frames queued to be encoded and to be saved when a
+    # video is extracted in the calling process (a decoded 4K frame is about
+    # 25 MB).
+    queue_length = 8
+
+    # The name of the jobs recording the progress of extractions.
+    job_name = 'video_select_extract'
+
+    def video_select_extract(self, video_id, sub_sample=1, max_sample=0,
+                             jobs=1, scene_threshold=0, min_gap=1, max_gap=0,
+                             window=0, start_time=0, end_time=0, fps=0,
+                             resume=False):
         """
-        This method extracts frames and thumbnails from a video to a frame set.
+        This method extracts frames and thumbnails from a video to a frame set
+        and records the frame number and timestamp of each frame (see
+        video_select_reextract). If jobs is greater than 1,
+        the video is split into up to jobs segments that are decoded in worker
+        processes (see _segments) unless frames are gated by scene change
+        (which depends on the last kept frame and so is sequential) or sampled
+        by time. The progress of the extraction is recorded in a job (see
+        JobModel) so that it can be resumed if it is interrupted.
 
         :param int video_id: The video ID.
         :param int sub_sample: Sample frames at a rate of 1 sample per
@@ -31,15 +77,590 @@ class DefaultVideoSelectExtractPlugin:
         :param int max_sample: Sample up to maximum count of frames. For
             example, sample up to 1000 total frames (and then cease to sample).
             The default value of 0 indicates that there is no maximum count of
+            frames. With scene_threshold or window, max_sample counts the kept
+            frames.
+        :param int jobs: The number of worker processes.
+        :param float scene_threshold: Keep only the sampled frames that differ
+            from the last kept frame by at least scene_threshold (see
+            SceneGate). The default value of 0 indicates to keep every sampled
+            frame.
+        :param int min_gap: See SceneGate.
+        :param int max_gap: See SceneGate.
+        :param int window: Keep only the sharpest sampled frame (see
+            util.cv.sharpness) of each window of window frames. For example,
+            if window is 30, then keep the sharpest of frames 0 to 29, of
+            frames 30 to 59 and so on. The default value of 0 indicates to
+            keep every sampled frame. The scene gate applies to the kept
             frames.
+        :param float start_time: Seek to start_time seconds into the video
+            before sampling. The default value is 0.
+        :param float end_time: Stop sampling at end_time seconds into the
+            video. The default value of 0 indicates the end of the video.
+        :param float fps: Sample frames at a rate of fps frames per second of
+            video (the first frame at or after each multiple of 1 / fps
+            seconds from start_time) regardless of the video's frame rate.
+            The default value of 0 indicates to sample by sub_sample instead
+            (the two are mutually exclusive).
+        :param bool resume: Resume the latest extraction from the video with
+            the same options into its frame set (after the last frame it
+            extracted) if it was interrupted or return its frame set if it
+            finished. The default value of False indicates to start a new
+            extraction (as does resume if there is no such extraction).
         :raises: CommandLineRouteHandlerError
+        :raises: ValueError
         :rtype: int
         """
 
+        gate = self._gate(scene_threshold, min_gap, max_gap)
+
+        self._check(sub_sample, window, start_time, end_time, fps)
+
         result = VideoModel().select(video_id)
 
         p1 = VideoFile.path(result[2])
 
+        options = self._options(sub_sample, max_sample, scene_threshold,
+                                min_gap, max_gap, window, start_time,
+                                end_time, fps)
+
+        job = self._job(video_id, options) if resume else None
+
+        if job is None:
+            codec = Codec()
+
+            last = None
+        else:
+            codec = FrameSetModel().codec(job[3])
+
+            last = self._last(job, codec, gate)
+
+            if job[7] == 1 or (last is not None and 0 < max_sample <= last[0]):
+                JobModel().update(job[0], finished=1)
+
+                return job[3]
+
+        timed = start_time > 0 or end_time > 0 or fps > 0
+
+        if jobs > 1 and gate is None and not timed:
+            first = 0 if last is None else \
+                self._first(last[1], sub_sample, window)
+
+            segments = self._segments(p1, sub_sample, max_sample, jobs,
+                                      window,
+                                      VideoModel().probe(video_id)[0], first)
+
+            if len(segments) > 1:
+                if last is not None and max_sample > 0:
+                    max_sample -= last[0]
+
+                return self._video_select_extract_segments(
+                    video_id, p1, codec, segments, sub_sample, max_sample,
+                    jobs, window, options, job)
+
+        frames = self._frames(p1, sub_sample, max_sample, gate, window,
+                              start_time, end_time, fps, last)
+
+        return self._save_frames(video_id, codec, frames, options, job)
+
+    def video_select_reextract(self, video_id, frame_numbers, width=0):
+        """
+        This method extracts the frames with the given frame numbers (e.g. the
+        frame numbers of the frames of a frame set that survived curation, see
+        FrameModel.positions) and their thumbnails from a video to a new frame
+        set, seeking straight to each frame (or grabbing forward to it if it
+        is fewer than seek_min_stride frames ahead) rather than decoding the
+        whole video.
+
+        :param int video_id: The video ID.
+        :param list(int) frame_numbers: The (0-based) frame numbers.
+        :param int width: Resize the frames to width pixels wide (preserving
+            aspect ratio). The default value of 0 indicates not to resize
+            them.
+        :raises: CommandLineRouteHandlerError
+        :rtype: int
+        """
+
+        result = VideoModel().select(video_id)
+
+        p1 = VideoFile.path(result[2])
+
+        frames = self._frames_at(p1, sorted(set(frame_numbers)), width)
+
+        return self._save_frames(video_id, Codec(), frames)
+
+    def video_select_extract_many(self, video_ids, sub_sample=1, max_sample=0,
+                                  jobs=1, scene_threshold=0, min_gap=1,
+                                  max_gap=0, window=0, start_time=0,
+                                  end_time=0, fps=0):
+        """
+        This method extracts frames and thumbnails from many videos to many
+        frame sets, decoding up to jobs videos at a time in worker processes.
+        The calling process inserts the frame sets and frames in video order
+        so that their IDs are the same as if the videos were extracted one
+        after another. It yields the video ID and frame set ID of each video.
+        A video's job (see video_select_extract) is recorded as its frames are
+        inserted, so an interrupted extraction resumes from the video that
+        was being inserted.
+
+        :param list(int) video_ids: The video IDs.
+        :param int sub_sample: See video_select_extract.
+        :param int max_sample: See video_select_extract.
+        :param int jobs: The number of worker processes.
+        :param float scene_threshold: See video_select_extract.
+        :param int min_gap: See video_select_extract.
+        :param int max_gap: See video_select_extract.
+        :param int window: See video_select_extract.
+        :param float start_time: See video_select_extract.
+        :param float end_time: See video_select_extract.
+        :param float fps: See video_select_extract.
+        :raises: CommandLineRouteHandlerError
+        :raises: ValueError
+        :rtype: generator(tuple(int, int))
+        """
+
+        gate = self._gate(scene_threshold, min_gap, max_gap)
+
+        self._check(sub_sample, window, start_time, end_time, fps)
+
+        video_model = VideoModel()
+
+        codec = Codec()
+
+        options = self._options(sub_sample, max_sample, scene_threshold,
+                                min_gap, max_gap, window, start_time,
+                                end_time, fps)
+
+        tmp_dirs = []
+
+        futures = collections.deque()
+
+        done = 0
+
+        try:
+            with process_pool(jobs) as executor:
+                for video_id in video_ids:
+                    p1 = VideoFile.path(video_model.select(video_id)[2])
+
+                    tmp_dir = tempfile.mkdtemp(prefix='.tmp',
+                                               dir=FrameSetDir.path())
+
+                    tmp_dirs.append(tmp_dir)
+
+                    futures.append((video_id, tmp_dir, executor.submit(
+                        self._extract, p1, tmp_dir, codec, sub_sample,
+                        max_sample, gate, window, start_time, end_time,
+                        fps)))
+
+                    # bound the number of decoded videos awaiting insertion
+                    if len(futures) >= jobs * 2:
+                        done += 1
+
+                        yield self._consume(futures, codec, done,
+                                            len(video_ids), options)
+
+                while futures:
+                    done += 1
+
+                    yield self._consume(futures, codec, done,
+                                        len(video_ids), options)
+        except BaseException:
+            # don't decode the videos that have not been started
+            for _, _, future in futures:
+                future.cancel()
+
+            raise
+        finally:
+            for tmp_dir in tmp_dirs:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _save_frames(self, video_id, codec, frames, options=None, job=None):
+        """
+        This method inserts a frame set (or resumes the job's frame set) and
+        saves the frames and thumbnails yielded by a _frames (or _frames_at)
+        generator to it.
+
+        :param int video_id: The video ID.
+        :param Codec codec: The codec.
+        :param generator frames: The generator.
+        :param str options: The job's options (see _options). The default
+            value of None indicates not to record a job.
+        :param tuple job: The job to resume or None.
+        :raises: CommandLineRouteHandlerError
+        :rtype: int
+        """
+
+        # raises if the video file can not be opened
+        next(frames, None)
+
+        frame_set_id, job_id = self._begin(video_id, codec, options, job)
+
+        p1 = FrameSetSubDir.path(frame_set_id)
+
+        # frames are decoded in a thread, encoded in a pool of threads (OpenCV
+        # releases the GIL) and written with their rows in this thread, with
+        # up to length frames queued between each stage (so that no more than
+        # length frames are encoded at once)
+        length = self.queue_length
+
+        threads = min(self.encode_threads or os.cpu_count() or 1, length)
+
+        # without a job the rows are flushed like those of any batch so that
+        # the frames saved before an exception are kept
+        with FrameModel().batch(checkpoints=job_id is not None) as batch, \
+                concurrent.futures.ThreadPoolExecutor(threads) as executor:
+            futures = collections.deque()
+
+            for i, timestamp, frame in prefetch(frames, length):
+                futures.append(((i, timestamp), executor.submit(
+                    self._encode, codec, frame)))
+
+                if len(futures) >= length:
+                    self._save_next(batch, frame_set_id, p1, codec, futures,
+                                    job_id)
+
+            while futures:
+                self._save_next(batch, frame_set_id, p1, codec, futures,
+                                job_id)
+
+        self._finish(job_id)
+
+        return frame_set_id
+
+    def _begin(self, video_id, codec, options, job):
+        """
+        This method inserts a frame set and a job recording the extraction to
+        it (unless options is None) and returns their IDs, or returns the
+        frame set ID and ID of the job to resume.
+
+        :param int video_id: The video ID.
+        :param Codec codec: The codec.
+        :param str options: The job's options (see _options) or None.
+        :param tuple job: The job to resume or None.
+        :rtype: tuple(int, int)
+        """
+
+        if job is not None:
+            debug(f'Job with ID {job[0]:08d} resumed into frame set with ID '
+                  f'{job[3]:08d}', 4)
+
+            return job[3], job[0]
+
+        frame_set_id = FrameSetModel().insert(video_id, codec)
+
+        os.makedirs(FrameSetSubDir.path(frame_set_id))
+
+        job_id = None
+
+        if options is not None:
+            job_id = JobModel().insert(self.job_name, video_id, options,
+                                       frame_set_id=frame_set_id)
+
+        return frame_set_id, job_id
+
+    def _checkpoint(self, batch, job_id, i):
+        """
+        This method records that a job extracted the frame with frame number
+        i. It is called after the frame is inserted so that the checkpoint is
+        committed in the same transaction as the frame (see
+        ModelBatch.checkpoint).
+
+        :param ModelBatch batch: The frame batch.
+        :param int job_id: The job ID or None.
+        :param int i: The frame number.
+        :rtype: None
+        """
+
+        if job_id is not None:
+            batch.checkpoint(JobModel().update, job_id, checkpoint=i)
+
+    def _finish(self, job_id):
+        """
+        This method records that a job finished.
+
+        :param int job_id: The job ID or None.
+        :rtype: None
+        """
+
+        if job_id is not None:
+            JobModel().update(job_id, finished=1)
+
+    def _options(self, sub_sample, max_sample, scene_threshold, min_gap,
+                 max_gap, window, start_time, end_time, fps):
+        """
+        This method serializes the options that determine the frames that are
+        extracted from a video (a job is only resumed with the same options).
+
+        :param int sub_sample: See video_select_extract.
+        :param int max_sample: See video_select_extract.
+        :param float scene_threshold: See video_select_extract.
+        :param int min_gap: See video_select_extract.
+        :param int max_gap: See video_select_extract.
+        :param int window: See video_select_extract.
+        :param float start_time: See video_select_extract.
+        :param float end_time: See video_select_extract.
+        :param float fps: See video_select_extract.
+        :rtype: str
+        """
+
+        return json.dumps({'sub_sample': sub_sample, 'max_sample': max_sample,
+                           'scene_threshold': scene_threshold,
+                           'min_gap': min_gap, 'max_gap': max_gap,
+                           'window': window, 'start_time': start_time,
+                           'end_time': end_time, 'fps': fps}, sort_keys=True)
+
+    def _job(self, video_id, options):
+        """
+        This method returns the latest job extracting from a video with the
+        options or None if there is none.
+
+        :param int video_id: The video ID.
+        :param str options: The options (see _options).
+        :rtype: tuple
+        """
+
+        return JobModel().find(self.job_name, video_id, options)
+
+    def _last(self, job, codec, gate):
+        """
+        This method returns the number of frames a job extracted and the frame
+        number, timestamp and (if gate is not None) frame of the last of them
+        or None if it extracted none.
+
+        :param tuple job: The job.
+        :param Codec codec: The frame set's codec.
+        :param SceneGate gate: The scene gate or None.
+        :rtype: tuple(int, int, float, numpy.ndarray)
+        """
+
+        positions = FrameModel().positions(job[3])
+
+        if job[6] is None or not positions:
+            return None
+
+        frame_id, i, timestamp = positions[-1]
+
+        frame = None
+
+        if gate is not None:
+            frame = cv2.imread(FrameFile.path(FrameSetSubDir.path(job[3]),
+                                              frame_id, codec.extension))
+
+        return len(positions), i, timestamp, frame
+
+    def _first(self, i, sub_sample, window):
+        """
+        This method returns the first frame number that may be sampled after
+        the frame with frame number i was sampled (the next sampled frame or
+        the start of the next window).
+
+        :param int i: The frame number.
+        :param int sub_sample: See video_select_extract.
+        :param int window: See video_select_extract.
+        :rtype: int
+        """
+
+        step = window or sub_sample
+
+        return -(-(i + 1) // step) * step
+
+    def _gate(self, scene_threshold, min_gap, max_gap):
+        """
+        This method returns a scene gate or None if scene_threshold is 0.
+
+        :param float scene_threshold: See video_select_extract.
+        :param int min_gap: See video_select_extract.
+        :param int max_gap: See video_select_extract.
+        :raises: ValueError
+        :rtype: SceneGate
+        """
+
+        if scene_threshold == 0:
+            return None
+
+        return SceneGate(scene_threshold, min_gap, max_gap)
+
+    def _check(self, sub_sample, window, start_time, end_time, fps):
+        """
+        This method validates the sampling options.
+
+        :param int sub_sample: See video_select_extract.
+        :param int window: See video_select_extract.
+        :param float start_time: See video_select_extract.
+        :param float end_time: See video_select_extract.
+        :param float fps: See video_select_extract.
+        :raises: ValueError
+        :rtype: None
+        """
+
+        if window < 0:
+            raise ValueError(f'The window must be at least 0 (got {window})')
+
+        if start_time < 0:
+            raise ValueError(f'The start time must be at least 0 (got '
+                             f'{start_time})')
+
+        if end_time != 0 and end_time <= start_time:
+            raise ValueError(f'The end time must be 0 or after the start '
+                             f'time (got {end_time})')
+
+        if fps < 0:
+            raise ValueError(f'The fps must be at least 0 (got {fps})')
+
+        if fps > 0 and sub_sample != 1:
+            raise ValueError('The fps and sub-sample options are mutually '
+                             'exclusive')
+
+    def _video_select_extract_segments(self, video_id, p1, codec, segments,
+                                       sub_sample, max_sample, jobs, window,
+                                       options=None, job=None):
+        """
+        This method extracts frames and thumbnails from a video to a frame set
+        by decoding its segments in a pool of jobs worker processes and
+        inserting the frames in temporal order as each segment is decoded.
+
+        :param int video_id: The video ID.
+        :param str p1: The path to the video file.
+        :param Codec codec: The codec.
+        :param list(tuple(int, int)) segments: The segments.
+        :param int sub_sample: See video_select_extract.
+        :param int max_sample: See video_select_extract.
+        :param int jobs: The number of worker processes.
+        :param int window: See video_select_extract.
+        :param str options: See _save_frames.
+        :param tuple job: See _save_frames.
+        :raises: CommandLineRouteHandlerError
+        :rtype: int
+        """
+
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp', dir=FrameSetDir.path())
+
+        try:
+            with process_pool(jobs) as executor:
+                futures = [executor.submit(self._extract_segment, p1, tmp_dir,
+                                           codec, start, end, sub_sample,
+                                           window)
+                           for start, end in segments]
+
+                samples = self._segment_samples(video_id, futures)
+
+                # raises if the video file can not be opened
+                next(samples, None)
+
+                if max_sample > 0:
+                    samples = itertools.islice(samples, max_sample)
+
+                return self._insert(video_id, tmp_dir, codec, samples,
+                                    options, job)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _segment_samples(self, video_id, futures):
+        """
+        This method yields None once the first segment of a video is decoded
+        (see _frames) and then the samples (see _extract_segment) of each
+        segment in order as it is decoded.
+
+        :param int video_id: The video ID.
+        :param list(concurrent.futures.Future) futures: The segments' futures.
+        :raises: CommandLineRouteHandlerError
+        :rtype: generator(tuple(int, int, float))
+        """
+
+        for i, future in enumerate(futures):
+            samples = future.result()
+
+            debug(f'Segment {i + 1}/{len(futures)} of video with ID '
+                  f'{video_id:08d} decoded', 4)
+
+            if i == 0:
+                yield None
+
+            yield from samples
+
+    def _segments(self, p1, sub_sample, max_sample, jobs, window=0,
+                  length=None, first=0):
+        """
+        This method splits a video (from the frame with frame number first)
+        into up to jobs segments of at least min_segment_length frames and
+        returns their [start, end) frame numbers. Segments start on sampled
+        frames (or on windows, so that no window spans two segments). The
+        last segment's end is None (read to the end of the video) unless
+        max_sample bounds it, since the frame count reported by the container
+        may be an estimate.
+
+        :param str p1: The path to the video file.
+        :param int sub_sample: See video_select_extract.
+        :param int max_sample: See video_select_extract.
+        :param int jobs: The number of segments.
+        :param int window: See video_select_extract.
+        :param int length: The video's frame count as probed when it was
+            inserted (see VideoModel.probe). The default value of None
+            indicates to read it from the video file.
+        :param int first: The first frame number (a sampled frame or the start
+            of a window). The default value is 0.
+        :raises: CommandLineRouteHandlerError
+        :rtype: list(tuple(int, int))
+        """
+
+        if length is None:
+            vc = cv2.VideoCapture(p1)
+
+            try:
+                if not vc.isOpened():
+                    raise CommandLineRouteHandlerError(
+                        f'OpenCV VideoCapture isOpened returned false for '
+                        f'{p1}')
+
+                length = int(vc.get(cv2.CAP_PROP_FRAME_COUNT))
+            finally:
+                vc.release()
+
+        end = self._end(sub_sample, max_sample, window)
+
+        if end is not None:
+            length = min(length, end)
+
+        step = window or sub_sample
+
+        count = min(jobs, (length - first) // max(self.min_segment_length, 1))
+
+        if count <= 1:
+            return [(first, end)]
+
+        starts = []
+
+        for i in range(0, count):
+            start = first + -(-((length - first) * i // count) // step) * step
+
+            if start < length and (not starts or start > starts[-1]):
+                starts.append(start)
+
+        if len(starts) <= 1:
+            return [(first, end)]
+
+        return list(zip(starts, starts[1:] + [end]))
+
+    def _extract_segment(self, p1, tmp_dir, codec, start, end, sub_sample,
+                         window=0):
+        """
+        This method extracts the sampled frames and thumbnails of the frames
+        start (inclusive) to end (exclusive or None for the end of the video)
+        of a video to a temporary directory (named by their 1-based position
+        in the sampled video or the 1-based number of their window) and
+        returns their names, frame numbers and timestamps in order. It is run
+        in a worker process.
+
+        :param str p1: The path to the video file.
+        :param str tmp_dir: The path to the temporary directory.
+        :param Codec codec: The codec.
+        :param int start: The first frame number.
+        :param int end: The frame number after the last frame or None.
+        :param int sub_sample: See video_select_extract.
+        :param int window: See video_select_extract.
+        :raises: CommandLineRouteHandlerError
+        :rtype: list(tuple(int, int, float))
+        """
+
         vc = cv2.VideoCapture(p1)
 
         try:
@@ -47,53 +668,543 @@ class DefaultVideoSelectExtractPlugin:
                 raise CommandLineRouteHandlerError(
                     f'OpenCV VideoCapture isOpened returned false for {p1}')
 
-            frame_set_id = FrameSetModel().insert(video_id)
+            result = []
 
-            p2 = FrameSetSubDir.path(frame_set_id)
+            samples = self._sample(vc, start, end, sub_sample)
 
-            os.makedirs(p2)
+            if window > 0:
+                samples = self._sharpest(samples, window)
 
-            frame_model = FrameModel()
+            for i, timestamp, frame in samples:
+                index = i // (window or sub_sample) + 1
 
-            sub_sample_ = sub_sample
-            max_sample_ = 0
+                self._write(tmp_dir, index, codec, frame)
 
-            while True:
-                ret, frame = vc.read()
-                if not ret:
-                    break
+                result.append((index, i, timestamp))
+        finally:
+            vc.release()
+
+        return result
+
+    def _consume(self, futures, codec, index, total, options=None):
+        """
+        This method waits for the first video in a queue of videos being
+        decoded, reports progress, inserts its frame set and returns the video
+        ID and frame set ID.
+
+        :param collections.deque futures: The queue of video IDs, temporary
+            directories and futures.
+        :param Codec codec: The codec.
+        :param int index: The 1-based position of the video.
+        :param int total: The total number of videos.
+        :param str options: See _save_frames.
+        :raises: CommandLineRouteHandlerError
+        :rtype: tuple(int, int)
+        """
+
+        video_id, tmp_dir, future = futures.popleft()
+
+        positions = future.result()
+
+        debug(f'Video with ID {video_id:08d} decoded to {len(positions)} '
+              f'frames ({index}/{total})', 3)
+
+        samples = [(n, i, timestamp)
+                   for n, (i, timestamp) in enumerate(positions, 1)]
 
-                # sub_sample
-                if sub_sample_ != sub_sample:
-                    sub_sample_ += 1
-                    continue
-                else:
-                    sub_sample_ = 1
+        return video_id, self._insert(video_id, tmp_dir, codec, samples,
+                                      options)
 
-                frame_id = frame_model.insert(frame_set_id, 0)
+    def _insert(self, video_id, tmp_dir, codec, samples, options=None,
+                job=None):
+        """
+        This method inserts a frame set (or resumes the job's frame set) and
+        the frames extracted to a temporary directory (by _extract or
+        _extract_segment) and moves the frames and thumbnails into the frame
+        set's directory.
+
+        :param int video_id: The video ID.
+        :param str tmp_dir: The path to the temporary directory.
+        :param Codec codec: The codec.
+        :param iterable(tuple(int, int, float)) samples: The frames' names in
+            the temporary directory, frame numbers and timestamps in order.
+        :param str options: See _save_frames.
+        :param tuple job: See _save_frames.
+        :rtype: int
+        """
 
-                p3 = FrameFile.path(p2, frame_id, 'jpg')
+        frame_set_id, job_id = self._begin(video_id, codec, options, job)
 
-                cv2.imwrite(p3, frame, [cv2.IMWRITE_JPEG_QUALITY, 100])
+        p1 = FrameSetSubDir.path(frame_set_id)
 
-                # imutils.resize preserves aspect ratio.
-                thumbnail = imutils.resize(frame, width=192, height=192)
+        with FrameModel().batch(checkpoints=job_id is not None) as batch:
+            for n, i, timestamp in samples:
+                frame_id = batch.insert(frame_set_id, 0, timestamp, i)
 
-                p4 = FrameFile.path(p2, frame_id, 'jpg', '192x192')
+                p2 = FrameFile.path(p1, frame_id, codec.extension)
+                p3 = FrameFile.path(p1, frame_id, codec.extension, '192x192')
 
-                # can adjust jpeg quality thus impacting file size
-                cv2.imwrite(p4, thumbnail, [cv2.IMWRITE_JPEG_QUALITY, 100])
+                os.replace(FrameFile.path(tmp_dir, n, codec.extension), p2)
+                os.replace(FrameFile.path(tmp_dir, n, codec.extension,
+                                          '192x192'), p3)
 
-                debug(f'Frame with ID {frame_id:08d} and thumbnail extracted '
-                      f'to {p3} and {p4}', 4)
+                self._checkpoint(batch, job_id, i)
 
-                # max_sample
-                max_sample_ += 1
+                debug(f'Frame with ID {frame_id:08d} and thumbnail '
+                      f'extracted to {p2} and {p3}', 4)
 
-                if max_sample > 0:
-                    if max_sample_ == max_sample:
-                        break
+        self._finish(job_id)
+
+        return frame_set_id
+
+    def _extract(self, p1, tmp_dir, codec, sub_sample, max_sample, gate,
+                 window=0, start_time=0, end_time=0, fps=0):
+        """
+        This method extracts frames and thumbnails from a video to a temporary
+        directory (named by their 1-based position in the video) and returns
+        their frame numbers and timestamps. It is run in a worker process.
+
+        :param str p1: The path to the video file.
+        :param str tmp_dir: The path to the temporary directory.
+        :param Codec codec: The codec.
+        :param int sub_sample: See video_select_extract.
+        :param int max_sample: See video_select_extract.
+        :param SceneGate gate: The scene gate or None.
+        :param int window: See video_select_extract.
+        :param float start_time: See video_select_extract.
+        :param float end_time: See video_select_extract.
+        :param float fps: See video_select_extract.
+        :raises: CommandLineRouteHandlerError
+        :rtype: list(tuple(int, float))
+        """
+
+        positions = []
+
+        frames = self._frames(p1, sub_sample, max_sample, gate, window,
+                              start_time, end_time, fps)
+
+        next(frames, None)
+
+        for i, timestamp, frame in frames:
+            positions.append((i, timestamp))
+
+            self._write(tmp_dir, len(positions), codec, frame)
+
+        return positions
+
+    def _frames(self, p1, sub_sample, max_sample, gate=None, window=0,
+                start_time=0, end_time=0, fps=0, last=None):
+        """
+        This method yields the frame number, timestamp and frame of the
+        sampled frames of a video. The video file is opened when the generator
+        is first advanced; it yields None first so that the caller can check
+        that the video file can be opened before consuming any frames.
+
+        :param str p1: The path to the video file.
+        :param int sub_sample: See video_select_extract.
+        :param int max_sample: See video_select_extract.
+        :param SceneGate gate: The optional scene gate.
+        :param int window: See video_select_extract.
+        :param float start_time: See video_select_extract.
+        :param float end_time: See video_select_extract.
+        :param float fps: See video_select_extract.
+        :param tuple last: The number of frames already extracted and the
+            frame number, timestamp and frame of the last of them (see _last)
+            to sample after or None.
+        :raises: CommandLineRouteHandlerError
+        :rtype: generator(tuple(int, float, numpy.ndarray))
+        """
+
+        vc = cv2.VideoCapture(p1)
+
+        try:
+            if not vc.isOpened():
+                raise CommandLineRouteHandlerError(
+                    f'OpenCV VideoCapture isOpened returned false for {p1}')
+
+            yield None
+
+            if last is None:
+                last = (0, None, None, None)
+
+            start_ms = start_time * 1000
+            end_ms = end_time * 1000
+
+            # seek straight to the start time
+            position = self._seek_time(vc, 0, start_ms)
+
+            if fps > 0:
+                samples = self._sample_fps(vc, position, start_ms, end_ms, fps,
+                                           last[2])
+            else:
+                end = None
+
+                # max_sample bounds the frames decoded only if every sampled
+                # frame from the first frame is kept
+                if gate is None and position == 0:
+                    end = self._end(sub_sample, max_sample, window)
+
+                start = position
+
+                if last[1] is not None:
+                    start = max(start, self._first(last[1], sub_sample,
+                                                   window))
+
+                samples = self._sample(vc, start, end, sub_sample,
+                                       start_ms, end_ms, position)
+
+            if window > 0:
+                samples = self._sharpest(samples, window)
+
+            if gate is not None:
+                samples = gate.filter(samples, None if last[1] is None else
+                                      (last[1], last[3]))
+
+            if max_sample > 0:
+                samples = itertools.islice(samples, max_sample - last[0])
+
+            yield from samples
         finally:
             vc.release()
 
-        return frame_set_id
+    def _frames_at(self, p1, frame_numbers, width):
+        """
+        This method yields the frame number, timestamp and frame of the frames
+        of a video with the given frame numbers (see
+        video_select_reextract). The video file is opened when the generator
+        is first advanced; it yields None first (see _frames).
+
+        :param str p1: The path to the video file.
+        :param list(int) frame_numbers: The sorted frame numbers.
+        :param int width: See video_select_reextract.
+        :raises: CommandLineRouteHandlerError
+        :rtype: generator(tuple(int, float, numpy.ndarray))
+        """
+
+        vc = cv2.VideoCapture(p1)
+
+        try:
+            if not vc.isOpened():
+                raise CommandLineRouteHandlerError(
+                    f'OpenCV VideoCapture isOpened returned false for {p1}')
+
+            yield None
+
+            position = 0
+
+            for i in frame_numbers:
+                if i - position >= self.seek_min_stride:
+                    position = self._seek(vc, position, i)
+
+                while position < i:
+                    if not vc.grab():
+                        return
+
+                    position += 1
+
+                ret, frame = vc.read()
+                if not ret:
+                    return
+
+                position += 1
+
+                if width > 0:
+                    # imutils.resize preserves aspect ratio.
+                    frame = imutils.resize(frame, width=width)
+
+                yield i, self._timestamp(vc), frame
+        finally:
+            vc.release()
+
+    def _end(self, sub_sample, max_sample, window):
+        """
+        This method returns the frame number after the last frame that
+        max_sample (without a scene gate) allows to be sampled or None if
+        there is no maximum.
+
+        :param int sub_sample: See video_select_extract.
+        :param int max_sample: See video_select_extract.
+        :param int window: See video_select_extract.
+        :rtype: int
+        """
+
+        if max_sample <= 0:
+            return None
+
+        if window > 0:
+            return max_sample * window
+
+        return (max_sample - 1) * sub_sample + 1
+
+    def _sharpest(self, samples, window):
+        """
+        This method yields the sharpest sample (see util.cv.sharpness) of each
+        window of window frames.
+
+        :param iterable(tuple(int, float, numpy.ndarray)) samples: The frame
+            numbers, timestamps and frames.
+        :param int window: See video_select_extract.
+        :rtype: generator(tuple(int, float, numpy.ndarray))
+        """
+
+        best = None
+
+        for sample in samples:
+            if best is not None and \
+                    sample[0] // window != best[0][0] // window:
+                yield best[0]
+
+                best = None
+
+            score = sharpness(sample[-1])
+
+            if best is None or score > best[1]:
+                best = (sample, score)
+
+        if best is not None:
+            yield best[0]
+
+    def _sample(self, vc, start, end, sub_sample, start_ms=0, end_ms=0,
+                position=0):
+        """
+        This method yields the frame number, timestamp (in milliseconds) and
+        frame of every sub_sample-th frame (counting from the first frame of
+        the video) of the frames start (inclusive) to end (exclusive or None
+        for the end of the video) and start_ms (inclusive) to end_ms
+        (exclusive or 0 for the end of the video) of a video. Only the sampled
+        frames are decoded to images: skipped frames are grabbed (demuxed and
+        decoded but not converted) or, for strides of at least
+        seek_min_stride frames, sought past.
+
+        :param cv2.VideoCapture vc: The video capture.
+        :param int start: The first frame number.
+        :param int end: The frame number after the last frame or None.
+        :param int sub_sample: See video_select_extract.
+        :param float start_ms: The first timestamp.
+        :param float end_ms: The timestamp after the last frame or 0.
+        :param int position: The video capture's current frame number.
+        :rtype: generator(tuple(int, float, numpy.ndarray))
+        """
+
+        i = -(-start // sub_sample) * sub_sample
+
+        position = self._seek(vc, position, i)
+
+        while end is None or i < end:
+            if sub_sample >= self.seek_min_stride:
+                position = self._seek(vc, position, i)
+
+            while position < i:
+                if not vc.grab():
+                    return
+
+                position += 1
+
+                if end_ms > 0 and vc.get(cv2.CAP_PROP_POS_MSEC) >= end_ms:
+                    return
+
+            ret, frame = vc.read()
+            if not ret:
+                return
+
+            position += 1
+
+            timestamp = self._timestamp(vc)
+
+            if end_ms > 0 and timestamp >= end_ms:
+                return
+
+            if timestamp >= start_ms:
+                yield i, timestamp, frame
+
+            i += sub_sample
+
+    def _sample_fps(self, vc, position, start_ms, end_ms, fps, after_ms=None):
+        """
+        This method yields the frame number, timestamp (in milliseconds) and
+        frame of the first frame at or after each multiple of 1 / fps seconds
+        from start_ms (inclusive) to end_ms (exclusive or 0 for the end of the
+        video) of a video. Only the sampled frames are decoded to images:
+        skipped frames are grabbed or, if the video has at least
+        seek_min_stride frames per sample, sought past.
+
+        :param cv2.VideoCapture vc: The video capture.
+        :param int position: The video capture's current frame number.
+        :param float start_ms: The first timestamp.
+        :param float end_ms: The timestamp after the last frame or 0.
+        :param float fps: See video_select_extract.
+        :param float after_ms: Sample after the sample with timestamp
+            after_ms (e.g. to resume sampling). The default value of None
+            indicates to sample from start_ms.
+        :rtype: generator(tuple(int, float, numpy.ndarray))
+        """
+
+        interval = 1000 / fps
+
+        seek = vc.get(cv2.CAP_PROP_FPS) / fps >= self.seek_min_stride
+
+        # timestamps within a microsecond of a sample time are on it
+        epsilon = 0.001
+
+        next_ms = start_ms
+
+        if after_ms is not None:
+            next_ms = start_ms + (math.floor(
+                (after_ms - start_ms + epsilon) / interval) + 1) * interval
+
+            position = self._seek_time(vc, position, next_ms)
+
+        while True:
+            if not vc.grab():
+                return
+
+            i = position
+
+            position += 1
+
+            timestamp = self._timestamp(vc)
+
+            if end_ms > 0 and timestamp >= end_ms:
+                return
+
+            if timestamp + epsilon < next_ms:
+                continue
+
+            ret, frame = vc.retrieve()
+            if not ret:
+                return
+
+            yield i, timestamp, frame
+
+            next_ms = start_ms + (math.floor(
+                (timestamp - start_ms + epsilon) / interval) + 1) * interval
+
+            if seek:
+                position = self._seek_time(vc, position, next_ms)
+
+    def _timestamp(self, vc):
+        """
+        This method returns the timestamp of the last frame grabbed or read
+        from a video capture in milliseconds (rounded to the microsecond).
+
+        :param cv2.VideoCapture vc: The video capture.
+        :rtype: float
+        """
+
+        return round(vc.get(cv2.CAP_PROP_POS_MSEC), 3)
+
+    def _seek(self, vc, position, i):
+        """
+        This method positions a video capture at frame number i (FFmpeg seeks
+        to the preceding keyframe and decodes forward) and returns the new
+        position. If the backend can not seek, the position is unchanged and
+        the caller grabs its way forward instead.
+
+        :param cv2.VideoCapture vc: The video capture.
+        :param int position: The current frame number.
+        :param int i: The target frame number.
+        :rtype: int
+        """
+
+        if i <= position:
+            return position
+
+        if vc.set(cv2.CAP_PROP_POS_FRAMES, i):
+            return i
+
+        return position
+
+    def _seek_time(self, vc, position, ms):
+        """
+        This method positions a video capture at the first frame at or after
+        ms milliseconds and returns the new position (frame number). If the
+        backend can not seek, the position is unchanged and the caller skips
+        the frames before ms instead.
+
+        :param cv2.VideoCapture vc: The video capture.
+        :param int position: The current frame number.
+        :param float ms: The target timestamp.
+        :rtype: int
+        """
+
+        if ms <= 0:
+            return position
+
+        if vc.set(cv2.CAP_PROP_POS_MSEC, ms):
+            return int(vc.get(cv2.CAP_PROP_POS_FRAMES))
+
+        return position
+
+    def _save_next(self, batch, frame_set_id, p1, codec, futures,
+                   job_id=None):
+        """
+        This method waits for the first frame in a queue of frames being
+        encoded, inserts it and saves it and its thumbnail.
+
+        :param ModelBatch batch: The frame batch.
+        :param int frame_set_id: The frame set ID.
+        :param str p1: The path to the frame set directory.
+        :param Codec codec: The codec.
+        :param collections.deque futures: The queue of frame numbers and
+            timestamps and futures.
+        :param int job_id: The ID of the job recording the extraction or None.
+        :rtype: None
+        """
+
+        (i, timestamp), future = futures.popleft()
+
+        buffers = future.result()
+
+        frame_id = batch.insert(frame_set_id, 0, timestamp, i)
+
+        self._save(p1, frame_id, codec, buffers)
+
+        self._checkpoint(batch, job_id, i)
+
+        debug(f'Frame with ID {frame_id:08d} and thumbnail extracted to '
+              f'{FrameFile.path(p1, frame_id, codec.extension)} and '
+              f'{FrameFile.path(p1, frame_id, codec.extension, "192x192")}',
+              4)
+
+    def _write(self, p1, frame_id, codec, frame):
+        """
+        This method writes a frame and its thumbnail.
+
+        :param str p1: The path to the directory.
+        :param int frame_id: The frame ID.
+        :param Codec codec: The codec.
+        :param numpy.ndarray frame: The frame.
+        :rtype: None
+        """
+
+        self._save(p1, frame_id, codec, self._encode(codec, frame))
+
+    def _encode(self, codec, frame):
+        """
+        This method encodes a frame and its thumbnail.
+
+        :param Codec codec: The codec.
+        :param numpy.ndarray frame: The frame.
+        :rtype: tuple(numpy.ndarray, numpy.ndarray)
+        """
+
+        # imutils.resize preserves aspect ratio.
+        thumbnail = imutils.resize(frame, width=192, height=192)
+
+        return codec.encode(frame), codec.encode(thumbnail)
+
+    def _save(self, p1, frame_id, codec, buffers):
+        """
+        This method saves an encoded frame and its thumbnail.
+
+        :param str p1: The path to the directory.
+        :param int frame_id: The frame ID.
+        :param Codec codec: The codec.
+        :param tuple(numpy.ndarray, numpy.ndarray) buffers: The encoded frame
+            and thumbnail.
+        :rtype: None
+        """
+
+        buffers[0].tofile(FrameFile.path(p1, frame_id, codec.extension))
+        buffers[1].tofile(FrameFile.path(p1, frame_id, codec.extension,
+                                         '192x192'))
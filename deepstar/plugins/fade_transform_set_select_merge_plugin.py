@@ -1,5 +1,4 @@
 import os
-import shutil
 
 import cv2
 
@@ -7,6 +6,7 @@ from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
+from deepstar.util.codec import Codec
 from deepstar.util.debug import debug
 
 
@@ -54,7 +54,14 @@ class FadeTransformSetSelectMergePlugin:
             raise ValueError(
                 'Both transform sets must be greater than frame count')
 
-        transform_set_id = TransformSetModel().insert('fade', None, None)
+        transform_set_model = TransformSetModel()
+
+        codec_1 = transform_set_model.codec(transform_set_id_1)
+        codec_2 = transform_set_model.codec(transform_set_id_2)
+        codec = Codec()
+
+        transform_set_id = transform_set_model.insert('fade', None, None,
+                                                      codec)
 
         p1 = TransformSetSubDir.path(transform_set_id)
 
@@ -62,90 +69,64 @@ class FadeTransformSetSelectMergePlugin:
 
         p2 = TransformSetSubDir.path(transform_set_id_1)
         p3 = TransformSetSubDir.path(transform_set_id_2)
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
-        offset = 0
-        flag = True
-
-        while flag:
-            transforms = transform_model.list(transform_set_id_1,
-                                              length=length, offset=offset,
-                                              rejected=False)
-
-            for transform in transforms:
-                transform_id = transform_model.insert(transform_set_id,
-                                                      transform[2],
-                                                      transform[3],
-                                                      transform[4])
-
-                p4 = TransformFile.path(p2, transform[0], 'jpg')
-                p5 = TransformFile.path(p1, transform_id, 'jpg')
-
-                shutil.copy(p4, p5)
-
-                debug(f'Transform with ID {transform[0]:08d} at {p4} '
-                      f'merged as ID {transform_id:08d} at {p5}', 4)
-
-                offset += 1
 
-                if transform_set_1_count - offset == frame_count:
-                    flag = False
-                    break
+        transforms_1 = transform_model.iterate(transform_set_id_1,
+                                               rejected=False)
+        transforms_2 = transform_model.iterate(transform_set_id_2,
+                                               rejected=False)
 
-        transforms_1 = transform_model.list(transform_set_id_1,
-                                            length=frame_count, offset=offset,
-                                            rejected=False)
-        transforms_2 = transform_model.list(transform_set_id_2,
-                                            length=frame_count, offset=0,
-                                            rejected=False)
+        with transform_model.batch() as batch:
+            for _ in range(0, transform_set_1_count - frame_count):
+                transform = next(transforms_1)
 
-        for i in range(0, frame_count):
-            transform_id_1 = transforms_1[i][0]
-            transform_id_2 = transforms_2[i][0]
+                transform_id = batch.insert(transform_set_id, transform[2],
+                                            transform[3], transform[4])
 
-            image_path_1 = TransformFile.path(p2, transform_id_1, 'jpg')
-            image_path_2 = TransformFile.path(p3, transform_id_2, 'jpg')
+                p4 = TransformFile.path(p2, transform[0], codec_1.extension)
+                p5 = TransformFile.path(p1, transform_id, codec.extension)
 
-            transform_id = transform_model.insert(transform_set_id, None, None,
-                                                  0)
+                codec.copy(p4, codec_1, p5)
 
-            image_path_3 = TransformFile.path(p1, transform_id, 'jpg')
+                debug(f'Transform with ID {transform[0]:08d} at {p4} merged '
+                      f'as ID {transform_id:08d} at {p5}', 4)
 
-            image_1 = cv2.imread(image_path_1)
-            image_2 = cv2.imread(image_path_2)
-            alpha = 1.0 - float(i + 1) / float(frame_count)
-            image_3 = cv2.addWeighted(image_1, alpha, image_2, 1.0 - alpha, 0)
+            for i in range(0, frame_count):
+                transform_id_1 = next(transforms_1)[0]
+                transform_id_2 = next(transforms_2)[0]
 
-            cv2.imwrite(image_path_3, image_3, [cv2.IMWRITE_JPEG_QUALITY, 100])
+                image_path_1 = TransformFile.path(p2, transform_id_1,
+                                                  codec_1.extension)
+                image_path_2 = TransformFile.path(p3, transform_id_2,
+                                                  codec_2.extension)
 
-            debug(f'Transforms with ID {transform_id_1:08d} at {image_path_1} '
-                  f'and {transform_id_2:08d} at {image_path_2} merged with '
-                  f'alpha {alpha} as ID {transform_id:08d} at {image_path_3}',
-                  4)
+                transform_id = batch.insert(transform_set_id, None, None, 0)
 
-        offset = frame_count
+                image_path_3 = TransformFile.path(p1, transform_id,
+                                                  codec.extension)
 
-        while True:
-            transforms = transform_model.list(transform_set_id_2,
-                                              length=length, offset=offset,
-                                              rejected=False)
+                image_1 = cv2.imread(image_path_1)
+                image_2 = cv2.imread(image_path_2)
+                alpha = 1.0 - float(i + 1) / float(frame_count)
+                image_3 = cv2.addWeighted(image_1, alpha, image_2, 1.0 - alpha,
+                                          0)
 
-            if not transforms:
-                break
+                codec.write(image_path_3, image_3)
 
-            for transform in transforms:
-                transform_id = transform_model.insert(transform_set_id,
-                                                      transform[2],
-                                                      transform[3],
-                                                      transform[4])
+                debug(f'Transforms with ID {transform_id_1:08d} at '
+                      f'{image_path_1} and {transform_id_2:08d} at '
+                      f'{image_path_2} merged with alpha {alpha} as ID '
+                      f'{transform_id:08d} at {image_path_3}', 4)
 
-                p4 = TransformFile.path(p3, transform[0], 'jpg')
-                p5 = TransformFile.path(p1, transform_id, 'jpg')
+            for transform in transforms_2:
+                transform_id = batch.insert(transform_set_id, transform[2],
+                                            transform[3], transform[4])
 
-                shutil.copy(p4, p5)
+                p4 = TransformFile.path(p3, transform[0], codec_2.extension)
+                p5 = TransformFile.path(p1, transform_id, codec.extension)
 
-                debug(f'Transform with ID {transform[0]:08d} at {p4} '
-                      f'merged as ID {transform_id:08d} at {p5}', 4)
+                codec.copy(p4, codec_2, p5)
 
-                offset += 1
+                debug(f'Transform with ID {transform[0]:08d} at {p4} merged '
+                      f'as ID {transform_id:08d} at {p5}', 4)
 
         return transform_set_id
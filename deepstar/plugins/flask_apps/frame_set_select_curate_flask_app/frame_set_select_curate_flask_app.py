@@ -7,6 +7,7 @@ from flask_restful import abort, Api, Resource
 from deepstar.filesystem.frame_file import FrameFile
 from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
 from deepstar.models.frame_model import FrameModel
+from deepstar.models.frame_set_model import FrameSetModel
 
 
 class FrameSetSelectCurateFlaskApp:
@@ -62,8 +63,11 @@ class FrameSetSelectCurateFlaskApp:
 
         class FrameResource(Resource):
             def get(self, frame_set_id, frame_id):
+                codec = FrameSetModel().codec(frame_set_id)
+
                 return send_from_directory(FrameSetSubDir.path(frame_set_id),
-                                           FrameFile.name(frame_id, 'jpg',
+                                           FrameFile.name(frame_id,
+                                                          codec.extension,
                                                           '192x192'))
 
             def put(self, frame_set_id, frame_id):
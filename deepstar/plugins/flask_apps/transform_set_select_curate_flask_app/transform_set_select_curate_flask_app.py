@@ -7,6 +7,7 @@ from flask_restful import abort, Api, Resource
 from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
 from deepstar.models.transform_model import TransformModel
+from deepstar.models.transform_set_model import TransformSetModel
 
 
 class TransformSetSelectCurateFlaskApp:
@@ -63,9 +64,11 @@ class TransformSetSelectCurateFlaskApp:
 
         class TransformResource(Resource):
             def get(self, transform_set_id, transform_id):
+                codec = TransformSetModel().codec(transform_set_id)
+
                 return send_from_directory(
                     TransformSetSubDir.path(transform_set_id),
-                    TransformFile.name(transform_id, 'jpg'))
+                    TransformFile.name(transform_id, codec.extension))
 
             def put(self, transform_set_id, transform_id):
                 transform_model = TransformModel()
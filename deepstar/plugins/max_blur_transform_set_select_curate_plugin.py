@@ -1,9 +1,12 @@
+import os
+
 import cv2
-import imutils
 
 from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
 from deepstar.models.transform_model import TransformModel
+from deepstar.models.transform_set_model import TransformSetModel
+from deepstar.util.cv import sharpness
 from deepstar.util.debug import debug
 
 
@@ -32,39 +35,30 @@ class MaxBlurTransformSetSelectCuratePlugin:
         max_blur = float(opts['max-blur'])
 
         transform_model = TransformModel()
-        length = 100
-        offset = 0
         p1 = TransformSetSubDir.path(transform_set_id)
+        extension = TransformSetModel().codec(transform_set_id).extension
 
-        while True:
-            transforms = transform_model.list(transform_set_id, length=length,
-                                              offset=offset)
-            if not transforms:
-                break
-
-            for transform in transforms:
-                p2 = TransformFile.path(p1, transform[0], 'jpg')
-
-                debug(f'Curating transform with ID {transform[0]:08d} at {p2}',
-                      4)
+        # verdicts are committed in chunks rather than one row at a time
+        length = int(os.environ.get('MODEL_BATCH_LENGTH', '100'))
+        rejected = []
 
-                image = cv2.imread(p2)
+        for transform in transform_model.iterate(transform_set_id):
+            p2 = TransformFile.path(p1, transform[0], extension)
 
-                image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            debug(f'Curating transform with ID {transform[0]:08d} at {p2}',
+                  4)
 
-                h, w = image.shape[:2]
+            score = sharpness(cv2.imread(p2))
 
-                # recommendation to scale down image to ~500
-                if h > 600 or w > 600:
-                    # imutils.resize preserves aspect ratio.
-                    image = imutils.resize(image, width=500, height=500)
+            if score < max_blur:
+                rejected.append(transform[0])
 
-                score = cv2.Laplacian(image, cv2.CV_64F).var()
+                debug(f'Transform with ID {transform[0]:08d} rejected', 4)
 
-                if score < max_blur:
-                    transform_model.update(transform[0], rejected=1)
+                if len(rejected) >= length:
+                    transform_model.reject_many(rejected)
 
-                    debug(f'Transform with ID {transform[0]:08d} rejected',
-                          4)
+                    rejected = []
 
-            offset += length
+        if rejected:
+            transform_model.reject_many(rejected)
@@ -3,11 +3,13 @@ import os
 import cv2
 import imutils
 import numpy as np
-from mtcnn.mtcnn import MTCNN
 from keras.models import load_model
 
 from deepstar.util.debug import debug
 from deepstar.util.detector_base import DetectorBase
+from deepstar.util.face_detector import FaceDetector
+from deepstar.util.face_tracker import FaceTracker
+from deepstar.util.model_cache import ModelCache
 
 
 class MesoNetVideoSelectDetectPlugin(DetectorBase):
@@ -18,12 +20,36 @@ class MesoNetVideoSelectDetectPlugin(DetectorBase):
     name = "mesonet"
 
     def __init__(self):
-        self.face_detector = MTCNN()
+        self.mesonet = ModelCache.get('mesonet')
+
+    @classmethod
+    def load_mesonet(cls):
+        """
+        This method loads the trained MesoNet model (see ModelCache).
+
+        :rtype: keras.Model
+        """
+
         model_path = os.path.join(
             os.path.dirname(os.path.realpath(__file__)),
             'trained_detectors',
             'mesonet.hdf5')
-        self.mesonet = load_model(model_path)
+
+        return load_model(model_path)
+
+    @classmethod
+    def models(cls, opts):
+        """
+        This method returns the names of the models (see ModelCache) used to
+        detect deepfakes with a dict of options, so that they can be loaded
+        before the video is opened.
+
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: list(str)
+        """
+
+        return ['mesonet'] + FaceDetector.models(opts)
     
     def video_select_detect(self, video_path, opts):
         """
@@ -32,10 +58,25 @@ class MesoNetVideoSelectDetectPlugin(DetectorBase):
         video is authentic, and None if no analysis could be
         performed.
 
+        Faces are detected by the backend selected by the 'detector' option
+        (see FaceDetector) in frames downscaled so that their longer side is
+        at most the 'detect-max-side' option (if set). If the 'track' option
+        (N) is set, faces are detected in every Nth frame only
+        and tracked in the frames in between (see FaceTracker).
+
         :param str video_path: The path on local disk to the video.
+        :raises: ValueError
         :rtype: bool
         """
 
+        detector = FaceDetector.get(*FaceDetector.options(opts))
+
+        interval = FaceTracker.options(opts)
+
+        if interval > 0:
+            detector = FaceTracker(detector, interval,
+                                   min_confidence=detector.min_confidence)
+
         vc = cv2.VideoCapture(video_path)
 
         face_limit = -1
@@ -54,7 +95,7 @@ class MesoNetVideoSelectDetectPlugin(DetectorBase):
             if not ret:
                 break
             
-            face_set.extend(self.get_faces(frame))
+            face_set.extend(self.get_faces(frame, detector=detector))
         
         if len(face_set) < 10:
             debug('Less than 10 faces were extracted from this video' + 
@@ -75,18 +116,29 @@ class MesoNetVideoSelectDetectPlugin(DetectorBase):
         debug(f'Video is authentic ({prediction_mean:.04f})', 2)
         return False
 
-    def get_faces(self, frame, min_confidence=0.9, offset_percent=0.2):
+    def get_faces(self, frame, min_confidence=None, offset_percent=0.2,
+                  detector=None):
         """
         Extracts the faces from a single frame.
 
         :param np.array frame: The frame image as a numpy array.
         :param float min_confidence: The minumum confidence level of the face detection.
+            The default value is the detector's (see FaceDetectorBase).
         :param float offset_perfect: Offset for the extracted face.
+        :param FaceDetectorBase detector: The detector (or a FaceTracker of
+            consecutive frames). The default value is the default backend
+            with the default options (see FaceDetector).
         :rtype: list
         """
 
+        if detector is None:
+            detector = FaceDetector.get(FaceDetector.default)
+
+        if min_confidence is None:
+            min_confidence = detector.min_confidence
+
         faces = []
-        results = self.face_detector.detect_faces(frame)
+        results = detector.detect_faces([frame])[0]
 
         frame_height, frame_width = frame.shape[:2]
 
@@ -1,8 +1,11 @@
+import os
+
 import cv2
 
 from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
 from deepstar.models.transform_model import TransformModel
+from deepstar.models.transform_set_model import TransformSetModel
 from deepstar.util.debug import debug
 
 
@@ -31,28 +34,30 @@ class MinSizeTransformSetSelectCuratePlugin:
         min_length = int(opts['min-size'])
 
         transform_model = TransformModel()
-        length = 100
-        offset = 0
         p1 = TransformSetSubDir.path(transform_set_id)
+        extension = TransformSetModel().codec(transform_set_id).extension
+
+        # verdicts are committed in chunks rather than one row at a time
+        length = int(os.environ.get('MODEL_BATCH_LENGTH', '100'))
+        rejected = []
+
+        for transform in transform_model.iterate(transform_set_id):
+            p2 = TransformFile.path(p1, transform[0], extension)
 
-        while True:
-            transforms = transform_model.list(transform_set_id, length=length,
-                                              offset=offset)
-            if not transforms:
-                break
+            debug(f'Curating transform with ID {transform[0]:08d} at {p2}',
+                  4)
 
-            for transform in transforms:
-                p2 = TransformFile.path(p1, transform[0], 'jpg')
+            h, w = cv2.imread(p2).shape[:2]
 
-                debug(f'Curating transform with ID {transform[0]:08d} at {p2}',
-                      4)
+            if h < min_length or w < min_length:
+                rejected.append(transform[0])
 
-                h, w = cv2.imread(p2).shape[:2]
+                debug(f'Transform with ID {transform[0]:08d} rejected', 4)
 
-                if h < min_length or w < min_length:
-                    transform_model.update(transform[0], rejected=1)
+                if len(rejected) >= length:
+                    transform_model.reject_many(rejected)
 
-                    debug(f'Transform with ID {transform[0]:08d} rejected',
-                          4)
+                    rejected = []
 
-            offset += length
+        if rejected:
+            transform_model.reject_many(rejected)
@@ -2,16 +2,20 @@ import os
 import json
 
 import cv2
-from mtcnn.mtcnn import MTCNN
 
 from deepstar.models.frame_model import FrameModel
+from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.job_model import JobModel
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
 from deepstar.filesystem.frame_file import FrameFile
 from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
 from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
+from deepstar.util.codec import Codec
 from deepstar.util.debug import debug
+from deepstar.util.face_detector import FaceDetector
+from deepstar.util.face_tracker import FaceTracker
 
 
 class MTCNNFrameSetSelectExtractPlugin:
@@ -21,70 +25,205 @@ class MTCNNFrameSetSelectExtractPlugin:
 
     name = 'face'
 
+    # The name of the jobs recording the progress of extractions.
+    job_name = 'frame_set_select_extract_face'
+
+    # The maximum number of frames (of the same size) in which faces are
+    # detected at once (see FaceDetectorBase.detect_faces).
+    batch_size = 8
+
+    @classmethod
+    def models(cls, opts):
+        """
+        This method returns the names of the models (see ModelCache) used to
+        extract faces with a dict of options, so that they can be loaded
+        before any frame set is processed.
+
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: list(str)
+        """
+
+        return FaceDetector.models(opts)
+
     def frame_set_select_extract(self, frame_set_id, opts):
         """
-        This method extracts faces from each frame in a frame set.
+        This method extracts faces from each frame in a frame set. Faces are
+        detected in batches of consecutive frames of the same size. The
+        progress of the extraction (the ID of the last frame processed) is
+        recorded in a job (see JobModel). If the 'resume' option is set, the
+        latest extraction from the frame set with the same options is resumed
+        into its transform set if it was interrupted (or its transform set is
+        returned if it finished).
+
+        Faces are detected by the backend selected by the 'detector' option
+        (mtcnn, the default, or blazeface) (see FaceDetector). mtcnn detects
+        faces in frames downscaled so that their longer side is at most the
+        'detect-max-side' option (if set) and the boxes and keypoints are
+        mapped back to the full size frames for cropping. The 'min-face-size'
+        and 'scale-factor' options set the image pyramid of mtcnn (see
+        BatchMTCNN) and the 'score-threshold' option sets the minimum score
+        of blazeface (see BlazeFaceFaceDetector).
+
+        If the 'track' option (N) is set, faces are detected in every Nth
+        frame only and tracked in the frames in between (see FaceTracker).
+        The track ID of each face is stored in its transform's metadata.
 
         :param int frame_set_id: The frame set ID.
         :param dict opts: The dict of opts.
+        :raises: ValueError
         :rtype: int
         """
 
-        detector = MTCNN()
         offset_percent = 0.2
-        min_confidence = 0.9
         debug_ = True if 'debug' in opts else False
 
+        detector_name, detector_options = FaceDetector.options(opts)
+
+        interval = FaceTracker.options(opts)
+
+        options = json.dumps(dict(detector_options, debug=debug_,
+                                  detector=detector_name, track=interval),
+                             sort_keys=True)
+
+        job_model = JobModel()
+
+        job = None
+
+        if 'resume' in opts:
+            job = job_model.find(self.job_name, frame_set_id, options)
+
+        if job is not None and job[7] == 1:
+            return job[4]
+
+        detector = FaceDetector.get(detector_name, detector_options)
+
+        min_confidence = detector.min_confidence
+
         frame_set_path = FrameSetSubDir.path(frame_set_id)
 
-        transform_set_id = TransformSetModel().insert(self.name, frame_set_id)
-        transform_set_path = TransformSetSubDir.path(transform_set_id)
-        os.makedirs(transform_set_path)
+        if job is None:
+            codecs = (FrameSetModel().codec(frame_set_id), Codec())
+
+            transform_set_id = TransformSetModel().insert(
+                self.name, frame_set_id, codec=codecs[1])
+            transform_set_path = TransformSetSubDir.path(transform_set_id)
+            os.makedirs(transform_set_path)
+
+            job_id = job_model.insert(self.job_name, frame_set_id, options,
+                                      transform_set_id=transform_set_id)
+
+            after = 0
+        else:
+            job_id, transform_set_id, after = job[0], job[4], job[6] or 0
 
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
-        offset = 0
+            codecs = (FrameSetModel().codec(frame_set_id),
+                      TransformSetModel().codec(transform_set_id))
+            transform_set_path = TransformSetSubDir.path(transform_set_id)
 
-        while True:
-            result = FrameModel().list(frame_set_id, length=length,
-                                       offset=offset, rejected=False)
+            debug(f'Job with ID {job_id:08d} resumed into transform set with '
+                  f'ID {transform_set_id:08d} after frame with ID '
+                  f'{after:08d}', 4)
 
-            if not result:
-                break
+        if interval > 0:
+            detector = FaceTracker(detector, interval,
+                                   min_confidence=min_confidence,
+                                   next_id=self._next_track_id(
+                                       transform_set_id))
 
-            for frame_id, _, rejected in result:
-                self._extract_faces(frame_set_path, frame_id,
-                                    transform_set_path, transform_set_id,
-                                    detector, offset_percent, min_confidence,
-                                    debug_)
+        result = FrameModel().iterate(frame_set_id, rejected=False,
+                                      after=after)
 
-            offset += length
+        with TransformModel().batch(checkpoints=True) as batch:
+            for frames in self._batches(frame_set_path, result, codecs[0]):
+                faces = detector.detect_faces([img for _, _, img in frames])
+
+                for (frame_id, frame_path, img), results in zip(frames,
+                                                                faces):
+                    self._extract_faces(img, results, frame_path, frame_id,
+                                        transform_set_path, transform_set_id,
+                                        offset_percent, min_confidence,
+                                        debug_, batch, codecs)
+
+                    # committed in the same transaction as the frame's
+                    # transforms (see ModelBatch.checkpoint)
+                    batch.checkpoint(job_model.update, job_id,
+                                     checkpoint=frame_id)
+
+        job_model.update(job_id, finished=1)
 
         return transform_set_id
 
-    def _extract_faces(self, frame_set_path, frame_id, transform_set_path,
-                       transform_set_id, detector, offset_percent,
-                       min_confidence, debug_):
+    def _next_track_id(self, transform_set_id):
+        """
+        This method returns the ID of the next track of a transform set (e.g.
+        to resume tracking faces into it).
+
+        :param int transform_set_id: The transform set ID.
+        :rtype: int
         """
-        This method extracts faces from a frame.
 
-        :param str frame_set_path:The frame set path.
+        track_ids = [json.loads(transform[3]).get('track_id', 0)
+                     for transform in TransformModel().iterate(
+                         transform_set_id)]
+
+        return max(track_ids, default=0) + 1
+
+    def _batches(self, frame_set_path, frames, codec):
+        """
+        This method reads frames and yields them in lists of up to batch_size
+        consecutive frames of the same size.
+
+        :param str frame_set_path: The frame set path.
+        :param generator(tuple) frames: The frames.
+        :param Codec codec: The frame set codec.
+        :rtype: generator(list(tuple(int, str, numpy.ndarray)))
+        """
+
+        frames_ = []
+
+        for frame_id, _, _ in frames:
+            frame_path = FrameFile.path(frame_set_path, frame_id,
+                                        codec.extension)
+            img = cv2.imread(frame_path)
+
+            if frames_ and (len(frames_) >= self.batch_size or
+                            frames_[0][2].shape != img.shape):
+                yield frames_
+
+                frames_ = []
+
+            frames_.append((frame_id, frame_path, img))
+
+        if frames_:
+            yield frames_
+
+    def _extract_faces(self, img, results, frame_path, frame_id,
+                       transform_set_path, transform_set_id, offset_percent,
+                       min_confidence, debug_, batch, codecs):
+        """
+        This method extracts the faces detected in a frame.
+
+        :param numpy.ndarray img: The frame.
+        :param list(dict) results: The faces detected in the frame (see
+            FaceDetectorBase.detect_faces and FaceTracker.detect_faces).
+        :param str frame_path: The frame path.
         :param int frame_id: The frame ID.
         :param str transform_set_path: The transform set path.
         :param transform_set_id: The transform set ID.
-        :param MTCNN detector: The detector to use to detect faces.
         :param float offset_percent:
         :param float min_confidence: The minimum confidence value required to
             accept/reject a detected face.
         :param bool debug_: True if should place markers on landmarks else
             False if should not.
+        :param ModelBatch batch: The batch with which to insert transforms.
+        :param tuple(Codec, Codec) codecs: The frame set and transform set
+            codecs.
         :rtype: None
         """
 
-        frame_path = FrameFile.path(frame_set_path, frame_id, 'jpg')
-        img = cv2.imread(frame_path)
         img_height, img_width = img.shape[:2]
 
-        results = detector.detect_faces(img)
         for r in results:
             if r['confidence'] < min_confidence:
                 continue
@@ -101,13 +240,16 @@ class MTCNNFrameSetSelectExtractPlugin:
             metadata = {'face': {k: [v[0] - adjusted_x, v[1] - adjusted_y]
                                  for k, v in r['keypoints'].items()}}
 
-            transform_id = TransformModel().insert(transform_set_id, frame_id,
-                                                   json.dumps(metadata), 0)
+            if 'track_id' in r:
+                metadata['track_id'] = r['track_id']
+
+            transform_id = batch.insert(transform_set_id, frame_id,
+                                        json.dumps(metadata), 0)
 
             face_crop = img[adjusted_y:adjusted_bottom_y,
                             adjusted_x:adjusted_right_x]
             output_path = TransformFile.path(transform_set_path, transform_id,
-                                             'jpg')
+                                             codecs[1].extension)
 
             if debug_ is True:
                 for _, v in metadata['face'].items():
@@ -115,8 +257,7 @@ class MTCNNFrameSetSelectExtractPlugin:
                                    markerType=cv2.MARKER_DIAMOND,
                                    markerSize=15, thickness=2)
 
-            cv2.imwrite(output_path, face_crop,
-                        [cv2.IMWRITE_JPEG_QUALITY, 100])
+            codecs[1].write(output_path, face_crop)
 
             debug(f'Transform with ID {transform_id:08d} at {output_path} '
                   f'extracted from frame with ID {frame_id:08d} at '
@@ -6,6 +6,7 @@ from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
+from deepstar.util.codec import Codec
 from deepstar.util.debug import debug
 from deepstar.util.cv import overlay_transparent_image
 
@@ -50,46 +51,41 @@ class OverlayImageTransformSetSelectMergePlugin:
 
         transform_model = TransformModel()
 
-        transform_set_id_ = TransformSetModel().insert('overlay_image', None,
-                                                       None)
+        transform_set_model = TransformSetModel()
+
+        codec = transform_set_model.codec(transform_set_id)
+        codec_ = Codec()
+
+        transform_set_id_ = transform_set_model.insert('overlay_image', None,
+                                                       None, codec_)
 
         p1 = TransformSetSubDir.path(transform_set_id_)
 
         os.makedirs(p1)
 
         p2 = TransformSetSubDir.path(transform_set_id)
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
-        offset = 0
 
         image_1 = cv2.imread(image_path_1, cv2.IMREAD_UNCHANGED)
 
-        while True:
-            transforms = transform_model.list(transform_set_id,
-                                              length=length, offset=offset,
-                                              rejected=False)
-
-            if not transforms:
-                break
+        with transform_model.batch() as batch:
+            for transform in transform_model.iterate(transform_set_id,
+                                                     rejected=False):
+                transform_id = batch.insert(transform_set_id_, None, None, 0)
 
-            for transform in transforms:
-                transform_id = transform_model.insert(transform_set_id_, None,
-                                                      None, 0)
-
-                image_path_2 = TransformFile.path(p2, transform[0], 'jpg')
+                image_path_2 = TransformFile.path(p2, transform[0],
+                                                  codec.extension)
 
                 image_2 = cv2.imread(image_path_2)
 
                 image_3 = overlay_transparent_image(image_2, image_1, x1, y1)
 
-                image_path_3 = TransformFile.path(p1, transform_id, 'jpg')
+                image_path_3 = TransformFile.path(p1, transform_id,
+                                                  codec_.extension)
 
-                cv2.imwrite(image_path_3, image_3,
-                            [cv2.IMWRITE_JPEG_QUALITY, 100])
+                codec_.write(image_path_3, image_3)
 
                 debug(f'{image_path_1} and transform with ID '
                       f'{transform[0]:08d} at {image_path_2} merged as ID '
                       f'{transform_id:08d} at {image_path_3}', 4)
 
-            offset += length
-
         return transform_set_id_
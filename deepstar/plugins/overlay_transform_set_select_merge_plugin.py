@@ -6,6 +6,7 @@ from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
+from deepstar.util.codec import Codec
 from deepstar.util.debug import debug
 
 
@@ -52,7 +53,14 @@ class OverlayTransformSetSelectMergePlugin:
                 'Both transform sets must have the same number of '
                 'non-rejected transforms (be the same length)')
 
-        transform_set_id = TransformSetModel().insert('overlay', None, None)
+        transform_set_model = TransformSetModel()
+
+        codec_1 = transform_set_model.codec(transform_set_id_1)
+        codec_2 = transform_set_model.codec(transform_set_id_2)
+        codec = Codec()
+
+        transform_set_id = transform_set_model.insert('overlay', None, None,
+                                                      codec)
 
         p1 = TransformSetSubDir.path(transform_set_id)
 
@@ -60,31 +68,26 @@ class OverlayTransformSetSelectMergePlugin:
 
         p2 = TransformSetSubDir.path(transform_set_id_1)
         p3 = TransformSetSubDir.path(transform_set_id_2)
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
-        offset = 0
 
-        while True:
-            transforms_1 = transform_model.list(transform_set_id_1,
-                                                length=length, offset=offset,
-                                                rejected=False)
-            transforms_2 = transform_model.list(transform_set_id_2,
-                                                length=length, offset=offset,
-                                                rejected=False)
+        transforms_1 = transform_model.iterate(transform_set_id_1,
+                                               rejected=False)
+        transforms_2 = transform_model.iterate(transform_set_id_2,
+                                               rejected=False)
 
-            if not transforms_1:
-                break
+        with transform_model.batch() as batch:
+            for transform_1, transform_2 in zip(transforms_1, transforms_2):
+                transform_id_1 = transform_1[0]
+                transform_id_2 = transform_2[0]
 
-            for i in range(0, len(transforms_1)):
-                transform_id_1 = transforms_1[i][0]
-                transform_id_2 = transforms_2[i][0]
+                image_path_1 = TransformFile.path(p2, transform_id_1,
+                                                  codec_1.extension)
+                image_path_2 = TransformFile.path(p3, transform_id_2,
+                                                  codec_2.extension)
 
-                image_path_1 = TransformFile.path(p2, transform_id_1, 'jpg')
-                image_path_2 = TransformFile.path(p3, transform_id_2, 'jpg')
+                transform_id = batch.insert(transform_set_id, None, None, 0)
 
-                transform_id = transform_model.insert(transform_set_id, None,
-                                                      None, 0)
-
-                image_path_3 = TransformFile.path(p1, transform_id, 'jpg')
+                image_path_3 = TransformFile.path(p1, transform_id,
+                                                  codec.extension)
 
                 image_1 = cv2.imread(image_path_1)
 
@@ -94,14 +97,11 @@ class OverlayTransformSetSelectMergePlugin:
 
                 image_2[y1:y1 + height_1, x1:x1 + width_1] = image_1
 
-                cv2.imwrite(image_path_3, image_2,
-                            [cv2.IMWRITE_JPEG_QUALITY, 100])
+                codec.write(image_path_3, image_2)
 
                 debug(f'Transforms with ID {transform_id_1:08d} at '
                       f'{image_path_1} and {transform_id_2:08d} at '
                       f'{image_path_2} merged as ID {transform_id:08d} at '
                       f'{image_path_3}', 4)
 
-            offset += length
-
         return transform_set_id
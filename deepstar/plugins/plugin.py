@@ -1,105 +1,87 @@
-from deepstar.plugins.adjust_color_transform_set_select_extract_plugin import \
-    AdjustColorTransformSetSelectExtractPlugin
-from deepstar.plugins.crop_transform_set_select_extract_plugin import \
-    CropTransformSetSelectExtractPlugin
-from deepstar.plugins.default_video_select_extract_plugin import \
-    DefaultVideoSelectExtractPlugin
-from deepstar.plugins.fade_transform_set_select_merge_plugin import \
-    FadeTransformSetSelectMergePlugin
-from deepstar.plugins.manual_frame_set_select_curate_plugin import \
-    ManualFrameSetSelectCuratePlugin
-from deepstar.plugins.manual_transform_set_select_curate_plugin import \
-    ManualTransformSetSelectCuratePlugin
-from deepstar.plugins.max_blur_transform_set_select_curate_plugin import \
-    MaxBlurTransformSetSelectCuratePlugin
-from deepstar.plugins.max_size_transform_set_select_extract_plugin import \
-    MaxSizeTransformSetSelectExtractPlugin
-from deepstar.plugins.min_size_transform_set_select_curate_plugin import \
-    MinSizeTransformSetSelectCuratePlugin
-from deepstar.plugins.mtcnn_frame_set_select_extract_plugin import \
-    MTCNNFrameSetSelectExtractPlugin
-from deepstar.plugins.overlay_image_transform_set_select_merge_plugin import \
-    OverlayImageTransformSetSelectMergePlugin
-from deepstar.plugins.overlay_transform_set_select_merge_plugin import \
-    OverlayTransformSetSelectMergePlugin
-from deepstar.plugins.pad_transform_set_select_extract_plugin import \
-    PadTransformSetSelectExtractPlugin
-from deepstar.plugins.resize_transform_set_select_extract_plugin import \
-    ResizeTransformSetSelectExtractPlugin
-from deepstar.plugins.slice_transform_set_select_extract_plugin import \
-    SliceTransformSetSelectExtractPlugin
-from deepstar.plugins.transform_set_frame_set_select_extract_plugin import \
-    TransformSetFrameSetSelectExtractPlugin
-from deepstar.plugins.mesonet_video_select_detect_plugin import \
-    MesoNetVideoSelectDetectPlugin
-from deepstar.plugins.mouth_transform_set_select_extract_plugin import \
-    MouthTransformSetSelectExtractPlugin
-
-try:
-    from deepstar.plugins.custom_plugin import CustomPlugin
-except ImportError:
-    pass
+import importlib
 
 
 class Plugin:
     """
     This class implements the Plugin class.
+
+    Plugins are registered by 'module:class' path and are only imported when
+    they are requested via get, so that e.g. listing videos does not pay for
+    importing TensorFlow.
     """
 
     _map = {
         'video_select_extract': {
-            'default': DefaultVideoSelectExtractPlugin
+            'default': 'deepstar.plugins.default_video_select_extract_plugin'
+                       ':DefaultVideoSelectExtractPlugin'
         },
         'video_select_deploy': {
         },
         'video_select_detect': {
-            MesoNetVideoSelectDetectPlugin.name:
-                MesoNetVideoSelectDetectPlugin
+            'mesonet': 'deepstar.plugins.mesonet_video_select_detect_plugin'
+                       ':MesoNetVideoSelectDetectPlugin'
         },
         'frame_set_select_curate': {
-            ManualFrameSetSelectCuratePlugin.name:
-                ManualFrameSetSelectCuratePlugin
+            'manual': 'deepstar.plugins.manual_frame_set_select_curate_plugin'
+                      ':ManualFrameSetSelectCuratePlugin'
         },
         'frame_set_select_extract': {
-            MTCNNFrameSetSelectExtractPlugin.name:
-                MTCNNFrameSetSelectExtractPlugin,
-            TransformSetFrameSetSelectExtractPlugin.name:
-                TransformSetFrameSetSelectExtractPlugin
+            'face': 'deepstar.plugins.mtcnn_frame_set_select_extract_plugin'
+                    ':MTCNNFrameSetSelectExtractPlugin',
+            'transform_set': 'deepstar.plugins'
+                             '.transform_set_frame_set_select_extract_plugin'
+                             ':TransformSetFrameSetSelectExtractPlugin'
         },
         'transform_set_select_curate': {
-            ManualTransformSetSelectCuratePlugin.name:
-                ManualTransformSetSelectCuratePlugin,
-            MaxBlurTransformSetSelectCuratePlugin.name:
-                MaxBlurTransformSetSelectCuratePlugin,
-            MinSizeTransformSetSelectCuratePlugin.name:
-                MinSizeTransformSetSelectCuratePlugin
+            'manual': 'deepstar.plugins'
+                      '.manual_transform_set_select_curate_plugin'
+                      ':ManualTransformSetSelectCuratePlugin',
+            'max_blur': 'deepstar.plugins'
+                        '.max_blur_transform_set_select_curate_plugin'
+                        ':MaxBlurTransformSetSelectCuratePlugin',
+            'min_size': 'deepstar.plugins'
+                        '.min_size_transform_set_select_curate_plugin'
+                        ':MinSizeTransformSetSelectCuratePlugin'
         },
         'transform_set_select_extract': {
-            AdjustColorTransformSetSelectExtractPlugin.name:
-                AdjustColorTransformSetSelectExtractPlugin,
-            CropTransformSetSelectExtractPlugin.name:
-                CropTransformSetSelectExtractPlugin,
-            MaxSizeTransformSetSelectExtractPlugin.name:
-                MaxSizeTransformSetSelectExtractPlugin,
-            PadTransformSetSelectExtractPlugin.name:
-                PadTransformSetSelectExtractPlugin,
-            ResizeTransformSetSelectExtractPlugin.name:
-                ResizeTransformSetSelectExtractPlugin,
-            SliceTransformSetSelectExtractPlugin.name:
-                SliceTransformSetSelectExtractPlugin,
-            MouthTransformSetSelectExtractPlugin.name:
-                MouthTransformSetSelectExtractPlugin
+            'adjust_color': 'deepstar.plugins'
+                            '.adjust_color_transform_set_select_extract_plugin'
+                            ':AdjustColorTransformSetSelectExtractPlugin',
+            'crop': 'deepstar.plugins.crop_transform_set_select_extract_plugin'
+                    ':CropTransformSetSelectExtractPlugin',
+            'max_size': 'deepstar.plugins'
+                        '.max_size_transform_set_select_extract_plugin'
+                        ':MaxSizeTransformSetSelectExtractPlugin',
+            'pad': 'deepstar.plugins.pad_transform_set_select_extract_plugin'
+                   ':PadTransformSetSelectExtractPlugin',
+            'resize': 'deepstar.plugins'
+                      '.resize_transform_set_select_extract_plugin'
+                      ':ResizeTransformSetSelectExtractPlugin',
+            'slice': 'deepstar.plugins'
+                     '.slice_transform_set_select_extract_plugin'
+                     ':SliceTransformSetSelectExtractPlugin',
+            'mouth': 'deepstar.plugins'
+                     '.mouth_transform_set_select_extract_plugin'
+                     ':MouthTransformSetSelectExtractPlugin'
         },
         'transform_set_select_merge': {
-            FadeTransformSetSelectMergePlugin.name:
-                FadeTransformSetSelectMergePlugin,
-            OverlayTransformSetSelectMergePlugin.name:
-                OverlayTransformSetSelectMergePlugin,
-            OverlayImageTransformSetSelectMergePlugin.name:
-                OverlayImageTransformSetSelectMergePlugin
+            'fade': 'deepstar.plugins.fade_transform_set_select_merge_plugin'
+                    ':FadeTransformSetSelectMergePlugin',
+            'overlay': 'deepstar.plugins'
+                       '.overlay_transform_set_select_merge_plugin'
+                       ':OverlayTransformSetSelectMergePlugin',
+            'overlay_image': 'deepstar.plugins'
+                             '.overlay_image_transform_set_select_merge_plugin'
+                             ':OverlayImageTransformSetSelectMergePlugin'
         }
     }
 
+    # The entry point group in which installed packages may register plugins
+    # as '<operation>.<name> = <module>:<class>'.
+    entry_point_group = 'deepstar.plugins'
+
+    _entry_points = None
+
     @classmethod
     def custom_plugin(cls):
         """
@@ -109,10 +91,66 @@ class Plugin:
         """
 
         try:
-            return CustomPlugin
-        except NameError:
+            module = importlib.import_module('deepstar.plugins.custom_plugin')
+        except ImportError:
             return None
 
+        return getattr(module, 'CustomPlugin', None)
+
+    @classmethod
+    def entry_points(cls):
+        """
+        This method returns the plugins registered by installed packages in
+        the entry point group as a dict of dicts (by operation then name) of
+        entry points. Entry points are not loaded.
+
+        :rtype: dict
+        """
+
+        if Plugin._entry_points is not None:
+            return Plugin._entry_points
+
+        try:
+            from importlib.metadata import entry_points
+
+            try:
+                eps = entry_points(group=Plugin.entry_point_group)
+            except TypeError:
+                eps = entry_points().get(Plugin.entry_point_group, [])
+        except ImportError:
+            from pkg_resources import iter_entry_points
+
+            eps = iter_entry_points(Plugin.entry_point_group)
+
+        map_ = {}
+
+        for ep in eps:
+            operation, _, name = ep.name.partition('.')
+
+            if name:
+                map_.setdefault(operation, {})[name] = ep
+
+        Plugin._entry_points = map_
+
+        return map_
+
+    @classmethod
+    def load(cls, path):
+        """
+        This method imports and returns a plugin by 'module:class' path. A
+        plugin registered as a class (rather than a path) is returned as is.
+
+        :param str path: The plugin's 'module:class' path.
+        :rtype: object
+        """
+
+        if not isinstance(path, str):
+            return path
+
+        module, _, name = path.partition(':')
+
+        return getattr(importlib.import_module(module), name)
+
     @classmethod
     def get(cls, operation, plugin='default'):
         """
@@ -131,6 +169,12 @@ class Plugin:
 
         if operation in Plugin._map:
             if plugin in Plugin._map[operation]:
-                return Plugin._map[operation][plugin]
+                return Plugin.load(Plugin._map[operation][plugin])
+
+        entry_points_ = cls.entry_points()
+
+        if operation in entry_points_:
+            if plugin in entry_points_[operation]:
+                return entry_points_[operation][plugin].load()
 
         return None
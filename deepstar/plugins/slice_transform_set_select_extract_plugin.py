@@ -1,10 +1,10 @@
 import os
-import shutil
 
 from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
+from deepstar.util.codec import Codec
 from deepstar.util.debug import debug
 
 
@@ -37,8 +37,12 @@ class SliceTransformSetSelectExtractPlugin:
 
         result = transform_set_model.select(transform_set_id)
 
+        codec = transform_set_model.codec(transform_set_id)
+        codec_ = Codec()
+
         transform_set_id_ = TransformSetModel().insert('slice', result[2],
-                                                       transform_set_id)
+                                                       transform_set_id,
+                                                       codec_)
 
         p1 = TransformSetSubDir.path(transform_set_id_)
 
@@ -46,39 +50,26 @@ class SliceTransformSetSelectExtractPlugin:
 
         p2 = TransformSetSubDir.path(transform_set_id)
         transform_model = TransformModel()
-        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
-        offset = 0
-        flag = True
-
-        while flag:
-            transforms = transform_model.list(transform_set_id, length=length,
-                                              offset=offset, rejected=False)
 
-            if not transforms:
-                break
-
-            for transform in transforms:
+        with transform_model.batch() as batch:
+            for transform in transform_model.iterate(transform_set_id,
+                                                     rejected=False):
                 if transform[0] < start:
                     continue
 
                 if transform[0] > end:
-                    flag = False
                     break
 
-                transform_id = transform_model.insert(transform_set_id_,
-                                                      transform[2],
-                                                      transform[3],
-                                                      transform[4])
+                transform_id = batch.insert(transform_set_id_, transform[2],
+                                            transform[3], transform[4])
 
-                p3 = TransformFile.path(p2, transform[0], 'jpg')
-                p4 = TransformFile.path(p1, transform_id, 'jpg')
+                p3 = TransformFile.path(p2, transform[0], codec.extension)
+                p4 = TransformFile.path(p1, transform_id, codec_.extension)
 
-                shutil.copy(p3, p4)
+                codec_.copy(p3, codec, p4)
 
                 debug(f'Transform with ID {transform_id:08d} at {p4} '
                       f'extracted from transform with ID {transform[0]:08d} '
                       f'at {p3}', 4)
 
-            offset += length
-
         return transform_set_id_
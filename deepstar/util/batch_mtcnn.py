@@ -0,0 +1,671 @@
+import cv2
+import numpy as np
+
+from deepstar.util.debug import debug
+from deepstar.util.face_detector_base import FaceDetectorBase
+
+
+class BatchMTCNN(FaceDetectorBase):
+    """
+    This class implements the BatchMTCNN class.
+
+    A batch MTCNN runs the cascade of an MTCNN face detector (see
+    mtcnn.mtcnn.MTCNN) over a batch of images of the same size at once: P-Net
+    over all of the images at each scale of the image pyramid and R-Net and
+    O-Net over the candidate boxes of all of the images. The boxes, keypoints
+    and confidences are those of MTCNN.detect_faces for each image (the
+    stages are ported from mtcnn 0.1). Detectors whose networks are not
+    exposed (e.g. mtcnn<0.1) detect faces image by image with their own
+    pyramid settings (a warning is printed when such a BatchMTCNN is
+    initialized).
+
+    Since the cost of the cascade grows with the size of the images, the
+    images may be downscaled so that their longer side is at most max_side
+    pixels before faces are detected. The boxes and keypoints are then
+    mapped back to the full size images.
+    """
+
+    model_name = 'mtcnn'
+
+    def __init__(self, detector, max_side=0, min_face_size=20,
+                 scale_factor=0.709):
+        """
+        This method initializes an instance of the BatchMTCNN class.
+
+        :param MTCNN detector: The detector.
+        :param int max_side: The maximum length in pixels of the longer side
+            of the images in which faces are detected. The default value of 0
+            indicates the full size images.
+        :param int min_face_size: The minimum size in pixels of the faces
+            detected (in the images in which faces are detected). The default
+            value is 20.
+        :param float scale_factor: The scale factor of the image pyramid
+            (greater than 0 and less than 1). The default value is 0.709.
+        :raises: ValueError
+        :rtype: None
+        """
+
+        self.validate(max_side, min_face_size, scale_factor)
+
+        self.detector = detector
+        self.max_side = max_side
+        self.min_face_size = min_face_size
+        self.scale_factor = scale_factor
+
+        # True if the cascade can be run over batches of images
+        self.batched = all(hasattr(detector, name)
+                           for name in ('_pnet', '_rnet', '_onet'))
+
+        if not self.batched:
+            debug('The face detector does not expose its networks (mtcnn>=0.1 '
+                  'is required), so faces are detected image by image', 2)
+
+    @classmethod
+    def options(cls, opts):
+        """
+        This method validates and parses the 'detect-max-side',
+        'min-face-size' and 'scale-factor' options of a dict of options into
+        the keyword arguments of __init__.
+
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: dict
+        """
+
+        try:
+            kwargs = {
+                'max_side': int(opts.get('detect-max-side', 0)),
+                'min_face_size': int(opts.get('min-face-size', 20)),
+                'scale_factor': float(opts.get('scale-factor', 0.709))
+            }
+        except ValueError as e:
+            raise ValueError(f'The detection options are not valid ({e})')
+
+        cls.validate(**kwargs)
+
+        return kwargs
+
+    @classmethod
+    def validate(cls, max_side, min_face_size, scale_factor):
+        """
+        This method validates the keyword arguments of __init__.
+
+        :param int max_side: The maximum side.
+        :param int min_face_size: The minimum face size.
+        :param float scale_factor: The scale factor.
+        :raises: ValueError
+        :rtype: None
+        """
+
+        if max_side != 0 and max_side < 12:
+            raise ValueError(f'The maximum side must be 0 or at least 12 (got '
+                             f'{max_side})')
+
+        if min_face_size < 12:
+            raise ValueError(f'The minimum face size must be at least 12 (got '
+                             f'{min_face_size})')
+
+        if not 0 < scale_factor < 1:
+            raise ValueError(f'The scale factor must be greater than 0 and '
+                             f'less than 1 (got {scale_factor})')
+
+    def detect_faces(self, images):
+        """
+        This method detects faces in a batch of images of the same size and
+        returns the faces detected in each image (see MTCNN.detect_faces).
+
+        :param list(numpy.ndarray) images: The images.
+        :rtype: list(list(dict))
+        """
+
+        if len(images) == 0:
+            return []
+
+        height, width = images[0].shape[:2]
+
+        scale = 1
+
+        if 0 < self.max_side < max(height, width):
+            scale = self.max_side / max(height, width)
+
+            width = max(1, int(round(width * scale)))
+            height = max(1, int(round(height * scale)))
+
+            images = [cv2.resize(image, (width, height),
+                                 interpolation=cv2.INTER_AREA)
+                      for image in images]
+
+        if not self.batched:
+            return [[self._remap(face, scale)
+                     for face in self.detector.detect_faces(image)]
+                    for image in images]
+
+        m = 12 / self.min_face_size
+
+        scales = self._scales(m, min(height, width) * m)
+
+        candidates = self._stage1(images, scales, width, height)
+        candidates = self._stage2(images, candidates)
+        candidates = self._stage3(images, candidates, width, height)
+
+        return [self._faces(total_boxes, points, scale)
+                for total_boxes, points in candidates]
+
+    def _scales(self, m, min_layer):
+        """
+        This method returns the scales of the image pyramid.
+
+        :param float m: The scale at which the minimum face size is 12 pixels.
+        :param float min_layer: The scaled length of the shorter side.
+        :rtype: list(float)
+        """
+
+        scales = []
+        factor_count = 0
+
+        while min_layer >= 12:
+            scales.append(m * np.power(self.scale_factor, factor_count))
+            min_layer = min_layer * self.scale_factor
+            factor_count += 1
+
+        return scales
+
+    def _predict(self, network, batch):
+        """
+        This method runs a network over a batch.
+
+        :param keras.Model network: The network.
+        :param numpy.ndarray batch: The batch.
+        :rtype: list(numpy.ndarray)
+        """
+
+        return network.predict(batch, verbose=0)
+
+    def _stage1(self, images, scales, width, height):
+        """
+        This method runs P-Net over the images at each scale and returns the
+        candidate boxes of each image and their padding.
+
+        :param list(numpy.ndarray) images: The images.
+        :param list(float) scales: The scales.
+        :param int width: The width of the images.
+        :param int height: The height of the images.
+        :rtype: list(tuple(numpy.ndarray, tuple))
+        """
+
+        threshold = self.detector._steps_threshold[0]
+
+        total_boxes = [np.empty((0, 9)) for _ in images]
+
+        for scale in scales:
+            size = (int(np.ceil(width * scale)), int(np.ceil(height * scale)))
+
+            batch = np.stack([
+                (cv2.resize(image, size, interpolation=cv2.INTER_AREA) -
+                 127.5) * 0.0078125 for image in images])
+
+            out = self._predict(self.detector._pnet,
+                                np.transpose(batch, (0, 2, 1, 3)))
+
+            out0 = np.transpose(out[0], (0, 2, 1, 3))
+            out1 = np.transpose(out[1], (0, 2, 1, 3))
+
+            for n in range(len(images)):
+                boxes = self._generate_bounding_box(out1[n, :, :, 1].copy(),
+                                                    out0[n, :, :, :].copy(),
+                                                    scale, threshold)
+
+                # inter-scale nms
+                pick = self._nms(boxes.copy(), 0.5, 'Union')
+
+                if boxes.size > 0 and pick.size > 0:
+                    total_boxes[n] = np.append(total_boxes[n],
+                                               boxes[pick, :], axis=0)
+
+        candidates = []
+
+        for boxes in total_boxes:
+            pad = None
+
+            if boxes.shape[0] > 0:
+                boxes = boxes[self._nms(boxes.copy(), 0.7, 'Union'), :]
+
+                regw = boxes[:, 2] - boxes[:, 0]
+                regh = boxes[:, 3] - boxes[:, 1]
+
+                qq1 = boxes[:, 0] + boxes[:, 5] * regw
+                qq2 = boxes[:, 1] + boxes[:, 6] * regh
+                qq3 = boxes[:, 2] + boxes[:, 7] * regw
+                qq4 = boxes[:, 3] + boxes[:, 8] * regh
+
+                boxes = np.transpose(np.vstack([qq1, qq2, qq3, qq4,
+                                                boxes[:, 4]]))
+                boxes = self._rerec(boxes.copy())
+
+                boxes[:, 0:4] = np.fix(boxes[:, 0:4]).astype(np.int32)
+
+                pad = self._pad(boxes.copy(), width, height)
+
+            candidates.append((boxes, pad))
+
+        return candidates
+
+    def _stage2(self, images, candidates):
+        """
+        This method runs R-Net over the candidate boxes of all of the images
+        and returns the refined boxes of each image and their padding.
+
+        :param list(numpy.ndarray) images: The images.
+        :param list(tuple) candidates: The boxes of each image and their
+            padding (see _stage1).
+        :rtype: list(tuple(numpy.ndarray, tuple))
+        """
+
+        crops = [self._crops(image, boxes, pad, 24)
+                 for image, (boxes, pad) in zip(images, candidates)]
+
+        scores, regs = self._run(self.detector._rnet, crops, (1, 0))
+
+        results = []
+
+        for (boxes, pad), crop, score, mv in zip(candidates, crops, scores,
+                                                 regs):
+            if crop is None:
+                results.append((np.empty(shape=(0,)), pad))
+
+                continue
+
+            if boxes.shape[0] == 0:
+                results.append((boxes, pad))
+
+                continue
+
+            ipass = np.where(score > self.detector._steps_threshold[1])
+
+            boxes = np.hstack([boxes[ipass[0], 0:4].copy(),
+                               np.expand_dims(score[ipass].copy(), 1)])
+
+            mv = mv[:, ipass[0]]
+
+            if boxes.shape[0] > 0:
+                pick = self._nms(boxes, 0.7, 'Union')
+                boxes = boxes[pick, :]
+                boxes = self._bbreg(boxes.copy(), np.transpose(mv[:, pick]))
+                boxes = self._rerec(boxes.copy())
+
+            results.append((boxes, pad))
+
+        return results
+
+    def _stage3(self, images, candidates, width, height):
+        """
+        This method runs O-Net over the candidate boxes of all of the images
+        and returns the boxes of each image and their keypoints.
+
+        :param list(numpy.ndarray) images: The images.
+        :param list(tuple) candidates: The boxes of each image and their
+            padding (see _stage2).
+        :param int width: The width of the images.
+        :param int height: The height of the images.
+        :rtype: list(tuple(numpy.ndarray, numpy.ndarray))
+        """
+
+        boxes_ = []
+        crops = []
+
+        for image, (boxes, _) in zip(images, candidates):
+            if boxes.shape[0] > 0:
+                boxes = np.fix(boxes).astype(np.int32)
+
+                crops.append(self._crops(image, boxes,
+                                         self._pad(boxes.copy(), width,
+                                                   height), 48))
+            else:
+                crops.append(np.empty((0, 48, 48, 3)))
+
+            boxes_.append(boxes)
+
+        scores, regs, points_ = self._run(self.detector._onet, crops,
+                                          (2, 0, 1))
+
+        results = []
+
+        for boxes, crop, score, mv, points in zip(boxes_, crops, scores, regs,
+                                                  points_):
+            if boxes.shape[0] == 0 or crop is None:
+                results.append((np.empty(shape=(0,)), np.empty(shape=(0,))))
+
+                continue
+
+            ipass = np.where(score > self.detector._steps_threshold[2])
+
+            points = points[:, ipass[0]]
+
+            boxes = np.hstack([boxes[ipass[0], 0:4].copy(),
+                               np.expand_dims(score[ipass].copy(), 1)])
+
+            mv = mv[:, ipass[0]]
+
+            w = boxes[:, 2] - boxes[:, 0] + 1
+            h = boxes[:, 3] - boxes[:, 1] + 1
+
+            points[0:5, :] = np.tile(w, (5, 1)) * points[0:5, :] + \
+                np.tile(boxes[:, 0], (5, 1)) - 1
+            points[5:10, :] = np.tile(h, (5, 1)) * points[5:10, :] + \
+                np.tile(boxes[:, 1], (5, 1)) - 1
+
+            if boxes.shape[0] > 0:
+                boxes = self._bbreg(boxes.copy(), np.transpose(mv))
+                pick = self._nms(boxes.copy(), 0.7, 'Min')
+                boxes = boxes[pick, :]
+                points = points[:, pick]
+
+            results.append((boxes, points))
+
+        return results
+
+    def _crops(self, image, boxes, pad, size):
+        """
+        This method returns the normalized crops of the boxes of an image
+        resized to size x size pixels or None if a box cannot be cropped.
+
+        :param numpy.ndarray image: The image.
+        :param numpy.ndarray boxes: The boxes.
+        :param tuple pad: The padding of the boxes (see _pad).
+        :param int size: The size.
+        :rtype: numpy.ndarray
+        """
+
+        if boxes.shape[0] == 0:
+            return np.empty((0, size, size, 3))
+
+        dy, edy, dx, edx, y, ey, x, ex, tmpw, tmph = pad
+
+        crops = np.zeros(shape=(size, size, 3, boxes.shape[0]))
+
+        for k in range(boxes.shape[0]):
+            tmp = np.zeros((int(tmph[k]), int(tmpw[k]), 3))
+
+            tmp[dy[k] - 1:edy[k], dx[k] - 1:edx[k], :] = \
+                image[y[k] - 1:ey[k], x[k] - 1:ex[k], :]
+
+            if tmp.shape[0] > 0 and tmp.shape[1] > 0 or \
+                    tmp.shape[0] == 0 and tmp.shape[1] == 0:
+                crops[:, :, :, k] = cv2.resize(tmp, (size, size),
+                                               interpolation=cv2.INTER_AREA)
+            else:
+                return None
+
+        crops = (crops - 127.5) * 0.0078125
+
+        return np.transpose(crops, (3, 1, 0, 2))
+
+    def _run(self, network, crops, outputs):
+        """
+        This method runs a network over the crops of all of the images at
+        once and returns the transposed outputs for each image. The first
+        output is the score of the face class.
+
+        :param keras.Model network: The network.
+        :param list(numpy.ndarray) crops: The crops of each image (None if an
+            image's boxes cannot be cropped).
+        :param tuple(int) outputs: The indexes of the outputs.
+        :rtype: tuple(list(numpy.ndarray))
+        """
+
+        lengths = [0 if crop is None else crop.shape[0] for crop in crops]
+
+        results = tuple([] for _ in outputs)
+
+        if sum(lengths) == 0:
+            for result in results:
+                result.extend(None for _ in crops)
+
+            return results
+
+        out = self._predict(network, np.concatenate(
+            [crop for crop in crops if crop is not None]))
+
+        offsets = np.cumsum([0] + lengths)
+
+        for result, i in zip(results, outputs):
+            output = np.transpose(out[i])
+
+            if i == outputs[0]:
+                output = output[1, :]
+
+            for n in range(len(crops)):
+                result.append(output[..., offsets[n]:offsets[n + 1]])
+
+        return results
+
+    def _faces(self, total_boxes, points, scale=1):
+        """
+        This method returns the faces of boxes and their keypoints.
+
+        :param numpy.ndarray total_boxes: The boxes.
+        :param numpy.ndarray points: The keypoints.
+        :param float scale: The scale of the images in which the faces were
+            detected (boxes and keypoints are mapped back to scale 1).
+        :rtype: list(dict)
+        """
+
+        faces = []
+
+        if scale != 1 and len(total_boxes) > 0:
+            total_boxes = total_boxes.copy()
+            total_boxes[:, 0:4] /= scale
+            points = points / scale
+
+        for bounding_box, keypoints in zip(total_boxes, points.T):
+            x = max(0, int(bounding_box[0]))
+            y = max(0, int(bounding_box[1]))
+            width = int(bounding_box[2] - x)
+            height = int(bounding_box[3] - y)
+
+            faces.append({
+                'box': [x, y, width, height],
+                'confidence': bounding_box[-1],
+                'keypoints': {
+                    'left_eye': (int(keypoints[0]), int(keypoints[5])),
+                    'right_eye': (int(keypoints[1]), int(keypoints[6])),
+                    'nose': (int(keypoints[2]), int(keypoints[7])),
+                    'mouth_left': (int(keypoints[3]), int(keypoints[8])),
+                    'mouth_right': (int(keypoints[4]), int(keypoints[9])),
+                }
+            })
+
+        return faces
+
+    def _remap(self, face, scale):
+        """
+        This method maps the box and keypoints of a face detected in an image
+        of a scale back to scale 1.
+
+        :param dict face: The face (see MTCNN.detect_faces).
+        :param float scale: The scale.
+        :rtype: dict
+        """
+
+        if scale == 1:
+            return face
+
+        return dict(face,
+                    box=[int(v / scale) for v in face['box']],
+                    keypoints={k: (int(v[0] / scale), int(v[1] / scale))
+                               for k, v in face['keypoints'].items()})
+
+    def _generate_bounding_box(self, imap, reg, scale, t):
+        """
+        This method returns the boxes of a P-Net heatmap.
+
+        :param numpy.ndarray imap: The heatmap.
+        :param numpy.ndarray reg: The box regression.
+        :param float scale: The scale.
+        :param float t: The threshold.
+        :rtype: numpy.ndarray
+        """
+
+        stride = 2
+        cellsize = 12
+
+        imap = np.transpose(imap)
+        dx1 = np.transpose(reg[:, :, 0])
+        dy1 = np.transpose(reg[:, :, 1])
+        dx2 = np.transpose(reg[:, :, 2])
+        dy2 = np.transpose(reg[:, :, 3])
+
+        y, x = np.where(imap >= t)
+
+        if y.shape[0] == 1:
+            dx1 = np.flipud(dx1)
+            dy1 = np.flipud(dy1)
+            dx2 = np.flipud(dx2)
+            dy2 = np.flipud(dy2)
+
+        score = imap[(y, x)]
+        reg = np.transpose(np.vstack([dx1[(y, x)], dy1[(y, x)], dx2[(y, x)],
+                                      dy2[(y, x)]]))
+
+        if reg.size == 0:
+            reg = np.empty(shape=(0, 3))
+
+        bb = np.transpose(np.vstack([y, x]))
+
+        q1 = np.fix((stride * bb + 1) / scale)
+        q2 = np.fix((stride * bb + cellsize) / scale)
+
+        return np.hstack([q1, q2, np.expand_dims(score, 1), reg])
+
+    def _nms(self, boxes, threshold, method):
+        """
+        This method performs non maximum suppression and returns the indexes
+        of the boxes kept.
+
+        :param numpy.ndarray boxes: The boxes.
+        :param float threshold: The overlap threshold.
+        :param str method: 'Min' or 'Union'.
+        :rtype: numpy.ndarray
+        """
+
+        if boxes.size == 0:
+            return np.empty((0, 3))
+
+        x1 = boxes[:, 0]
+        y1 = boxes[:, 1]
+        x2 = boxes[:, 2]
+        y2 = boxes[:, 3]
+        s = boxes[:, 4]
+
+        area = (x2 - x1 + 1) * (y2 - y1 + 1)
+        sorted_s = np.argsort(s)
+
+        pick = np.zeros_like(s, dtype=np.int16)
+        counter = 0
+
+        while sorted_s.size > 0:
+            i = sorted_s[-1]
+            pick[counter] = i
+            counter += 1
+            idx = sorted_s[0:-1]
+
+            xx1 = np.maximum(x1[i], x1[idx])
+            yy1 = np.maximum(y1[i], y1[idx])
+            xx2 = np.minimum(x2[i], x2[idx])
+            yy2 = np.minimum(y2[i], y2[idx])
+
+            w = np.maximum(0.0, xx2 - xx1 + 1)
+            h = np.maximum(0.0, yy2 - yy1 + 1)
+
+            inter = w * h
+
+            if method == 'Min':
+                o = inter / np.minimum(area[i], area[idx])
+            else:
+                o = inter / (area[i] + area[idx] - inter)
+
+            sorted_s = sorted_s[np.where(o <= threshold)]
+
+        return pick[0:counter]
+
+    def _pad(self, total_boxes, w, h):
+        """
+        This method returns the padding of boxes that exceed an image.
+
+        :param numpy.ndarray total_boxes: The boxes.
+        :param int w: The width of the image.
+        :param int h: The height of the image.
+        :rtype: tuple(numpy.ndarray)
+        """
+
+        tmpw = (total_boxes[:, 2] - total_boxes[:, 0] + 1).astype(np.int32)
+        tmph = (total_boxes[:, 3] - total_boxes[:, 1] + 1).astype(np.int32)
+        numbox = total_boxes.shape[0]
+
+        dx = np.ones(numbox, dtype=np.int32)
+        dy = np.ones(numbox, dtype=np.int32)
+        edx = tmpw.copy().astype(np.int32)
+        edy = tmph.copy().astype(np.int32)
+
+        x = total_boxes[:, 0].copy().astype(np.int32)
+        y = total_boxes[:, 1].copy().astype(np.int32)
+        ex = total_boxes[:, 2].copy().astype(np.int32)
+        ey = total_boxes[:, 3].copy().astype(np.int32)
+
+        tmp = np.where(ex > w)
+        edx.flat[tmp] = np.expand_dims(-ex[tmp] + w + tmpw[tmp], 1)
+        ex[tmp] = w
+
+        tmp = np.where(ey > h)
+        edy.flat[tmp] = np.expand_dims(-ey[tmp] + h + tmph[tmp], 1)
+        ey[tmp] = h
+
+        tmp = np.where(x < 1)
+        dx.flat[tmp] = np.expand_dims(2 - x[tmp], 1)
+        x[tmp] = 1
+
+        tmp = np.where(y < 1)
+        dy.flat[tmp] = np.expand_dims(2 - y[tmp], 1)
+        y[tmp] = 1
+
+        return dy, edy, dx, edx, y, ey, x, ex, tmpw, tmph
+
+    def _rerec(self, bbox):
+        """
+        This method converts boxes to squares.
+
+        :param numpy.ndarray bbox: The boxes.
+        :rtype: numpy.ndarray
+        """
+
+        height = bbox[:, 3] - bbox[:, 1]
+        width = bbox[:, 2] - bbox[:, 0]
+        max_side_length = np.maximum(width, height)
+        bbox[:, 0] = bbox[:, 0] + width * 0.5 - max_side_length * 0.5
+        bbox[:, 1] = bbox[:, 1] + height * 0.5 - max_side_length * 0.5
+        bbox[:, 2:4] = bbox[:, 0:2] + \
+            np.transpose(np.tile(max_side_length, (2, 1)))
+
+        return bbox
+
+    def _bbreg(self, boundingbox, reg):
+        """
+        This method calibrates boxes with their regression.
+
+        :param numpy.ndarray boundingbox: The boxes.
+        :param numpy.ndarray reg: The regression.
+        :rtype: numpy.ndarray
+        """
+
+        if reg.shape[1] == 1:
+            reg = np.reshape(reg, (reg.shape[2], reg.shape[3]))
+
+        w = boundingbox[:, 2] - boundingbox[:, 0] + 1
+        h = boundingbox[:, 3] - boundingbox[:, 1] + 1
+        b1 = boundingbox[:, 0] + reg[:, 0] * w
+        b2 = boundingbox[:, 1] + reg[:, 1] * h
+        b3 = boundingbox[:, 2] + reg[:, 2] * w
+        b4 = boundingbox[:, 3] + reg[:, 3] * h
+        boundingbox[:, 0:4] = np.transpose(np.vstack([b1, b2, b3, b4]))
+
+        return boundingbox
@@ -0,0 +1,264 @@
+import os
+
+import cv2
+import numpy as np
+
+from deepstar.util.face_detector_base import FaceDetectorBase
+
+
+class BlazeFaceFaceDetector(FaceDetectorBase):
+    """
+    This class implements the BlazeFaceFaceDetector class.
+
+    A BlazeFace face detector detects faces with the short range BlazeFace
+    network of MediaPipe via OpenCV's DNN module. It is a small single shot
+    detector that runs in a few milliseconds per image on a CPU (rather than
+    the seconds of MTCNN on large frames), so that it suits frames in which
+    faces are large (e.g. within a few meters of the camera). Each image is
+    padded to a square and downscaled to the 128x128 pixel input of the
+    network, so that smaller faces may not be detected.
+
+    The network detects the eyes, nose tip and mouth center of each face
+    but not the corners of the mouth, so that the mouth corners of its faces
+    (in the format of MTCNN.detect_faces) are estimated from the mouth center
+    and the eyes.
+
+    The network (face_detection_short_range.tflite, from the mediapipe
+    0.10.14 distribution, Apache License 2.0, see
+    face_detection_short_range.LICENSE) is loaded from
+    deepstar/plugins/trained_detectors. It requires OpenCV 4.8 or later.
+    """
+
+    model_name = 'blazeface'
+
+    # The filename of the network in deepstar/plugins/trained_detectors.
+    model_filename = 'face_detection_short_range.tflite'
+
+    # The length in pixels of the sides of the network's input.
+    input_size = 128
+
+    # The ratio of the width of a mouth to the distance between the eyes.
+    mouth_ratio = 0.7
+
+    def __init__(self, detector, score_threshold=0.5, nms_threshold=0.3):
+        """
+        This method initializes an instance of the BlazeFaceFaceDetector
+        class.
+
+        :param cv2.dnn.Net detector: The detector.
+        :param float score_threshold: The minimum confidence of the faces
+            detected (between 0 and 1). The default value is 0.5.
+        :param float nms_threshold: The maximum overlap (intersection over
+            union) of the boxes of two faces detected in an image (between 0
+            and 1). The default value is 0.3.
+        :raises: ValueError
+        :rtype: None
+        """
+
+        self.validate(score_threshold, nms_threshold)
+
+        self.detector = detector
+        self.score_threshold = score_threshold
+        self.nms_threshold = nms_threshold
+
+        # the faces detected are those of sufficient confidence
+        self.min_confidence = score_threshold
+
+        self.anchors = self._anchors()
+
+    @classmethod
+    def load_blazeface(cls):
+        """
+        This method loads the BlazeFace network (see ModelCache).
+
+        :raises: ValueError
+        :rtype: cv2.dnn.Net
+        """
+
+        model_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+            'plugins',
+            'trained_detectors',
+            cls.model_filename)
+
+        if not os.path.isfile(model_path):
+            raise ValueError(f'The BlazeFace model was not found at '
+                             f'{model_path}')
+
+        # OpenCV reads TFLite models since 4.8 (the last release for Python
+        # 3.6 is 4.6)
+        if not hasattr(cv2.dnn, 'readNetFromTFLite'):
+            raise ValueError(f'The BlazeFace face detector requires OpenCV '
+                             f'4.8 or later (got {cv2.__version__})')
+
+        # the new DNN engine of OpenCV 5 fails to infer the shapes of the
+        # network
+        if hasattr(cv2.dnn, 'ENGINE_CLASSIC'):
+            return cv2.dnn.readNetFromTFLite(model_path,
+                                             engine=cv2.dnn.ENGINE_CLASSIC)
+
+        return cv2.dnn.readNetFromTFLite(model_path)
+
+    @classmethod
+    def options(cls, opts):
+        """
+        This method validates and parses the 'score-threshold' and
+        'nms-threshold' options of a dict of options into the keyword
+        arguments of __init__.
+
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: dict
+        """
+
+        try:
+            kwargs = {
+                'score_threshold': float(opts.get('score-threshold', 0.5)),
+                'nms_threshold': float(opts.get('nms-threshold', 0.3))
+            }
+        except ValueError as e:
+            raise ValueError(f'The detection options are not valid ({e})')
+
+        cls.validate(**kwargs)
+
+        return kwargs
+
+    @classmethod
+    def validate(cls, score_threshold, nms_threshold):
+        """
+        This method validates the keyword arguments of __init__.
+
+        :param float score_threshold: The score threshold.
+        :param float nms_threshold: The NMS threshold.
+        :raises: ValueError
+        :rtype: None
+        """
+
+        if not 0 <= score_threshold <= 1:
+            raise ValueError(f'The score threshold must be between 0 and 1 '
+                             f'(got {score_threshold})')
+
+        if not 0 <= nms_threshold <= 1:
+            raise ValueError(f'The NMS threshold must be between 0 and 1 '
+                             f'(got {nms_threshold})')
+
+    def detect_faces(self, images):
+        """
+        This method detects faces in each of a list of images and returns the
+        faces detected in each image (see MTCNN.detect_faces).
+
+        :param list(numpy.ndarray) images: The images.
+        :rtype: list(list(dict))
+        """
+
+        return [self._detect(image) for image in images]
+
+    def _anchors(self):
+        """
+        This method returns the centers of the network's anchors (relative to
+        the size of its input), 2 per cell of its 16x16 grid followed by 6 per
+        cell of its 8x8 grid.
+
+        :rtype: numpy.ndarray
+        """
+
+        anchors = []
+
+        for cells, count in ((16, 2), (8, 6)):
+            centers = (np.arange(cells, dtype=np.float32) + 0.5) / cells
+
+            x, y = np.meshgrid(centers, centers)
+
+            anchors.append(np.repeat(np.stack([x.ravel(), y.ravel()], 1),
+                                     count, 0))
+
+        return np.concatenate(anchors)
+
+    def _detect(self, image):
+        """
+        This method detects the faces in an image.
+
+        :param numpy.ndarray image: The image.
+        :rtype: list(dict)
+        """
+
+        height, width = image.shape[:2]
+
+        side = max(height, width)
+
+        # the image is padded to a square so that it is not distorted
+        image = cv2.copyMakeBorder(image, 0, side - height, 0, side - width,
+                                   cv2.BORDER_CONSTANT, value=0)
+
+        blob = cv2.dnn.blobFromImage(image, 1 / 127.5,
+                                     (self.input_size, self.input_size),
+                                     (127.5, 127.5, 127.5), swapRB=True)
+
+        self.detector.setInput(blob)
+
+        scores, rows = self.detector.forward(['classificators', 'regressors'])
+
+        scores = np.clip(scores[0, :, 0].astype(np.float64), -100, 100)
+        scores = 1 / (1 + np.exp(-scores))
+
+        keep = scores >= self.score_threshold
+
+        if not keep.any():
+            return []
+
+        scores = scores[keep]
+
+        # the boxes and keypoints are offsets from the anchors' centers in
+        # pixels of the network's input
+        rows = rows[0, keep] / self.input_size
+        anchors = self.anchors[keep]
+
+        centers = (rows[:, 0:2] + anchors) * side
+        sizes = rows[:, 2:4] * side
+
+        boxes = np.concatenate([centers - sizes / 2, sizes], 1)
+
+        points = (rows[:, 4:16].reshape(-1, 6, 2) + anchors[:, None]) * side
+
+        indices = cv2.dnn.NMSBoxes(boxes.tolist(), scores.tolist(),
+                                   self.score_threshold, self.nms_threshold)
+
+        return [self._face(boxes[i], points[i], scores[i])
+                for i in np.array(indices, dtype=int).reshape(-1)]
+
+    def _face(self, box, points, score):
+        """
+        This method returns the face of a box, its keypoints (the eyes, nose
+        tip, mouth center and ears) and its score.
+
+        :param numpy.ndarray box: The box.
+        :param numpy.ndarray points: The keypoints.
+        :param float score: The score.
+        :rtype: dict
+        """
+
+        x = max(0, int(box[0]))
+        y = max(0, int(box[1]))
+        width = int(box[0] + box[2] - x)
+        height = int(box[1] + box[3] - y)
+
+        # MTCNN names the keypoints by their side of the image rather than
+        # of the face
+        eyes = sorted([tuple(point) for point in points[0:2]])
+
+        offset = (np.array(eyes[1]) - np.array(eyes[0])) * self.mouth_ratio / 2
+
+        mouth_left = points[3] - offset
+        mouth_right = points[3] + offset
+
+        return {
+            'box': [x, y, width, height],
+            'confidence': float(score),
+            'keypoints': {
+                'left_eye': (int(eyes[0][0]), int(eyes[0][1])),
+                'right_eye': (int(eyes[1][0]), int(eyes[1][1])),
+                'nose': (int(points[2][0]), int(points[2][1])),
+                'mouth_left': (int(mouth_left[0]), int(mouth_left[1])),
+                'mouth_right': (int(mouth_right[0]), int(mouth_right[1]))
+            }
+        }
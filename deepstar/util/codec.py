@@ -0,0 +1,141 @@
+import os
+
+import cv2
+
+from deepstar.util.link import link
+
+
+class Codec:
+    """
+    This class implements the Codec class.
+
+    A codec is the image format (and its quality or compression level) in
+    which the files of a frame set or transform set are written. It is
+    specified as '<format>[:<level>]':
+
+    jpg:Q  - JPEG with quality Q (0 to 100, default 100)
+    png:L  - lossless PNG with compression level L (0 to 9, default 3)
+    webp:Q - WebP with quality Q (1 to 100 or 101 for lossless, default 101)
+    bmp    - uncompressed (raw) lossless BMP
+
+    The codec of new sets is set by the DEEPSTAR_CODEC environment variable
+    (default jpg:100) and is stored per set.
+    """
+
+    # format: (extension, OpenCV param, default level, minimum, maximum)
+    formats = {
+        'jpg': ('jpg', cv2.IMWRITE_JPEG_QUALITY, 100, 0, 100),
+        'png': ('png', cv2.IMWRITE_PNG_COMPRESSION, 3, 0, 9),
+        'webp': ('webp', cv2.IMWRITE_WEBP_QUALITY, 101, 1, 101),
+        'bmp': ('bmp', None, None, None, None)
+    }
+
+    # The codec of sets that predate codecs.
+    legacy = 'jpg:100'
+
+    def __init__(self, spec=None):
+        """
+        This method initializes an instance of the Codec class.
+
+        :param str spec: The optional codec spec. The default value is the
+            value of the DEEPSTAR_CODEC environment variable or jpg:100.
+        :raises: ValueError
+        :rtype: None
+        """
+
+        if spec is None:
+            spec = os.environ.get('DEEPSTAR_CODEC', Codec.legacy)
+
+        format_, _, level = spec.partition(':')
+
+        if format_ not in Codec.formats:
+            raise ValueError(f"'{spec}' is not a valid codec (expected one of "
+                             f"{', '.join(Codec.formats)})")
+
+        extension, param, default, minimum, maximum = Codec.formats[format_]
+
+        if param is None:
+            if level:
+                raise ValueError(f"'{spec}' is not a valid codec ("
+                                 f"{format_} does not take a level)")
+        else:
+            level = int(level) if level else default
+
+            if level < minimum or level > maximum:
+                raise ValueError(f"'{spec}' is not a valid codec ({format_} "
+                                 f"level must be {minimum} to {maximum})")
+
+        self._format = format_
+        self._extension = extension
+        self._params = [] if param is None else [param, level]
+        self._spec = format_ if param is None else f'{format_}:{level}'
+
+    @property
+    def spec(self):
+        """
+        This method returns the value for the spec property (the normalized
+        codec spec).
+
+        :rtype: str
+        """
+
+        return self._spec
+
+    @property
+    def extension(self):
+        """
+        This method returns the value for the extension property.
+
+        :rtype: str
+        """
+
+        return self._extension
+
+    def __eq__(self, other):
+        return isinstance(other, Codec) and self._spec == other._spec
+
+    def __hash__(self):
+        return hash(self._spec)
+
+    def __repr__(self):
+        return f"Codec('{self._spec}')"
+
+    def encode(self, image):
+        """
+        This method encodes an image.
+
+        :param numpy.ndarray image: The image.
+        :rtype: numpy.ndarray
+        """
+
+        _, buffer = cv2.imencode(f'.{self._extension}', image, self._params)
+
+        return buffer
+
+    def write(self, path, image):
+        """
+        This method writes an image.
+
+        :param str path: The path.
+        :param numpy.ndarray image: The image.
+        :rtype: None
+        """
+
+        self.encode(image).tofile(path)
+
+    def copy(self, src, src_codec, dst):
+        """
+        This method materializes the file at src (written with src_codec) at
+        dst in this codec, linking it (see util.link) if the codecs are the
+        same and transcoding it otherwise.
+
+        :param str src: The path to the source file.
+        :param Codec src_codec: The source file's codec.
+        :param str dst: The path to the target file.
+        :rtype: None
+        """
+
+        if src_codec == self:
+            link(src, dst)
+        else:
+            self.write(dst, cv2.imread(src))
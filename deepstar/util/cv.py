@@ -1,6 +1,7 @@
 import os
 
 import cv2
+import imutils
 import numpy as np
 
 
@@ -57,3 +58,17 @@ def overlay_transparent_image(bg, fg, x1, y1):
     bg[y1:y1 + h, x1:x1 + w] = overlaid
 
     return bg
+
+
+def sharpness(image):
+    # the variance of the Laplacian of the grayscale image (higher is sharper)
+    # downscaled to ~500 pixels per the usual recommendation
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    h, w = image.shape[:2]
+
+    if h > 600 or w > 600:
+        # imutils.resize preserves aspect ratio.
+        image = imutils.resize(image, width=500, height=500)
+
+    return cv2.Laplacian(image, cv2.CV_64F).var()
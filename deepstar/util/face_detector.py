@@ -0,0 +1,84 @@
+from deepstar.util.model_cache import ModelCache
+
+
+class FaceDetector:
+    """
+    This class implements the FaceDetector class.
+
+    Face detector backends (see FaceDetectorBase) are registered by name with
+    their 'module:class' path and are selected via the 'detector' option
+    (mtcnn by default). A backend is only imported when it is requested and
+    its model is loaded once per process (see ModelCache).
+    """
+
+    _map = {
+        'mtcnn': 'deepstar.util.batch_mtcnn:BatchMTCNN',
+        'blazeface': 'deepstar.util.blazeface_face_detector'
+                     ':BlazeFaceFaceDetector'
+    }
+
+    default = 'mtcnn'
+
+    @classmethod
+    def options(cls, opts):
+        """
+        This method validates and parses the 'detector' option and the
+        options of the backend it selects of a dict of options into the
+        backend name and the keyword arguments of its __init__.
+
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: tuple(str, dict)
+        """
+
+        name = opts.get('detector', FaceDetector.default)
+
+        return name, cls.load(name).options(opts)
+
+    @classmethod
+    def models(cls, opts):
+        """
+        This method returns the names of the models (see ModelCache) of the
+        backend selected by the 'detector' option of a dict of options.
+
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: list(str)
+        """
+
+        name, _ = cls.options(opts)
+
+        return [cls.load(name).model_name]
+
+    @classmethod
+    def get(cls, name, kwargs=None):
+        """
+        This method returns an instance of a backend by name with its model.
+
+        :param str name: The backend name.
+        :param dict kwargs: The keyword arguments of the backend's __init__
+            (see options).
+        :raises: ValueError
+        :rtype: FaceDetectorBase
+        """
+
+        class_ = cls.load(name)
+
+        return class_(ModelCache.get(class_.model_name), **(kwargs or {}))
+
+    @classmethod
+    def load(cls, name):
+        """
+        This method imports and returns a backend class by name.
+
+        :param str name: The backend name.
+        :raises: ValueError
+        :rtype: type
+        """
+
+        if name not in FaceDetector._map:
+            raise ValueError(f"'{name}' is not a valid face detector "
+                             f"(expected one of "
+                             f"{', '.join(FaceDetector._map)})")
+
+        return ModelCache.load(FaceDetector._map[name])
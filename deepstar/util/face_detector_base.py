@@ -0,0 +1,44 @@
+class FaceDetectorBase:
+    """
+    This class implements the FaceDetectorBase class.
+
+    Subclasses (face detector backends, see FaceDetector) implement
+    detect_faces (and optionally options). A backend is initialized with the
+    model named by model_name (see ModelCache) and the keyword arguments
+    returned by options. Each face detected is a dict with the format of
+    MTCNN.detect_faces: 'box' ([x, y, width, height]), 'confidence' and
+    'keypoints' ('left_eye', 'right_eye', 'nose', 'mouth_left' and
+    'mouth_right' as (x, y) tuples), so that plugins consuming the faces
+    (e.g. MouthTransformSetSelectExtractPlugin) work with any backend.
+    """
+
+    # The name of the backend's model (see ModelCache).
+    model_name = None
+
+    # The minimum confidence of the faces used by the plugins (the
+    # confidences of the backends are not calibrated alike).
+    min_confidence = 0.9
+
+    @classmethod
+    def options(cls, opts):
+        """
+        This method validates and parses a dict of options into the keyword
+        arguments of __init__.
+
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: dict
+        """
+
+        return {}
+
+    def detect_faces(self, images):
+        """
+        This method detects the faces in each of a list of images.
+
+        :param list(numpy.ndarray) images: The images (BGR).
+        :rtype: list(list(dict))
+        """
+
+        raise NotImplementedError('FaceDetectorBase.detect_faces not '
+                                  'implemented')
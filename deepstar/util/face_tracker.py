@@ -0,0 +1,298 @@
+import cv2
+
+
+class FaceTracker:
+    """
+    This class implements the FaceTracker class.
+
+    A face tracker detects faces (with a detector such as BatchMTCNN, see
+    FaceDetectorBase) in every interval-th image of a sequence of consecutive
+    images (e.g. the frames of a video) and tracks the faces detected in the
+    images in between by matching each face's template (its grayscale box in
+    the previous image) in a window around its box. Faces are detected again
+    as soon as a face cannot be tracked (its best match scores less than
+    min_score).
+
+    Each face is assigned a track ID that is stable across images: a face
+    detected in an image continues the track of the face of the previous
+    image that it overlaps most (with an IoU of at least min_iou) or else
+    starts a new track.
+    """
+
+    # The maximum length in pixels of the longer side of the templates (faces
+    # are matched at a smaller scale if they are larger).
+    template_size = 48
+
+    def __init__(self, detector, interval, min_score=0.6, min_iou=0.3,
+                 min_confidence=0, search=0.5, next_id=1):
+        """
+        This method initializes an instance of the FaceTracker class.
+
+        :param FaceDetectorBase detector: The detector.
+        :param int interval: Detect faces in every interval-th image (at
+            least 1 in which case faces are detected in every image).
+        :param float min_score: The minimum match score (normalized cross
+            correlation) of a tracked face.
+        :param float min_iou: The minimum IoU of a detected face and the face
+            of the previous image whose track it continues.
+        :param float min_confidence: The minimum confidence of a detected face
+            (faces with a lower confidence are neither returned nor tracked).
+        :param float search: The size of the window in which a face is
+            matched as a fraction of the size of its box on each side.
+        :param int next_id: The ID of the next track (e.g. to resume).
+        :raises: ValueError
+        :rtype: None
+        """
+
+        if interval < 1:
+            raise ValueError(f'The tracking interval must be at least 1 (got '
+                             f'{interval})')
+
+        self.detector = detector
+        self.interval = interval
+        self.min_score = min_score
+        self.min_iou = min_iou
+        self.min_confidence = min_confidence
+        self.search = search
+
+        self._next_id = next_id
+
+        # the faces of the previous image and their templates
+        self._faces = []
+
+        # the number of images since faces were last detected
+        self._count = interval
+
+    @classmethod
+    def options(cls, opts):
+        """
+        This method validates and parses the 'track' option (the interval) of
+        a dict of options. The interval is 0 if the option is not set.
+
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: int
+        """
+
+        try:
+            interval = int(opts.get('track', 0))
+        except ValueError as e:
+            raise ValueError(f'The tracking interval is not valid ({e})')
+
+        if interval < 0:
+            raise ValueError(f'The tracking interval must be at least 1 (got '
+                             f'{interval})')
+
+        return interval
+
+    def detect_faces(self, images):
+        """
+        This method detects or tracks the faces in each of a sequence of
+        images (see update).
+
+        :param list(numpy.ndarray) images: The images.
+        :rtype: list(list(dict))
+        """
+
+        return [self.update(image) for image in images]
+
+    def update(self, image):
+        """
+        This method detects or tracks the faces in the next image and returns
+        them (see MTCNN.detect_faces) with their track IDs ('track_id').
+
+        :param numpy.ndarray image: The image.
+        :rtype: list(dict)
+        """
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        faces = None
+
+        if self._count < self.interval:
+            faces = self._track(gray)
+
+        if faces is None:
+            faces = self._detect(image)
+
+            self._count = 0
+
+        self._count += 1
+
+        self._faces = [(face, self._template(gray, face['box']))
+                       for face in faces]
+
+        return [dict(face) for face in faces]
+
+    def _detect(self, image):
+        """
+        This method detects the faces in an image and assigns them track IDs.
+
+        :param numpy.ndarray image: The image.
+        :rtype: list(dict)
+        """
+
+        faces = [face for face in self.detector.detect_faces([image])[0]
+                 if face['confidence'] >= self.min_confidence]
+
+        previous = [face for face, _ in self._faces]
+
+        pairs = sorted(((self.iou(face['box'], face_['box']), i, j)
+                        for i, face in enumerate(faces)
+                        for j, face_ in enumerate(previous)), reverse=True)
+
+        track_ids = {}
+        used = set()
+
+        for iou, i, j in pairs:
+            if iou < self.min_iou:
+                break
+
+            if i in track_ids or j in used:
+                continue
+
+            track_ids[i] = previous[j]['track_id']
+            used.add(j)
+
+        for i, face in enumerate(faces):
+            if i not in track_ids:
+                track_ids[i] = self._next_id
+                self._next_id += 1
+
+            face['track_id'] = track_ids[i]
+
+        return faces
+
+    def _track(self, gray):
+        """
+        This method tracks the faces of the previous image in an image and
+        returns them or None if a face cannot be tracked.
+
+        :param numpy.ndarray gray: The grayscale image.
+        :rtype: list(dict)
+        """
+
+        faces = []
+
+        for face, template in self._faces:
+            offset = self._match(gray, face['box'], template)
+
+            if offset is None:
+                return None
+
+            dx, dy = offset
+
+            x, y, width, height = face['box']
+
+            faces.append(dict(face,
+                              box=[x + dx, y + dy, width, height],
+                              keypoints={k: (v[0] + dx, v[1] + dy)
+                                         for k, v in face['keypoints']
+                                         .items()}))
+
+        return faces
+
+    def _scale(self, box):
+        """
+        This method returns the scale at which the template of a box is
+        matched.
+
+        :param list(int) box: The box.
+        :rtype: float
+        """
+
+        return min(1, self.template_size / max(box[2], box[3], 1))
+
+    def _template(self, gray, box):
+        """
+        This method returns the template of a box (the part of the box within
+        the image at the box's scale) and its offset from the box or None if
+        the box is not within the image.
+
+        :param numpy.ndarray gray: The grayscale image.
+        :param list(int) box: The box.
+        :rtype: tuple(numpy.ndarray, int, int)
+        """
+
+        x, y, width, height = box
+
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(gray.shape[1], x + width), min(gray.shape[0], y + height)
+
+        scale = self._scale(box)
+
+        size = (int(round((x2 - x1) * scale)), int(round((y2 - y1) * scale)))
+
+        if size[0] < 1 or size[1] < 1:
+            return None
+
+        template = cv2.resize(gray[y1:y2, x1:x2], size,
+                              interpolation=cv2.INTER_AREA)
+
+        return template, x1 - x, y1 - y
+
+    def _match(self, gray, box, template):
+        """
+        This method matches the template of a box in a window around the box
+        and returns the offset of the best match or None if it scores less
+        than min_score.
+
+        :param numpy.ndarray gray: The grayscale image.
+        :param list(int) box: The box.
+        :param tuple template: The template (see _template).
+        :rtype: tuple(int, int)
+        """
+
+        if template is None:
+            return None
+
+        template, offset_x, offset_y = template
+
+        x, y, width, height = box
+
+        margin_x = int(width * self.search)
+        margin_y = int(height * self.search)
+
+        x1, y1 = max(0, x - margin_x), max(0, y - margin_y)
+        x2 = min(gray.shape[1], x + width + margin_x)
+        y2 = min(gray.shape[0], y + height + margin_y)
+
+        scale = self._scale(box)
+
+        size = (int(round((x2 - x1) * scale)), int(round((y2 - y1) * scale)))
+
+        if size[0] < template.shape[1] or size[1] < template.shape[0]:
+            return None
+
+        window = cv2.resize(gray[y1:y2, x1:x2], size,
+                            interpolation=cv2.INTER_AREA)
+
+        scores = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+
+        _, score, _, (px, py) = cv2.minMaxLoc(scores)
+
+        # a NaN score (e.g. of a flat template) does not pass either
+        if not score >= self.min_score:
+            return None
+
+        return (int(round(x1 + px / scale)) - offset_x - x,
+                int(round(y1 + py / scale)) - offset_y - y)
+
+    def iou(self, box_1, box_2):
+        """
+        This method returns the intersection over union of two boxes.
+
+        :param list(int) box_1: The first box.
+        :param list(int) box_2: The second box.
+        :rtype: float
+        """
+
+        x1, y1, w1, h1 = box_1
+        x2, y2, w2, h2 = box_2
+
+        w = max(0, min(x1 + w1, x2 + w2) - max(x1, x2))
+        h = max(0, min(y1 + h1, y2 + h2) - max(y1, y2))
+
+        union = w1 * h1 + w2 * h2 - w * h
+
+        return w * h / union if union > 0 else 0.0
@@ -0,0 +1,82 @@
+import os
+import shutil
+import sys
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# The Linux FICLONE ioctl request number (_IOW(0x94, 9, int)).
+FICLONE = 0x40049409
+
+# The (method, source dir, target dir) combinations that have failed once and
+# so are not retried for subsequent files.
+_unsupported = set()
+
+
+def link(src, dst):
+    """
+    This function materializes the file at src at dst without duplicating its
+    data where possible. It creates a reflink (a copy-on-write clone) where
+    the filesystem supports them, else a hardlink, else falls back to a copy.
+    Files materialized this way are expected not to be modified in place.
+
+    :param str src: The path to the source file.
+    :param str dst: The path to the target file (which must not exist).
+    :rtype: str
+    :returns: 'reflink', 'hardlink' or 'copy'.
+    """
+
+    key = (os.path.dirname(src), os.path.dirname(dst))
+
+    if ('reflink', key) not in _unsupported:
+        try:
+            _reflink(src, dst)
+
+            return 'reflink'
+        except FileExistsError:
+            raise
+        except OSError:
+            _unsupported.add(('reflink', key))
+
+    if ('hardlink', key) not in _unsupported:
+        try:
+            os.link(src, dst)
+
+            return 'hardlink'
+        except FileExistsError:
+            raise
+        except OSError:
+            _unsupported.add(('hardlink', key))
+
+    shutil.copy(src, dst)
+
+    return 'copy'
+
+
+def _reflink(src, dst):
+    """
+    This function clones the file at src to dst with the FICLONE ioctl.
+
+    :param str src: The path to the source file.
+    :param str dst: The path to the target file (which must not exist).
+    :raises: OSError
+    :rtype: None
+    """
+
+    if fcntl is None or not sys.platform.startswith('linux'):
+        raise OSError('Reflinks are not supported on this platform')
+
+    with open(src, 'rb') as s, open(dst, 'xb') as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+
+            os.remove(dst)
+
+            raise
+
+    shutil.copymode(src, dst)
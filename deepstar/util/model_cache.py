@@ -0,0 +1,97 @@
+import importlib
+import threading
+
+from deepstar.util.debug import debug
+
+
+class ModelCache:
+    """
+    This class implements the ModelCache class.
+
+    Models (e.g. the MTCNN face detector) are registered by name with the
+    'module:callable' path of a function that loads them. A model is loaded
+    once per process when it is first requested via get (or warmed via warm)
+    and is then shared by every plugin instance, so that e.g. extracting faces
+    from many frame sets does not rebuild the detector per frame set. The
+    route handlers warm the models a plugin declares (see e.g.
+    MTCNNFrameSetSelectExtractPlugin.models) before running it.
+    """
+
+    _map = {
+        'mtcnn': 'mtcnn.mtcnn:MTCNN',
+        'mesonet': 'deepstar.plugins.mesonet_video_select_detect_plugin'
+                   ':MesoNetVideoSelectDetectPlugin.load_mesonet',
+        'blazeface': 'deepstar.util.blazeface_face_detector'
+                     ':BlazeFaceFaceDetector.load_blazeface'
+    }
+
+    _models = {}
+
+    _lock = threading.RLock()
+
+    @classmethod
+    def get(cls, name):
+        """
+        This method returns a model by name, loading it if it is not loaded.
+
+        :param str name: The model name.
+        :raises: ValueError
+        :rtype: object
+        """
+
+        with ModelCache._lock:
+            if name not in ModelCache._models:
+                if name not in ModelCache._map:
+                    raise ValueError(f"'{name}' is not a valid model name "
+                                     f"(expected one of "
+                                     f"{', '.join(ModelCache._map)})")
+
+                ModelCache._models[name] = cls.load(ModelCache._map[name])()
+
+                debug(f'Model {name} loaded', 4)
+
+            return ModelCache._models[name]
+
+    @classmethod
+    def warm(cls, names):
+        """
+        This method loads models by name that are not loaded (e.g. before
+        they are first requested).
+
+        :param list(str) names: The model names.
+        :raises: ValueError
+        :rtype: None
+        """
+
+        for name in names:
+            cls.get(name)
+
+    @classmethod
+    def clear(cls):
+        """
+        This method unloads all models.
+
+        :rtype: None
+        """
+
+        with ModelCache._lock:
+            ModelCache._models.clear()
+
+    @classmethod
+    def load(cls, path):
+        """
+        This method imports and returns the function that loads a model by
+        'module:callable' path (the callable may be an attribute of a class).
+
+        :param str path: The function's 'module:callable' path.
+        :rtype: callable
+        """
+
+        module, _, name = path.partition(':')
+
+        function = importlib.import_module(module)
+
+        for attr in name.split('.'):
+            function = getattr(function, attr)
+
+        return function
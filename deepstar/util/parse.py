@@ -24,3 +24,37 @@ def parse_range(range_):
                 result.append(x)
 
     return result
+
+
+def parse_time(time_):
+    """
+    This function parses a time of the form [[HH:]MM:]SS[.fff] into seconds.
+
+    Example:
+
+    '00:10:30.5' -> 630.5
+    '90' -> 90.0
+
+    :param str time_: The time.
+    :raises: ValueError
+    :rtype: float
+    """
+
+    message = f"'{time_}' is not a valid time (expected [[HH:]MM:]SS[.fff])"
+
+    parts = time_.strip().split(':')
+
+    try:
+        values = [float(part) for part in parts]
+    except ValueError:
+        raise ValueError(message)
+
+    if len(values) > 3 or any(value < 0 for value in values):
+        raise ValueError(message)
+
+    seconds = 0.0
+
+    for value in values:
+        seconds = seconds * 60 + value
+
+    return seconds
@@ -0,0 +1,70 @@
+import queue
+import threading
+
+
+# Marks the end of the items in a prefetch queue.
+_END = object()
+
+
+def prefetch(iterable, length):
+    """
+    This function iterates an iterable in a background thread and yields its
+    items, buffering up to length items ahead of the consumer (the producer
+    blocks when the buffer is full). An exception raised by the iterable is
+    re-raised to the consumer.
+
+    :param iterable iterable: The iterable.
+    :param int length: The maximum number of buffered items.
+    :rtype: generator
+    """
+
+    items = queue.Queue(maxsize=length)
+
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((_END, e))
+
+            return
+        finally:
+            # e.g. release a generator's resources in the thread using them
+            if hasattr(iterable, 'close'):
+                iterable.close()
+
+        put((_END, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+
+    thread.start()
+
+    try:
+        while True:
+            item, e = items.get()
+
+            if item is _END:
+                if e is not None:
+                    raise e
+
+                return
+
+            yield item
+    finally:
+        stop.set()
+
+        thread.join()
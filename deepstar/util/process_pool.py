@@ -0,0 +1,51 @@
+import concurrent.futures
+import multiprocessing
+import os
+
+import cv2
+
+
+def job_count(opts):
+    """
+    This function returns the number of worker processes requested via the
+    'jobs' option, else the DEEPSTAR_JOBS environment variable, else 1.
+
+    :param dict opts: The dict of options.
+    :raises: ValueError
+    :rtype: int
+    """
+
+    return int(opts.get('jobs', os.environ.get('DEEPSTAR_JOBS', '1')))
+
+
+def process_pool(jobs, threads=1):
+    """
+    This function returns a pool of jobs worker processes in which OpenCV may
+    use up to threads threads each. Workers are forked where the platform
+    supports it (main.py does not guard against being re-imported by spawned
+    workers).
+
+    :param int jobs: The number of worker processes.
+    :param int threads: The number of threads OpenCV may use per worker.
+    :rtype: concurrent.futures.ProcessPoolExecutor
+    """
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = None
+
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs, mp_context=context, initializer=_init_worker,
+        initargs=(threads,))
+
+
+def _init_worker(threads):
+    """
+    This function initializes a worker process.
+
+    :param int threads: The number of threads OpenCV may use per worker.
+    :rtype: None
+    """
+
+    cv2.setNumThreads(threads)
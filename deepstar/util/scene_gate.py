@@ -0,0 +1,103 @@
+import cv2
+import numpy as np
+
+
+class SceneGate:
+    """
+    This class implements the SceneGate class.
+
+    A scene gate keeps only the frames of a video that differ from the last
+    kept frame (e.g. on a scene change or motion) so that near identical
+    frames of static footage are not extracted. The difference of two frames
+    is the mean absolute difference of their downscaled grayscale images
+    scaled to 0 (identical) to 1 (see distance).
+    """
+
+    # The size to which frames are downscaled before they are compared.
+    size = (64, 36)
+
+    def __init__(self, threshold, min_gap=1, max_gap=0):
+        """
+        This method initializes an instance of the SceneGate class.
+
+        :param float threshold: Keep a frame if its distance to the last kept
+            frame is at least threshold (greater than 0 and at most 1).
+        :param int min_gap: Never keep a frame fewer than min_gap frames after
+            the last kept frame. The default value of 1 indicates no minimum.
+        :param int max_gap: Always keep a frame at least max_gap frames after
+            the last kept frame. The default value of 0 indicates no maximum.
+        :raises: ValueError
+        :rtype: None
+        """
+
+        if not 0 < threshold <= 1:
+            raise ValueError(f'The scene threshold must be greater than 0 and '
+                             f'at most 1 (got {threshold})')
+
+        if min_gap < 1:
+            raise ValueError(f'The minimum gap must be at least 1 (got '
+                             f'{min_gap})')
+
+        if max_gap != 0 and max_gap < min_gap:
+            raise ValueError(f'The maximum gap must be 0 or at least the '
+                             f'minimum gap (got {max_gap})')
+
+        self.threshold = threshold
+        self.min_gap = min_gap
+        self.max_gap = max_gap
+
+    def filter(self, samples, last=None):
+        """
+        This method yields the samples that pass the gate. A sample is a tuple
+        of a frame number, any other values and a frame (last). The first
+        sample always passes unless last is given.
+
+        :param iterable(tuple) samples: The samples.
+        :param tuple(int, numpy.ndarray) last: The frame number and frame of
+            the last sample that passed (e.g. to resume filtering). The
+            default value is None.
+        :rtype: generator(tuple)
+        """
+
+        if last is not None:
+            last = (last[0], self.signature(last[1]))
+
+        for sample in samples:
+            i, frame = sample[0], sample[-1]
+
+            if last is not None and i - last[0] < self.min_gap:
+                continue
+
+            signature = self.signature(frame)
+
+            if last is not None and \
+                    (self.max_gap == 0 or i - last[0] < self.max_gap) and \
+                    self.distance(last[1], signature) < self.threshold:
+                continue
+
+            last = (i, signature)
+
+            yield sample
+
+    def signature(self, frame):
+        """
+        This method returns the downscaled grayscale image of a frame.
+
+        :param numpy.ndarray frame: The frame.
+        :rtype: numpy.ndarray
+        """
+
+        image = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    def distance(self, signature_1, signature_2):
+        """
+        This method returns the distance of two frames' signatures.
+
+        :param numpy.ndarray signature_1: The first signature.
+        :param numpy.ndarray signature_2: The second signature.
+        :rtype: float
+        """
+
+        return float(np.mean(cv2.absdiff(signature_1, signature_2))) / 255
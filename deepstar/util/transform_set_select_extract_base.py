@@ -0,0 +1,223 @@
+import collections
+import os
+
+import cv2
+
+from deepstar.filesystem.transform_file import TransformFile
+from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
+from deepstar.models.transform_model import TransformModel
+from deepstar.models.transform_set_model import TransformSetModel
+from deepstar.util.codec import Codec
+from deepstar.util.debug import debug
+from deepstar.util.process_pool import job_count, process_pool
+
+
+class TransformSetSelectExtractBase:
+    """
+    This class implements the TransformSetSelectExtractBase class.
+
+    Subclasses implement transform (and optionally options). The transform set
+    is partitioned into ID ranges of MODEL_LIST_LENGTH transforms that are
+    read, transformed and written to temporary files by a pool of 'jobs'
+    worker processes (the 'jobs' option, else the DEEPSTAR_JOBS environment
+    variable, else 1 in which case no pool is used). A single writer (the
+    calling process) then inserts the new transforms and renames their files
+    in transform ID order so that the new transform IDs are deterministic.
+    """
+
+    # The number of threads OpenCV may use in each worker process.
+    threads = 1
+
+    def options(self, opts):
+        """
+        This method validates and parses the dict of options into the options
+        passed to transform.
+
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: object
+        """
+
+        return opts
+
+    def transform(self, image, metadata, options):
+        """
+        This method transforms an image and returns the transformed image and
+        its metadata or None if the transform should be skipped. It is run in
+        a worker process.
+
+        :param numpy.ndarray image: The image.
+        :param str metadata: Metadata for the transform.
+        :param object options: The options returned by options.
+        :rtype: tuple(numpy.ndarray, str)
+        """
+
+        raise NotImplementedError('transform not implemented')
+
+    def transform_set_select_extract(self, transform_set_id, opts):
+        """
+        This method extracts a transform set from a transform set.
+
+        :param int transform_set_id: The transform set ID.
+        :param dict opts: The dict of options.
+        :raises: ValueError
+        :rtype: int
+        """
+
+        options = self.options(opts)
+
+        jobs = job_count(opts)
+
+        transform_set_model = TransformSetModel()
+
+        result = transform_set_model.select(transform_set_id)
+
+        codecs = (transform_set_model.codec(transform_set_id), Codec())
+
+        target_set_id = transform_set_model.insert(self.name, result[2],
+                                                   transform_set_id,
+                                                   codecs[1])
+
+        p1 = TransformSetSubDir.path(target_set_id)
+
+        os.makedirs(p1)
+
+        p2 = TransformSetSubDir.path(transform_set_id)
+
+        transform_model = TransformModel()
+
+        transforms = transform_model.iterate(transform_set_id, rejected=False)
+
+        with transform_model.batch() as batch:
+            for transform, (extracted, metadata) in self._map(
+                    transforms, p1, p2, codecs, options, jobs):
+                if not extracted:
+                    continue
+
+                target_id = batch.insert(target_set_id, transform[2],
+                                         metadata, 0)
+
+                p3 = TransformFile.path(p2, transform[0], codecs[0].extension)
+                p4 = TransformFile.path(p1, target_id, codecs[1].extension)
+
+                os.replace(self._tmp_path(p1, transform[0], codecs[1]), p4)
+
+                debug(f'Transform with ID {target_id:08d} at {p4} extracted '
+                      f'from transform with ID {transform[0]:08d} at {p3}', 4)
+
+        return target_set_id
+
+    def _map(self, transforms, p1, p2, codecs, options, jobs):
+        """
+        This method runs _extract over ID ranges of transforms (in a pool of
+        jobs worker processes if jobs is greater than 1) and yields each
+        transform with its _extract result in transform ID order.
+
+        :param generator(tuple) transforms: The transforms.
+        :param str p1: The path to the target transform set directory.
+        :param str p2: The path to the source transform set directory.
+        :param tuple(Codec, Codec) codecs: The source and target codecs.
+        :param object options: The options returned by options.
+        :param int jobs: The number of worker processes.
+        :rtype: generator(tuple)
+        """
+
+        length = int(os.environ.get('MODEL_LIST_LENGTH', '100'))
+
+        chunks = self._chunks(transforms, length)
+
+        if jobs <= 1:
+            for chunk in chunks:
+                yield from zip(chunk, self._extract(p1, p2, codecs, options,
+                                                    chunk))
+
+            return
+
+        with process_pool(jobs, self.threads) as executor:
+            futures = collections.deque()
+
+            for chunk in chunks:
+                futures.append((chunk, executor.submit(self._extract, p1, p2,
+                                                       codecs, options,
+                                                       chunk)))
+
+                # bound the number of chunks in flight
+                if len(futures) >= jobs * 2:
+                    chunk_, future = futures.popleft()
+
+                    yield from zip(chunk_, future.result())
+
+            while futures:
+                chunk_, future = futures.popleft()
+
+                yield from zip(chunk_, future.result())
+
+    def _extract(self, p1, p2, codecs, options, chunk):
+        """
+        This method transforms a chunk of transforms to temporary files and
+        returns whether each was extracted (False if skipped) and its new
+        metadata.
+
+        :param str p1: The path to the target transform set directory.
+        :param str p2: The path to the source transform set directory.
+        :param tuple(Codec, Codec) codecs: The source and target codecs.
+        :param object options: The options returned by options.
+        :param list(tuple) chunk: The transforms.
+        :rtype: list(tuple(bool, str))
+        """
+
+        results = []
+
+        for transform in chunk:
+            image = cv2.imread(TransformFile.path(p2, transform[0],
+                                                  codecs[0].extension))
+
+            result = self.transform(image, transform[3], options)
+
+            if result is None:
+                results.append((False, None))
+
+                continue
+
+            codecs[1].write(self._tmp_path(p1, transform[0], codecs[1]),
+                            result[0])
+
+            results.append((True, result[1]))
+
+        return results
+
+    def _chunks(self, transforms, length):
+        """
+        This method partitions transforms into lists of up to length
+        transforms.
+
+        :param generator(tuple) transforms: The transforms.
+        :param int length: The length.
+        :rtype: generator(list(tuple))
+        """
+
+        chunk = []
+
+        for transform in transforms:
+            chunk.append(transform)
+
+            if len(chunk) >= length:
+                yield chunk
+
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    def _tmp_path(self, p1, transform_id, codec):
+        """
+        This method returns the temporary path to which the transform of a
+        transform is written.
+
+        :param str p1: The path to the target transform set directory.
+        :param int transform_id: The source transform ID.
+        :param Codec codec: The target codec.
+        :rtype: str
+        """
+
+        return TransformFile.path(p1, transform_id, f'tmp.{codec.extension}')
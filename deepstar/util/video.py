@@ -1,6 +1,47 @@
 import cv2
 
 
+def probe_video_file(video_path):
+    """
+    This method probes a video file and returns its frame count, FPS, width,
+    height, duration (in milliseconds) and FourCC (e.g. 'avc1') as reported by
+    its container (the frame count may be an estimate) or None if the video
+    file can not be opened. Each value is None if it is not reported.
+
+    :param str video_path: The path to the video file.
+    :rtype: tuple(int, float, int, int, float, str)
+    """
+
+    vc = cv2.VideoCapture(video_path)
+
+    try:
+        if not vc.isOpened():
+            return None
+
+        frame_count = int(vc.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = vc.get(cv2.CAP_PROP_FPS)
+        width = int(vc.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(vc.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fourcc = int(vc.get(cv2.CAP_PROP_FOURCC))
+    finally:
+        vc.release()
+
+    frame_count = frame_count if frame_count > 0 else None
+    fps = fps if fps > 0 else None
+    width = width if width > 0 else None
+    height = height if height > 0 else None
+
+    if frame_count is not None and fps is not None:
+        duration = round(frame_count * 1000 / fps, 3)
+    else:
+        duration = None
+
+    fourcc = ''.join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(0, 4))
+    fourcc = fourcc.strip('\x00 ') or None
+
+    return frame_count, fps, width, height, duration, fourcc
+
+
 def create_one_video_file_from_one_image_file(image_path, video_path,
                                               frame_count=1):
     """
@@ -0,0 +1,56 @@
+import os
+
+import cv2
+import numpy as np
+
+
+def benchmark_enabled():
+    """
+    This function returns True if the BENCHMARK environment variable is set
+    to 1 else False. Benchmarks are slow and so are skipped by default.
+
+    :rtype: bool
+    """
+
+    return os.environ.get('BENCHMARK', '0') == '1'
+
+
+def create_video(path, length, width=1280, height=720, fps=30,
+                 scene_length=0):
+    """
+    This function writes a synthetic video of length frames (a textured
+    background with a moving square) to path. If scene_length is greater than
+    0, the background is still and changes every scene_length frames and the
+    square moves slowly (like static footage).
+
+    :param str path: The path to the video file.
+    :param int length: The number of frames.
+    :param int width: The frame width.
+    :param int height: The frame height.
+    :param int fps: The frame rate.
+    :param int scene_length: The number of frames per scene.
+    :rtype: None
+    """
+
+    vw = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps,
+                         (width, height))
+
+    background = np.random.RandomState(0).randint(
+        0, 256, (height, width, 3), dtype=np.uint8)
+
+    try:
+        for i in range(0, length):
+            if scene_length > 0:
+                frame = np.roll(background, (i // scene_length) * 200, axis=1)
+
+                x = (i // 4) % (width - 100)
+            else:
+                frame = np.roll(background, i * 4, axis=1)
+
+                x = (i * 8) % (width - 100)
+
+            cv2.rectangle(frame, (x, 100), (x + 100, 200), (0, 0, 255), -1)
+
+            vw.write(frame)
+    finally:
+        vw.release()
@@ -0,0 +1,73 @@
+import os
+import time
+import unittest
+
+import cv2
+import numpy as np
+
+from deepstar.util.codec import Codec
+from deepstar.util.tempdir import tempdir
+
+from . import benchmark_enabled, create_video
+
+
+@unittest.skipUnless(benchmark_enabled(), 'BENCHMARK is not set to 1')
+class TestCodec(unittest.TestCase):
+    """
+    This class benchmarks the Codec class (the encode and decode time, size
+    and PSNR per frame of each codec). The number of frames may be overridden
+    by the BENCHMARK_LENGTH environment variable.
+    """
+
+    specs = ['jpg:100', 'jpg:90', 'png:1', 'png:3', 'webp:90', 'webp:101',
+             'bmp']
+
+    def test_codecs(self):
+        length = int(os.environ.get('BENCHMARK_LENGTH', '10'))
+
+        with tempdir() as tempdir_:
+            path = os.path.join(tempdir_, 'video.mp4')
+
+            create_video(path, length)
+
+            vc = cv2.VideoCapture(path)
+
+            try:
+                frames = [vc.read()[1] for _ in range(0, length)]
+            finally:
+                vc.release()
+
+        print()
+
+        for spec in self.specs:
+            codec = Codec(spec)
+
+            start = time.time()
+
+            buffers = [codec.encode(frame) for frame in frames]
+
+            encode = (time.time() - start) / length
+
+            start = time.time()
+
+            images = [cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+                      for buffer in buffers]
+
+            decode = (time.time() - start) / length
+
+            size = sum(buffer.size for buffer in buffers) / length
+
+            if all(np.array_equal(frame, image)
+                   for frame, image in zip(frames, images)):
+                psnr = 'lossless'
+            else:
+                psnr = np.mean([cv2.PSNR(frame, image)
+                                for frame, image in zip(frames, images)])
+
+                psnr = f'PSNR {psnr:.2f}dB'
+
+            self.assertEqual(images[0].shape, frames[0].shape)
+
+            print(f'{spec:>8}: encode {encode * 1000:7.2f}ms, decode '
+                  f'{decode * 1000:6.2f}ms, {size / 1024:8.1f}KiB, '
+                  f'{psnr}')
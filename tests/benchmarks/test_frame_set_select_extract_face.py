@@ -0,0 +1,134 @@
+import os
+import time
+import unittest
+
+import cv2
+
+from deepstar.util.batch_mtcnn import BatchMTCNN
+from deepstar.util.face_tracker import FaceTracker
+from deepstar.util.model_cache import ModelCache
+
+from . import benchmark_enabled
+
+
+@unittest.skipUnless(benchmark_enabled(), 'BENCHMARK is not set to 1')
+class TestFrameSetSelectExtractFace(unittest.TestCase):
+    """
+    This class benchmarks face detection (see BatchMTCNN) over the frames of
+    the videos in tests/support at their size and upscaled to 1080p for each
+    maximum side (the 'detect-max-side' option) and for each tracking
+    interval (the 'track' option). The recall is the fraction of the faces
+    detected in the full size frames (in every frame) that are detected (with
+    an IoU of at least 0.5) in the downscaled frames (or tracked).
+    """
+
+    def frames(self, height):
+        support = os.path.dirname(os.path.realpath(__file__)) + '/../support'
+
+        frames = []
+
+        for filename in ['video_0000.mp4', 'video_0001.mp4']:
+            vc = cv2.VideoCapture(os.path.join(support, filename))
+
+            while True:
+                ret, frame = vc.read()
+
+                if not ret:
+                    break
+
+                if frame.shape[0] != height:
+                    width = int(round(frame.shape[1] * height /
+                                      frame.shape[0]))
+
+                    frame = cv2.resize(frame, (width, height),
+                                       interpolation=cv2.INTER_CUBIC)
+
+                frames.append(frame)
+
+            vc.release()
+
+        return frames
+
+    def iou(self, box_1, box_2):
+        x1, y1, w1, h1 = box_1
+        x2, y2, w2, h2 = box_2
+
+        w = max(0, min(x1 + w1, x2 + w2) - max(x1, x2))
+        h = max(0, min(y1 + h1, y2 + h2) - max(y1, y2))
+
+        return w * h / (w1 * h1 + w2 * h2 - w * h)
+
+    def detect(self, detector, frames):
+        # build the networks' predict functions for the frame size (untimed)
+        detector.detect_faces(frames[:8])
+
+        start = time.time()
+
+        faces = []
+
+        for i in range(0, len(frames), 8):
+            faces.extend(detector.detect_faces(frames[i:i + 8]))
+
+        return faces, time.time() - start
+
+    def recall(self, expected, result):
+        count = sum(len(faces) for faces in expected)
+
+        found = sum(
+            any(self.iou(face['box'], face_['box']) >= 0.5
+                for face_ in faces_)
+            for faces, faces_ in zip(expected, result)
+            for face in faces)
+
+        return count, found / count if count else 1.0
+
+    def test_detect_max_side(self):
+        mtcnn = ModelCache.get('mtcnn')
+
+        for height in [720, 1080]:
+            frames = self.frames(height)
+
+            expected, full = self.detect(BatchMTCNN(mtcnn), frames)
+
+            count, _ = self.recall(expected, expected)
+
+            for max_side in [1280, 960, 640, 480]:
+                if max_side >= frames[0].shape[1]:
+                    continue
+
+                result, elapsed = self.detect(
+                    BatchMTCNN(mtcnn, max_side=max_side), frames)
+
+                _, recall = self.recall(expected, result)
+
+                print(f'\ndetect_faces {len(frames)} {height}p frames '
+                      f'({count} faces): full size {full:.2f}s, '
+                      f'detect_max_side {max_side} {elapsed:.2f}s '
+                      f'({full / elapsed:.2f}x), recall {recall:.2f}')
+
+                self.assertGreaterEqual(recall, 0.8)
+
+    def test_track(self):
+        mtcnn = ModelCache.get('mtcnn')
+
+        frames = self.frames(720)
+
+        expected, full = self.detect(BatchMTCNN(mtcnn), frames)
+
+        for interval in [5, 10]:
+            detector = FaceTracker(BatchMTCNN(mtcnn), interval)
+
+            start = time.time()
+
+            result = detector.detect_faces(frames)
+
+            elapsed = time.time() - start
+
+            count, recall = self.recall(expected, result)
+
+            print(f'\ndetect_faces {len(frames)} 720p frames ({count} '
+                  f'faces): every frame {full:.2f}s, track {interval} '
+                  f'{elapsed:.2f}s ({full / elapsed:.2f}x), recall '
+                  f'{recall:.2f}')
+
+            self.assertGreaterEqual(recall, 0.8)
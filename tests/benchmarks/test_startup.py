@@ -0,0 +1,44 @@
+import mock
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+from deepstar.util.tempdir import tempdir
+
+from . import benchmark_enabled
+
+
+@unittest.skipUnless(benchmark_enabled(), 'BENCHMARK is not set to 1')
+class TestStartup(unittest.TestCase):
+    """
+    This class benchmarks the startup time of list commands. The target (in
+    seconds) may be overridden by the STARTUP_TIME_TARGET environment variable.
+    """
+
+    def run_command(self, args):
+        path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            '../../main.py')
+
+        times = []
+
+        for _ in range(0, 3):
+            start = time.time()
+
+            subprocess.run([sys.executable, path] + args,
+                           stdout=subprocess.DEVNULL, check=True)
+
+            times.append(time.time() - start)
+
+        return min(times)
+
+    def test_list(self):
+        target = float(os.environ.get('STARTUP_TIME_TARGET', '2.0'))
+
+        with tempdir() as tempdir_:
+            with mock.patch.dict(os.environ, {'DEEPSTAR_PATH': tempdir_}):
+                for args in [['list', 'videos'], ['list', 'frame_sets'],
+                             ['list', 'transform_sets']]:
+                    self.assertLess(self.run_command(args), target,
+                                    ' '.join(args))
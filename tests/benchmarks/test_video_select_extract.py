@@ -0,0 +1,222 @@
+import mock
+import os
+import time
+import unittest
+
+from deepstar.filesystem.video_file import VideoFile
+from deepstar.models.frame_model import FrameModel
+from deepstar.models.video_model import VideoModel
+from deepstar.plugins.default_video_select_extract_plugin import \
+    DefaultVideoSelectExtractPlugin
+
+from . import benchmark_enabled, create_video
+from unit import deepstar_path
+
+
+@unittest.skipUnless(benchmark_enabled(), 'BENCHMARK is not set to 1')
+class TestVideoSelectExtract(unittest.TestCase):
+    """
+    This class benchmarks DefaultVideoSelectExtractPlugin. The video length
+    and number of jobs may be overridden by the BENCHMARK_LENGTH and
+    BENCHMARK_JOBS environment variables.
+    """
+
+    def test_segments(self):
+        length = int(os.environ.get('BENCHMARK_LENGTH', '1800'))
+        jobs = int(os.environ.get('BENCHMARK_JOBS', str(os.cpu_count())))
+
+        with deepstar_path():
+            create_video(VideoFile.path('video.mp4'), length)
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                start = time.time()
+
+                frame_set_id = plugin.video_select_extract(1)
+
+                serial = time.time() - start
+
+                start = time.time()
+
+                frame_set_id_ = plugin.video_select_extract(1, jobs=jobs)
+
+                segments = time.time() - start
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)), length)
+            self.assertEqual(len(FrameModel().list(frame_set_id_)), length)
+
+            print(f'\nvideo_select_extract {length} frames: serial '
+                  f'{serial:.2f}s, {jobs} segments {segments:.2f}s '
+                  f'({serial / segments:.2f}x)')
+
+    def test_sub_sample(self):
+        length = int(os.environ.get('BENCHMARK_LENGTH', '1800'))
+
+        with deepstar_path():
+            create_video(VideoFile.path('video.mp4'), length)
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            for sub_sample in [30, 300]:
+                times = {}
+
+                for name, stride in [('grab', length + 1), ('seek', 1)]:
+                    with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                        with mock.patch.object(plugin, 'seek_min_stride',
+                                               stride):
+                            start = time.time()
+
+                            plugin.video_select_extract(
+                                1, sub_sample=sub_sample)
+
+                            times[name] = time.time() - start
+
+                print(f'\nvideo_select_extract {length} frames sub_sample '
+                      f'{sub_sample}: grab {times["grab"]:.2f}s, seek '
+                      f'{times["seek"]:.2f}s')
+
+    def test_scene_threshold(self):
+        length = int(os.environ.get('BENCHMARK_LENGTH', '1800'))
+
+        with deepstar_path():
+            create_video(VideoFile.path('video.mp4'), length,
+                         scene_length=300)
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                start = time.time()
+
+                frame_set_id = plugin.video_select_extract(1)
+
+                every = time.time() - start
+
+                start = time.time()
+
+                frame_set_id_ = plugin.video_select_extract(
+                    1, scene_threshold=0.05, max_gap=150)
+
+                scene = time.time() - start
+
+            count = len(FrameModel().list(frame_set_id))
+            count_ = len(FrameModel().list(frame_set_id_))
+
+            self.assertEqual(count, length)
+            self.assertLess(count_, length / 10)
+
+            print(f'\nvideo_select_extract {length} frames (scenes of 300 '
+                  f'frames): every frame {count} frames {every:.2f}s, '
+                  f'scene_threshold 0.05 {count_} frames {scene:.2f}s')
+
+    def test_window(self):
+        length = int(os.environ.get('BENCHMARK_LENGTH', '1800'))
+
+        with deepstar_path():
+            create_video(VideoFile.path('video.mp4'), length)
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                start = time.time()
+
+                frame_set_id = plugin.video_select_extract(1)
+
+                every = time.time() - start
+
+                start = time.time()
+
+                frame_set_id_ = plugin.video_select_extract(1, window=30)
+
+                window = time.time() - start
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)), length)
+            self.assertEqual(len(FrameModel().list(frame_set_id_)),
+                             -(-length // 30))
+
+            print(f'\nvideo_select_extract {length} frames: every frame '
+                  f'{every:.2f}s, sharpest per 30 frame window '
+                  f'{window:.2f}s')
+
+    def test_time_range(self):
+        length = int(os.environ.get('BENCHMARK_LENGTH', '1800'))
+
+        with deepstar_path():
+            create_video(VideoFile.path('video.mp4'), length)
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            # the last 10% of the video
+            start_time = length * 0.9 / 30
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                start = time.time()
+
+                plugin.video_select_extract(1)
+
+                every = time.time() - start
+
+                start = time.time()
+
+                frame_set_id = plugin.video_select_extract(
+                    1, start_time=start_time)
+
+                range_ = time.time() - start
+
+                start = time.time()
+
+                frame_set_id_ = plugin.video_select_extract(1, fps=2)
+
+                fps = time.time() - start
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)),
+                             length - int(length * 0.9))
+            self.assertEqual(len(FrameModel().list(frame_set_id_)),
+                             -(-length // 15))
+
+            print(f'\nvideo_select_extract {length} frames: every frame '
+                  f'{every:.2f}s, last 10% (from {start_time:.1f}s) '
+                  f'{range_:.2f}s, 2 fps {fps:.2f}s')
+
+    def test_reextract(self):
+        length = int(os.environ.get('BENCHMARK_LENGTH', '1800'))
+
+        with deepstar_path():
+            create_video(VideoFile.path('video.mp4'), length)
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            # e.g. the 1% of frames that survived curation
+            frame_numbers = list(range(0, length, 100))
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                start = time.time()
+
+                plugin.video_select_extract(1)
+
+                every = time.time() - start
+
+                start = time.time()
+
+                frame_set_id = plugin.video_select_reextract(1, frame_numbers)
+
+                reextract = time.time() - start
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)),
+                             len(frame_numbers))
+
+            print(f'\nvideo_select_reextract {len(frame_numbers)} of {length} '
+                  f'frames: every frame {every:.2f}s, re-extract '
+                  f'{reextract:.2f}s ({every / reextract:.2f}x)')
@@ -0,0 +1,126 @@
+from io import StringIO
+import mock
+import os
+import sys
+import unittest
+
+from deepstar.command_line_route_handlers.blob_command_line_route_handler \
+    import BlobCommandLineRouteHandler
+from deepstar.command_line_route_handlers \
+    .frame_set_command_line_route_handler \
+    import FrameSetCommandLineRouteHandler
+from deepstar.command_line_route_handlers.video_command_line_route_handler \
+    import VideoCommandLineRouteHandler
+from deepstar.filesystem.frame_file import FrameFile
+from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
+from deepstar.models.blob_model import BlobModel
+
+from .. import deepstar_path
+
+
+class TestBlobCommandLineRouteHandler(unittest.TestCase):
+    """
+    This class tests the BlobCommandLineRouteHandler class.
+    """
+
+    def test_blob_store(self):
+        with deepstar_path():
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0',
+                                              'DEEPSTAR_BLOB_STORE': '1'}):
+                route_handler = VideoCommandLineRouteHandler()
+
+                video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+                route_handler.insert_file(video_0001)
+
+                route_handler.select_extract([1])
+
+                FrameSetCommandLineRouteHandler().select_clone([1])
+
+            blob_model = BlobModel()
+
+            # 5 frames and 5 thumbnails referenced by 2 frame sets
+            count, refs, size, ref_size = blob_model.stats()
+            self.assertEqual(count, 10)
+            self.assertEqual(refs, 20)
+            self.assertEqual(ref_size, size * 2)
+
+            p1 = FrameSetSubDir.path(1)
+            p2 = FrameSetSubDir.path(2)
+
+            self.assertTrue(os.path.samefile(FrameFile.path(p1, 1, 'jpg'),
+                                             FrameFile.path(p2, 6, 'jpg')))
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                FrameSetCommandLineRouteHandler().delete([1])
+
+            self.assertEqual(blob_model.stats()[:2], (10, 10))
+
+            args = ['main.py', 'gc', 'blobs']
+            opts = {}
+
+            route_handler = BlobCommandLineRouteHandler()
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            self.assertEqual(actual, '0 blobs (0 bytes) were successfully removed')  # noqa
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                FrameSetCommandLineRouteHandler().delete([2])
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            self.assertEqual(actual, f'10 blobs ({size} bytes) were successfully removed')  # noqa
+
+            self.assertEqual(blob_model.stats(), (0, 0, 0, 0))
+
+    def test_list(self):
+        with deepstar_path():
+            args = ['main.py', 'list', 'blobs']
+            opts = {}
+
+            route_handler = BlobCommandLineRouteHandler()
+
+            try:
+                sys.stdout = StringIO()
+                with mock.patch.dict(os.environ, {'DEEPSTAR_BLOB_STORE': '0'}):  # noqa
+                    route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            expected = 'enabled=False\n' \
+                       'blobs | refs | size | referenced size\n' \
+                       '-------------------------------------\n' \
+                       '0 | 0 | 0 | 0'
+
+            self.assertEqual(actual, expected)
+
+    def test_usage(self):
+        with deepstar_path():
+            route_handler = BlobCommandLineRouteHandler()
+
+            args = ['main.py', 'usage', 'blobs']
+            opts = {}
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            self.assertTrue('Usage - Blobs' in actual)
@@ -7,18 +7,23 @@ import sys
 import textwrap
 import unittest
 
+import cv2
+
 from deepstar.filesystem.frame_file import FrameFile
 from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
 from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
 from deepstar.models.frame_model import FrameModel
 from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.model import Model
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
 from deepstar.models.video_model import VideoModel
 from deepstar.plugins.plugin import Plugin
+from deepstar.util.codec import Codec
 from deepstar.util.command_line_route_handler_error import \
     CommandLineRouteHandlerError
+from deepstar.util.model_cache import ModelCache
 from deepstar.command_line_route_handlers \
     .frame_set_command_line_route_handler \
     import FrameSetCommandLineRouteHandler
@@ -213,6 +218,57 @@ class TestFrameSetCommandLineRouteHandler(unittest.TestCase):
             self.assertTrue(os.path.isfile(TransformFile.path(p1, 4, 'jpg')))
             self.assertTrue(os.path.isfile(TransformFile.path(p1, 5, 'jpg')))
 
+    def test_select_extract_face_fails_with_invalid_options(self):
+        with deepstar_path():
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                route_handler = VideoCommandLineRouteHandler()
+
+                video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+                route_handler.insert_file(video_0001)
+
+                route_handler.select_extract([1])
+
+            args = ['main.py', 'select', 'frame_sets', '1', 'extract', 'face']
+            opts = {'detect-max-side': '10'}
+
+            with self.assertRaises(CommandLineRouteHandlerError):
+                try:
+                    FrameSetCommandLineRouteHandler().handle(args, opts)
+                except CommandLineRouteHandlerError as e:
+                    self.assertEqual(e.message, 'The maximum side must be 0 or at least 12 (got 10)')  # noqa
+
+                    raise e
+
+            self.assertEqual(TransformSetModel().list(), [])
+
+    def test_select_extract_face_warms_models(self):
+        with deepstar_path():
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                route_handler = VideoCommandLineRouteHandler()
+
+                video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+                route_handler.insert_file(video_0001)
+
+                route_handler.select_extract([1, 1])
+
+            args = ['main.py', 'select', 'frame_sets', '1-2', 'extract', 'face']  # noqa
+            opts = {}
+
+            with mock.patch.object(ModelCache, 'warm', side_effect=ValueError('The model failed to load')) as warm:  # noqa
+                with self.assertRaises(CommandLineRouteHandlerError):
+                    try:
+                        FrameSetCommandLineRouteHandler().handle(args, opts)
+                    except CommandLineRouteHandlerError as e:
+                        self.assertEqual(e.message, 'The model failed to load')  # noqa
+
+                        raise e
+
+            warm.assert_called_once_with(['mtcnn'])
+
+            self.assertEqual(TransformSetModel().list(), [])
+
     def test_select_extract_transform_set(self):
         with deepstar_path():
             with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
@@ -674,6 +730,52 @@ class TestFrameSetCommandLineRouteHandler(unittest.TestCase):
             self.assertTrue(os.path.isfile(FrameFile.path(p1, 28, 'jpg', '192x192')))  # noqa
             self.assertTrue(os.path.isfile(FrameFile.path(p1, 29, 'jpg', '192x192')))  # noqa
 
+    def test_select_merge_codec(self):
+        with deepstar_path():
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                route_handler = VideoCommandLineRouteHandler()
+
+                video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+                route_handler.insert_file(video_0001)
+                route_handler.insert_file(video_0001)
+
+                route_handler.select_extract([1])
+
+                with mock.patch.dict(os.environ, {'DEEPSTAR_CODEC': 'png:1'}):
+                    route_handler.select_extract([2])
+
+            args = ['main.py', 'select', 'frame_sets', '1-2', 'merge']
+            opts = {}
+
+            try:
+                sys.stdout = StringIO()
+                with mock.patch.dict(os.environ, {'DEEPSTAR_CODEC': 'png:1'}):
+                    FrameSetCommandLineRouteHandler().handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            self.assertEqual(actual, 'frame_set_id=3, fk_videos=None')
+
+            # db
+            self.assertEqual(FrameSetModel().codec(3), Codec('png:1'))
+
+            # files (frames 11-15 are transcoded, frames 16-20 are linked)
+            p1 = FrameSetSubDir.path(3)
+            p2 = FrameSetSubDir.path(2)
+
+            for frame_id in range(11, 21):
+                for res in ['', '192x192']:
+                    with open(FrameFile.path(p1, frame_id, 'png', res), 'rb') as file_:  # noqa
+                        self.assertEqual(file_.read(4), b'\x89PNG')
+
+            for frame_id in range(16, 21):
+                with open(FrameFile.path(p1, frame_id, 'png'), 'rb') as file_:
+                    with open(FrameFile.path(p2, frame_id - 10, 'png'), 'rb') as file__:  # noqa
+                        self.assertEqual(file_.read(), file__.read())
+
     def test_select_merge_fails_to_select_a_frame_set(self):
         with deepstar_path():
             args = ['main.py', 'select', 'frame_sets', '1,2', 'merge']
@@ -687,6 +789,143 @@ class TestFrameSetCommandLineRouteHandler(unittest.TestCase):
 
                     raise e
 
+    def test_select_reextract(self):
+        with deepstar_path():
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                route_handler = VideoCommandLineRouteHandler()
+
+                video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+                route_handler.insert_file(video_0001)
+
+                route_handler.select_extract([1])
+
+            frame_model = FrameModel()
+
+            frame_model.update(2, 1)
+            frame_model.update(4, 1)
+
+            args = ['main.py', 'select', 'frame_sets', '1', 'reextract']
+            opts = {}
+
+            try:
+                sys.stdout = StringIO()
+                FrameSetCommandLineRouteHandler().handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            self.assertEqual(actual, 'frame_set_id=2, fk_videos=1')
+
+            # db
+            self.assertEqual(FrameSetModel().select(2), (2, 1))
+
+            result = frame_model.positions(2)
+            self.assertEqual(result, [(6, 0, 0.0), (7, 2, 66.733), (8, 4, 133.467)])  # noqa
+
+            # files (the frames are re-extracted as they were extracted)
+            p1 = FrameSetSubDir.path(2)
+            p2 = FrameSetSubDir.path(1)
+
+            for frame_id, frame_id_ in [(6, 1), (7, 3), (8, 5)]:
+                for res in ['', '192x192']:
+                    with open(FrameFile.path(p1, frame_id, 'jpg', res), 'rb') as file_:  # noqa
+                        with open(FrameFile.path(p2, frame_id_, 'jpg', res), 'rb') as file__:  # noqa
+                            self.assertEqual(file_.read(), file__.read())
+
+    def test_select_reextract_width(self):
+        with deepstar_path():
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                route_handler = VideoCommandLineRouteHandler()
+
+                video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+                route_handler.insert_file(video_0001)
+                route_handler.insert_file(video_0001)
+
+                route_handler.select_extract([1, 2])
+
+            args = ['main.py', 'select', 'frame_sets', '1-2', 'reextract']
+            opts = {'width': '320'}
+
+            try:
+                sys.stdout = StringIO()
+                FrameSetCommandLineRouteHandler().handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            expected = textwrap.dedent('''
+            frame_set_id=3, fk_videos=1
+            frame_set_id=4, fk_videos=2''').strip()
+
+            self.assertEqual(actual, expected)
+
+            # db
+            self.assertEqual(len(FrameModel().list(3)), 5)
+            self.assertEqual(len(FrameModel().list(4)), 5)
+
+            # files
+            p1 = FrameSetSubDir.path(3)
+
+            image = cv2.imread(FrameFile.path(p1, 11, 'jpg'))
+
+            self.assertEqual(image.shape[1], 320)
+
+    def test_select_reextract_fails_to_select_a_frame_set(self):
+        with deepstar_path():
+            args = ['main.py', 'select', 'frame_sets', '1', 'reextract']
+            opts = {}
+
+            with self.assertRaises(CommandLineRouteHandlerError):
+                try:
+                    FrameSetCommandLineRouteHandler().handle(args, opts)
+                except CommandLineRouteHandlerError as e:
+                    self.assertEqual(e.message, 'Frame set with ID 00000001 not found')  # noqa
+
+                    raise e
+
+    def test_select_reextract_fails_without_a_video(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            args = ['main.py', 'select', 'frame_sets', '1', 'reextract']
+            opts = {}
+
+            with self.assertRaises(CommandLineRouteHandlerError):
+                try:
+                    FrameSetCommandLineRouteHandler().handle(args, opts)
+                except CommandLineRouteHandlerError as e:
+                    self.assertEqual(e.message, 'Frame set with ID 00000001 does not correspond to a video')  # noqa
+
+                    raise e
+
+    def test_select_reextract_fails_without_a_frame_number(self):
+        with deepstar_path():
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                route_handler = VideoCommandLineRouteHandler()
+
+                video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+                route_handler.insert_file(video_0001)
+
+                route_handler.select_extract([1])
+
+            Model.execute('UPDATE frames SET frame_number = NULL WHERE id = 3')
+
+            args = ['main.py', 'select', 'frame_sets', '1', 'reextract']
+            opts = {}
+
+            with self.assertRaises(CommandLineRouteHandlerError):
+                try:
+                    FrameSetCommandLineRouteHandler().handle(args, opts)
+                except CommandLineRouteHandlerError as e:
+                    self.assertEqual(e.message, 'Frame with ID 00000003 does not have a frame number')  # noqa
+
+                    raise e
+
     def test_insert_images(self):
         with deepstar_path():
             image_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/image_0001.jpg'  # noqa
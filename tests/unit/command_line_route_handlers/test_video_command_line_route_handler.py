@@ -19,6 +19,8 @@ from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
 from deepstar.filesystem.video_file import VideoFile
 from deepstar.models.frame_model import FrameModel
 from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.job_model import JobModel
+from deepstar.models.model import Model
 from deepstar.models.video_model import VideoModel
 from deepstar.plugins.plugin import Plugin
 from deepstar.util.command_line_route_handler_error import \
@@ -65,8 +67,11 @@ class TestVideoCommandLineRouteHandler(unittest.TestCase):
             UUID(result[2].rstrip('.mp4'), version=4)
             self.assertEqual(result[3], None)
 
+            result = VideoModel().probe(1)
+            self.assertEqual(result, (5, 30000 / 1001, 1280, 720, 166.833, 'h264'))  # noqa
+
             # files
-            self.assertTrue(os.path.isfile(VideoFile.path(result[2])))
+            self.assertTrue(os.path.isfile(VideoFile.path(VideoModel().select(1)[2])))  # noqa
 
     def test_insert_file_description(self):
         with deepstar_path():
@@ -675,7 +680,8 @@ class TestVideoCommandLineRouteHandler(unittest.TestCase):
     def test_list(self):
         with deepstar_path():
             video_model = VideoModel()
-            video_model.insert('test1', 'test2')
+            video_model.insert('test1', 'test2', None,
+                               (5, 29.97, 1280, 720, 166.833, 'h264'))
             video_model.insert('test3', 'test4')
             video_model.insert('test5', 'test6')
 
@@ -694,11 +700,11 @@ class TestVideoCommandLineRouteHandler(unittest.TestCase):
             # stdout
             expected = textwrap.dedent('''
             3 results
-            id | uri | filename | description
-            ---------------------------------
-            1 | test1 | test2 | None
-            2 | test3 | test4 | None
-            3 | test5 | test6 | None''').strip()
+            id | uri | filename | description | frame_count | fps | width | height | duration | fourcc
+            -----------------------------------------------------------------------------------------
+            1 | test1 | test2 | None | 5 | 29.97 | 1280 | 720 | 166.833 | h264
+            2 | test3 | test4 | None | None | None | None | None | None | None
+            3 | test5 | test6 | None | None | None | None | None | None | None''').strip()  # noqa
 
             self.assertEqual(actual, expected)
 
@@ -790,6 +796,93 @@ class TestVideoCommandLineRouteHandler(unittest.TestCase):
 
             self.assertEqual(actual, expected)
 
+    def test_select_extract_many_jobs(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+            shutil.copyfile(video_0001, VideoFile.path('video_0002.mp4'))
+            shutil.copyfile(video_0001, VideoFile.path('video_0003.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+            VideoModel().insert('test', 'video_0002.mp4')
+            VideoModel().insert('test', 'video_0003.mp4')
+
+            args = ['main.py', 'select', 'videos', '1-2,3', 'extract']
+            opts = {'jobs': '2'}
+
+            route_handler = VideoCommandLineRouteHandler()
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            expected = textwrap.dedent('''
+            Video with ID 00000001 decoded to 5 frames (1/3)
+            frame_set_id=1, video_id=1
+            Video with ID 00000002 decoded to 5 frames (2/3)
+            frame_set_id=2, video_id=2
+            Video with ID 00000003 decoded to 5 frames (3/3)
+            frame_set_id=3, video_id=3
+            ''').strip()
+
+            self.assertEqual(actual, expected)
+
+            # db
+            self.assertEqual(FrameModel().list(3)[0], (11, 3, 0))
+            self.assertEqual(FrameModel().list(3)[-1], (15, 3, 0))
+
+    def test_select_extract_resume(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+            shutil.copyfile(video_0001, VideoFile.path('video_0002.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+            VideoModel().insert('test', 'video_0002.mp4')
+
+            args = ['main.py', 'select', 'videos', '1-2', 'extract']
+            opts = {'sub-sample': '2'}
+
+            route_handler = VideoCommandLineRouteHandler()
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # interrupt the extraction of video 2 after its first frame
+            Model.execute('DELETE FROM frames WHERE fk_frame_sets = 2 AND id > 4')  # noqa
+            JobModel().update(2, checkpoint=0, finished=0)
+
+            opts = {'sub-sample': '2', 'resume': True, 'jobs': '2'}
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            expected = textwrap.dedent('''
+            frame_set_id=1, video_id=1
+            frame_set_id=2, video_id=2
+            ''').strip()
+
+            self.assertEqual(actual, expected)
+
+            # db
+            self.assertEqual(len(FrameSetModel().list()), 2)
+            self.assertEqual([r[1] for r in FrameModel().positions(2)], [0, 2, 4])  # noqa
+            self.assertEqual(JobModel().select(2)[6:], (4, 1))
+
     def test_select_extract_sub_sample(self):
         with deepstar_path():
             video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
@@ -873,6 +966,152 @@ class TestVideoCommandLineRouteHandler(unittest.TestCase):
             self.assertTrue(os.path.isfile(FrameFile.path(p1, 1, 'jpg', '192x192')))  # noqa
             self.assertTrue(os.path.isfile(FrameFile.path(p1, 2, 'jpg', '192x192')))  # noqa
 
+    def test_select_extract_scene_threshold(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            args = ['main.py', 'select', 'videos', '1', 'extract']
+            opts = {'scene-threshold': '0.5', 'max-gap': '2'}
+
+            route_handler = VideoCommandLineRouteHandler()
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            self.assertEqual(actual, 'frame_set_id=1, video_id=1')
+
+            # db
+            result = FrameModel().list(1)
+            self.assertEqual(len(result), 3)
+            self.assertEqual(result[0], (1, 1, 0))
+            self.assertEqual(result[1], (2, 1, 0))
+            self.assertEqual(result[2], (3, 1, 0))
+
+    def test_select_extract_fails_with_an_invalid_scene_threshold(self):
+        with deepstar_path():
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            args = ['main.py', 'select', 'videos', '1', 'extract']
+            opts = {'scene-threshold': '0.5', 'min-gap': '0'}
+
+            with self.assertRaises(CommandLineRouteHandlerError):
+                try:
+                    VideoCommandLineRouteHandler().handle(args, opts)
+                except CommandLineRouteHandlerError as e:
+                    self.assertEqual(e.message, 'The minimum gap must be at least 1 (got 0)')  # noqa
+
+                    raise e
+
+    def test_select_extract_window(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            args = ['main.py', 'select', 'videos', '1', 'extract']
+            opts = {'window': '2'}
+
+            route_handler = VideoCommandLineRouteHandler()
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            self.assertEqual(actual, 'frame_set_id=1, video_id=1')
+
+            # db
+            result = FrameModel().list(1)
+            self.assertEqual(len(result), 3)
+            self.assertEqual(result[0], (1, 1, 0))
+            self.assertEqual(result[1], (2, 1, 0))
+            self.assertEqual(result[2], (3, 1, 0))
+
+    def test_select_extract_time_range(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            args = ['main.py', 'select', 'videos', '1', 'extract']
+            opts = {'start-time': '00:00:00.05', 'end-time': '0.12'}
+
+            route_handler = VideoCommandLineRouteHandler()
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            self.assertEqual(actual, 'frame_set_id=1, video_id=1')
+
+            # db
+            result = [(r[0], r[2]) for r in FrameModel().positions(1)]
+            self.assertEqual(result, [(1, 66.733), (2, 100.1)])
+
+    def test_select_extract_fps(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            args = ['main.py', 'select', 'videos', '1', 'extract']
+            opts = {'fps': '15'}
+
+            route_handler = VideoCommandLineRouteHandler()
+
+            try:
+                sys.stdout = StringIO()
+                route_handler.handle(args, opts)
+                actual = sys.stdout.getvalue().strip()
+            finally:
+                sys.stdout = sys.__stdout__
+
+            # stdout
+            self.assertEqual(actual, 'frame_set_id=1, video_id=1')
+
+            # db
+            result = [(r[0], r[2]) for r in FrameModel().positions(1)]
+            self.assertEqual(result, [(1, 0.0), (2, 66.733), (3, 133.467)])
+
+    def test_select_extract_fails_with_an_invalid_time(self):
+        with deepstar_path():
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            args = ['main.py', 'select', 'videos', '1', 'extract']
+
+            for opts, message in [
+                    ({'start-time': '1:a'}, "'1:a' is not a valid time (expected [[HH:]MM:]SS[.fff])"),  # noqa
+                    ({'start-time': '2', 'end-time': '1'}, 'The end time must be 0 or after the start time (got 1.0)')]:  # noqa
+                with self.assertRaises(CommandLineRouteHandlerError):
+                    try:
+                        VideoCommandLineRouteHandler().handle(args, opts)
+                    except CommandLineRouteHandlerError as e:
+                        self.assertEqual(e.message, message)
+
+                        raise e
+
     def test_select_extract_fails_to_select_a_video(self):
         with deepstar_path():
             args = ['main.py', 'select', 'videos', '1', 'extract']
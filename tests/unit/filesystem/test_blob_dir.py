@@ -0,0 +1,22 @@
+import mock
+import os
+import unittest
+
+from deepstar.filesystem.blob_dir import BlobDir
+
+from .. import deepstar_path
+
+
+class TestBlobDir(unittest.TestCase):
+    """
+    This class tests the BlobDir class.
+    """
+
+    def test_path(self):
+        with mock.patch.dict(os.environ, {'DEEPSTAR_PATH': 'test'}):
+            self.assertEqual(BlobDir.path(), os.path.realpath('test/files/blobs'))  # noqa
+
+    def test_init(self):
+        with deepstar_path():
+            BlobDir.init()
+            self.assertTrue(os.path.isdir(BlobDir.path()))
@@ -0,0 +1,15 @@
+import mock
+import os
+import unittest
+
+from deepstar.filesystem.blob_file import BlobFile
+
+
+class TestBlobFile(unittest.TestCase):
+    """
+    This class tests the BlobFile class.
+    """
+
+    def test_path(self):
+        with mock.patch.dict(os.environ, {'DEEPSTAR_PATH': 'test'}):
+            self.assertEqual(BlobFile.path('abcdef'), os.path.realpath('test/files/blobs/ab/abcdef'))  # noqa
@@ -0,0 +1,182 @@
+import mock
+import os
+import unittest
+
+from deepstar.filesystem.blob_file import BlobFile
+from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
+from deepstar.models.blob_model import BlobModel
+from deepstar.models.model import Model
+
+from .. import deepstar_path
+
+
+class TestBlobModel(unittest.TestCase):
+    """
+    This class tests the BlobModel class.
+    """
+
+    def mock_frame_set(self, frame_set_id, data):
+        p1 = FrameSetSubDir.path(frame_set_id)
+
+        os.makedirs(p1)
+
+        for i, d in enumerate(data):
+            with open(os.path.join(p1, f'{i + 1:08X}.jpg'), 'wb') as file_:
+                file_.write(d)
+
+        return p1
+
+    def test_init(self):
+        with deepstar_path():
+            BlobModel.init()
+
+            self.assertEqual(BlobModel().stats(), (0, 0, 0, 0))
+
+    def test_enabled(self):
+        with mock.patch.dict(os.environ, {'DEEPSTAR_BLOB_STORE': '1'}):
+            self.assertTrue(BlobModel.enabled())
+
+        with mock.patch.dict(os.environ, {'DEEPSTAR_BLOB_STORE': '0'}):
+            self.assertFalse(BlobModel.enabled())
+
+    def test_insert(self):
+        with deepstar_path():
+            p1 = self.mock_frame_set(1, [b'test1', b'test2', b'test1'])
+
+            blob_model = BlobModel()
+
+            path1 = os.path.join(p1, '00000001.jpg')
+            path3 = os.path.join(p1, '00000003.jpg')
+
+            self.assertEqual(blob_model.insert(path1), 1)
+            self.assertEqual(blob_model.insert(path3), 1)
+
+            result = blob_model.select(path3)
+            self.assertEqual(result[0], 1)
+            self.assertEqual(result[3], 5)
+            self.assertEqual(result[4], 2)
+
+            # the duplicate is replaced with a hardlink to the blob
+            blob_path = BlobFile.path(result[1])
+            self.assertTrue(os.path.samefile(path1, blob_path))
+            self.assertTrue(os.path.samefile(path3, blob_path))
+
+            with open(path3, 'rb') as file_:
+                self.assertEqual(file_.read(), b'test1')
+
+            # inserting again is a no-op
+            self.assertEqual(blob_model.insert(path3), 1)
+            self.assertEqual(blob_model.stats(), (1, 2, 5, 10))
+
+    def test_insert_replaced_file(self):
+        with deepstar_path():
+            p1 = self.mock_frame_set(1, [b'test1'])
+
+            blob_model = BlobModel()
+
+            path1 = os.path.join(p1, '00000001.jpg')
+
+            blob_model.insert(path1)
+
+            os.remove(path1)
+
+            with open(path1, 'wb') as file_:
+                file_.write(b'test2')
+
+            self.assertEqual(blob_model.insert(path1), 2)
+            self.assertEqual(blob_model.stats(), (2, 1, 10, 5))
+
+    def test_insert_dir(self):
+        with deepstar_path():
+            p1 = self.mock_frame_set(1, [b'test1', b'test2', b'test1'])
+            p2 = self.mock_frame_set(2, [b'test2', b'test3'])
+
+            blob_model = BlobModel()
+
+            self.assertEqual(blob_model.insert_dir(p1), 3)
+            self.assertEqual(blob_model.insert_dir(p2), 2)
+
+            self.assertEqual(blob_model.stats(), (3, 5, 15, 25))
+
+    def test_insert_dir_length(self):
+        with deepstar_path():
+            p1 = self.mock_frame_set(1, [b'test1', b'test2', b'test1'])
+
+            blob_model = BlobModel()
+
+            digest = blob_model._digest
+            calls = []
+
+            def _digest(path, stat):
+                calls.append((Model.connection().in_transaction, blob_model.stats()[1]))  # noqa
+
+                return digest(path, stat)
+
+            with mock.patch.object(blob_model, '_digest', _digest):
+                self.assertEqual(blob_model.insert_dir(p1, length=2), 3)
+
+            # the files are hashed outside of the transactions and the first
+            # 2 references are committed before the 3rd file is hashed
+            self.assertEqual(calls, [(False, 0), (False, 0), (False, 2)])
+            self.assertEqual(blob_model.stats(), (2, 3, 10, 15))
+
+    def test_insert_dir_links(self):
+        with deepstar_path():
+            p1 = self.mock_frame_set(1, [b'test1'])
+            p2 = FrameSetSubDir.path(2)
+
+            os.makedirs(p2)
+
+            blob_model = BlobModel()
+
+            blob_model.insert_dir(p1)
+
+            os.link(os.path.join(p1, '00000001.jpg'),
+                    os.path.join(p2, '00000002.jpg'))
+
+            with mock.patch('hashlib.sha256') as sha256:
+                blob_model.insert_dir(p2)
+
+                sha256.assert_not_called()
+
+            self.assertEqual(blob_model.stats(), (1, 2, 5, 10))
+
+    def test_delete_dir(self):
+        with deepstar_path():
+            p1 = self.mock_frame_set(1, [b'test1', b'test2'])
+            p2 = self.mock_frame_set(2, [b'test2'])
+            p16 = self.mock_frame_set(16, [b'test2'])
+
+            blob_model = BlobModel()
+
+            blob_model.insert_dir(p1)
+            blob_model.insert_dir(p2)
+            blob_model.insert_dir(p16)
+
+            self.assertEqual(blob_model.delete_dir(p1), 2)
+
+            self.assertEqual(blob_model.stats(), (2, 2, 10, 10))
+            self.assertIsNone(blob_model.select(os.path.join(p1, '00000001.jpg')))  # noqa
+            self.assertIsNotNone(blob_model.select(os.path.join(p2, '00000001.jpg')))  # noqa
+
+            self.assertEqual(blob_model.delete_dir(p1), 0)
+
+    def test_gc(self):
+        with deepstar_path():
+            p1 = self.mock_frame_set(1, [b'test1', b'test2'])
+            p2 = self.mock_frame_set(2, [b'test2'])
+
+            blob_model = BlobModel()
+
+            blob_model.insert_dir(p1)
+            blob_model.insert_dir(p2)
+
+            blob_path = BlobFile.path(blob_model.select(os.path.join(p1, '00000001.jpg'))[1])  # noqa
+
+            blob_model.delete_dir(p1)
+
+            self.assertEqual(blob_model.gc(), (1, 5))
+            self.assertFalse(os.path.exists(blob_path))
+            self.assertEqual(blob_model.stats(), (1, 1, 5, 5))
+
+            self.assertEqual(blob_model.gc(), (0, 0))
@@ -3,6 +3,7 @@ import unittest
 
 from deepstar.models.frame_model import FrameModel
 from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.model import Model
 from deepstar.models.video_model import VideoModel
 
 from .. import deepstar_path
@@ -99,6 +100,136 @@ class TestFrameModel(unittest.TestCase):
             result = FrameModel().list(1)
             self.assertIsNone(result)
 
+    def test_iterate(self):
+        with deepstar_path():
+            VideoModel().insert('test1', 'test2')
+
+            FrameSetModel().insert(1)
+            FrameSetModel().insert(1)
+
+            frame_model = FrameModel()
+            frame_model.insert(1, 0)
+            frame_model.insert(2, 0)
+            frame_model.insert(1, 1)
+            frame_model.insert(1, 0)
+
+            result = list(frame_model.iterate(1))
+            self.assertEqual(len(result), 3)
+            self.assertEqual(result[0], (1, 1, 0))
+            self.assertEqual(result[1], (3, 1, 1))
+            self.assertEqual(result[2], (4, 1, 0))
+
+            result = list(frame_model.iterate(1, length=1))
+            self.assertEqual(len(result), 3)
+            self.assertEqual(result[0], (1, 1, 0))
+            self.assertEqual(result[1], (3, 1, 1))
+            self.assertEqual(result[2], (4, 1, 0))
+
+            result = list(frame_model.iterate(1, rejected=False, length=1))
+            self.assertEqual(len(result), 2)
+            self.assertEqual(result[0], (1, 1, 0))
+            self.assertEqual(result[1], (4, 1, 0))
+
+            result = list(frame_model.iterate(1, length=1, after=1))
+            self.assertEqual(len(result), 2)
+            self.assertEqual(result[0], (3, 1, 1))
+            self.assertEqual(result[1], (4, 1, 0))
+
+    def test_iterate_fails_to_iterate_frame_set(self):
+        with deepstar_path():
+            result = list(FrameModel().iterate(1))
+            self.assertEqual(result, [])
+
+    def test_batch(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            frame_model = FrameModel()
+            frame_model.insert(1, 0)
+
+            with frame_model.batch(length=2) as batch:
+                self.assertEqual(batch.insert(1, 0), 2)
+                self.assertEqual(batch.insert(1, 1), 3)
+                self.assertEqual(batch.insert(1, 0), 4)
+
+            result = frame_model.list(1)
+            self.assertEqual(result, [(1, 1, 0), (2, 1, 0), (3, 1, 1), (4, 1, 0)])  # noqa
+
+    def test_merge(self):
+        with deepstar_path():
+            frame_set_model = FrameSetModel()
+            frame_set_model.insert(None)
+            frame_set_model.insert(None)
+            frame_set_model.insert(None)
+
+            frame_model = FrameModel()
+            frame_model.insert(1, 0)
+            frame_model.insert(2, 0)
+            frame_model.insert(1, 1)
+            frame_model.insert(1, 0)
+
+            self.assertEqual(frame_model.merge(3, 1), [(1, 5), (3, 6), (4, 7)])  # noqa
+            self.assertEqual(frame_model.list(3), [(5, 3, 0), (6, 3, 1), (7, 3, 0)])  # noqa
+
+            self.assertEqual(frame_model.merge(3, 1, rejected=False), [(1, 8), (4, 9)])  # noqa
+            self.assertEqual(frame_model.count(3), 5)
+
+    def test_merge_while_a_batch_is_open(self):
+        with deepstar_path():
+            frame_set_model = FrameSetModel()
+            frame_set_model.insert(None)
+            frame_set_model.insert(None)
+            frame_set_model.insert(None)
+
+            frame_model = FrameModel()
+            frame_model.insert(1, 0)
+            frame_model.insert(2, 0)
+            frame_model.insert(1, 1)
+            frame_model.insert(1, 0)
+
+            with frame_model.batch(length=5) as batch:
+                self.assertEqual(batch.insert(2, 0), 5)
+                self.assertEqual(batch.insert(2, 1), 6)
+                self.assertEqual(batch.insert(2, 0), 7)
+
+                # the batch's reserved IDs (5-9) are not assigned
+                self.assertEqual(frame_model.merge(3, 1), [(1, 10), (3, 11), (4, 12)])  # noqa
+
+            self.assertEqual(frame_model.list(2), [(2, 2, 0), (5, 2, 0), (6, 2, 1), (7, 2, 0)])  # noqa
+            self.assertEqual(frame_model.list(3), [(10, 3, 0), (11, 3, 1), (12, 3, 0)])  # noqa
+
+            frame_model.insert(1, 0)
+
+            self.assertEqual(frame_model.select(13), (13, 1, 0))
+
+    def test_merge_fails_to_merge_frame_set(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            self.assertEqual(FrameModel().merge(1, 2), [])
+
+    def test_positions(self):
+        with deepstar_path():
+            frame_set_model = FrameSetModel()
+            frame_set_model.insert(None)
+            frame_set_model.insert(None)
+
+            frame_model = FrameModel()
+            frame_model.insert(1, 0, 0.0, 0)
+            frame_model.insert(1, 1, 33.367, 1)
+            frame_model.insert(1, 0)
+
+            with frame_model.batch() as batch:
+                batch.insert(1, 0, 100.1, 3)
+
+            self.assertEqual(frame_model.positions(1), [(1, 0, 0.0), (2, 1, 33.367), (3, None, None), (4, 3, 100.1)])  # noqa
+            self.assertEqual(frame_model.positions(1, rejected=False), [(1, 0, 0.0), (3, None, None), (4, 3, 100.1)])  # noqa
+
+            # merged frames keep their positions
+            frame_model.merge(2, 1)
+
+            self.assertEqual(frame_model.positions(2), [(5, 0, 0.0), (6, 1, 33.367), (7, None, None), (8, 3, 100.1)])  # noqa
+
     def test_update(self):
         with deepstar_path():
             VideoModel().insert('test1', 'test2')
@@ -122,6 +253,53 @@ class TestFrameModel(unittest.TestCase):
             result = FrameModel().update(1, 1)
             self.assertFalse(result)
 
+    def test_set_rejected(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            frame_model = FrameModel()
+            frame_model.insert(1, 0)
+            frame_model.insert(1, 0)
+            frame_model.insert(1, 1)
+
+            self.assertEqual(frame_model.set_rejected([1, 3], 1), 2)
+            self.assertEqual([r[-1] for r in frame_model.list(1)], [1, 0, 1])
+
+            self.assertEqual(frame_model.set_rejected([1, 2, 4], 0), 2)
+            self.assertEqual([r[-1] for r in frame_model.list(1)], [0, 0, 1])
+
+    def test_set_rejected_in_transaction(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            frame_model = FrameModel()
+            frame_model.insert(1, 0)
+            frame_model.insert(1, 0)
+            frame_model.insert(1, 1)
+
+            Model.execute('BEGIN')
+            frame_model.set_rejected([1, 2], 1)
+            self.assertTrue(Model.connection().in_transaction)
+            Model.execute('ROLLBACK')
+
+            self.assertEqual([r[-1] for r in frame_model.list(1)], [0, 0, 1])
+
+    def test_reject_many(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            frame_model = FrameModel()
+            frame_model.insert(1, 0)
+            frame_model.insert(1, 0)
+            frame_model.insert(1, 1)
+
+            self.assertEqual(frame_model.reject_many([2]), 1)
+            self.assertEqual([r[-1] for r in frame_model.list(1)], [0, 1, 1])
+
+    def test_reject_many_fails_to_reject(self):
+        with deepstar_path():
+            self.assertEqual(FrameModel().reject_many([1, 2]), 0)
+
     def test_count(self):
         with deepstar_path():
             VideoModel().insert('test1', 'test2')
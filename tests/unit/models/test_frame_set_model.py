@@ -1,7 +1,12 @@
+import os
 import unittest
 
+import mock
+
+from deepstar.models.model import Model
 from deepstar.models.frame_set_model import FrameSetModel
 from deepstar.models.video_model import VideoModel
+from deepstar.util.codec import Codec
 
 from .. import deepstar_path
 
@@ -37,6 +42,26 @@ class TestFrameSetModel(unittest.TestCase):
             result = frame_set_model.select(1)
             self.assertEqual(result, (1, 1))
 
+    def test_codec(self):
+        with deepstar_path():
+            VideoModel().insert('test1', 'test2')
+
+            frame_set_model = FrameSetModel()
+            frame_set_model.insert(1)
+            frame_set_model.insert(1, Codec('png:1'))
+
+            with mock.patch.dict(os.environ, {'DEEPSTAR_CODEC': 'webp:90'}):
+                frame_set_model.insert(1)
+
+            self.assertEqual(frame_set_model.codec(1), Codec('jpg:100'))
+            self.assertEqual(frame_set_model.codec(2), Codec('png:1'))
+            self.assertEqual(frame_set_model.codec(3), Codec('webp:90'))
+
+            # sets that predate codecs
+            Model.execute('UPDATE frame_sets SET codec = NULL WHERE id = 1')
+
+            self.assertEqual(frame_set_model.codec(1), Codec('jpg:100'))
+
     def test_list(self):
         with deepstar_path():
             VideoModel().insert('test1', 'test2')
@@ -0,0 +1,117 @@
+import unittest
+
+from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.job_model import JobModel
+from deepstar.models.transform_set_model import TransformSetModel
+from deepstar.models.video_model import VideoModel
+
+from .. import deepstar_path
+
+
+class TestJobModel(unittest.TestCase):
+    """
+    This class tests the JobModel class.
+    """
+
+    def test_select(self):
+        with deepstar_path():
+            VideoModel().insert('test1', 'test2')
+
+            FrameSetModel().insert(1)
+
+            job_model = JobModel()
+            job_id = job_model.insert('test', 1, '{}', frame_set_id=1)
+            self.assertEqual(job_id, 1)
+            result = job_model.select(1)
+            self.assertEqual(result, (1, 'test', 1, 1, None, '{}', None, 0))
+
+    def test_select_fails_to_select_job(self):
+        with deepstar_path():
+            result = JobModel().select(1)
+            self.assertIsNone(result)
+
+    def test_find(self):
+        with deepstar_path():
+            job_model = JobModel()
+            job_model.insert('test', 1, '{}')
+            job_model.insert('test', 1, '{}')
+            job_model.insert('test', 1, '{"a": 1}')
+            job_model.insert('test', 2, '{}')
+            job_model.insert('other', 1, '{}')
+
+            # the latest job
+            result = job_model.find('test', 1, '{}')
+            self.assertEqual(result, (2, 'test', 1, None, None, '{}', None, 0))  # noqa
+
+            result = job_model.find('test', 1, '{"a": 1}')
+            self.assertEqual(result, (3, 'test', 1, None, None, '{"a": 1}', None, 0))  # noqa
+
+            result = job_model.find('test', 3, '{}')
+            self.assertIsNone(result)
+
+    def test_update(self):
+        with deepstar_path():
+            job_model = JobModel()
+            job_model.insert('test', 1, '{}')
+
+            result = job_model.update(1, checkpoint=10)
+            self.assertTrue(result)
+            result = job_model.select(1)
+            self.assertEqual(result, (1, 'test', 1, None, None, '{}', 10, 0))
+
+            result = job_model.update(1, checkpoint=20, finished=1)
+            self.assertTrue(result)
+            result = job_model.select(1)
+            self.assertEqual(result, (1, 'test', 1, None, None, '{}', 20, 1))
+
+    def test_update_fails_to_update_job(self):
+        with deepstar_path():
+            result = JobModel().update(1)
+            self.assertFalse(result)
+
+            result = JobModel().update(1, checkpoint=10)
+            self.assertFalse(result)
+
+    def test_list(self):
+        with deepstar_path():
+            job_model = JobModel()
+            job_model.insert('test', 1, '{}')
+            job_model.insert('test', 3, '{}')
+            result = job_model.list()
+            self.assertEqual(len(result), 2)
+            self.assertEqual(result[0], (1, 'test', 1, None, None, '{}', None, 0))  # noqa
+            self.assertEqual(result[1], (2, 'test', 3, None, None, '{}', None, 0))  # noqa
+
+    def test_delete(self):
+        with deepstar_path():
+            job_model = JobModel()
+            job_model.insert('test', 1, '{}')
+            result = job_model.delete(1)
+            self.assertTrue(result)
+            result = job_model.select(1)
+            self.assertIsNone(result)
+
+    def test_delete_fails_to_delete_job(self):
+        with deepstar_path():
+            result = JobModel().delete(1)
+            self.assertFalse(result)
+
+    def test_delete_cascades_from_sets(self):
+        with deepstar_path():
+            VideoModel().insert('test1', 'test2')
+
+            FrameSetModel().insert(1)
+            FrameSetModel().insert(1)
+
+            TransformSetModel().insert('test', 1)
+
+            job_model = JobModel()
+            job_model.insert('test', 1, '{}', frame_set_id=1)
+            job_model.insert('test', 1, '{}', frame_set_id=2)
+            job_model.insert('test', 1, '{}', transform_set_id=1)
+
+            TransformSetModel().delete(1)
+            FrameSetModel().delete(2)
+
+            result = job_model.list()
+            self.assertEqual(result, [(1, 'test', 1, 1, None, '{}', None, 0)])
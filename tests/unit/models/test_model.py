@@ -14,22 +14,28 @@ class TestModel(unittest.TestCase):
 
     def test_init(self):
         with deepstar_path():
-            self.assertEqual(type(Model.db), sqlite3.Connection)
+            self.assertEqual(type(Model.connection()), sqlite3.Connection)
 
     def test_isolation_level(self):
         with deepstar_path():
-            Model.db.execute('CREATE TABLE test (test TEXT)')
-            Model.db.execute("INSERT INTO test (test) VALUES ('test')")
+            Model.execute('CREATE TABLE test (test TEXT)')
+            Model.execute("INSERT INTO test (test) VALUES ('test')")
             Model.close()
             Model.init()
-            self.assertEqual(Model.db.execute('SELECT test FROM test').fetchone(), ('test',))  # noqa
+            self.assertEqual(Model.execute('SELECT test FROM test').fetchone(), ('test',))  # noqa
 
     def test_foreign_key_constraints(self):
         with deepstar_path():
-            Model.db.execute('CREATE TABLE test1 (id INTEGER PRIMARY KEY)')
-            Model.db.execute('CREATE TABLE test2 ( fk_test1 INTEGER, FOREIGN KEY(fk_test1) REFERENCES test1(id))')  # noqa
+            Model.execute('CREATE TABLE test1 (id INTEGER PRIMARY KEY)')
+            Model.execute('CREATE TABLE test2 ( fk_test1 INTEGER, FOREIGN KEY(fk_test1) REFERENCES test1(id))')  # noqa
             with self.assertRaises(sqlite3.IntegrityError):
-                Model.db.execute('INSERT INTO test2 (fk_test1) VALUES (1)')
+                Model.execute('INSERT INTO test2 (fk_test1) VALUES (1)')
+
+    def test_pragmas(self):
+        with deepstar_path():
+            self.assertEqual(Model.execute('PRAGMA journal_mode').fetchone(), ('wal',))  # noqa
+            self.assertEqual(Model.execute('PRAGMA synchronous').fetchone(), (1,))  # noqa
+            self.assertEqual(Model.execute('PRAGMA foreign_keys').fetchone(), (1,))  # noqa
 
     def test_check_same_thread(self):
         with deepstar_path():
@@ -46,7 +52,94 @@ class TestModel(unittest.TestCase):
 
             Model.close()
 
+    def test_connection_per_thread(self):
+        with deepstar_path():
+            connections = []
+
+            def a():
+                connections.append(Model.connection())
+                connections.append(Model.connection())
+
+            thread = threading.Thread(target=a)
+            thread.start()
+            thread.join()
+
+            self.assertIs(connections[0], connections[1])
+            self.assertIsNot(connections[0], Model.connection())
+            self.assertIs(Model.connection(), Model.connection())
+
+    def test_reader_not_blocked_by_writer(self):
+        with deepstar_path():
+            Model.execute('CREATE TABLE test (test TEXT)')
+            Model.execute("INSERT INTO test (test) VALUES ('test1')")
+
+            Model.execute('BEGIN IMMEDIATE')
+            Model.execute("INSERT INTO test (test) VALUES ('test2')")
+
+            result = []
+
+            def a():
+                result.extend(Model.execute('SELECT test FROM test').fetchall())  # noqa
+
+            thread = threading.Thread(target=a)
+            thread.start()
+            thread.join()
+
+            Model.execute('COMMIT')
+
+            self.assertEqual(result, [('test1',)])
+            self.assertEqual(len(Model.execute('SELECT test FROM test').fetchall()), 2)  # noqa
+
+    def test_transaction(self):
+        with deepstar_path():
+            Model.execute('CREATE TABLE test (test TEXT)')
+
+            with Model.transaction():
+                Model.execute("INSERT INTO test (test) VALUES ('test1')")
+                self.assertTrue(Model.connection().in_transaction)
+
+            self.assertFalse(Model.connection().in_transaction)
+
+            with self.assertRaises(ValueError):
+                with Model.transaction():
+                    Model.execute("INSERT INTO test (test) VALUES ('test2')")
+
+                    raise ValueError()
+
+            self.assertFalse(Model.connection().in_transaction)
+            self.assertEqual(Model.execute('SELECT test FROM test').fetchall(), [('test1',)])  # noqa
+
+    def test_transaction_nested(self):
+        with deepstar_path():
+            Model.execute('CREATE TABLE test (test TEXT)')
+
+            with Model.transaction():
+                with Model.transaction():
+                    Model.execute("INSERT INTO test (test) VALUES ('test1')")
+
+                self.assertTrue(Model.connection().in_transaction)
+
+            self.assertEqual(Model.execute('SELECT test FROM test').fetchall(), [('test1',)])  # noqa
+
+    def test_reserve(self):
+        with deepstar_path():
+            Model.execute('CREATE TABLE test (id INTEGER PRIMARY KEY AUTOINCREMENT, test TEXT)')  # noqa
+
+            self.assertEqual(Model.reserve('test', 3), 1)
+            self.assertEqual(Model.reserve('test', 2), 4)
+
+            Model.execute("INSERT INTO test (id, test) VALUES (10, 'test1')")  # noqa
+
+            self.assertEqual(Model.reserve('test', 1), 11)
+
+            Model.execute("INSERT INTO test (test) VALUES ('test2')")
+
+            self.assertEqual(Model.execute('SELECT MAX(id) FROM test').fetchone()[0], 12)  # noqa
+
     def test_close(self):
         with deepstar_path():
+            connection = Model.connection()
             Model.close()
-            self.assertEqual(Model.db, None)
+            with self.assertRaises(sqlite3.ProgrammingError):
+                connection.execute('SELECT 1')
+            self.assertIsNot(Model.connection(), connection)
@@ -0,0 +1,192 @@
+import sqlite3
+import threading
+import unittest
+
+import mock
+
+from deepstar.models.frame_model import FrameModel
+from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.model import Model
+from deepstar.models.model_batch import ModelBatch
+
+from .. import deepstar_path
+
+
+class TestModelBatch(unittest.TestCase):
+    """
+    This class tests the ModelBatch class.
+    """
+
+    def test_insert(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            frame_model = FrameModel()
+            frame_model.insert(1, 0)
+
+            with ModelBatch('frames', ['fk_frame_sets', 'rejected']) as batch:  # noqa
+                self.assertEqual(batch.insert(1, 0), 2)
+                self.assertEqual(batch.insert(1, 1), 3)
+                self.assertIsNone(frame_model.select(2))
+
+            self.assertEqual(frame_model.list(1), [(1, 1, 0), (2, 1, 0), (3, 1, 1)])  # noqa
+
+    def test_insert_flushes_every_length_rows(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            frame_model = FrameModel()
+
+            with ModelBatch('frames', ['fk_frame_sets', 'rejected'], 2) as batch:  # noqa
+                for i in range(0, 5):
+                    batch.insert(1, 0)
+
+                self.assertEqual(frame_model.count(1), 4)
+
+            self.assertEqual(frame_model.count(1), 5)
+            self.assertEqual([r[0] for r in frame_model.list(1)], [1, 2, 3, 4, 5])  # noqa
+
+    def test_insert_rolls_back(self):
+        with deepstar_path():
+            frame_model = FrameModel()
+
+            with self.assertRaises(sqlite3.IntegrityError):
+                with ModelBatch('frames', ['fk_frame_sets', 'rejected']) as batch:  # noqa
+                    batch.insert(1, 0)
+
+            self.assertFalse(Model.connection().in_transaction)
+            self.assertIsNone(frame_model.list(1))
+
+    def test_insert_flushes_on_exception(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            with self.assertRaises(ValueError):
+                with ModelBatch('frames', ['fk_frame_sets', 'rejected']) as batch:  # noqa
+                    batch.insert(1, 0)
+
+                    raise ValueError()
+
+            self.assertEqual(FrameModel().count(1), 1)
+
+    def test_insert_in_transaction(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            Model.execute('BEGIN')
+
+            with ModelBatch('frames', ['fk_frame_sets', 'rejected']) as batch:  # noqa
+                batch.insert(1, 0)
+
+            self.assertTrue(Model.connection().in_transaction)
+
+            Model.execute('ROLLBACK')
+
+            self.assertEqual(FrameModel().count(1), 0)
+
+    def test_insert_does_not_block_other_writers(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            frame_model = FrameModel()
+
+            result = []
+
+            def insert():
+                # a writer on another connection is neither blocked by the
+                # batch nor assigned a reserved ID
+                result.append(frame_model.insert(1, 1))
+
+            with mock.patch.object(Model, 'timeout', 0.1):
+                with ModelBatch('frames', ['fk_frame_sets', 'rejected'], 3) as batch:  # noqa
+                    self.assertEqual(batch.insert(1, 0), 1)
+
+                    self.assertFalse(Model.connection().in_transaction)
+
+                    thread = threading.Thread(target=insert)
+                    thread.start()
+                    thread.join()
+
+                    self.assertEqual(batch.insert(1, 0), 2)
+
+            self.assertEqual(result, [4])
+            self.assertEqual(frame_model.list(1), [(1, 1, 0), (2, 1, 0), (4, 1, 1)])  # noqa
+
+            # the unused ID is not given back since the sequence advanced
+            self.assertEqual(frame_model.insert(1, 0), 5)
+
+    def test_insert_gives_back_unused_ids(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            with ModelBatch('frames', ['fk_frame_sets', 'rejected']) as batch:  # noqa
+                batch.insert(1, 0)
+                batch.insert(1, 0)
+
+            self.assertEqual(FrameModel().insert(1, 0), 3)
+
+            with ModelBatch('frames', ['fk_frame_sets', 'rejected']) as batch:  # noqa
+                self.assertEqual(batch.insert(1, 0), 4)
+
+    def test_checkpoint(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            frame_model = FrameModel()
+
+            checkpoints = []
+
+            def checkpoint(i):
+                # made in the transaction in which the rows are flushed
+                self.assertTrue(Model.connection().in_transaction)
+
+                checkpoints.append((i, frame_model.count(1)))
+
+            with ModelBatch('frames', ['fk_frame_sets', 'rejected'], 2, True) as batch:  # noqa
+                for i in range(0, 3):
+                    # rows are only flushed at checkpoints
+                    batch.insert(1, 0)
+                    batch.insert(1, 0)
+                    batch.insert(1, 0)
+
+                    self.assertEqual(frame_model.count(1), 3 * i)
+
+                    batch.checkpoint(checkpoint, i)
+
+                    self.assertEqual(frame_model.count(1), 3 * (i + 1))
+
+            self.assertEqual(checkpoints, [(0, 3), (1, 6), (2, 9)])
+
+    def test_checkpoint_without_rows(self):
+        with deepstar_path():
+            function = mock.Mock()
+
+            with ModelBatch('frames', ['fk_frame_sets', 'rejected'], 2, True) as batch:  # noqa
+                batch.checkpoint(function, 1)
+                batch.checkpoint(function, 2)
+
+                self.assertEqual(function.call_args_list, [mock.call(1), mock.call(2)])  # noqa
+
+                batch.checkpoint(function, 3)
+
+            function.assert_called_with(3)
+
+            self.assertFalse(Model.connection().in_transaction)
+
+    def test_checkpoint_discards_rows_on_exception(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+
+            function = mock.Mock()
+
+            with self.assertRaises(ValueError):
+                with ModelBatch('frames', ['fk_frame_sets', 'rejected'], 100, True) as batch:  # noqa
+                    batch.insert(1, 0)
+                    batch.checkpoint(function, 1)
+                    batch.insert(1, 0)
+
+                    raise ValueError()
+
+            # the row inserted after the last checkpoint is discarded
+            self.assertEqual(FrameModel().count(1), 1)
+            function.assert_called_once_with(1)
@@ -0,0 +1,165 @@
+import unittest
+
+from deepstar.models.frame_model import FrameModel
+from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.model import Model
+from deepstar.models.schema_model import SchemaModel
+from deepstar.models.transform_model import TransformModel
+from deepstar.models.transform_set_model import TransformSetModel
+
+from .. import deepstar_path
+
+
+class TestSchemaModel(unittest.TestCase):
+    """
+    This class tests the SchemaModel class.
+    """
+
+    def query_plan(self, query, params):
+        result = Model.execute('EXPLAIN QUERY PLAN ' + query, params)
+
+        return ' '.join([r[3] for r in result.fetchall()])
+
+    def indexes(self):
+        result = Model.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name NOT LIKE 'sqlite_%' AND tbl_name IN ('frames', 'transforms', 'transform_sets') ORDER BY name")  # noqa
+
+        return [r[0] for r in result.fetchall()]
+
+    def columns(self, table):
+        result = Model.execute(f'PRAGMA table_info({table})')
+
+        return [r[1] for r in result.fetchall()]
+
+    def test_init(self):
+        with deepstar_path():
+            self.assertEqual(SchemaModel.version(), len(SchemaModel.migrations))  # noqa
+
+            self.assertEqual(self.indexes(), [
+                'frames_fk_frame_sets_rejected',
+                'transform_sets_fk_frame_sets',
+                'transform_sets_fk_prev_transform_sets',
+                'transforms_fk_frames',
+                'transforms_fk_transform_sets_rejected'
+            ])
+
+    def test_init_upgrades_existing_db(self):
+        with deepstar_path():
+            for index in self.indexes():
+                Model.execute(f'DROP INDEX {index}')
+
+            Model.execute('ALTER TABLE frame_sets DROP COLUMN codec')
+            Model.execute('ALTER TABLE transform_sets DROP COLUMN codec')
+            Model.execute('ALTER TABLE frames DROP COLUMN timestamp')
+            Model.execute('ALTER TABLE frames DROP COLUMN frame_number')
+
+            for column in ['frame_count', 'fps', 'width', 'height', 'duration',
+                           'fourcc']:
+                Model.execute(f'ALTER TABLE videos DROP COLUMN {column}')
+
+            Model.execute('PRAGMA user_version = 0')
+
+            SchemaModel.init()
+
+            self.assertEqual(SchemaModel.version(), len(SchemaModel.migrations))  # noqa
+            self.assertEqual(len(self.indexes()), 5)
+            self.assertIn('codec', self.columns('frame_sets'))
+            self.assertIn('codec', self.columns('transform_sets'))
+            self.assertIn('timestamp', self.columns('frames'))
+            self.assertIn('frame_number', self.columns('frames'))
+            self.assertIn('frame_count', self.columns('videos'))
+            self.assertIn('fourcc', self.columns('videos'))
+
+    def test_init_rebuilds_tables_with_autoincrement(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+            FrameModel().insert(1, 0, 100.0, 3)
+            TransformSetModel().insert('test', 1)
+            TransformModel().insert(1, 1, '{}', 0)
+
+            Model.execute('PRAGMA user_version = 6')
+
+            SchemaModel.init()
+
+            for table in ['frames', 'transforms']:
+                result = Model.execute("SELECT sql FROM sqlite_master WHERE name = ?", (table,))  # noqa
+                self.assertIn('AUTOINCREMENT', result.fetchone()[0])
+
+            self.assertEqual(FrameModel().positions(1), [(1, 3, 100.0)])
+            self.assertEqual(TransformModel().list(1), [(1, 1, 1, '{}', 0)])
+            self.assertEqual(len(self.indexes()), 5)
+
+            # foreign keys are enforced again
+            self.assertEqual(Model.execute('PRAGMA foreign_keys').fetchone()[0], 1)  # noqa
+
+            TransformSetModel().delete(1)
+            FrameSetModel().delete(1)
+
+            self.assertIsNone(TransformModel().select(1))
+            self.assertIsNone(FrameModel().select(1))
+
+    def test_init_is_idempotent(self):
+        with deepstar_path():
+            SchemaModel.init()
+
+            self.assertEqual(SchemaModel.version(), len(SchemaModel.migrations))  # noqa
+            self.assertEqual(len(self.indexes()), 5)
+
+    def test_query_plan_frames(self):
+        with deepstar_path():
+            query = 'SELECT id, fk_frame_sets, rejected FROM frames WHERE +fk_frame_sets = ? AND id > ? AND id <= ? ORDER BY id LIMIT ?'  # noqa
+            plan = self.query_plan(query, (1, 0, 100, 100))
+            self.assertIn('USING INTEGER PRIMARY KEY (rowid>? AND rowid<?)', plan)  # noqa
+            self.assertNotIn('TEMP B-TREE', plan)
+
+            query = 'SELECT id, fk_frame_sets, rejected FROM frames WHERE fk_frame_sets = ? AND rejected = 0 AND id > ? AND id <= ? ORDER BY id LIMIT ?'  # noqa
+            plan = self.query_plan(query, (1, 0, 100, 100))
+            self.assertIn('COVERING INDEX frames_fk_frame_sets_rejected ', plan)  # noqa
+            self.assertNotIn('TEMP B-TREE', plan)
+
+            query = 'SELECT MIN(id), MAX(id) FROM frames WHERE fk_frame_sets = ?'  # noqa
+            plan = self.query_plan(query, (1,))
+            self.assertIn('COVERING INDEX frames_fk_frame_sets_rejected ', plan)  # noqa
+
+            query = 'SELECT count(*) FROM frames WHERE fk_frame_sets = ?'
+            plan = self.query_plan(query, (1,))
+            self.assertIn('COVERING INDEX frames_fk_frame_sets_rejected ', plan)  # noqa
+
+            query = 'SELECT count(*) FROM frames WHERE fk_frame_sets = ? AND rejected = 0'  # noqa
+            plan = self.query_plan(query, (1,))
+            self.assertIn('COVERING INDEX frames_fk_frame_sets_rejected ', plan)  # noqa
+
+    def test_query_plan_transforms(self):
+        with deepstar_path():
+            query = 'SELECT id, fk_transform_sets, fk_frames, metadata, rejected FROM transforms WHERE +fk_transform_sets = ? AND id > ? AND id <= ? ORDER BY id LIMIT ?'  # noqa
+            plan = self.query_plan(query, (1, 0, 100, 100))
+            self.assertIn('USING INTEGER PRIMARY KEY (rowid>? AND rowid<?)', plan)  # noqa
+            self.assertNotIn('TEMP B-TREE', plan)
+
+            query = 'SELECT id, fk_transform_sets, fk_frames, metadata, rejected FROM transforms WHERE fk_transform_sets = ? AND rejected = 0 AND id > ? AND id <= ? ORDER BY id LIMIT ?'  # noqa
+            plan = self.query_plan(query, (1, 0, 100, 100))
+            self.assertIn('INDEX transforms_fk_transform_sets_rejected ', plan)  # noqa
+            self.assertNotIn('TEMP B-TREE', plan)
+
+            query = 'SELECT MIN(id), MAX(id) FROM transforms WHERE fk_transform_sets = ?'  # noqa
+            plan = self.query_plan(query, (1,))
+            self.assertIn('COVERING INDEX transforms_fk_transform_sets_rejected ', plan)  # noqa
+
+            query = 'SELECT count(*) FROM transforms WHERE fk_transform_sets = ? AND rejected = 0'  # noqa
+            plan = self.query_plan(query, (1,))
+            self.assertIn('COVERING INDEX transforms_fk_transform_sets_rejected ', plan)  # noqa
+
+    def test_query_plan_foreign_keys(self):
+        with deepstar_path():
+            query = 'SELECT id FROM transforms WHERE fk_frames = ?'
+            plan = self.query_plan(query, (1,))
+            self.assertIn('COVERING INDEX transforms_fk_frames ', plan)
+
+            query = 'SELECT id FROM transform_sets WHERE fk_frame_sets = ?'
+            plan = self.query_plan(query, (1,))
+            self.assertIn('COVERING INDEX transform_sets_fk_frame_sets ', plan)  # noqa
+
+    def test_query_plan_jobs(self):
+        with deepstar_path():
+            query = 'SELECT id FROM jobs WHERE name = ? AND source_id = ? AND options = ? ORDER BY id DESC LIMIT 1'  # noqa
+            plan = self.query_plan(query, ('test', 1, '{}'))
+            self.assertIn('INDEX jobs_name_source_id ', plan)
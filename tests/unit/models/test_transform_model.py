@@ -3,6 +3,7 @@ import unittest
 
 from deepstar.models.frame_model import FrameModel
 from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.model import Model
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
 
@@ -115,6 +116,115 @@ class TestTransformModel(unittest.TestCase):
             result = TransformModel().list(1)
             self.assertIsNone(result)
 
+    def test_iterate(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+            FrameModel().insert(1, 0)
+
+            TransformSetModel().insert('test', 1)
+            TransformSetModel().insert('test', 1)
+
+            transform_model = TransformModel()
+            transform_model.insert(1, 1, '{}', 0)
+            transform_model.insert(2, 1, '{}', 0)
+            transform_model.insert(1, 1, '{}', 1)
+            transform_model.insert(1, 1, '{}', 0)
+
+            result = list(transform_model.iterate(1))
+            self.assertEqual(len(result), 3)
+            self.assertEqual(result[0], (1, 1, 1, '{}', 0))
+            self.assertEqual(result[1], (3, 1, 1, '{}', 1))
+            self.assertEqual(result[2], (4, 1, 1, '{}', 0))
+
+            result = list(transform_model.iterate(1, length=1))
+            self.assertEqual(len(result), 3)
+            self.assertEqual(result[0], (1, 1, 1, '{}', 0))
+            self.assertEqual(result[1], (3, 1, 1, '{}', 1))
+            self.assertEqual(result[2], (4, 1, 1, '{}', 0))
+
+            result = list(transform_model.iterate(1, rejected=False,
+                                                  length=1))
+            self.assertEqual(len(result), 2)
+            self.assertEqual(result[0], (1, 1, 1, '{}', 0))
+            self.assertEqual(result[1], (4, 1, 1, '{}', 0))
+
+    def test_iterate_fails_to_iterate_transform_set(self):
+        with deepstar_path():
+            result = list(TransformModel().iterate(1))
+            self.assertEqual(result, [])
+
+    def test_batch(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+            FrameModel().insert(1, 0)
+
+            TransformSetModel().insert('test', 1)
+
+            transform_model = TransformModel()
+            transform_model.insert(1, 1, '{}', 0)
+
+            with transform_model.batch(length=2) as batch:
+                self.assertEqual(batch.insert(1, 1, '{}', 0), 2)
+                self.assertEqual(batch.insert(1, None, '{}', 1), 3)
+                self.assertEqual(batch.insert(1, 1, '{}', 0), 4)
+
+            result = transform_model.list(1)
+            self.assertEqual(len(result), 4)
+            self.assertEqual(result[2], (3, 1, None, '{}', 1))
+
+    def test_merge(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+            FrameModel().insert(1, 0)
+
+            transform_set_model = TransformSetModel()
+            transform_set_model.insert('test', 1)
+            transform_set_model.insert('test', 1)
+            transform_set_model.insert('test', 1)
+
+            transform_model = TransformModel()
+            transform_model.insert(1, 1, '{"a": 1}', 0)
+            transform_model.insert(2, 1, '{}', 0)
+            transform_model.insert(1, None, '{"a": 2}', 1)
+
+            self.assertEqual(transform_model.merge(3, 1), [(1, 4), (3, 5)])
+            self.assertEqual(transform_model.list(3), [(4, 3, 1, '{"a": 1}', 0), (5, 3, None, '{"a": 2}', 1)])  # noqa
+
+            self.assertEqual(transform_model.merge(3, 1, rejected=False), [(1, 6)])  # noqa
+            self.assertEqual(transform_model.count(3), 3)
+
+    def test_merge_while_a_batch_is_open(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+            FrameModel().insert(1, 0)
+
+            transform_set_model = TransformSetModel()
+            transform_set_model.insert('test', 1)
+            transform_set_model.insert('test', 1)
+            transform_set_model.insert('test', 1)
+
+            transform_model = TransformModel()
+            transform_model.insert(1, 1, '{"a": 1}', 0)
+            transform_model.insert(2, 1, '{}', 0)
+            transform_model.insert(1, None, '{"a": 2}', 1)
+
+            with transform_model.batch(length=5) as batch:
+                self.assertEqual(batch.insert(2, 1, '{}', 0), 4)
+                self.assertEqual(batch.insert(2, 1, '{}', 0), 5)
+
+                # the batch's reserved IDs (4-8) are not assigned
+                self.assertEqual(transform_model.merge(3, 1), [(1, 9), (3, 10)])  # noqa
+
+            self.assertEqual([t[0] for t in transform_model.list(2)], [2, 4, 5])  # noqa
+            self.assertEqual([t[0] for t in transform_model.list(3)], [9, 10])  # noqa
+
+    def test_merge_fails_to_merge_transform_set(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+            TransformSetModel().insert('test', 1)
+
+            self.assertEqual(TransformModel().merge(1, 2), [])
+
     def test_update(self):
         with deepstar_path():
             FrameSetModel().insert(None)
@@ -139,6 +249,62 @@ class TestTransformModel(unittest.TestCase):
             result = TransformModel().update(1, '{}', 1)
             self.assertFalse(result)
 
+    def test_set_rejected(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+            FrameModel().insert(1, 0)
+
+            TransformSetModel().insert('test', 1)
+
+            transform_model = TransformModel()
+            transform_model.insert(1, 1, '{}', 0)
+            transform_model.insert(1, 1, '{}', 0)
+            transform_model.insert(1, 1, '{}', 1)
+
+            self.assertEqual(transform_model.set_rejected([1, 3], 1), 2)
+            self.assertEqual([r[-1] for r in transform_model.list(1)], [1, 0, 1])  # noqa
+
+            self.assertEqual(transform_model.set_rejected([1, 2, 4], 0), 2)
+            self.assertEqual([r[-1] for r in transform_model.list(1)], [0, 0, 1])  # noqa
+
+    def test_set_rejected_in_transaction(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+            FrameModel().insert(1, 0)
+
+            TransformSetModel().insert('test', 1)
+
+            transform_model = TransformModel()
+            transform_model.insert(1, 1, '{}', 0)
+            transform_model.insert(1, 1, '{}', 0)
+            transform_model.insert(1, 1, '{}', 1)
+
+            Model.execute('BEGIN')
+            transform_model.set_rejected([1, 2], 1)
+            self.assertTrue(Model.connection().in_transaction)
+            Model.execute('ROLLBACK')
+
+            self.assertEqual([r[-1] for r in transform_model.list(1)], [0, 0, 1])  # noqa
+
+    def test_reject_many(self):
+        with deepstar_path():
+            FrameSetModel().insert(None)
+            FrameModel().insert(1, 0)
+
+            TransformSetModel().insert('test', 1)
+
+            transform_model = TransformModel()
+            transform_model.insert(1, 1, '{}', 0)
+            transform_model.insert(1, 1, '{}', 0)
+            transform_model.insert(1, 1, '{}', 1)
+
+            self.assertEqual(transform_model.reject_many([2]), 1)
+            self.assertEqual([r[-1] for r in transform_model.list(1)], [0, 1, 1])  # noqa
+
+    def test_reject_many_fails_to_reject(self):
+        with deepstar_path():
+            self.assertEqual(TransformModel().reject_many([1, 2]), 0)
+
     def test_count(self):
         with deepstar_path():
             FrameSetModel().insert(None)
@@ -1,8 +1,13 @@
+import os
 import unittest
 
+import mock
+
 from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.model import Model
 from deepstar.models.transform_set_model import TransformSetModel
 from deepstar.models.video_model import VideoModel
+from deepstar.util.codec import Codec
 
 from .. import deepstar_path
 
@@ -42,6 +47,28 @@ class TestTransformSetModel(unittest.TestCase):
             result = transform_set_model.select(1)
             self.assertEqual(result, (1, 'test', 1, None))
 
+    def test_codec(self):
+        with deepstar_path():
+            VideoModel().insert('test1', 'test2')
+
+            FrameSetModel().insert(1)
+
+            transform_set_model = TransformSetModel()
+            transform_set_model.insert('test', 1)
+            transform_set_model.insert('test', 1, None, Codec('png:1'))
+
+            with mock.patch.dict(os.environ, {'DEEPSTAR_CODEC': 'webp:90'}):
+                transform_set_model.insert('test', 1)
+
+            self.assertEqual(transform_set_model.codec(1), Codec('jpg:100'))
+            self.assertEqual(transform_set_model.codec(2), Codec('png:1'))
+            self.assertEqual(transform_set_model.codec(3), Codec('webp:90'))
+
+            # sets that predate codecs
+            Model.execute('UPDATE transform_sets SET codec = NULL WHERE id = 1')  # noqa
+
+            self.assertEqual(transform_set_model.codec(1), Codec('jpg:100'))
+
     def test_list(self):
         with deepstar_path():
             VideoModel().insert('test1', 'test2')
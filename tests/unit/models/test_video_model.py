@@ -31,6 +31,27 @@ class TestVideoModel(unittest.TestCase):
             result = video_model.select(1)
             self.assertEqual(result, (1, 'test1', 'test2', None))
 
+    def test_insert_probe(self):
+        with deepstar_path():
+            video_model = VideoModel()
+            video_model.insert('test1', 'test2', 'test3',
+                               (5, 29.97, 1280, 720, 166.833, 'h264'))
+            result = video_model.select(1)
+            self.assertEqual(result, (1, 'test1', 'test2', 'test3'))
+            result = video_model.probe(1)
+            self.assertEqual(result, (5, 29.97, 1280, 720, 166.833, 'h264'))
+            result = video_model.list()
+            self.assertEqual(result[0], (1, 'test1', 'test2', 'test3', 5, 29.97, 1280, 720, 166.833, 'h264'))  # noqa
+
+    def test_probe(self):
+        with deepstar_path():
+            video_model = VideoModel()
+            video_model.insert('test1', 'test2')
+            result = video_model.probe(1)
+            self.assertEqual(result, (None,) * 6)
+            result = video_model.probe(2)
+            self.assertIsNone(result)
+
     def test_update(self):
         with deepstar_path():
             video_model = VideoModel()
@@ -58,9 +79,9 @@ class TestVideoModel(unittest.TestCase):
             video_model.insert('test5', 'test6')
             result = video_model.list()
             self.assertEqual(len(result), 3)
-            self.assertEqual(result[0], (1, 'test1', 'test2', None))
-            self.assertEqual(result[1], (2, 'test3', 'test4', None))
-            self.assertEqual(result[2], (3, 'test5', 'test6', None))
+            self.assertEqual(result[0], (1, 'test1', 'test2', None) + (None,) * 6)  # noqa
+            self.assertEqual(result[1], (2, 'test3', 'test4', None) + (None,) * 6)  # noqa
+            self.assertEqual(result[2], (3, 'test5', 'test6', None) + (None,) * 6)  # noqa
 
     def test_delete(self):
         with deepstar_path():
@@ -1,20 +1,28 @@
+import concurrent.futures
+import math
 import os
 import shutil
 import unittest
 
 import cv2
+import mock
 import numpy as np
 
 from deepstar.filesystem.frame_file import FrameFile
+from deepstar.filesystem.frame_set_dir import FrameSetDir
 from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
 from deepstar.filesystem.video_file import VideoFile
 from deepstar.models.frame_model import FrameModel
 from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.job_model import JobModel
+from deepstar.models.model import Model
 from deepstar.models.video_model import VideoModel
 from deepstar.plugins.default_video_select_extract_plugin import \
     DefaultVideoSelectExtractPlugin
 from deepstar.util.command_line_route_handler_error import \
     CommandLineRouteHandlerError
+from deepstar.util.codec import Codec
+from deepstar.util.prefetch import prefetch
 
 from .. import deepstar_path
 
@@ -130,3 +138,928 @@ class TestDefaultVideoSelectExtractPlugin(unittest.TestCase):
                 VideoModel().insert('test', 'test')
 
                 DefaultVideoSelectExtractPlugin().video_select_extract(1)
+
+    def test_video_select_extract_many(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            for i in range(1, 4):
+                shutil.copyfile(video_0001, VideoFile.path(f'video_000{i}.mp4'))  # noqa
+
+                VideoModel().insert('test', f'video_000{i}.mp4')
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                results = list(DefaultVideoSelectExtractPlugin().video_select_extract_many([1, 2, 3], sub_sample=2, jobs=2))  # noqa
+
+            self.assertEqual(results, [(1, 1), (2, 2), (3, 3)])
+
+            # db
+            self.assertEqual(FrameSetModel().list(), [(1, 1), (2, 2), (3, 3)])  # noqa
+
+            self.assertEqual(FrameModel().list(1), [(1, 1, 0), (2, 1, 0), (3, 1, 0)])  # noqa
+            self.assertEqual(FrameModel().list(2), [(4, 2, 0), (5, 2, 0), (6, 2, 0)])  # noqa
+            self.assertEqual(FrameModel().list(3), [(7, 3, 0), (8, 3, 0), (9, 3, 0)])  # noqa
+
+            # files
+            for frame_set_id in range(1, 4):
+                p1 = FrameSetSubDir.path(frame_set_id)
+
+                self.assertEqual(len(os.listdir(p1)), 6)
+
+            # the frames of each video match those extracted serially
+            frame_set_id = DefaultVideoSelectExtractPlugin().video_select_extract(1, sub_sample=2)  # noqa
+
+            p1 = FrameSetSubDir.path(1)
+            p2 = FrameSetSubDir.path(frame_set_id)
+
+            for frame_id, frame_id_ in zip([1, 2, 3], [10, 11, 12]):
+                for res in ['', '192x192']:
+                    with open(FrameFile.path(p1, frame_id, 'jpg', res), 'rb') as file_:  # noqa
+                        with open(FrameFile.path(p2, frame_id_, 'jpg', res), 'rb') as file__:  # noqa
+                            self.assertEqual(file_.read(), file__.read())
+
+            # temporary directories are removed
+            self.assertEqual(sorted(os.listdir(FrameSetDir.path())), ['00000001', '00000002', '00000003', '00000004'])  # noqa
+
+    def test_video_select_extract_many_fails_to_open_video_file(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+            VideoModel().insert('test', 'test')
+
+            results = DefaultVideoSelectExtractPlugin().video_select_extract_many([1, 2], jobs=2)  # noqa
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                with self.assertRaises(CommandLineRouteHandlerError):
+                    list(results)
+
+            # the video preceding the failed video is extracted
+            self.assertEqual(FrameSetModel().list(), [(1, 1)])
+
+            self.assertEqual(sorted(os.listdir(FrameSetDir.path())), ['00000001'])  # noqa
+
+    def test_video_select_extract_segments(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            with mock.patch.object(plugin, 'min_segment_length', 1):
+                self.assertEqual(plugin.video_select_extract(1, jobs=3), 1)
+                self.assertEqual(plugin.video_select_extract(1, sub_sample=2, jobs=2), 2)  # noqa
+
+            plugin.video_select_extract(1)
+            plugin.video_select_extract(1, sub_sample=2)
+
+            # db
+            self.assertEqual(FrameModel().list(1), [(1, 1, 0), (2, 1, 0), (3, 1, 0), (4, 1, 0), (5, 1, 0)])  # noqa
+            self.assertEqual(FrameModel().list(2), [(6, 2, 0), (7, 2, 0), (8, 2, 0)])  # noqa
+
+            # the frames match those extracted serially
+            for frame_set_id, frame_set_id_ in [(1, 3), (2, 4)]:
+                p1 = FrameSetSubDir.path(frame_set_id)
+                p2 = FrameSetSubDir.path(frame_set_id_)
+
+                names = sorted(os.listdir(p1))
+                names_ = sorted(os.listdir(p2))
+
+                self.assertEqual(len(names), len(names_))
+
+                for name, name_ in zip(names, names_):
+                    with open(os.path.join(p1, name), 'rb') as file_:
+                        with open(os.path.join(p2, name_), 'rb') as file__:
+                            self.assertEqual(file_.read(), file__.read())
+
+            # temporary directories are removed
+            self.assertEqual(len(os.listdir(FrameSetDir.path())), 4)
+
+    def test_segments(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            p1 = VideoFile.path('video_0001.mp4')
+
+            shutil.copyfile(video_0001, p1)
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            self.assertEqual(plugin._segments(p1, 1, 0, 3), [(0, None)])
+
+            with mock.patch.object(plugin, 'min_segment_length', 1):
+                self.assertEqual(plugin._segments(p1, 1, 0, 1), [(0, None)])
+                self.assertEqual(plugin._segments(p1, 1, 0, 3), [(0, 1), (1, 3), (3, None)])  # noqa
+                self.assertEqual(plugin._segments(p1, 2, 0, 3), [(0, 2), (2, 4), (4, None)])  # noqa
+                self.assertEqual(plugin._segments(p1, 1, 3, 2), [(0, 1), (1, 3)])  # noqa
+                self.assertEqual(plugin._segments(p1, 1, 0, 10), [(0, 1), (1, 2), (2, 3), (3, 4), (4, None)])  # noqa
+
+    def test_segments_length(self):
+        with deepstar_path():
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            # the probed frame count is used without opening the video file
+            with mock.patch.object(plugin, 'min_segment_length', 1), \
+                    mock.patch('cv2.VideoCapture') as vc:
+                self.assertEqual(plugin._segments(VideoFile.path('test'), 1, 0, 3, length=5), [(0, 1), (1, 3), (3, None)])  # noqa
+
+            vc.assert_not_called()
+
+    def test_video_select_extract_segments_probe(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            # the video is segmented by the probed (not the actual) frame count
+            VideoModel().insert('test', 'video.mp4', None,
+                                (9, 10.0, 64, 48, 900.0, 'mp4v'))
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            with mock.patch.object(plugin, 'min_segment_length', 1), \
+                    mock.patch.object(plugin, '_video_select_extract_segments') as segments:  # noqa
+                plugin.video_select_extract(1, jobs=3)
+
+            self.assertEqual(segments.call_args[0][3], [(0, 3), (3, 6), (6, None)])  # noqa
+
+    def test_segments_fails_to_open_video_file(self):
+        with deepstar_path():
+            with self.assertRaises(CommandLineRouteHandlerError):
+                DefaultVideoSelectExtractPlugin()._segments(VideoFile.path('test'), 1, 0, 2)  # noqa
+
+    def test_video_select_extract_seek(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            plugin.video_select_extract(1, sub_sample=2)
+
+            with mock.patch.object(plugin, 'seek_min_stride', 1):
+                plugin.video_select_extract(1, sub_sample=2)
+
+            # db
+            self.assertEqual(FrameModel().list(2), [(4, 2, 0), (5, 2, 0), (6, 2, 0)])  # noqa
+
+            # the frames match those grabbed
+            p1 = FrameSetSubDir.path(1)
+            p2 = FrameSetSubDir.path(2)
+
+            for frame_id, frame_id_ in zip([1, 2, 3], [4, 5, 6]):
+                for res in ['', '192x192']:
+                    with open(FrameFile.path(p1, frame_id, 'jpg', res), 'rb') as file_:  # noqa
+                        with open(FrameFile.path(p2, frame_id_, 'jpg', res), 'rb') as file__:  # noqa
+                            self.assertEqual(file_.read(), file__.read())
+
+    def video_capture(self, length, seekable, fps=10):
+        class VideoCapture:
+            """
+            A video capture of length frames at fps frames per second whose
+            frames are their frame numbers.
+            """
+
+            def __init__(self):
+                self.position = 0
+                self.calls = []
+
+            def grab(self):
+                self.calls.append('grab')
+                self.position += 1
+                return self.position <= length
+
+            def retrieve(self):
+                self.calls.append('retrieve')
+                return True, self.position - 1
+
+            def read(self):
+                self.calls.append('read')
+                self.position += 1
+                return self.position <= length, self.position - 1
+
+            def get(self, prop):
+                if prop == cv2.CAP_PROP_FPS:
+                    return fps
+                if prop == cv2.CAP_PROP_POS_FRAMES:
+                    return self.position
+                # the timestamp of the last frame read
+                return max(self.position - 1, 0) * 1000 / fps
+
+            def set(self, prop, value):
+                if not seekable:
+                    return False
+                if prop == cv2.CAP_PROP_POS_MSEC:
+                    self.calls.append(f'set {value}ms')
+                    self.position = math.ceil(value * fps / 1000)
+                else:
+                    self.calls.append(f'set {value}')
+                    self.position = value
+                return True
+
+        return VideoCapture()
+
+    def test_sample(self):
+        plugin = DefaultVideoSelectExtractPlugin()
+
+        # grab skipped frames
+        vc = self.video_capture(7, True)
+        self.assertEqual(list(plugin._sample(vc, 0, None, 3)), [(0, 0, 0), (3, 300, 3), (6, 600, 6)])  # noqa
+        self.assertEqual(vc.calls, ['read', 'grab', 'grab', 'read', 'grab', 'grab', 'read', 'grab'])  # noqa
+
+        # seek to the first sampled frame of a segment
+        vc = self.video_capture(7, True)
+        self.assertEqual(list(plugin._sample(vc, 1, 5, 2)), [(2, 200, 2), (4, 400, 4)])  # noqa
+        self.assertEqual(vc.calls, ['set 2', 'read', 'grab', 'read'])
+
+        # seek past skipped frames
+        with mock.patch.object(plugin, 'seek_min_stride', 3):
+            vc = self.video_capture(7, True)
+            self.assertEqual(list(plugin._sample(vc, 0, None, 3)), [(0, 0, 0), (3, 300, 3), (6, 600, 6)])  # noqa
+            self.assertEqual(vc.calls, ['read', 'set 3', 'read', 'set 6', 'read', 'set 9', 'read'])  # noqa
+
+            # grab if the video capture can not seek
+            vc = self.video_capture(7, False)
+            self.assertEqual(list(plugin._sample(vc, 0, None, 3)), [(0, 0, 0), (3, 300, 3), (6, 600, 6)])  # noqa
+            self.assertEqual(vc.calls, ['read', 'grab', 'grab', 'read', 'grab', 'grab', 'read', 'grab'])  # noqa
+
+    def test_sample_time(self):
+        plugin = DefaultVideoSelectExtractPlugin()
+
+        # stop at the end time (without decoding the frames after it)
+        vc = self.video_capture(10, True)
+        self.assertEqual(list(plugin._sample(vc, 0, None, 2, 0, 500)), [(0, 0, 0), (2, 200, 2), (4, 400, 4)])  # noqa
+        self.assertEqual(vc.calls, ['read', 'grab', 'read', 'grab', 'read', 'grab'])  # noqa
+
+        # skip the frames before the start time if the video capture can not
+        # seek
+        vc = self.video_capture(10, False)
+        self.assertEqual(plugin._seek_time(vc, 0, 350), 0)
+        self.assertEqual(list(plugin._sample(vc, 0, None, 2, 350, 700)), [(4, 400, 4), (6, 600, 6)])  # noqa
+
+    def test_sample_fps(self):
+        plugin = DefaultVideoSelectExtractPlugin()
+
+        # 10 fps sampled at 4 fps (every 250ms)
+        vc = self.video_capture(10, True)
+        self.assertEqual(list(plugin._sample_fps(vc, 0, 0, 0, 4)), [(0, 0, 0), (3, 300, 3), (5, 500, 5), (8, 800, 8)])  # noqa
+        self.assertEqual(vc.calls, ['grab', 'retrieve', 'grab', 'grab', 'grab', 'retrieve', 'grab', 'grab', 'retrieve', 'grab', 'grab', 'grab', 'retrieve', 'grab', 'grab'])  # noqa
+
+        # from a start time to an end time
+        vc = self.video_capture(10, True)
+        position = plugin._seek_time(vc, 0, 250)
+        self.assertEqual(position, 3)
+        self.assertEqual(list(plugin._sample_fps(vc, position, 250, 800, 2)), [(3, 300, 3)])  # noqa
+        self.assertEqual(vc.calls, ['set 250ms', 'grab', 'retrieve', 'grab', 'grab', 'grab', 'grab', 'grab'])  # noqa
+
+        # seek past skipped frames
+        with mock.patch.object(plugin, 'seek_min_stride', 3):
+            vc = self.video_capture(10, True)
+            self.assertEqual(list(plugin._sample_fps(vc, 0, 0, 0, 2.5)), [(0, 0, 0), (4, 400, 4), (8, 800, 8)])  # noqa
+            self.assertEqual(vc.calls, ['grab', 'retrieve', 'set 400.0ms', 'grab', 'retrieve', 'set 800.0ms', 'grab', 'retrieve', 'set 1200.0ms', 'grab'])  # noqa
+
+    def test_video_select_extract_encode_threads(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            with mock.patch.object(plugin, 'encode_threads', 1):
+                plugin.video_select_extract(1)
+
+            with mock.patch.object(plugin, 'encode_threads', 3):
+                plugin.video_select_extract(1)
+
+            # db
+            self.assertEqual(FrameModel().list(2), [(6, 2, 0), (7, 2, 0), (8, 2, 0), (9, 2, 0), (10, 2, 0)])  # noqa
+
+            # the frames are saved in order
+            p1 = FrameSetSubDir.path(1)
+            p2 = FrameSetSubDir.path(2)
+
+            for frame_id in range(1, 6):
+                for res in ['', '192x192']:
+                    with open(FrameFile.path(p1, frame_id, 'jpg', res), 'rb') as file_:  # noqa
+                        with open(FrameFile.path(p2, frame_id + 5, 'jpg', res), 'rb') as file__:  # noqa
+                            self.assertEqual(file_.read(), file__.read())
+
+    def test_video_select_extract_queue_length(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            module = 'deepstar.plugins.default_video_select_extract_plugin'
+
+            with mock.patch.object(plugin, 'queue_length', 2), \
+                    mock.patch.object(plugin, 'encode_threads', 4), \
+                    mock.patch(f'{module}.prefetch', wraps=prefetch) as prefetch_, \
+                    mock.patch(f'{module}.concurrent.futures.ThreadPoolExecutor', wraps=concurrent.futures.ThreadPoolExecutor) as executor:  # noqa
+                plugin.video_select_extract(1)
+
+            self.assertEqual(prefetch_.call_args[0][1], 2)
+            executor.assert_called_once_with(2)
+
+            self.assertEqual(FrameModel().list(1), [(1, 1, 0), (2, 1, 0), (3, 1, 0), (4, 1, 0), (5, 1, 0)])  # noqa
+
+    def test_video_select_extract_codec(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            with mock.patch.dict(os.environ, {'DEEPSTAR_CODEC': 'png:1'}):
+                DefaultVideoSelectExtractPlugin().video_select_extract(1)
+
+            # db
+            self.assertEqual(FrameSetModel().codec(1), Codec('png:1'))
+
+            # files
+            p1 = FrameSetSubDir.path(1)
+
+            for frame_id in range(1, 6):
+                for res in ['', '192x192']:
+                    path = FrameFile.path(p1, frame_id, 'png', res)
+
+                    with open(path, 'rb') as file_:
+                        self.assertEqual(file_.read(4), b'\x89PNG')
+
+            self.assertEqual(len(os.listdir(p1)), 10)
+
+    def test_video_select_extract_scene_threshold(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            # the first two frames are identical
+            frame_set_id = plugin.video_select_extract(1, scene_threshold=0.03)  # noqa
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)), 4)
+
+            # the frames are those of an extract of every frame
+            frame_set_id_ = plugin.video_select_extract(1)
+
+            p1 = FrameSetSubDir.path(frame_set_id)
+            p2 = FrameSetSubDir.path(frame_set_id_)
+
+            for frame_id, frame_id_ in [(1, 5), (2, 7), (3, 8), (4, 9)]:
+                with open(FrameFile.path(p1, frame_id, 'jpg'), 'rb') as file_:  # noqa
+                    with open(FrameFile.path(p2, frame_id_, 'jpg'), 'rb') as file__:  # noqa
+                        self.assertEqual(file_.read(), file__.read())
+
+            frame_set_id = plugin.video_select_extract(1, scene_threshold=0.5)
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)), 1)
+
+            frame_set_id = plugin.video_select_extract(1, scene_threshold=0.5,
+                                                       max_gap=2)
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)), 3)
+
+            frame_set_id = plugin.video_select_extract(1, scene_threshold=0.03,
+                                                       min_gap=3)
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)), 2)
+
+            # max_sample counts the kept frames
+            frame_set_id = plugin.video_select_extract(1, max_sample=3,
+                                                       scene_threshold=0.03)
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)), 3)
+
+            # the video is decoded serially with jobs
+            with mock.patch.object(plugin, 'min_segment_length', 1):
+                frame_set_id = plugin.video_select_extract(
+                    1, scene_threshold=0.03, jobs=2)
+
+            self.assertEqual(len(FrameModel().list(frame_set_id)), 4)
+
+    def test_video_select_extract_scene_threshold_fails(self):
+        with deepstar_path():
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            with self.assertRaises(ValueError):
+                DefaultVideoSelectExtractPlugin().video_select_extract(
+                    1, scene_threshold=2)
+
+            self.assertIsNone(FrameSetModel().select(1))
+
+    def test_video_select_extract_many_scene_threshold(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                results = list(DefaultVideoSelectExtractPlugin()
+                               .video_select_extract_many(
+                                   [1, 2], jobs=2, scene_threshold=0.03))
+
+            self.assertEqual(results, [(1, 1), (2, 2)])
+
+            self.assertEqual(len(FrameModel().list(1)), 4)
+            self.assertEqual(len(FrameModel().list(2)), 4)
+
+    def test_video_select_extract_window(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            frame_set_id = plugin.video_select_extract(1)
+
+            frame_set_ids = [plugin.video_select_extract(1, window=2),
+                             plugin.video_select_extract(1, window=3),
+                             plugin.video_select_extract(1, window=2,
+                                                         max_sample=2)]
+
+            # decoded in segments aligned to the windows
+            with mock.patch.object(plugin, 'min_segment_length', 1):
+                frame_set_ids.append(plugin.video_select_extract(
+                    1, window=2, jobs=2))
+
+            # the frames are those of an extract of every frame (the
+            # sharpness of frames 0 to 4 decreases)
+            p1 = FrameSetSubDir.path(frame_set_id)
+
+            for frame_set_id_, frames in zip(frame_set_ids, [[0, 2, 4], [0, 3], [0, 2], [0, 2, 4]]):  # noqa
+                result = FrameModel().list(frame_set_id_)
+
+                self.assertEqual(len(result), len(frames))
+
+                p2 = FrameSetSubDir.path(frame_set_id_)
+
+                for frame, i in zip(result, frames):
+                    with open(FrameFile.path(p1, i + 1, 'jpg'), 'rb') as file_:  # noqa
+                        with open(FrameFile.path(p2, frame[0], 'jpg'), 'rb') as file__:  # noqa
+                            self.assertEqual(file_.read(), file__.read())
+
+    def test_video_select_extract_window_fails(self):
+        with deepstar_path():
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            with self.assertRaises(ValueError):
+                try:
+                    DefaultVideoSelectExtractPlugin().video_select_extract(
+                        1, window=-1)
+                except ValueError as e:
+                    self.assertEqual(str(e), 'The window must be at least 0 (got -1)')  # noqa
+
+                    raise e
+
+    def test_sharpest(self):
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+
+        cv2.rectangle(image, (16, 16), (48, 48), (255, 255, 255), -1)
+
+        blurry = cv2.GaussianBlur(image, (9, 9), 0)
+
+        samples = [(0, 0, blurry), (2, 200, image), (4, 400, blurry),
+                   (6, 600, blurry), (8, 800, image), (10, 1000, blurry)]
+
+        result = list(DefaultVideoSelectExtractPlugin()._sharpest(samples, 6))  # noqa
+
+        self.assertEqual([i for i, _, _ in result], [2, 8])
+        self.assertIs(result[0][2], image)
+
+    def test_segments_window(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            p1 = VideoFile.path('video_0001.mp4')
+
+            shutil.copyfile(video_0001, p1)
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            with mock.patch.object(plugin, 'min_segment_length', 1):
+                self.assertEqual(plugin._segments(p1, 1, 0, 3, 2), [(0, 2), (2, 4), (4, None)])  # noqa
+                self.assertEqual(plugin._segments(p1, 1, 0, 3, 3), [(0, 3), (3, None)])  # noqa
+                self.assertEqual(plugin._segments(p1, 1, 1, 3, 2), [(0, 2)])  # noqa
+
+    def create_video(self, path, length=30, fps=10):
+        vw = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps,
+                             (64, 48))
+
+        try:
+            for i in range(0, length):
+                vw.write(np.full((48, 64, 3), i * 8, dtype=np.uint8))
+        finally:
+            vw.release()
+
+    def test_video_select_extract_timestamps(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            frame_set_id = plugin.video_select_extract(1, sub_sample=3)
+
+            expected = [(i + 1, i * 300.0) for i in range(0, 10)]
+
+            self.assertEqual([(r[0], r[2]) for r in FrameModel().positions(frame_set_id)], expected)  # noqa
+
+            # segments
+            with mock.patch.object(plugin, 'min_segment_length', 1):
+                frame_set_id = plugin.video_select_extract(1, sub_sample=3,
+                                                           jobs=3)
+
+            expected = [(i + 11, i * 300.0) for i in range(0, 10)]
+
+            self.assertEqual([(r[0], r[2]) for r in FrameModel().positions(frame_set_id)], expected)  # noqa
+
+            # many
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                results = list(plugin.video_select_extract_many(
+                    [1, 2], sub_sample=3, jobs=2))
+
+            expected = [(i + 31, i * 300.0) for i in range(0, 10)]
+
+            self.assertEqual([(r[0], r[2]) for r in FrameModel().positions(results[1][1])], expected)  # noqa
+
+    def test_video_select_extract_time_range(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            frame_set_id = plugin.video_select_extract(1, start_time=1,
+                                                       end_time=2)
+
+            expected = [(i - 9, i * 100.0) for i in range(10, 20)]
+
+            self.assertEqual([(r[0], r[2]) for r in FrameModel().positions(frame_set_id)], expected)  # noqa
+
+            # the frames are those of an extract of every frame
+            frame_set_id_ = plugin.video_select_extract(1)
+
+            p1 = FrameSetSubDir.path(frame_set_id)
+            p2 = FrameSetSubDir.path(frame_set_id_)
+
+            for frame_id in range(1, 11):
+                with open(FrameFile.path(p1, frame_id, 'jpg'), 'rb') as file_:  # noqa
+                    with open(FrameFile.path(p2, frame_id + 20, 'jpg'), 'rb') as file__:  # noqa
+                        self.assertEqual(file_.read(), file__.read())
+
+            # sub_sample counts from the first frame of the video and
+            # max_sample counts from the start time
+            frame_set_id = plugin.video_select_extract(
+                1, sub_sample=4, max_sample=3, start_time=0.5)
+
+            self.assertEqual([timestamp for _, _, timestamp in FrameModel().positions(frame_set_id)], [800, 1200, 1600])  # noqa
+
+    def test_video_select_extract_fps(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            frame_set_id = plugin.video_select_extract(1, fps=2)
+
+            self.assertEqual([timestamp for _, _, timestamp in FrameModel().positions(frame_set_id)], [0, 500, 1000, 1500, 2000, 2500])  # noqa
+
+            frame_set_id = plugin.video_select_extract(1, fps=2,
+                                                       start_time=0.25,
+                                                       end_time=1.5)
+
+            self.assertEqual([timestamp for _, _, timestamp in FrameModel().positions(frame_set_id)], [300, 800, 1300])  # noqa
+
+            # seek past skipped frames
+            with mock.patch.object(plugin, 'seek_min_stride', 2):
+                frame_set_id = plugin.video_select_extract(1, fps=2)
+
+            self.assertEqual([timestamp for _, _, timestamp in FrameModel().positions(frame_set_id)], [0, 500, 1000, 1500, 2000, 2500])  # noqa
+
+    def test_video_select_extract_time_fails(self):
+        with deepstar_path():
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            for kwargs, message in [
+                    ({'start_time': -1}, 'The start time must be at least 0 (got -1)'),  # noqa
+                    ({'start_time': 2, 'end_time': 1}, 'The end time must be 0 or after the start time (got 1)'),  # noqa
+                    ({'fps': -1}, 'The fps must be at least 0 (got -1)'),
+                    ({'fps': 2, 'sub_sample': 2}, 'The fps and sub-sample options are mutually exclusive')]:  # noqa
+                with self.assertRaises(ValueError):
+                    try:
+                        plugin.video_select_extract(1, **kwargs)
+                    except ValueError as e:
+                        self.assertEqual(str(e), message)
+
+                        raise e
+
+    def test_video_select_extract_frame_numbers(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            frame_set_id = plugin.video_select_extract(1, sub_sample=3)
+
+            expected = [(i + 1, i * 3, i * 300.0) for i in range(0, 10)]
+
+            self.assertEqual(FrameModel().positions(frame_set_id), expected)
+
+            # segments
+            with mock.patch.object(plugin, 'min_segment_length', 1):
+                frame_set_id = plugin.video_select_extract(1, sub_sample=3,
+                                                           jobs=3)
+
+            expected = [(i + 11, i * 3, i * 300.0) for i in range(0, 10)]
+
+            self.assertEqual(FrameModel().positions(frame_set_id), expected)
+
+            # many
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                results = list(plugin.video_select_extract_many(
+                    [1, 2], sub_sample=3, jobs=2))
+
+            expected = [(i + 31, i * 3, i * 300.0) for i in range(0, 10)]
+
+            self.assertEqual(FrameModel().positions(results[1][1]), expected)  # noqa
+
+    def test_video_select_reextract(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            plugin.video_select_extract(1)
+
+            # frames 25 and 28 are sought to, frame 2 is grabbed forward to
+            with mock.patch.object(plugin, 'seek_min_stride', 3):
+                frame_set_id = plugin.video_select_reextract(1, [28, 2, 25])
+
+            expected = [(31, 2, 200.0), (32, 25, 2500.0), (33, 28, 2800.0)]
+
+            self.assertEqual(FrameModel().positions(frame_set_id), expected)
+
+            p1 = FrameSetSubDir.path(frame_set_id)
+            p2 = FrameSetSubDir.path(1)
+
+            for frame_id, frame_id_ in [(31, 3), (32, 26), (33, 29)]:
+                with open(FrameFile.path(p1, frame_id, 'jpg'), 'rb') as file_:
+                    with open(FrameFile.path(p2, frame_id_, 'jpg'), 'rb') as file__:  # noqa
+                        self.assertEqual(file_.read(), file__.read())
+
+    def test_video_select_reextract_interrupted(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            encode = plugin._encode
+            calls = []
+
+            def _encode(codec, frame):
+                # the 4th frame fails to encode
+                calls.append(None)
+
+                if len(calls) == 4:
+                    raise KeyboardInterrupt()
+
+                return encode(codec, frame)
+
+            with self.assertRaises(KeyboardInterrupt):
+                with mock.patch.object(plugin, '_encode', _encode):
+                    plugin.video_select_reextract(1, list(range(0, 10)))
+
+            # without a job the frames saved before the interruption are kept
+            self.assertEqual([r[1] for r in FrameModel().positions(1)], [0, 1, 2])  # noqa
+
+            for frame_id in range(1, 4):
+                self.assertTrue(os.path.isfile(FrameFile.path(FrameSetSubDir.path(1), frame_id, 'jpg')))  # noqa
+
+    def test_video_select_reextract_width(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+
+            frame_set_id = DefaultVideoSelectExtractPlugin() \
+                .video_select_reextract(1, [0, 29, 30], width=128)
+
+            # frame 30 is past the end of the video
+            self.assertEqual(len(FrameModel().list(frame_set_id)), 2)
+
+            image = cv2.imread(FrameFile.path(FrameSetSubDir.path(frame_set_id), 1, 'jpg'))  # noqa
+
+            self.assertEqual(image.shape, (96, 128, 3))
+
+    def test_video_select_reextract_fails_to_open_video_file(self):
+        with deepstar_path():
+            with self.assertRaises(CommandLineRouteHandlerError):
+                VideoModel().insert('test', 'test')
+
+                DefaultVideoSelectExtractPlugin().video_select_reextract(1, [0])  # noqa
+
+    def test_video_select_extract_job(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            plugin.video_select_extract(1, sub_sample=4)
+
+            # segments
+            with mock.patch.object(plugin, 'min_segment_length', 1):
+                plugin.video_select_extract(1, sub_sample=4, jobs=3)
+
+            # many
+            with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0'}):
+                list(plugin.video_select_extract_many([1, 2], sub_sample=4,
+                                                      jobs=2))
+
+            options = plugin._options(4, 0, 0, 1, 0, 0, 0, 0, 0)
+
+            result = JobModel().list()
+            self.assertEqual(result, [
+                (1, 'video_select_extract', 1, 1, None, options, 28, 1),
+                (2, 'video_select_extract', 1, 2, None, options, 28, 1),
+                (3, 'video_select_extract', 1, 3, None, options, 28, 1),
+                (4, 'video_select_extract', 2, 4, None, options, 28, 1)])
+
+    def interrupt(self, frame_set_id, length):
+        # keep the first length frames of a frame set as if its extraction
+        # was interrupted
+        result = FrameModel().positions(frame_set_id)
+
+        Model.execute('DELETE FROM frames WHERE fk_frame_sets = ? AND id > ?',
+                      (frame_set_id, result[length - 1][0]))
+
+        # as if the deleted frames' IDs were never used
+        Model.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'frames'",  # noqa
+                      (result[length - 1][0],))
+
+        job = JobModel().find('video_select_extract', 1,
+                              JobModel().list()[-1][5])
+
+        JobModel().update(job[0], checkpoint=result[length - 1][1],
+                          finished=0)
+
+        return result
+
+    def test_video_select_extract_resume(self):
+        for kwargs in [{'sub_sample': 3},
+                       {'sub_sample': 2, 'max_sample': 8},
+                       {'window': 4},
+                       {'fps': 3},
+                       {'start_time': 0.5, 'end_time': 2.5},
+                       {'scene_threshold': 0.05, 'max_gap': 5},
+                       {'sub_sample': 3, 'jobs': 3},
+                       {'window': 4, 'jobs': 3}]:
+            with self.subTest(**kwargs), deepstar_path():
+                self.create_video(VideoFile.path('video.mp4'))
+
+                VideoModel().insert('test', 'video.mp4')
+
+                plugin = DefaultVideoSelectExtractPlugin()
+
+                with mock.patch.object(plugin, 'min_segment_length', 1):
+                    frame_set_id = plugin.video_select_extract(1, **kwargs)
+
+                    expected = self.interrupt(frame_set_id, 3)
+
+                    result = plugin.video_select_extract(1, resume=True,
+                                                         **kwargs)
+
+                self.assertEqual(result, frame_set_id)
+
+                self.assertEqual(FrameModel().positions(frame_set_id), expected)  # noqa
+
+                p1 = FrameSetSubDir.path(frame_set_id)
+
+                for frame_id, _, _ in expected:
+                    self.assertTrue(os.path.isfile(FrameFile.path(p1, frame_id, 'jpg')))  # noqa
+                    self.assertTrue(os.path.isfile(FrameFile.path(p1, frame_id, 'jpg', '192x192')))  # noqa
+
+                self.assertEqual(JobModel().list()[-1][6:], (expected[-1][1], 1))  # noqa
+
+    def test_video_select_extract_resume_interrupted(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            encode = plugin._encode
+            calls = []
+
+            def _encode(codec, frame):
+                # the 6th frame fails to encode
+                calls.append(None)
+
+                if len(calls) == 6:
+                    raise OSError('No space left on device')
+
+                return encode(codec, frame)
+
+            with self.assertRaises(OSError):
+                with mock.patch.object(plugin, '_encode', _encode):
+                    plugin.video_select_extract(1, sub_sample=1)
+
+            # the frames before the 6th frame were committed with the
+            # checkpoint
+            self.assertEqual(len(FrameModel().list(1)), 5)
+            self.assertEqual(JobModel().select(1)[6:], (4, 0))
+
+            frame_set_id = plugin.video_select_extract(1, sub_sample=1,
+                                                       resume=True)
+
+            self.assertEqual(frame_set_id, 1)
+
+            result = FrameModel().positions(1)
+            self.assertEqual([r[1] for r in result], list(range(0, 30)))
+            self.assertEqual(JobModel().select(1)[6:], (29, 1))
+
+    def test_video_select_extract_resume_finished(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            frame_set_id = plugin.video_select_extract(1, sub_sample=3)
+
+            with mock.patch.object(plugin, '_frames') as frames:
+                result = plugin.video_select_extract(1, sub_sample=3,
+                                                     resume=True)
+
+            frames.assert_not_called()
+
+            self.assertEqual(result, frame_set_id)
+            self.assertEqual(len(FrameModel().list(frame_set_id)), 10)
+
+    def test_video_select_extract_resume_new(self):
+        with deepstar_path():
+            self.create_video(VideoFile.path('video.mp4'))
+
+            VideoModel().insert('test', 'video.mp4')
+
+            plugin = DefaultVideoSelectExtractPlugin()
+
+            # no job
+            self.assertEqual(plugin.video_select_extract(1, sub_sample=3, resume=True), 1)  # noqa
+
+            # a job with other options
+            self.assertEqual(plugin.video_select_extract(1, sub_sample=5, resume=True), 2)  # noqa
+
+            # a job whose frame set was deleted (its ID is reused)
+            FrameSetModel().delete(2)
+
+            shutil.rmtree(FrameSetSubDir.path(2))
+
+            self.assertIsNone(JobModel().select(2))
+
+            self.assertEqual(plugin.video_select_extract(1, sub_sample=5, resume=True), 2)  # noqa
+
+            self.assertEqual(len(FrameModel().list(2)), 6)
+            self.assertEqual(JobModel().list()[-1][3:5], (2, None))
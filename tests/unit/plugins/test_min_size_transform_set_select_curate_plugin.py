@@ -2,6 +2,7 @@ import json
 import os
 import shutil
 import unittest
+from unittest import mock
 
 from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
@@ -81,6 +82,27 @@ class TestMinSizeTransformSetSelectCuratePlugin(unittest.TestCase):
             json.loads(t.pop(3))
             self.assertEqual(t, [5, 1, 5, 0])
 
+    def test_transform_set_select_curate_min_size_commits_in_chunks(self):
+        with deepstar_path():
+            with mock.patch.dict(os.environ, {'MODEL_BATCH_LENGTH': '1'}):
+                video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+                shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+                VideoModel().insert('test', 'video_0001.mp4')
+
+                DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+
+                self.mock_transform_set()
+
+                with mock.patch.object(TransformModel, 'reject_many', wraps=TransformModel().reject_many) as reject_many:  # noqa
+                    MinSizeTransformSetSelectCuratePlugin().transform_set_select_curate(1, {'min-size': '300'})  # noqa
+
+                self.assertEqual(reject_many.call_count, 2)
+
+            result = TransformModel().list(1)
+            self.assertEqual([t[4] for t in result], [0, 1, 0, 1, 0])
+
     def test_transform_set_select_curate_min_size_fails_due_to_missing_required_option(self):  # noqa
         with deepstar_path():
             video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
@@ -5,23 +5,67 @@ import shutil
 import unittest
 
 import cv2
+from mtcnn.mtcnn import MTCNN
 import numpy as np
 
+from deepstar.filesystem.frame_file import FrameFile
+from deepstar.filesystem.frame_set_sub_dir import FrameSetSubDir
 from deepstar.filesystem.transform_file import TransformFile
 from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
 from deepstar.filesystem.video_file import VideoFile
 from deepstar.models.frame_model import FrameModel
+from deepstar.models.job_model import JobModel
+from deepstar.models.model_batch import ModelBatch
 from deepstar.models.transform_model import TransformModel
 from deepstar.models.transform_set_model import TransformSetModel
 from deepstar.models.video_model import VideoModel
 from deepstar.plugins.default_video_select_extract_plugin import \
     DefaultVideoSelectExtractPlugin
+from deepstar.plugins.mouth_transform_set_select_extract_plugin import \
+    MouthTransformSetSelectExtractPlugin
 from deepstar.plugins.mtcnn_frame_set_select_extract_plugin import \
     MTCNNFrameSetSelectExtractPlugin
+from deepstar.util.batch_mtcnn import BatchMTCNN
+from deepstar.util.codec import Codec
+from deepstar.util.face_detector import FaceDetector
+from deepstar.util.face_detector_base import FaceDetectorBase
+from deepstar.util.model_cache import ModelCache
 
 from .. import deepstar_path
 
 
+class DummyFaceDetector(FaceDetectorBase):
+    """
+    This class implements a face detector backend for testing that detects
+    one face per image.
+    """
+
+    model_name = 'test'
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    def detect_faces(self, images):
+        faces = []
+
+        for image in images:
+            self.detector(image)
+
+            faces.append([{
+                'box': [500, 100, 200, 250],
+                'confidence': 0.95,
+                'keypoints': {
+                    'left_eye': (560, 182),
+                    'right_eye': (640, 180),
+                    'nose': (600, 230),
+                    'mouth_left': (565, 282),
+                    'mouth_right': (635, 280)
+                }
+            }])
+
+        return faces
+
+
 class TestMTCNNFrameSetSelectExtractPlugin(unittest.TestCase):
     """
     This class implements tests for the MTCNNFrameSetSelectExtractPlugin class.
@@ -163,3 +207,294 @@ class TestMTCNNFrameSetSelectExtractPlugin(unittest.TestCase):
             self.assertIsInstance(cv2.imread(TransformFile.path(p1, 3, 'jpg')), np.ndarray)  # noqa
             self.assertIsInstance(cv2.imread(TransformFile.path(p1, 4, 'jpg')), np.ndarray)  # noqa
             self.assertIsInstance(cv2.imread(TransformFile.path(p1, 5, 'jpg')), np.ndarray)  # noqa
+
+    def test_frame_set_select_extract_face_resume(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+
+            plugin = MTCNNFrameSetSelectExtractPlugin()
+
+            extract_faces = plugin._extract_faces
+
+            def _extract_faces(img, results, frame_path, frame_id, *args):
+                # the 3rd frame fails
+                if frame_id == 3:
+                    raise OSError('No space left on device')
+
+                extract_faces(img, results, frame_path, frame_id, *args)
+
+            with self.assertRaises(OSError):
+                with mock.patch.object(plugin, '_extract_faces', _extract_faces):  # noqa
+                    plugin.frame_set_select_extract(1, {})
+
+            # the transforms of the frames before the 3rd frame were committed
+            # with the checkpoint
+            result = TransformModel().list(1)
+            self.assertEqual([t[2] for t in result], [1, 2])
+            self.assertEqual(JobModel().select(2)[6:], (2, 0))
+
+            transform_set_id = plugin.frame_set_select_extract(1, {'resume': True})  # noqa
+
+            self.assertEqual(transform_set_id, 1)
+
+            result = TransformModel().list(1)
+            self.assertEqual([t[2] for t in result], [1, 2, 3, 4, 5])
+            self.assertEqual(JobModel().select(2)[6:], (5, 1))
+
+            # a finished job is not run again
+            with mock.patch.object(plugin, '_extract_faces') as extract:
+                transform_set_id = plugin.frame_set_select_extract(1, {'resume': True})  # noqa
+
+            extract.assert_not_called()
+
+            self.assertEqual(transform_set_id, 1)
+            self.assertEqual(len(TransformSetModel().list()), 1)
+
+    def test_frame_set_select_extract_face_resume_mid_frame(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+
+            plugin = MTCNNFrameSetSelectExtractPlugin()
+
+            # three faces per frame
+            def detect_faces(self, images):
+                return [[{'box': [100 * i, 100, 80, 80], 'confidence': 0.99, 'keypoints': {'nose': (100 * i + 40, 140)}} for i in range(1, 4)] for _ in images]  # noqa
+
+            insert = ModelBatch.insert
+
+            calls = []
+
+            def _insert(self, *values):
+                # the 2nd face of the 3rd frame fails
+                calls.append(values)
+
+                if len(calls) == 8:
+                    raise OSError('No space left on device')
+
+                return insert(self, *values)
+
+            with mock.patch.dict(os.environ, {'MODEL_BATCH_LENGTH': '1'}):
+                with mock.patch.object(BatchMTCNN, 'detect_faces', detect_faces):  # noqa
+                    with self.assertRaises(OSError):
+                        with mock.patch.object(ModelBatch, 'insert', _insert):  # noqa
+                            plugin.frame_set_select_extract(1, {})
+
+                    # the transforms of the 3rd frame were not committed
+                    # without its checkpoint
+                    result = TransformModel().list(1)
+                    self.assertEqual([t[2] for t in result], [1, 1, 1, 2, 2, 2])  # noqa
+                    self.assertEqual(JobModel().select(2)[6:], (2, 0))
+
+                    plugin.frame_set_select_extract(1, {'resume': True})
+
+            result = TransformModel().list(1)
+            self.assertEqual([t[2] for t in result], [1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 5])  # noqa
+            self.assertEqual(JobModel().select(2)[6:], (5, 1))
+
+    def test_batches(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+
+            p1 = FrameSetSubDir.path(1)
+
+            # frame 4 is of another size
+            cv2.imwrite(FrameFile.path(p1, 4, 'jpg'), np.zeros((10, 20, 3), dtype=np.uint8))  # noqa
+
+            plugin = MTCNNFrameSetSelectExtractPlugin()
+
+            with mock.patch.object(plugin, 'batch_size', 2):
+                result = list(plugin._batches(p1, FrameModel().iterate(1), Codec()))  # noqa
+
+            self.assertEqual([[f[0] for f in frames] for frames in result], [[1, 2], [3], [4], [5]])  # noqa
+            self.assertEqual(result[0][0][1], FrameFile.path(p1, 1, 'jpg'))
+            self.assertEqual(result[2][0][2].shape, (10, 20, 3))
+
+    def test_frame_set_select_extract_face_loads_detector_once(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+            DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+
+            with mock.patch.dict(ModelCache._models, clear=True):
+                with mock.patch('mtcnn.mtcnn.MTCNN', wraps=MTCNN) as mtcnn:
+                    MTCNNFrameSetSelectExtractPlugin().frame_set_select_extract(1, {})  # noqa
+                    MTCNNFrameSetSelectExtractPlugin().frame_set_select_extract(2, {})  # noqa
+
+            mtcnn.assert_called_once_with()
+
+            self.assertEqual(len(TransformModel().list(2)), 5)
+
+    def test_frame_set_select_extract_face_detect_max_side(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+
+            plugin = MTCNNFrameSetSelectExtractPlugin()
+
+            plugin.frame_set_select_extract(1, {})
+            plugin.frame_set_select_extract(1, {'detect-max-side': '640', 'min-face-size': '20', 'scale-factor': '0.709'})  # noqa
+
+            self.assertEqual(len(TransformModel().list(2)), 5)
+
+            # the faces are cropped from the full size frames
+            for transform_1, transform_2 in zip(TransformModel().list(1), TransformModel().list(2)):  # noqa
+                image_1 = cv2.imread(TransformFile.path(TransformSetSubDir.path(1), transform_1[0], 'jpg'))  # noqa
+                image_2 = cv2.imread(TransformFile.path(TransformSetSubDir.path(2), transform_2[0], 'jpg'))  # noqa
+
+                self.assertLess(abs(image_1.shape[0] - image_2.shape[0]), 0.15 * image_1.shape[0])  # noqa
+                self.assertLess(abs(image_1.shape[1] - image_2.shape[1]), 0.15 * image_1.shape[1])  # noqa
+
+    def test_frame_set_select_extract_face_fails_with_invalid_options(self):
+        with deepstar_path():
+            with self.assertRaises(ValueError):
+                try:
+                    MTCNNFrameSetSelectExtractPlugin().frame_set_select_extract(1, {'scale-factor': '2'})  # noqa
+                except ValueError as e:
+                    self.assertEqual(str(e), 'The scale factor must be greater than 0 and less than 1 (got 2.0)')  # noqa
+
+                    raise e
+
+            self.assertEqual(TransformSetModel().list(), [])
+
+    def test_frame_set_select_extract_face_track(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+
+            plugin = MTCNNFrameSetSelectExtractPlugin()
+
+            with mock.patch.object(BatchMTCNN, 'detect_faces', autospec=True, side_effect=BatchMTCNN.detect_faces) as detect_faces:  # noqa
+                transform_set_id = plugin.frame_set_select_extract(1, {'track': '2'})  # noqa
+
+            # faces are detected in the 1st, 3rd and 5th frames only
+            self.assertEqual(detect_faces.call_count, 3)
+
+            result = TransformModel().list(transform_set_id)
+            self.assertEqual([t[2] for t in result], [1, 2, 3, 4, 5])
+
+            for t in result:
+                metadata = json.loads(t[3])
+                self.assertEqual(metadata['track_id'], 1)
+                self.assertEqual(set(metadata['face']), {'left_eye', 'right_eye', 'nose', 'mouth_left', 'mouth_right'})  # noqa
+
+            self.assertEqual(plugin._next_track_id(transform_set_id), 2)
+            self.assertEqual(plugin._next_track_id(transform_set_id + 1), 1)
+
+            # without tracking transforms have no track ID
+            transform_set_id = plugin.frame_set_select_extract(1, {})
+
+            result = TransformModel().list(transform_set_id)
+            self.assertNotIn('track_id', json.loads(result[0][3]))
+
+    def test_frame_set_select_extract_face_blazeface(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+
+            with mock.patch('mtcnn.mtcnn.MTCNN') as mtcnn:
+                transform_set_id = MTCNNFrameSetSelectExtractPlugin().frame_set_select_extract(1, {'detector': 'blazeface'})  # noqa
+
+            mtcnn.assert_not_called()
+
+            result = TransformModel().list(transform_set_id)
+            self.assertEqual(len(result), 5)
+
+            # the metadata has the format of mtcnn
+            metadata = json.loads(result[0][3])
+            self.assertEqual(set(metadata['face']), {'left_eye', 'right_eye', 'nose', 'mouth_left', 'mouth_right'})  # noqa
+
+            self.assertEqual(json.loads(JobModel().select(2)[5])['detector'], 'blazeface')  # noqa
+
+            p1 = TransformSetSubDir.path(transform_set_id)
+
+            # the face (296x296) and its offset
+            self.assertEqual(cv2.imread(TransformFile.path(p1, 1, 'jpg')).shape, (355, 355, 3))  # noqa
+
+            # so that e.g. mouths are extracted from the faces
+            transform_set_id_ = MouthTransformSetSelectExtractPlugin().transform_set_select_extract(transform_set_id, {})  # noqa
+
+            self.assertEqual(len(TransformModel().list(transform_set_id_)), 5)
+
+    def test_frame_set_select_extract_face_detector(self):
+        with deepstar_path():
+            video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+            shutil.copyfile(video_0001, VideoFile.path('video_0001.mp4'))
+
+            VideoModel().insert('test', 'video_0001.mp4')
+
+            DefaultVideoSelectExtractPlugin().video_select_extract(1)  # noqa
+
+            test = mock.Mock()
+
+            with mock.patch.dict(FaceDetector._map, {'test': f'{__name__}:DummyFaceDetector'}):  # noqa
+                with mock.patch.dict(ModelCache._models, {'test': test}):
+                    with mock.patch('mtcnn.mtcnn.MTCNN') as mtcnn:
+                        transform_set_id = MTCNNFrameSetSelectExtractPlugin().frame_set_select_extract(1, {'detector': 'test'})  # noqa
+
+            mtcnn.assert_not_called()
+
+            self.assertEqual(test.call_count, 5)
+
+            result = TransformModel().list(transform_set_id)
+            self.assertEqual(len(result), 5)
+
+            metadata = json.loads(result[0][3])
+            self.assertEqual(metadata, {'face': {'left_eye': [80, 107], 'right_eye': [160, 105], 'nose': [120, 155], 'mouth_left': [85, 207], 'mouth_right': [155, 205]}})  # noqa
+
+            self.assertEqual(json.loads(JobModel().select(2)[5])['detector'], 'test')  # noqa
+
+            # so that e.g. mouths are extracted from the faces
+            transform_set_id_ = MouthTransformSetSelectExtractPlugin().transform_set_select_extract(transform_set_id, {})  # noqa
+
+            self.assertEqual(len(TransformModel().list(transform_set_id_)), 5)
+
+    def test_frame_set_select_extract_face_fails_with_invalid_detector(self):
+        with deepstar_path():
+            with self.assertRaises(ValueError):
+                try:
+                    MTCNNFrameSetSelectExtractPlugin().frame_set_select_extract(1, {'detector': 'test'})  # noqa
+                except ValueError as e:
+                    self.assertEqual(str(e), "'test' is not a valid face detector (expected one of mtcnn, blazeface)")  # noqa
+
+                    raise e
+
+            self.assertEqual(TransformSetModel().list(), [])
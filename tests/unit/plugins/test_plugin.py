@@ -1,3 +1,7 @@
+import importlib.metadata
+import mock
+import subprocess
+import sys
 import unittest
 
 from deepstar.plugins.adjust_color_transform_set_select_extract_plugin import \
@@ -115,3 +119,43 @@ class TestPlugin(unittest.TestCase):
 
         plugin = TestPlugin1.get('test', 'test')
         self.assertIsNone(plugin)
+
+    def test_map(self):
+        for operation, plugins in Plugin._map.items():
+            for name in plugins:
+                plugin = Plugin.get(operation, name)
+                self.assertIsNotNone(plugin)
+                self.assertEqual(getattr(plugin, 'name', name), name)
+
+    def test_lazy(self):
+        code = 'import sys; ' \
+               'import deepstar.deepstar; ' \
+               'print(sorted(m for m in ["flask", "keras", "mtcnn", "tensorflow"] if m in sys.modules))'  # noqa
+
+        result = subprocess.run([sys.executable, '-c', code],
+                                stdout=subprocess.PIPE, check=True)
+
+        self.assertEqual(result.stdout.decode().strip(), '[]')
+
+    def test_entry_points(self):
+        eps = [
+            importlib.metadata.EntryPoint(
+                name='test.test',
+                value='deepstar.plugins.default_video_select_extract_plugin:DefaultVideoSelectExtractPlugin',  # noqa
+                group='deepstar.plugins'),
+            importlib.metadata.EntryPoint(
+                name='video_select_extract.default',
+                value='deepstar.plugins.plugin:Plugin',
+                group='deepstar.plugins')
+        ]
+
+        with mock.patch.object(Plugin, '_entry_points', None):
+            with mock.patch('importlib.metadata.entry_points', return_value=eps):  # noqa
+                plugin = Plugin.get('test', 'test')
+                self.assertTrue(plugin == DefaultVideoSelectExtractPlugin)
+
+                # built in plugins take precedence
+                plugin = Plugin.get('video_select_extract', 'default')
+                self.assertTrue(plugin == DefaultVideoSelectExtractPlugin)
+
+                self.assertIsNone(Plugin.get('test', 'default'))
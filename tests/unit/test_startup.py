@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+class TestStartup(unittest.TestCase):
+    """
+    This class tests that startup (importing deepstar.deepstar) does not
+    import the heavy dependencies of plugins (see tests/benchmarks for the
+    startup time of list commands).
+    """
+
+    def test_import(self):
+        path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            '../..')
+
+        code = ('import sys\n'
+                'import deepstar.deepstar\n'
+                'print(" ".join(sorted(set(name.split(".")[0] '
+                'for name in sys.modules))))')
+
+        result = subprocess.run([sys.executable, '-c', code], cwd=path,
+                                stdout=subprocess.PIPE, check=True)
+
+        modules = result.stdout.decode().split()
+
+        self.assertIn('deepstar', modules)
+
+        for name in ['tensorflow', 'keras', 'mtcnn', 'flask']:
+            self.assertNotIn(name, modules)
@@ -0,0 +1,194 @@
+import os
+import unittest
+
+import cv2
+import mock
+import numpy as np
+from mtcnn.mtcnn import MTCNN
+
+from deepstar.util.batch_mtcnn import BatchMTCNN
+
+
+class TestBatchMTCNN(unittest.TestCase):
+    """
+    This class tests the BatchMTCNN class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.detector = MTCNN()
+
+        video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+        vc = cv2.VideoCapture(video_0001)
+
+        cls.images = []
+
+        while True:
+            ret, frame = vc.read()
+
+            if not ret:
+                break
+
+            cls.images.append(frame)
+
+        vc.release()
+
+    def assertFacesEqual(self, faces_1, faces_2):
+        self.assertEqual(len(faces_1), len(faces_2))
+
+        for face_1, face_2 in zip(faces_1, faces_2):
+            self.assertEqual(face_1['box'], face_2['box'])
+            self.assertEqual(face_1['keypoints'], face_2['keypoints'])
+            self.assertAlmostEqual(face_1['confidence'], face_2['confidence'], places=5)  # noqa
+
+    def test_detect_faces(self):
+        # a frame without faces within the batch
+        images = self.images[:2] + [np.zeros_like(self.images[0])] + \
+            self.images[2:]
+
+        result = BatchMTCNN(self.detector).detect_faces(images)
+
+        self.assertEqual(len(result), 6)
+        self.assertEqual(result[2], [])
+
+        for image, faces in zip(images, result):
+            self.assertFacesEqual(faces, self.detector.detect_faces(image))
+
+        self.assertEqual([len(faces) for faces in result], [1, 1, 0, 1, 1, 1])
+
+    def test_detect_faces_batches_networks(self):
+        detector = BatchMTCNN(self.detector)
+
+        with mock.patch.object(detector, '_predict',
+                               wraps=detector._predict) as predict:
+            detector.detect_faces(self.images)
+
+        scales = detector._scales(12 / 20, 720 * 12 / 20)
+
+        # one P-Net run per scale and one R-Net and O-Net run
+        self.assertEqual(predict.call_count, len(scales) + 2)
+
+    def test_detect_faces_empty(self):
+        self.assertEqual(BatchMTCNN(self.detector).detect_faces([]), [])
+
+    def test_detect_faces_without_networks(self):
+        detector = mock.Mock(spec=['detect_faces'])
+        detector.detect_faces.side_effect = lambda image: [image.shape]
+
+        with mock.patch('deepstar.util.batch_mtcnn.debug') as debug:
+            detector_ = BatchMTCNN(detector)
+
+        # the fallback is not silent
+        self.assertFalse(detector_.batched)
+        debug.assert_called_once_with('The face detector does not expose its networks (mtcnn>=0.1 is required), so faces are detected image by image', 2)  # noqa
+
+        with mock.patch('deepstar.util.batch_mtcnn.debug') as debug:
+            self.assertTrue(BatchMTCNN(self.detector).batched)
+
+        debug.assert_not_called()
+
+        result = detector_.detect_faces(self.images[:2])
+
+        self.assertEqual(result, [[(720, 1280, 3)], [(720, 1280, 3)]])
+        self.assertEqual(detector.detect_faces.call_count, 2)
+
+    def test_detect_faces_max_side(self):
+        expected = BatchMTCNN(self.detector).detect_faces(self.images)
+
+        detector = BatchMTCNN(self.detector, max_side=640)
+
+        with mock.patch.object(detector, '_predict',
+                               wraps=detector._predict) as predict:
+            result = detector.detect_faces(self.images)
+
+        # P-Net ran on the downscaled images
+        self.assertEqual(predict.call_args_list[0][0][1].shape[1:3], (384, 216))  # noqa
+
+        self.assertEqual([len(faces) for faces in result], [1, 1, 1, 1, 1])
+
+        # the boxes and keypoints are mapped back to the full size images
+        for faces_1, faces_2 in zip(expected, result):
+            x1, y1, w1, h1 = faces_1[0]['box']
+            x2, y2, w2, h2 = faces_2[0]['box']
+
+            w = max(0, min(x1 + w1, x2 + w2) - max(x1, x2))
+            h = max(0, min(y1 + h1, y2 + h2) - max(y1, y2))
+
+            self.assertGreater(w * h / (w1 * h1 + w2 * h2 - w * h), 0.75)
+
+            for k, v in faces_1[0]['keypoints'].items():
+                self.assertLess(abs(v[0] - faces_2[0]['keypoints'][k][0]), 0.15 * w1)  # noqa
+                self.assertLess(abs(v[1] - faces_2[0]['keypoints'][k][1]), 0.15 * h1)  # noqa
+
+        # images no larger than the maximum side are not downscaled
+        result = BatchMTCNN(self.detector, max_side=1280).detect_faces(self.images[:1])  # noqa
+
+        self.assertFacesEqual(result[0], expected[0])
+
+    def test_detect_faces_pyramid(self):
+        detector = BatchMTCNN(self.detector, min_face_size=40,
+                              scale_factor=0.5)
+
+        with mock.patch.object(detector, '_predict',
+                               wraps=detector._predict) as predict:
+            result = detector.detect_faces(self.images[:1])
+
+        self.assertEqual(detector._scales(12 / 40, 720 * 12 / 40), [0.3, 0.15, 0.075, 0.0375, 0.01875])  # noqa
+        self.assertEqual(predict.call_count, 5 + 2)
+        self.assertEqual(len(result[0]), 1)
+
+    def test_detect_faces_without_networks_max_side(self):
+        detector = mock.Mock(spec=['detect_faces'])
+        detector.detect_faces.return_value = [{
+            'box': [10, 20, 30, 40],
+            'confidence': 0.99,
+            'keypoints': {'nose': (25, 35)}}]
+
+        result = BatchMTCNN(detector, max_side=640).detect_faces(self.images[:1])  # noqa
+
+        self.assertEqual(detector.detect_faces.call_args[0][0].shape, (360, 640, 3))  # noqa
+        self.assertEqual(result, [[{
+            'box': [20, 40, 60, 80],
+            'confidence': 0.99,
+            'keypoints': {'nose': (50, 70)}}]])
+
+    def test_options(self):
+        result = BatchMTCNN.options({})
+        self.assertEqual(result, {'max_side': 0, 'min_face_size': 20, 'scale_factor': 0.709})  # noqa
+
+        result = BatchMTCNN.options({'detect-max-side': '960', 'min-face-size': '40', 'scale-factor': '0.5'})  # noqa
+        self.assertEqual(result, {'max_side': 960, 'min_face_size': 40, 'scale_factor': 0.5})  # noqa
+
+    def test_options_fails(self):
+        with self.assertRaises(ValueError):
+            try:
+                BatchMTCNN.options({'detect-max-side': 'a'})
+            except ValueError as e:
+                self.assertEqual(str(e), "The detection options are not valid (invalid literal for int() with base 10: 'a')")  # noqa
+
+                raise e
+
+        with self.assertRaises(ValueError):
+            try:
+                BatchMTCNN.options({'detect-max-side': '10'})
+            except ValueError as e:
+                self.assertEqual(str(e), 'The maximum side must be 0 or at least 12 (got 10)')  # noqa
+
+                raise e
+
+        with self.assertRaises(ValueError):
+            try:
+                BatchMTCNN.options({'min-face-size': '10'})
+            except ValueError as e:
+                self.assertEqual(str(e), 'The minimum face size must be at least 12 (got 10)')  # noqa
+
+                raise e
+
+        with self.assertRaises(ValueError):
+            try:
+                BatchMTCNN(self.detector, scale_factor=1)
+            except ValueError as e:
+                self.assertEqual(str(e), 'The scale factor must be greater than 0 and less than 1 (got 1)')  # noqa
+
+                raise e
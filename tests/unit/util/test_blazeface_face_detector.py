@@ -0,0 +1,113 @@
+import os
+import unittest
+
+import cv2
+import mock
+import numpy as np
+
+from deepstar.util.blazeface_face_detector import BlazeFaceFaceDetector
+from deepstar.util.model_cache import ModelCache
+
+
+class TestBlazeFaceFaceDetector(unittest.TestCase):
+    """
+    This class tests the BlazeFaceFaceDetector class.
+    """
+
+    def support(self, name):
+        return os.path.dirname(os.path.realpath(__file__)) + '/../../support/' + name  # noqa
+
+    def assertPointAlmostEqual(self, actual, expected, delta=5):
+        self.assertEqual(len(actual), len(expected))
+
+        for a, e in zip(actual, expected):
+            self.assertAlmostEqual(a, e, delta=delta)
+
+    def test_detect_faces(self):
+        detector = BlazeFaceFaceDetector(ModelCache.get('blazeface'))
+
+        image = cv2.imread(self.support('image_0001.jpg'))
+
+        result = detector.detect_faces([image, np.zeros((360, 640, 3), dtype=np.uint8)])  # noqa
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(len(result[0]), 1)
+        self.assertEqual(result[1], [])
+
+        face = result[0][0]
+
+        self.assertPointAlmostEqual(face['box'], [30, 98, 272, 272])
+        self.assertGreater(face['confidence'], 0.7)
+        self.assertIsInstance(face['confidence'], float)
+
+        keypoints = face['keypoints']
+
+        self.assertPointAlmostEqual(keypoints['left_eye'], (83, 163))
+        self.assertPointAlmostEqual(keypoints['right_eye'], (209, 153))
+        self.assertPointAlmostEqual(keypoints['nose'], (135, 206))
+        self.assertPointAlmostEqual(keypoints['mouth_left'], (101, 282))
+        self.assertPointAlmostEqual(keypoints['mouth_right'], (189, 274))
+
+        for value in keypoints.values():
+            self.assertIsInstance(value[0], int)
+            self.assertIsInstance(value[1], int)
+
+    def test_detect_faces_in_a_frame(self):
+        detector = BlazeFaceFaceDetector(ModelCache.get('blazeface'))
+
+        vc = cv2.VideoCapture(self.support('video_0001.mp4'))
+
+        ret, frame = vc.read()
+
+        vc.release()
+
+        result = detector.detect_faces([frame])
+
+        self.assertEqual(len(result[0]), 1)
+
+        # the face of MTCNN.detect_faces is at [472, 90, 261, 358]
+        self.assertPointAlmostEqual(result[0][0]['box'], [447, 149, 296, 296])  # noqa
+
+    def test_detect_faces_score_threshold(self):
+        image = cv2.imread(self.support('image_0001.jpg'))
+
+        detector = BlazeFaceFaceDetector(ModelCache.get('blazeface'), score_threshold=0.99)  # noqa
+
+        self.assertEqual(detector.detect_faces([image]), [[]])
+
+    def test_load_blazeface(self):
+        self.assertIsInstance(BlazeFaceFaceDetector.load_blazeface(), cv2.dnn.Net)  # noqa
+
+    def test_load_blazeface_fails(self):
+        with mock.patch('deepstar.util.blazeface_face_detector.cv2.dnn', spec=[]):  # noqa
+            with self.assertRaises(ValueError):
+                try:
+                    BlazeFaceFaceDetector.load_blazeface()
+                except ValueError as e:
+                    self.assertTrue(str(e).startswith('The BlazeFace face detector requires OpenCV 4.8 or later'))  # noqa
+
+                    raise e
+
+    def test_options(self):
+        self.assertEqual(BlazeFaceFaceDetector.options({}), {'score_threshold': 0.5, 'nms_threshold': 0.3})  # noqa
+        self.assertEqual(BlazeFaceFaceDetector.options({'score-threshold': '0.7', 'nms-threshold': '0.5'}), {'score_threshold': 0.7, 'nms_threshold': 0.5})  # noqa
+
+    def test_options_fails(self):
+        with self.assertRaises(ValueError):
+            try:
+                BlazeFaceFaceDetector.options({'score-threshold': 'test'})
+            except ValueError as e:
+                self.assertTrue(str(e).startswith('The detection options are not valid'))  # noqa
+
+                raise e
+
+        with self.assertRaises(ValueError):
+            try:
+                BlazeFaceFaceDetector.options({'score-threshold': '2'})
+            except ValueError as e:
+                self.assertEqual(str(e), 'The score threshold must be between 0 and 1 (got 2.0)')  # noqa
+
+                raise e
+
+        with self.assertRaises(ValueError):
+            BlazeFaceFaceDetector.options({'nms-threshold': '-1'})
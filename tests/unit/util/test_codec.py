@@ -0,0 +1,102 @@
+import os
+import unittest
+
+import cv2
+import mock
+import numpy as np
+
+from deepstar.util.codec import Codec
+from deepstar.util.tempdir import tempdir
+
+
+class TestCodec(unittest.TestCase):
+    """
+    This class tests the Codec class.
+    """
+
+    def image(self):
+        return np.random.RandomState(0).randint(0, 256, (32, 48, 3),
+                                                dtype=np.uint8)
+
+    def test_init(self):
+        self.assertEqual(Codec('jpg').spec, 'jpg:100')
+        self.assertEqual(Codec('jpg:90').spec, 'jpg:90')
+        self.assertEqual(Codec('png').spec, 'png:3')
+        self.assertEqual(Codec('webp').spec, 'webp:101')
+        self.assertEqual(Codec('bmp').spec, 'bmp')
+
+        self.assertEqual(Codec('jpg:90').extension, 'jpg')
+        self.assertEqual(Codec('png:0').extension, 'png')
+        self.assertEqual(Codec('webp:80').extension, 'webp')
+        self.assertEqual(Codec('bmp').extension, 'bmp')
+
+    def test_init_default(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('DEEPSTAR_CODEC', None)
+
+            self.assertEqual(Codec(), Codec('jpg:100'))
+
+        with mock.patch.dict(os.environ, {'DEEPSTAR_CODEC': 'png:1'}):
+            self.assertEqual(Codec(), Codec('png:1'))
+
+    def test_init_fails(self):
+        for spec in ['gif', 'jpg:101', 'png:10', 'webp:0', 'bmp:1', 'jpg:x']:
+            with self.assertRaises(ValueError):
+                Codec(spec)
+
+        with self.assertRaises(ValueError):
+            try:
+                Codec('gif')
+            except ValueError as e:
+                self.assertEqual(str(e), "'gif' is not a valid codec (expected one of jpg, png, webp, bmp)")  # noqa
+
+                raise e
+
+    def test_eq(self):
+        self.assertEqual(Codec('jpg'), Codec('jpg:100'))
+        self.assertNotEqual(Codec('jpg:90'), Codec('jpg:100'))
+        self.assertEqual(len({Codec('png'), Codec('png:3')}), 1)
+
+    def test_write(self):
+        image = self.image()
+
+        with tempdir() as tempdir_:
+            for spec in ['png:0', 'png:9', 'webp:101', 'bmp']:
+                codec = Codec(spec)
+
+                path = os.path.join(tempdir_, f'{codec.spec}.{codec.extension}')  # noqa
+
+                codec.write(path, image)
+
+                # lossless
+                self.assertTrue(np.array_equal(cv2.imread(path), image), spec)  # noqa
+
+            path = os.path.join(tempdir_, 'test.jpg')
+
+            Codec('jpg:100').write(path, image)
+
+            self.assertEqual(cv2.imread(path).shape, image.shape)
+
+    def test_copy(self):
+        image = self.image()
+
+        with tempdir() as tempdir_:
+            p1 = os.path.join(tempdir_, 'test.png')
+            p2 = os.path.join(tempdir_, 'test_1.png')
+            p3 = os.path.join(tempdir_, 'test_2.bmp')
+
+            Codec('png').write(p1, image)
+
+            # linked
+            Codec('png').copy(p1, Codec('png'), p2)
+
+            with open(p1, 'rb') as file_1, open(p2, 'rb') as file_2:
+                self.assertEqual(file_1.read(), file_2.read())
+
+            # transcoded
+            Codec('bmp').copy(p1, Codec('png'), p3)
+
+            with open(p3, 'rb') as file_:
+                self.assertEqual(file_.read(2), b'BM')
+
+            self.assertTrue(np.array_equal(cv2.imread(p3), image))
@@ -0,0 +1,92 @@
+import unittest
+
+import mock
+
+from deepstar.util.batch_mtcnn import BatchMTCNN
+from deepstar.util.blazeface_face_detector import BlazeFaceFaceDetector
+from deepstar.util.face_detector import FaceDetector
+from deepstar.util.face_detector_base import FaceDetectorBase
+from deepstar.util.model_cache import ModelCache
+
+
+class DummyFaceDetector(FaceDetectorBase):
+    """
+    This class implements a face detector backend for testing.
+    """
+
+    model_name = 'test'
+
+    def __init__(self, detector, max_side=0):
+        self.detector = detector
+        self.max_side = max_side
+
+    @classmethod
+    def options(cls, opts):
+        return {'max_side': int(opts.get('detect-max-side', 0))}
+
+    def detect_faces(self, images):
+        return [[] for image in images]
+
+
+class TestFaceDetector(unittest.TestCase):
+    """
+    This class tests the FaceDetector class.
+    """
+
+    def setUp(self):
+        patcher = mock.patch.dict(FaceDetector._map, {'test': f'{__name__}:DummyFaceDetector'})  # noqa
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_options(self):
+        self.assertEqual(FaceDetector.options({}), ('mtcnn', {'max_side': 0, 'min_face_size': 20, 'scale_factor': 0.709}))  # noqa
+        self.assertEqual(FaceDetector.options({'detector': 'mtcnn', 'detect-max-side': '960'}), ('mtcnn', {'max_side': 960, 'min_face_size': 20, 'scale_factor': 0.709}))  # noqa
+        self.assertEqual(FaceDetector.options({'detector': 'blazeface', 'score-threshold': '0.7'}), ('blazeface', {'score_threshold': 0.7, 'nms_threshold': 0.3}))  # noqa
+        self.assertEqual(FaceDetector.options({'detector': 'test', 'detect-max-side': '960'}), ('test', {'max_side': 960}))  # noqa
+
+    def test_options_fails(self):
+        with self.assertRaises(ValueError):
+            try:
+                FaceDetector.options({'detector': 'test_invalid'})
+            except ValueError as e:
+                self.assertEqual(str(e), "'test_invalid' is not a valid face detector (expected one of mtcnn, blazeface, test)")  # noqa
+
+                raise e
+
+        with self.assertRaises(ValueError):
+            FaceDetector.options({'detector': 'mtcnn', 'detect-max-side': '10'})  # noqa
+
+    def test_models(self):
+        self.assertEqual(FaceDetector.models({}), ['mtcnn'])
+        self.assertEqual(FaceDetector.models({'detector': 'blazeface'}), ['blazeface'])  # noqa
+        self.assertEqual(FaceDetector.models({'detector': 'test'}), ['test'])  # noqa
+
+    def test_models_fails(self):
+        with self.assertRaises(ValueError):
+            FaceDetector.models({'detector': 'test_invalid'})
+
+    def test_get(self):
+        mtcnn = mock.Mock()
+        test = mock.Mock()
+
+        with mock.patch.dict(ModelCache._models, {'mtcnn': mtcnn, 'test': test}):  # noqa
+            detector = FaceDetector.get('mtcnn')
+
+            self.assertIsInstance(detector, BatchMTCNN)
+            self.assertIs(detector.detector, mtcnn)
+
+            detector = FaceDetector.get('test', {'max_side': 640})
+
+            self.assertIsInstance(detector, DummyFaceDetector)
+            self.assertIs(detector.detector, test)
+            self.assertEqual(detector.max_side, 640)
+
+        detector = FaceDetector.get('blazeface', {'score_threshold': 0.7})
+
+        self.assertIsInstance(detector, BlazeFaceFaceDetector)
+        self.assertIs(detector.detector, ModelCache.get('blazeface'))
+        self.assertEqual(detector.score_threshold, 0.7)
+
+    def test_get_fails(self):
+        with self.assertRaises(ValueError):
+            FaceDetector.get('test_invalid')
@@ -0,0 +1,143 @@
+import unittest
+
+import mock
+import numpy as np
+
+from deepstar.util.face_tracker import FaceTracker
+
+
+class TestFaceTracker(unittest.TestCase):
+    """
+    This class tests the FaceTracker class.
+    """
+
+    def frames(self, positions, size=60):
+        # a still background with textured 'faces' at positions (None if a
+        # frame has no face)
+        random = np.random.RandomState(0)
+
+        background = random.randint(0, 256, (360, 640, 3), dtype=np.uint8)
+        patch = random.randint(0, 256, (size, size, 3), dtype=np.uint8)
+
+        frames = []
+
+        for positions_ in positions:
+            frame = background.copy()
+
+            for x, y in positions_:
+                frame[y:y + size, x:x + size] = patch
+
+            frames.append(frame)
+
+        return frames
+
+    def detector(self, frames, positions, size=60, confidence=0.99):
+        def detect_faces(images):
+            i = next(i for i, frame in enumerate(frames)
+                     if frame is images[0])
+
+            return [[{'box': [x, y, size, size],
+                      'confidence': confidence,
+                      'keypoints': {'nose': (x + size // 2, y + size // 2)}}
+                     for x, y in positions[i]]]
+
+        detector = mock.Mock(spec=['detect_faces'])
+        detector.detect_faces.side_effect = detect_faces
+
+        return detector
+
+    def test_init_fails(self):
+        with self.assertRaises(ValueError):
+            try:
+                FaceTracker(mock.Mock(), 0)
+            except ValueError as e:
+                self.assertEqual(str(e), 'The tracking interval must be at least 1 (got 0)')  # noqa
+
+                raise e
+
+    def test_options(self):
+        self.assertEqual(FaceTracker.options({}), 0)
+        self.assertEqual(FaceTracker.options({'track': '5'}), 5)
+
+    def test_options_fails(self):
+        with self.assertRaises(ValueError):
+            try:
+                FaceTracker.options({'track': 'a'})
+            except ValueError as e:
+                self.assertEqual(str(e), "The tracking interval is not valid (invalid literal for int() with base 10: 'a')")  # noqa
+
+                raise e
+
+        with self.assertRaises(ValueError):
+            FaceTracker.options({'track': '-1'})
+
+    def test_detect_faces(self):
+        positions = [[(100 + 4 * i, 50 + 2 * i)] for i in range(7)]
+
+        frames = self.frames(positions)
+
+        detector = self.detector(frames, positions)
+
+        result = FaceTracker(detector, 3).detect_faces(frames)
+
+        # faces are detected in every 3rd frame
+        self.assertEqual(detector.detect_faces.call_count, 3)
+        self.assertEqual([call[0][0][0] is frames[i] for i, call in zip([0, 3, 6], detector.detect_faces.call_args_list)], [True] * 3)  # noqa
+
+        # and tracked in the frames in between
+        for i, faces in enumerate(result):
+            self.assertEqual(len(faces), 1)
+            self.assertEqual(faces[0]['box'], [100 + 4 * i, 50 + 2 * i, 60, 60])  # noqa
+            self.assertEqual(faces[0]['keypoints'], {'nose': (130 + 4 * i, 80 + 2 * i)})  # noqa
+            self.assertEqual(faces[0]['confidence'], 0.99)
+            self.assertEqual(faces[0]['track_id'], 1)
+
+    def test_detect_faces_redetects_if_tracking_fails(self):
+        # the face disappears in the 3rd frame
+        positions = [[(100, 50)], [(104, 50)], [], [], [(300, 200)]]
+
+        frames = self.frames(positions)
+
+        detector = self.detector(frames, positions)
+
+        result = FaceTracker(detector, 10).detect_faces(frames)
+
+        # the 3rd frame is detected again, the 4th and 5th are tracked
+        self.assertEqual(detector.detect_faces.call_count, 2)
+
+        self.assertEqual([len(faces) for faces in result], [1, 1, 0, 0, 0])
+
+    def test_detect_faces_track_ids(self):
+        # a second face appears and the first face is detected again
+        positions = [[(100, 50)], [(100, 50), (400, 200)],
+                     [(104, 52), (400, 200)]]
+
+        frames = self.frames(positions)
+
+        detector = self.detector(frames, positions)
+
+        result = FaceTracker(detector, 1, next_id=5).detect_faces(frames)
+
+        self.assertEqual(detector.detect_faces.call_count, 3)
+
+        self.assertEqual([[face['track_id'] for face in faces] for faces in result], [[5], [5, 6], [5, 6]])  # noqa
+
+    def test_detect_faces_min_confidence(self):
+        positions = [[(100, 50)], [(104, 50)]]
+
+        frames = self.frames(positions)
+
+        detector = self.detector(frames, positions, confidence=0.5)
+
+        result = FaceTracker(detector, 2, min_confidence=0.9).detect_faces(frames)  # noqa
+
+        self.assertEqual(result, [[], []])
+        self.assertEqual(detector.detect_faces.call_count, 1)
+
+    def test_iou(self):
+        tracker = FaceTracker(mock.Mock(), 1)
+
+        self.assertEqual(tracker.iou([0, 0, 10, 10], [0, 0, 10, 10]), 1.0)
+        self.assertEqual(tracker.iou([0, 0, 10, 10], [5, 0, 10, 10]), 50 / 150)  # noqa
+        self.assertEqual(tracker.iou([0, 0, 10, 10], [20, 20, 10, 10]), 0.0)
+        self.assertEqual(tracker.iou([0, 0, 0, 0], [0, 0, 0, 0]), 0.0)
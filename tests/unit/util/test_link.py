@@ -0,0 +1,81 @@
+import os
+import unittest
+from unittest import mock
+
+from deepstar.util import link as link_module
+from deepstar.util.link import link
+from deepstar.util.tempdir import tempdir
+
+
+class TestLink(unittest.TestCase):
+    """
+    This class tests the link module.
+    """
+
+    def setUp(self):
+        link_module._unsupported.clear()
+
+    def write(self, path, data):
+        with open(path, 'wb') as file_:
+            file_.write(data)
+
+    def read(self, path):
+        with open(path, 'rb') as file_:
+            return file_.read()
+
+    def test_link(self):
+        with tempdir() as tempdir_:
+            src = os.path.join(tempdir_, 'src')
+            dst = os.path.join(tempdir_, 'dst')
+
+            self.write(src, b'test')
+
+            method = link(src, dst)
+
+            self.assertIn(method, ['reflink', 'hardlink'])
+            self.assertEqual(self.read(dst), b'test')
+
+            if method == 'hardlink':
+                self.assertTrue(os.path.samefile(src, dst))
+
+    def test_link_falls_back_to_hardlink(self):
+        with tempdir() as tempdir_:
+            src = os.path.join(tempdir_, 'src')
+
+            self.write(src, b'test')
+
+            with mock.patch.object(link_module, '_reflink', side_effect=OSError()) as reflink:  # noqa
+                self.assertEqual(link(src, os.path.join(tempdir_, 'dst1')), 'hardlink')  # noqa
+                self.assertEqual(link(src, os.path.join(tempdir_, 'dst2')), 'hardlink')  # noqa
+
+                self.assertEqual(reflink.call_count, 1)
+
+            self.assertTrue(os.path.samefile(src, os.path.join(tempdir_, 'dst2')))  # noqa
+
+    def test_link_falls_back_to_copy(self):
+        with tempdir() as tempdir_:
+            src = os.path.join(tempdir_, 'src')
+            dst = os.path.join(tempdir_, 'dst')
+
+            self.write(src, b'test')
+
+            with mock.patch.object(link_module, '_reflink', side_effect=OSError()):  # noqa
+                with mock.patch('os.link', side_effect=OSError()):
+                    self.assertEqual(link(src, dst), 'copy')
+
+            self.assertEqual(self.read(dst), b'test')
+            self.assertFalse(os.path.samefile(src, dst))
+
+    def test_link_fails_if_target_exists(self):
+        with tempdir() as tempdir_:
+            src = os.path.join(tempdir_, 'src')
+            dst = os.path.join(tempdir_, 'dst')
+
+            self.write(src, b'test1')
+            self.write(dst, b'test2')
+
+            with self.assertRaises(FileExistsError):
+                link(src, dst)
+
+            self.assertEqual(self.read(dst), b'test2')
+            self.assertEqual(link_module._unsupported, set())
@@ -0,0 +1,76 @@
+import collections
+import datetime
+import unittest
+
+import mock
+
+from deepstar.util.model_cache import ModelCache
+
+
+class TestModelCache(unittest.TestCase):
+    """
+    This class tests the ModelCache class.
+    """
+
+    def setUp(self):
+        self.models = mock.patch.dict(ModelCache._models, clear=True)
+        self.models.start()
+
+        self.map = mock.patch.dict(ModelCache._map, {
+            'test': 'collections:OrderedDict',
+            'test_method': 'datetime:datetime.now'})
+        self.map.start()
+
+    def tearDown(self):
+        self.map.stop()
+        self.models.stop()
+
+    def test_get(self):
+        model = ModelCache.get('test')
+
+        self.assertEqual(model, {})
+
+        # loaded once
+        self.assertIs(ModelCache.get('test'), model)
+
+    def test_get_loads_once_across_plugins(self):
+        loader = mock.Mock(side_effect=object)
+
+        with mock.patch.object(ModelCache, 'load', return_value=loader):
+            model = ModelCache.get('test')
+
+            self.assertIs(ModelCache.get('test'), model)
+
+        loader.assert_called_once_with()
+
+    def test_get_fails_with_an_invalid_name(self):
+        with self.assertRaises(ValueError):
+            try:
+                ModelCache.get('test_invalid')
+            except ValueError as e:
+                self.assertTrue(str(e).startswith("'test_invalid' is not a valid model name (expected one of mtcnn, mesonet"))  # noqa
+
+                raise e
+
+    def test_warm(self):
+        ModelCache.warm(['test', 'test_method'])
+
+        self.assertEqual(set(ModelCache._models), {'test', 'test_method'})
+
+        model = ModelCache._models['test']
+
+        ModelCache.warm(['test'])
+
+        self.assertIs(ModelCache.get('test'), model)
+
+    def test_clear(self):
+        model = ModelCache.get('test')
+
+        ModelCache.clear()
+
+        self.assertEqual(ModelCache._models, {})
+        self.assertIsNot(ModelCache.get('test'), model)
+
+    def test_load(self):
+        self.assertIs(ModelCache.load('collections:OrderedDict'), collections.OrderedDict)  # noqa
+        self.assertEqual(ModelCache.load('datetime:datetime.now'), datetime.datetime.now)  # noqa
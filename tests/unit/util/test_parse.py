@@ -1,6 +1,6 @@
 import unittest
 
-from deepstar.util.parse import parse_range
+from deepstar.util.parse import parse_range, parse_time
 
 
 class TestParse(unittest.TestCase):
@@ -22,3 +22,23 @@ class TestParse(unittest.TestCase):
     def test_parse_range_fails_to_parse_non_digit(self):
         with self.assertRaises(ValueError):
             parse_range('a')
+
+    def test_parse_time(self):
+        self.assertEqual(parse_time('90'), 90)
+        self.assertEqual(parse_time('1.5'), 1.5)
+        self.assertEqual(parse_time('01:30'), 90)
+        self.assertEqual(parse_time('00:10:30.5'), 630.5)
+        self.assertEqual(parse_time('1:00:00'), 3600)
+
+    def test_parse_time_fails(self):
+        for time_ in ['a', '', '1:2:3:4', '-1', '00:-1', '1::2']:
+            with self.assertRaises(ValueError):
+                parse_time(time_)
+
+        with self.assertRaises(ValueError):
+            try:
+                parse_time('a')
+            except ValueError as e:
+                self.assertEqual(str(e), "'a' is not a valid time (expected [[HH:]MM:]SS[.fff])")  # noqa
+
+                raise e
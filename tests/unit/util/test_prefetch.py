@@ -0,0 +1,78 @@
+import threading
+import unittest
+
+from deepstar.util.prefetch import prefetch
+
+
+class TestPrefetch(unittest.TestCase):
+    """
+    This class tests the prefetch module.
+    """
+
+    def test_prefetch(self):
+        self.assertEqual(list(prefetch(range(0, 10), 3)), list(range(0, 10)))
+
+    def test_prefetch_empty(self):
+        self.assertEqual(list(prefetch([], 3)), [])
+
+    def test_prefetch_thread(self):
+        idents = []
+
+        def iterable():
+            for i in range(0, 3):
+                idents.append(threading.get_ident())
+
+                yield i
+
+        self.assertEqual(list(prefetch(iterable(), 1)), [0, 1, 2])
+
+        self.assertNotIn(threading.get_ident(), idents)
+
+    def test_prefetch_bounded(self):
+        produced = []
+
+        def iterable():
+            for i in range(0, 100):
+                produced.append(i)
+
+                yield i
+
+        items = prefetch(iterable(), 2)
+
+        self.assertEqual(next(items), 0)
+
+        # the item being put, the items buffered and the item consumed
+        self.assertLessEqual(len(produced), 4)
+
+        items.close()
+
+    def test_prefetch_close(self):
+        closed = threading.Event()
+
+        def iterable():
+            try:
+                while True:
+                    yield 0
+            finally:
+                closed.set()
+
+        items = prefetch(iterable(), 2)
+
+        self.assertEqual(next(items), 0)
+
+        items.close()
+
+        self.assertTrue(closed.is_set())
+
+    def test_prefetch_fails(self):
+        def iterable():
+            yield 0
+
+            raise ValueError('test')
+
+        items = prefetch(iterable(), 2)
+
+        self.assertEqual(next(items), 0)
+
+        with self.assertRaises(ValueError):
+            next(items)
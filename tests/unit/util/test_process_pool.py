@@ -0,0 +1,35 @@
+import os
+import unittest
+
+import cv2
+import mock
+
+from deepstar.util.process_pool import job_count, process_pool
+
+
+def _threads(_):
+    return cv2.getNumThreads()
+
+
+class TestProcessPool(unittest.TestCase):
+    """
+    This class tests the process_pool module.
+    """
+
+    def test_job_count(self):
+        with mock.patch.dict(os.environ, {'DEEPSTAR_JOBS': '4'}):
+            self.assertEqual(job_count({'jobs': '2'}), 2)
+            self.assertEqual(job_count({}), 4)
+
+        with mock.patch.dict(os.environ):
+            os.environ.pop('DEEPSTAR_JOBS', None)
+
+            self.assertEqual(job_count({}), 1)
+
+    def test_job_count_fails_to_parse(self):
+        with self.assertRaises(ValueError):
+            job_count({'jobs': 'test'})
+
+    def test_process_pool(self):
+        with process_pool(2) as executor:
+            self.assertEqual(list(executor.map(_threads, [0, 1])), [1, 1])
@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+
+from deepstar.util.scene_gate import SceneGate
+
+
+class TestSceneGate(unittest.TestCase):
+    """
+    This class tests the SceneGate class.
+    """
+
+    def samples(self, values):
+        return [(i, np.full((72, 128, 3), value, dtype=np.uint8))
+                for i, value in enumerate(values)]
+
+    def test_init_fails(self):
+        with self.assertRaises(ValueError):
+            try:
+                SceneGate(0)
+            except ValueError as e:
+                self.assertEqual(str(e), 'The scene threshold must be greater than 0 and at most 1 (got 0)')  # noqa
+
+                raise e
+
+        with self.assertRaises(ValueError):
+            SceneGate(1.5)
+
+        with self.assertRaises(ValueError):
+            try:
+                SceneGate(0.1, min_gap=0)
+            except ValueError as e:
+                self.assertEqual(str(e), 'The minimum gap must be at least 1 (got 0)')  # noqa
+
+                raise e
+
+        with self.assertRaises(ValueError):
+            try:
+                SceneGate(0.1, min_gap=5, max_gap=4)
+            except ValueError as e:
+                self.assertEqual(str(e), 'The maximum gap must be 0 or at least the minimum gap (got 4)')  # noqa
+
+                raise e
+
+    def test_distance(self):
+        gate = SceneGate(0.1)
+
+        samples = self.samples([0, 0, 51, 255])
+
+        signatures = [gate.signature(frame) for _, frame in samples]
+
+        self.assertEqual(signatures[0].shape, (36, 64))
+        self.assertEqual(gate.distance(signatures[0], signatures[1]), 0)
+        self.assertAlmostEqual(gate.distance(signatures[0], signatures[2]), 0.2)  # noqa
+        self.assertEqual(gate.distance(signatures[0], signatures[3]), 1)
+
+    def test_filter(self):
+        samples = self.samples([0, 10, 20, 30, 100, 100, 100, 200, 200])
+
+        result = [i for i, _ in SceneGate(0.1).filter(samples)]
+
+        # the distance is to the last kept frame (not the previous frame)
+        self.assertEqual(result, [0, 3, 4, 7])
+
+    def test_filter_min_gap(self):
+        samples = self.samples([0, 100, 200, 0, 100, 200])
+
+        result = [i for i, _ in SceneGate(0.1, min_gap=2).filter(samples)]
+
+        self.assertEqual(result, [0, 2, 4])
+
+    def test_filter_max_gap(self):
+        samples = self.samples([0] * 8)
+
+        result = [i for i, _ in SceneGate(0.1, max_gap=3).filter(samples)]
+
+        self.assertEqual(result, [0, 3, 6])
+
+    def test_filter_sub_sampled(self):
+        # gaps are in frames of the video (not samples)
+        samples = [(i * 10, frame) for i, frame in self.samples([0] * 4)]
+
+        result = [i for i, _ in SceneGate(0.1, max_gap=15).filter(samples)]
+
+        self.assertEqual(result, [0, 20])
+
+    def test_filter_last(self):
+        # resumed after frame 3 was kept
+        samples = self.samples([0, 10, 20, 30, 100, 100, 100, 200, 200])
+
+        last = samples[3]
+
+        result = [i for i, _ in SceneGate(0.1).filter(samples[4:], last)]
+
+        self.assertEqual(result, [4, 7])
+
+        result = [i for i, _ in SceneGate(0.1, min_gap=2).filter(samples[4:], last)]  # noqa
+
+        self.assertEqual(result, [5, 7])
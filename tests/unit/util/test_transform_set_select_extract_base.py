@@ -0,0 +1,106 @@
+import mock
+import os
+import shutil
+import unittest
+
+from deepstar.filesystem.transform_file import TransformFile
+from deepstar.filesystem.transform_set_sub_dir import TransformSetSubDir
+from deepstar.models.frame_set_model import FrameSetModel
+from deepstar.models.transform_model import TransformModel
+from deepstar.models.transform_set_model import TransformSetModel
+from deepstar.util.transform_set_select_extract_base import \
+    TransformSetSelectExtractBase
+
+from .. import deepstar_path
+
+
+class TestPlugin(TransformSetSelectExtractBase):
+    name = 'test'
+
+    def options(self, opts):
+        return 10
+
+    def transform(self, image, metadata, options):
+        if metadata == 'skip':
+            return None
+
+        return image[:options, :options], f'{metadata}-{options}'
+
+
+class TestTransformSetSelectExtractBase(unittest.TestCase):
+    """
+    This class tests the TransformSetSelectExtractBase class.
+    """
+
+    def mock_transform_set(self):
+        image_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/image_0001.jpg'  # noqa
+
+        FrameSetModel().insert(None)
+
+        TransformSetModel().insert('face', 1, None)
+
+        p1 = TransformSetSubDir.path(1)
+
+        os.mkdir(p1)
+
+        transform_model = TransformModel()
+
+        for i in range(0, 7):
+            metadata = 'skip' if i == 3 else str(i)
+
+            transform_id = transform_model.insert(1, None, metadata,
+                                                  1 if i == 5 else 0)
+
+            shutil.copy(image_0001, TransformFile.path(p1, transform_id, 'jpg'))  # noqa
+
+    def extract(self, jobs):
+        with mock.patch.dict(os.environ, {'DEBUG_LEVEL': '0',
+                                          'MODEL_LIST_LENGTH': '2'}):
+            return TestPlugin().transform_set_select_extract(1, {'jobs': jobs})  # noqa
+
+    def test_transform_set_select_extract(self):
+        with deepstar_path():
+            self.mock_transform_set()
+
+            self.assertEqual(self.extract('1'), 2)
+
+            # db
+            self.assertEqual(TransformSetModel().select(2), (2, 'test', 1, 1))  # noqa
+
+            result = TransformModel().list(2)
+            self.assertEqual(result, [
+                (8, 2, None, '0-10', 0),
+                (9, 2, None, '1-10', 0),
+                (10, 2, None, '2-10', 0),
+                (11, 2, None, '4-10', 0),
+                (12, 2, None, '6-10', 0)
+            ])
+
+            # files
+            p1 = TransformSetSubDir.path(2)
+
+            self.assertEqual(sorted(os.listdir(p1)), [TransformFile.name(i, 'jpg') for i in range(8, 13)])  # noqa
+
+    def test_transform_set_select_extract_jobs(self):
+        with deepstar_path():
+            self.mock_transform_set()
+
+            self.assertEqual(self.extract('1'), 2)
+            self.assertEqual(self.extract('3'), 3)
+
+            result_1 = TransformModel().list(2)
+            result_2 = TransformModel().list(3)
+
+            self.assertEqual(len(result_2), 5)
+            self.assertEqual([r[3] for r in result_1], [r[3] for r in result_2])  # noqa
+            self.assertEqual([r[0] for r in result_2], list(range(13, 18)))
+
+            p1 = TransformSetSubDir.path(2)
+            p2 = TransformSetSubDir.path(3)
+
+            for t1, t2 in zip(result_1, result_2):
+                with open(TransformFile.path(p1, t1[0], 'jpg'), 'rb') as f1:
+                    with open(TransformFile.path(p2, t2[0], 'jpg'), 'rb') as f2:  # noqa
+                        self.assertEqual(f1.read(), f2.read())
+
+            self.assertEqual(len(os.listdir(p2)), 5)
@@ -5,7 +5,7 @@ import cv2
 
 from deepstar.util.tempdir import tempdir
 from deepstar.util.video import create_one_video_file_from_one_image_file, \
-    create_one_video_file_from_many_image_files
+    create_one_video_file_from_many_image_files, probe_video_file
 
 
 class TestVideo(unittest.TestCase):
@@ -84,3 +84,14 @@ class TestVideo(unittest.TestCase):
                 self.assertEqual(vc.get(cv2.CAP_PROP_FRAME_COUNT), 5)
             finally:
                 vc.release()
+
+    def test_probe_video_file(self):
+        video_0001 = os.path.dirname(os.path.realpath(__file__)) + '/../../support/video_0001.mp4'  # noqa
+
+        result = probe_video_file(video_0001)
+
+        self.assertEqual(result, (5, 30000 / 1001, 1280, 720, 166.833, 'h264'))  # noqa
+
+    def test_probe_video_file_fails_to_open_video_file(self):
+        with tempdir() as tempdir_:
+            self.assertIsNone(probe_video_file(os.path.join(tempdir_, 'video.mp4')))  # noqa